@@ -96,10 +96,19 @@ def main():
         action="store_true",
         help="Show migration status"
     )
+    clarify_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue today's interrupted clarify session"
+    )
     
     # Parse arguments
     args = parser.parse_args()
     
+    # Metrics export (GTD_METRICS_PORT / GTD_METRICS_FILE)
+    from gtd_coach.metrics.registry import start_metrics_export
+    start_metrics_export()
+    
     # Default to review if no command specified
     if not args.command:
         args.command = "review"
@@ -157,6 +166,12 @@ def main():
                 print(f"{key}: {value}")
             sys.exit(0)
         
+        if args.resume:
+            from gtd_coach.agent.workflows.daily_clarify import DailyClarifyWorkflow
+            if DailyClarifyWorkflow().resume() is None:
+                print("Nothing to resume today")
+            sys.exit(0)
+        
         # Run clarify with appropriate settings
         use_legacy = args.legacy or os.getenv("USE_LEGACY_CLARIFY", "false").lower() == "true"
         adapter.run(use_legacy=use_legacy, show_comparison=args.compare)
@@ -6,11 +6,31 @@ Adapts coach responses based on detected user state
 
 import logging
 import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from collections import deque
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# State types in the order their modifiers are combined
+STATE_TYPES = ('low_energy', 'high_confusion', 'low_engagement', 'high_stress', 'needs_break')
+HISTORY_SIZE = 50
+
+
+class AdaptationRecord(NamedTuple):
+    """One entry of the adaptation history (timestamp is time.time())"""
+    timestamp: float
+    phase: Optional[str]
+    state_types: Tuple[str, ...]
+
+
+class _Adaptation(NamedTuple):
+    """Precomputed result for one (state flags, phase) combination"""
+    state_types: Tuple[str, ...]
+    prompt_modifiers: Tuple[str, ...]
+    settings: Tuple[Tuple[str, Any], ...]
+    flags: frozenset
+    combined_prompt_modifier: Optional[str]
+
 
 class AdaptiveResponseManager:
     """Adapts coach responses based on user state"""
@@ -80,8 +100,34 @@ class AdaptiveResponseManager:
     def __init__(self):
         """Initialize the adaptive response manager"""
         self.current_adaptations = {}
-        self.adaptation_history = []
+        self.adaptation_history = deque(maxlen=HISTORY_SIZE)
+        self.total_adaptations = 0
         self.adaptation_counts = {}
+        self._lookup = self._build_lookup()
+    
+    def _build_lookup(self) -> Dict[Tuple[int, Optional[str]], _Adaptation]:
+        """
+        Precompute adaptations for every (state flags, phase) combination
+        
+        Flags are a bitmask over STATE_TYPES; phases without overrides share
+        the None entry.
+        """
+        lookup = {}
+        for phase in (None, *self.PHASE_ADAPTATIONS):
+            for mask in range(1 << len(STATE_TYPES)):
+                adaptations = {'prompt_modifiers': [], 'settings': {}, 'flags': set()}
+                state_types = tuple(t for i, t in enumerate(STATE_TYPES) if mask & (1 << i))
+                for state_type in state_types:
+                    self._apply_adaptation(state_type, adaptations, phase)
+                modifiers = adaptations['prompt_modifiers']
+                lookup[mask, phase] = _Adaptation(
+                    state_types,
+                    tuple(modifiers),
+                    tuple(adaptations['settings'].items()),
+                    frozenset(adaptations['flags']),
+                    ' '.join(modifiers) if modifiers else None,
+                )
+        return lookup
     
     def get_adaptations(self, user_state: Dict[str, Any], phase: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -94,36 +140,32 @@ class AdaptiveResponseManager:
         Returns:
             Dictionary of adaptations to apply
         """
+        # State flags as a bitmask over STATE_TYPES
+        mask = (
+            (user_state.get('energy_level') == 'low')
+            | (user_state.get('confusion_level', 0) > 0.5) << 1
+            | (user_state.get('engagement_level', 1.0) < 0.6) << 2
+            | (user_state.get('stress_indicators', 0) >= 2) << 3
+            | bool(user_state.get('needs_break')) << 4
+        )
+        entry = self._lookup[mask, phase if phase in self.PHASE_ADAPTATIONS else None]
+        
+        # Fresh containers so callers can't alter the shared table entry
         adaptations = {
-            'prompt_modifiers': [],
-            'settings': {},
-            'flags': set()
+            'prompt_modifiers': list(entry.prompt_modifiers),
+            'settings': dict(entry.settings),
+            'flags': set(entry.flags)
         }
+        if entry.combined_prompt_modifier:
+            adaptations['combined_prompt_modifier'] = entry.combined_prompt_modifier
         
-        # Check each state condition and apply adaptations
-        if user_state.get('energy_level') == 'low':
-            self._apply_adaptation('low_energy', adaptations, phase)
-        
-        if user_state.get('confusion_level', 0) > 0.5:
-            self._apply_adaptation('high_confusion', adaptations, phase)
-        
-        if user_state.get('engagement_level', 1.0) < 0.6:
-            self._apply_adaptation('low_engagement', adaptations, phase)
-        
-        if user_state.get('stress_indicators', 0) >= 2:
-            self._apply_adaptation('high_stress', adaptations, phase)
-        
-        if user_state.get('needs_break'):
-            self._apply_adaptation('needs_break', adaptations, phase)
-        
-        # Combine prompt modifiers
-        if adaptations['prompt_modifiers']:
-            adaptations['combined_prompt_modifier'] = ' '.join(adaptations['prompt_modifiers'])
+        for state_type in entry.state_types:
+            self.adaptation_counts[state_type] = self.adaptation_counts.get(state_type, 0) + 1
         
         # Log adaptations
-        if adaptations['prompt_modifiers'] or adaptations['settings']:
+        if entry.prompt_modifiers or entry.settings:
             logger.info(f"Applying adaptations for phase {phase}: {adaptations['flags']}")
-            self._record_adaptation(user_state, adaptations, phase)
+            self._record_adaptation(entry, phase)
         
         self.current_adaptations = adaptations
         return adaptations
@@ -159,9 +201,6 @@ class AdaptiveResponseManager:
         for key in ['example_mode', 'celebration_mode', 'grounding_reminder', 'break_suggestion']:
             if base_adapt.get(key):
                 adaptations['flags'].add(key)
-        
-        # Track this adaptation
-        self.adaptation_counts[state_type] = self.adaptation_counts.get(state_type, 0) + 1
     
     def adapt_prompt(self, base_prompt: str, adaptations: Dict[str, Any]) -> str:
         """
@@ -213,22 +252,10 @@ class AdaptiveResponseManager:
         
         return adapted_settings
     
-    def _record_adaptation(self, user_state: Dict, adaptations: Dict, phase: Optional[str]):
-        """Record adaptation for analysis"""
-        self.adaptation_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'phase': phase,
-            'user_state': user_state,
-            'adaptations_applied': {
-                'modifiers': adaptations.get('prompt_modifiers', []),
-                'settings': adaptations.get('settings', {}),
-                'flags': list(adaptations.get('flags', set()))
-            }
-        })
-        
-        # Keep only last 50 adaptations
-        if len(self.adaptation_history) > 50:
-            self.adaptation_history.pop(0)
+    def _record_adaptation(self, entry: _Adaptation, phase: Optional[str]):
+        """Record adaptation for analysis (the deque keeps the last HISTORY_SIZE)"""
+        self.total_adaptations += 1
+        self.adaptation_history.append(AdaptationRecord(time.time(), phase, entry.state_types))
     
     def get_adaptation_metrics(self) -> Dict[str, Any]:
         """
@@ -238,7 +265,7 @@ class AdaptiveResponseManager:
             Dictionary of adaptation metrics
         """
         return {
-            'total_adaptations': len(self.adaptation_history),
+            'total_adaptations': self.total_adaptations,
             'adaptation_counts': self.adaptation_counts,
             'current_adaptations': self.current_adaptations,
             'most_common': max(self.adaptation_counts.items(), key=lambda x: x[1])[0] 
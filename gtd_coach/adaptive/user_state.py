@@ -6,11 +6,55 @@ Monitors user state from interaction patterns and signals
 
 import time
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Any
+
+from gtd_coach.patterns.keywords import KEYWORDS
 
 logger = logging.getLogger(__name__)
 
+# Ring buffer sizes - memory stays flat however long a session runs
+RESPONSE_WINDOW = 5
+STATE_HISTORY_SIZE = 20
+ADAPTATION_HISTORY_SIZE = 50
+
+
+class StateSnapshot(NamedTuple):
+    """One entry of the state history (timestamp is time.time())"""
+    timestamp: float
+    energy: str
+    confusion: float
+    engagement: float
+    stress: int
+    changes: Dict[str, str]
+
+
+def _build_adaptation_needs() -> Dict[tuple, Dict[str, Any]]:
+    """
+    Adaptation recommendations for every combination of state flags
+
+    Keys are (low_energy, high_confusion, low_engagement, high_stress);
+    later flags override earlier ones on shared keys (e.g. 'pace').
+    """
+    parts = (
+        {'prompt_length': 'shorter', 'pace': 'slower', 'encouragement': 'high', 'max_tokens': 100},
+        {'language': 'simpler', 'structure': 'more', 'examples': True, 'step_by_step': True},
+        {'energy': 'higher', 'variety': True, 'celebration': True, 'personalization': 'high'},
+        {'tone': 'calming', 'pace': 'slower', 'breaks': 'suggest', 'grounding': True},
+    )
+    table = {}
+    for mask in range(1 << len(parts)):
+        flags = tuple(bool(mask & (1 << i)) for i in range(len(parts)))
+        needs = {}
+        for flag, part in zip(flags, parts):
+            if flag:
+                needs.update(part)
+        table[flags] = needs
+    return table
+
+
+ADAPTATION_NEEDS = _build_adaptation_needs()
+
 
 class UserStateMonitor:
     """Monitors and assesses user state from existing signals"""
@@ -24,11 +68,11 @@ class UserStateMonitor:
         self.stress_indicators = 0    # count of stress signals
         
         # Tracking variables
-        self.recent_response_times = []  # Last 5 response times
+        self.recent_response_times = deque(maxlen=RESPONSE_WINDOW)
         self.confusion_markers_count = 0
         self.short_response_count = 0
         self.context_switches = 0
-        self.last_update_time = datetime.now()
+        self.last_update_time = time.monotonic()
         
         # Thresholds for state detection
         self.thresholds = {
@@ -40,9 +84,10 @@ class UserStateMonitor:
             'stress_threshold': 2       # stress indicators before flagging
         }
         
-        # History for pattern detection
-        self.state_history = []
-        self.adaptation_history = []
+        # History for pattern detection (bounded; totals are kept as counters)
+        self.state_history = deque(maxlen=STATE_HISTORY_SIZE)
+        self.adaptation_history = deque(maxlen=ADAPTATION_HISTORY_SIZE)
+        self.adaptations_triggered = 0
     
     def update_from_interaction(self, 
                                response_time: float,
@@ -61,10 +106,8 @@ class UserStateMonitor:
         """
         state_changes = {}
         
-        # Track response time
+        # Track response time (the deque drops the oldest)
         self.recent_response_times.append(response_time)
-        if len(self.recent_response_times) > 5:
-            self.recent_response_times.pop(0)
         
         # Detect fatigue from slow responses
         if response_time > self.thresholds['slow_response']:
@@ -89,23 +132,15 @@ class UserStateMonitor:
         else:
             # Normal response - gradually restore energy
             if self.energy_level == "low" and len(self.recent_response_times) >= 3:
-                avg_recent = sum(self.recent_response_times[-3:]) / 3
+                times = self.recent_response_times
+                avg_recent = (times[-1] + times[-2] + times[-3]) / 3
                 if avg_recent < self.thresholds['slow_response']:
                     self.energy_level = "normal"
                     state_changes['energy'] = "recovered"
         
-        # Check for confusion markers
-        confusion_phrases = [
-            "i don't understand", "confused", "not sure", 
-            "what do you mean", "can you explain", "lost",
-            "don't get it", "huh", "wait what"
-        ]
-        
-        content_lower = content.lower()
-        for phrase in confusion_phrases:
-            if phrase in content_lower:
-                self.confusion_markers_count += 1
-                break
+        # Check for confusion markers (phrases in patterns/keywords.py)
+        if KEYWORDS.scan(content).has('confusion_phrase'):
+            self.confusion_markers_count += 1
         
         # Update confusion level
         if self.confusion_markers_count > 0:
@@ -130,21 +165,13 @@ class UserStateMonitor:
                 if self.stress_indicators > 0:
                     self.stress_indicators = max(0, self.stress_indicators - 1)
         
-        # Record state snapshot
-        self.state_history.append({
-            'timestamp': datetime.now(),
-            'energy': self.energy_level,
-            'confusion': self.confusion_level,
-            'engagement': self.engagement_level,
-            'stress': self.stress_indicators,
-            'changes': state_changes
-        })
+        # Record state snapshot (the deque keeps the last STATE_HISTORY_SIZE)
+        self.state_history.append(StateSnapshot(
+            time.time(), self.energy_level, self.confusion_level,
+            self.engagement_level, self.stress_indicators, state_changes
+        ))
         
-        # Keep only last 20 states
-        if len(self.state_history) > 20:
-            self.state_history.pop(0)
-        
-        self.last_update_time = datetime.now()
+        self.last_update_time = time.monotonic()
         return state_changes
     
     def _check_fatigue_pattern(self) -> bool:
@@ -158,8 +185,9 @@ class UserStateMonitor:
             return False
         
         # Check for consistently slow responses
-        slow_count = sum(1 for t in self.recent_response_times[-3:] 
-                        if t > self.thresholds['slow_response'])
+        times = self.recent_response_times
+        slow = self.thresholds['slow_response']
+        slow_count = (times[-1] > slow) + (times[-2] > slow) + (times[-3] > slow)
         
         return slow_count >= 2
     
@@ -186,51 +214,19 @@ class UserStateMonitor:
         Returns:
             Dictionary of adaptation recommendations
         """
-        adaptations = {}
-        
-        # Low energy adaptations
-        if self.energy_level == "low":
-            adaptations.update({
-                'prompt_length': 'shorter',
-                'pace': 'slower',
-                'encouragement': 'high',
-                'max_tokens': 100
-            })
-        
-        # High confusion adaptations
-        if self.confusion_level > self.thresholds['confusion_threshold']:
-            adaptations.update({
-                'language': 'simpler',
-                'structure': 'more',
-                'examples': True,
-                'step_by_step': True
-            })
-        
-        # Low engagement adaptations
-        if self.engagement_level < 0.6:
-            adaptations.update({
-                'energy': 'higher',
-                'variety': True,
-                'celebration': True,
-                'personalization': 'high'
-            })
-        
-        # High stress adaptations
-        if self.stress_indicators >= self.thresholds['stress_threshold']:
-            adaptations.update({
-                'tone': 'calming',
-                'pace': 'slower',
-                'breaks': 'suggest',
-                'grounding': True
-            })
-        
-        # Record what adaptations were recommended
+        flags = (
+            self.energy_level == "low",
+            self.confusion_level > self.thresholds['confusion_threshold'],
+            self.engagement_level < 0.6,
+            self.stress_indicators >= self.thresholds['stress_threshold'],
+        )
+        # Copy so callers can't alter the shared table entry
+        adaptations = dict(ADAPTATION_NEEDS[flags])
+        
+        # Record which flags fired (the deque keeps the last ADAPTATION_HISTORY_SIZE)
         if adaptations:
-            self.adaptation_history.append({
-                'timestamp': datetime.now(),
-                'state': self.get_state(),
-                'adaptations': adaptations
-            })
+            self.adaptations_triggered += 1
+            self.adaptation_history.append((time.time(), flags))
         
         return adaptations
     
@@ -250,9 +246,9 @@ class UserStateMonitor:
         """
         return {
             'total_states_tracked': len(self.state_history),
-            'adaptations_triggered': len(self.adaptation_history),
+            'adaptations_triggered': self.adaptations_triggered,
             'current_state': self.get_state(),
             'avg_response_time': sum(self.recent_response_times) / len(self.recent_response_times) 
                                 if self.recent_response_times else 0,
-            'time_since_last_update': (datetime.now() - self.last_update_time).total_seconds()
+            'time_since_last_update': time.monotonic() - self.last_update_time
         }
\ No newline at end of file
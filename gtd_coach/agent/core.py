@@ -4,13 +4,15 @@ Core LangGraph ReAct Agent for GTD Coach
 Handles the main agent logic with aggressive context management for 32K token limit
 """
 
+import os
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
-from langchain_core.messages.utils import trim_messages, count_tokens_approximately
+from langchain_core.messages.utils import trim_messages
 from langchain_core.runnables import RunnablePassthrough, Runnable
 from langchain_core.language_models import BaseChatModel
 from langgraph.prebuilt import create_react_agent
@@ -22,6 +24,10 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 
 # Import token tracking fix
 from .core_metrics_fix import inject_token_tracking
+from .token_ledger import TokenLedger, load_tokenizer
+from .phase_summary import PhaseSummarizer
+from gtd_coach.prompts.compiled import resolve_prompt_layout
+from gtd_coach.llm.gateway import gateway_http_client, gateway_http_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +118,8 @@ class GTDAgent:
                  model_name: str = "xlam-7b-fc-r",  # Default to xLAM function calling model
                  checkpoint_dir: Optional[Path] = None,
                  use_memory_saver: bool = False,
-                 prompt_object: Optional[Any] = None):
+                 prompt_object: Optional[Any] = None,
+                 context_layout: Optional[str] = None):
         """
         Initialize the GTD Agent
         
@@ -122,10 +129,16 @@ class GTDAgent:
             checkpoint_dir: Directory for SQLite checkpoints
             use_memory_saver: Use in-memory checkpointer (for testing)
             prompt_object: Optional Langfuse prompt object for linking
+            context_layout: "inline" (time context in the system prefix) or
+                "prefix_stable" (static prefix, time context on the latest turn).
+                Defaults to GTD_PROMPT_LAYOUT.
         """
         self.lm_studio_url = lm_studio_url
         self.model_name = model_name
         self.prompt_object = prompt_object  # Store for later use in tracing
+        self.context_layout = resolve_prompt_layout(
+            context_layout or os.environ.get("GTD_PROMPT_LAYOUT")
+        )
         
         # Initialize LLM client for LM Studio
         self.llm = self._create_lm_studio_client()
@@ -152,12 +165,23 @@ class GTDAgent:
         # Agent will be created after tools are set
         self.agent = None
         
+        # Per-message token cache (real tokenizer when available offline)
+        self.token_ledger = TokenLedger(load_tokenizer())
+        
         # Track context usage
         self.context_metrics = {
+            'token_counter': self.token_ledger.mode,
             'total_tokens': 0,
             'phase_tokens': {},
-            'overflow_count': 0
+            'overflow_count': 0,
+            # Whether the system prefix was byte-identical to the previous call
+            'prefix_reuse': {'hits': 0, 'misses': 0}
         }
+        self._last_prefix_digest = None
+        
+        # Finished phases are summarized by the LLM in the background;
+        # placeholders stand in until the summary is ready
+        self.phase_summarizer = PhaseSummarizer(self.llm, max_tokens=self.SUMMARY_TOKENS // 2)
         
     @retry(
         stop=stop_after_attempt(3),
@@ -185,6 +209,9 @@ class GTDAgent:
             max_tokens=self.MAX_RESPONSE_TOKENS,
             streaming=True,  # Enable streaming for real-time feedback
             timeout=30,  # 30 second timeout for local inference
+            # Shared LM Studio queue, for both invoke/stream and the graph's async calls
+            http_client=gateway_http_client(),
+            http_async_client=gateway_http_async_client(),
         )
         
         # Perform health check
@@ -251,10 +278,12 @@ class GTDAgent:
             logger.error(f"LLM test failed: {e}")
             raise
         
-        # Create base agent with tools
+        # Create base agent with tools; every model call goes through the
+        # context manager, which picks the messages actually sent
         base_agent = create_react_agent(
             self.llm,
             self.tools,
+            pre_model_hook=self._pre_model_node,
             checkpointer=self.checkpointer
         )
         
@@ -266,6 +295,30 @@ class GTDAgent:
         
         logger.info(f"Created ReAct agent with {len(self.tools)} tools (wrapped for Langfuse compatibility)")
     
+    def _pre_model_node(self, state: Dict) -> Dict:
+        """
+        pre_model_hook node for the ReAct graph
+        
+        The graph state only carries messages; phase, timing and summary
+        fields live in the V2 tools' state manager, which the transition
+        tool updates. Fields the hook changes are written back there.
+        
+        Args:
+            state: Graph state
+            
+        Returns:
+            Update with the messages to send (the stored history is untouched)
+        """
+        from gtd_coach.agent.tools.time_manager_v2 import state_manager
+        
+        shared = state_manager.get_state()
+        view = {**shared, "messages": state["messages"]}
+        llm_input = self._pre_model_hook(view)
+        for key in ("phase_changed", "phase_summaries"):
+            if key in view and view[key] != shared.get(key):
+                state_manager.set(key, view[key])
+        return {"llm_input_messages": llm_input}
+    
     def _pre_model_hook(self, state: Dict) -> List:
         """
         Aggressive context management hook
@@ -279,17 +332,32 @@ class GTDAgent:
         """
         messages = state.get("messages", [])
         
+        # The runner seeds the conversation with its own system prompt; keep it
+        # ahead of the managed prefix rather than letting trimming drop it
+        leading = []
+        while messages and isinstance(messages[0], SystemMessage):
+            leading.append(messages[0])
+            messages = messages[1:]
+        
         # Check if phase changed - if so, summarize and reset
         if state.get("phase_changed", False):
-            summary = self._summarize_phase(messages, state.get("current_phase", ""))
-            state["phase_summary"] = state.get("phase_summary", "") + f"\n{summary}"
+            # The transition tool has already moved current_phase on
+            completed = state.get("completed_phases") or []
+            finished = completed[-1] if completed else state.get("current_phase", "")
+            summary = (self.phase_summarizer.cache.get(finished)
+                       or self._summarize_phase(messages, finished))
+            self.phase_summarizer.submit(finished, messages)
+            # One entry per phase, so the LLM summary can replace the placeholder by key
+            state["phase_summaries"] = {**(state.get("phase_summaries") or {}), finished: summary}
             # Keep only last 2 messages after phase change
             messages = messages[-2:] if len(messages) > 2 else messages
             state["phase_changed"] = False
             logger.info(f"Phase changed - reset context to {len(messages)} messages")
         
-        # Count current tokens
-        current_tokens = count_tokens_approximately(messages)
+        self._apply_phase_summaries(state)
+        
+        # Count current tokens (only messages new since the last call are tokenized)
+        current_tokens = self.token_ledger.count_messages(messages)
         
         # Aggressive trimming if over limit
         if current_tokens > self.MAX_INPUT_TOKENS:
@@ -297,19 +365,64 @@ class GTDAgent:
             messages = trim_messages(
                 messages,
                 strategy="last",
-                token_counter=count_tokens_approximately,
+                token_counter=self.token_ledger,
                 max_tokens=self.MAX_INPUT_TOKENS,
                 start_on="human",
                 end_on=("human", "tool"),
                 allow_partial=False
             )
             self.context_metrics['overflow_count'] += 1
+            current_tokens = self.token_ledger.count_messages(messages)
         
         # Add time awareness and phase context
         time_context = self._get_time_context(state)
         phase_guidance = self._get_phase_guidance(state)
         
-        # Construct final message list with system prompts
+        history = messages
+        if self.context_layout == "prefix_stable":
+            system_messages, messages = self._build_prefix_stable_context(
+                state, messages, time_context, phase_guidance
+            )
+        else:
+            system_messages = self._build_inline_context(state, time_context, phase_guidance)
+        if leading and self.context_layout == "prefix_stable":
+            system_messages[0] = SystemMessage(
+                content="\n\n".join([str(m.content) for m in leading] + [system_messages[0].content])
+            )
+        elif leading:
+            system_messages = leading + system_messages
+        
+        self._track_prefix_reuse(system_messages)
+        
+        # Track token usage
+        total_tokens = self.token_ledger(system_messages) + current_tokens
+        if messages is not history:
+            # Time context was appended to a copy of the latest turn
+            total_tokens += self.token_ledger.count_text(f"\n\n[{time_context}]")
+        self.context_metrics['total_tokens'] = total_tokens
+        
+        current_phase = state.get("current_phase", "UNKNOWN")
+        if current_phase not in self.context_metrics['phase_tokens']:
+            self.context_metrics['phase_tokens'][current_phase] = []
+        self.context_metrics['phase_tokens'][current_phase].append(total_tokens)
+        
+        logger.debug(f"Sending {total_tokens} tokens to LLM (phase: {current_phase})")
+        
+        return system_messages + messages
+    
+    def _build_inline_context(self, state: Dict, time_context: str,
+                              phase_guidance: str) -> List:
+        """
+        Build the system messages with time context inside the prefix
+        
+        Args:
+            state: Current agent state
+            time_context: Time awareness string
+            phase_guidance: Phase guidance string
+            
+        Returns:
+            System messages placed before the history
+        """
         system_messages = []
         
         # Compact system prompt
@@ -323,23 +436,67 @@ class GTDAgent:
             system_messages.append(SystemMessage(content=phase_guidance))
         
         # Add phase summary if exists
-        if state.get("phase_summary"):
+        phase_summary = self._render_phase_summary(state)
+        if phase_summary:
             system_messages.append(SystemMessage(
-                content=f"Previous phases summary:\n{state['phase_summary'][-self.SUMMARY_TOKENS:]}"
+                content=f"Previous phases summary:\n{phase_summary[-self.SUMMARY_TOKENS:]}"
             ))
         
-        # Track token usage
-        total_tokens = count_tokens_approximately(system_messages + messages)
-        self.context_metrics['total_tokens'] = total_tokens
+        return system_messages
+    
+    def _build_prefix_stable_context(self, state: Dict, messages: List, time_context: str,
+                                     phase_guidance: str) -> Tuple[List, List]:
+        """
+        Build a single static system message and move time context to the end
         
-        current_phase = state.get("current_phase", "UNKNOWN")
-        if current_phase not in self.context_metrics['phase_tokens']:
-            self.context_metrics['phase_tokens'][current_phase] = []
-        self.context_metrics['phase_tokens'][current_phase].append(total_tokens)
+        The system message only changes at phase transitions, so LM Studio can
+        reuse its prompt cache for the prefix and the history on every turn.
         
-        logger.debug(f"Sending {total_tokens} tokens to LLM (phase: {current_phase})")
+        Args:
+            state: Current agent state
+            messages: Conversation history (after trimming)
+            time_context: Time awareness string (changes every minute)
+            phase_guidance: Phase guidance string
+            
+        Returns:
+            Tuple of (system messages, history with time context on the latest turn)
+        """
+        static_parts = [self._get_system_prompt(state)]
+        if phase_guidance:
+            static_parts.append(phase_guidance)
+        phase_summary = self._render_phase_summary(state)
+        if phase_summary:
+            static_parts.append(
+                f"Previous phases summary:\n{phase_summary[-self.SUMMARY_TOKENS:]}"
+            )
+        system_messages = [SystemMessage(content="\n\n".join(static_parts))]
         
-        return system_messages + messages
+        if not time_context:
+            return system_messages, messages
+        
+        # Attach to a copy of the latest human/tool turn; history itself is untouched
+        last = messages[-1] if messages else None
+        if isinstance(last, (HumanMessage, ToolMessage)) and isinstance(last.content, str):
+            tagged = last.model_copy(update={"content": f"{last.content}\n\n[{time_context}]"})
+            return system_messages, messages[:-1] + [tagged]
+        
+        # Nothing suitable to attach to - keep the time context in the prefix
+        system_messages.append(SystemMessage(content=time_context))
+        return system_messages, messages
+    
+    def _track_prefix_reuse(self, system_messages: List) -> None:
+        """
+        Record whether the system prefix matches the previous call
+        
+        Args:
+            system_messages: System messages about to be sent
+        """
+        digest = hashlib.sha1(
+            "\x00".join(str(m.content) for m in system_messages).encode("utf-8")
+        ).hexdigest()
+        key = 'hits' if digest == self._last_prefix_digest else 'misses'
+        self.context_metrics['prefix_reuse'][key] += 1
+        self._last_prefix_digest = digest
     
     def _get_system_prompt(self, state: Dict) -> str:
         """
@@ -427,9 +584,38 @@ Do NOT proceed or transition phases until user responds.""",
         
         return guidance.get(phase, "")
     
+    def _apply_phase_summaries(self, state: Dict) -> None:
+        """
+        Swap placeholder phase summaries for finished LLM summaries
+        
+        Args:
+            state: Current agent state (phase_summaries is replaced, keyed by phase)
+        """
+        self.phase_summarizer.collect()
+        summaries = state.get("phase_summaries") or {}
+        ready = {phase: summary for phase, summary in self.phase_summarizer.cache.items()
+                 if phase in summaries and summaries[phase] != summary}
+        if ready:
+            state["phase_summaries"] = {**summaries, **ready}
+    
+    def _render_phase_summary(self, state: Dict) -> str:
+        """
+        Text of the previous-phases summary for the system prefix
+        
+        Args:
+            state: Current agent state
+            
+        Returns:
+            Free-form phase_summary followed by one line per summarized phase
+        """
+        parts = [state.get("phase_summary") or ""]
+        parts.extend((state.get("phase_summaries") or {}).values())
+        return "\n".join(part for part in parts if part)
+    
     def _summarize_phase(self, messages: List, phase: str) -> str:
         """
         Create compact summary of phase for context preservation
+        (placeholder used until the LLM summary is ready)
         
         Args:
             messages: Messages from the phase
@@ -559,4 +745,6 @@ Do NOT proceed or transition phases until user responds.""",
         Returns:
             Dictionary of context metrics
         """
-        return self.context_metrics.copy()
\ No newline at end of file
+        metrics = self.context_metrics.copy()
+        metrics['prefix_reuse'] = dict(self.context_metrics['prefix_reuse'])
+        return metrics
\ No newline at end of file
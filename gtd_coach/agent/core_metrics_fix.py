@@ -211,7 +211,9 @@ def inject_token_tracking(agent_class):
         # Update context_metrics with tracked tokens
         metrics = self.token_tracker.get_metrics()
         self.context_metrics['total_tokens'] = metrics['total_tokens']
-        self.context_metrics['phase_tokens'] = metrics['phase_tokens']
+        # phase_tokens holds per-call input sizes from the token ledger;
+        # server-reported usage per phase is kept separately
+        self.context_metrics['phase_usage'] = metrics['phase_tokens']
         
         return result
     
@@ -252,7 +254,9 @@ def inject_token_tracking(agent_class):
         # Update context_metrics after streaming
         metrics = self.token_tracker.get_metrics()
         self.context_metrics['total_tokens'] = metrics['total_tokens']
-        self.context_metrics['phase_tokens'] = metrics['phase_tokens']
+        # phase_tokens holds per-call input sizes from the token ledger;
+        # server-reported usage per phase is kept separately
+        self.context_metrics['phase_usage'] = metrics['phase_tokens']
     
     def new_get_context_metrics(self):
         """Enhanced context metrics with proper token tracking"""
@@ -262,6 +266,7 @@ def inject_token_tracking(agent_class):
         # Add token tracker metrics if available
         if hasattr(self, 'token_tracker'):
             token_metrics = self.token_tracker.get_metrics()
+            token_metrics['phase_usage'] = token_metrics.pop('phase_tokens')
             metrics.update(token_metrics)
         
         return metrics
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+LLM-generated phase summaries for the GTD agent context manager.
+When a phase ends, its messages are compressed into a bounded structured
+summary on a background thread while the next phase starts. Until the
+summary is ready the agent uses a deterministic placeholder, so no turn
+waits on summarization.
+"""
+
+import json
+import logging
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
+
+logger = logging.getLogger(__name__)
+
+# Bounds on the structured summary so it fits the SUMMARY_TOKENS budget
+MAX_ITEMS_PER_FIELD = 8
+MAX_ITEM_CHARS = 80
+MAX_TRANSCRIPT_CHARS = 6000
+
+SUMMARY_FIELDS = ("captured_items", "decisions", "priorities")
+
+SUMMARY_INSTRUCTIONS = """You compress one phase of a GTD weekly review for later context.
+Reply with JSON only, using exactly these keys:
+{"captured_items": [...], "decisions": [...], "priorities": [...]}
+Each value is a list of at most 8 short strings (under 12 words each).
+captured_items: tasks, projects or concerns the user mentioned.
+decisions: next actions, deferrals, deletions or other choices made.
+priorities: anything the user ranked or committed to this week.
+Use empty lists when nothing applies. Do not add commentary."""
+
+
+def format_summary(phase: str, summary: Dict[str, List[str]]) -> str:
+    """
+    Render a structured summary as one compact line for the system prefix
+
+    Args:
+        phase: Phase name
+        summary: Dict with SUMMARY_FIELDS lists
+
+    Returns:
+        Summary string, e.g. "MIND_SWEEP: captured: a; b | decisions: c"
+    """
+    parts = []
+    labels = {"captured_items": "captured", "decisions": "decisions", "priorities": "priorities"}
+    for field in SUMMARY_FIELDS:
+        values = summary.get(field) or []
+        if values:
+            parts.append(f"{labels[field]}: {'; '.join(values)}")
+    return f"{phase}: {' | '.join(parts)}" if parts else f"{phase}: Completed"
+
+
+def parse_summary(text: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Parse and bound the model's JSON reply
+
+    Args:
+        text: Raw model output (may be wrapped in prose or code fences)
+
+    Returns:
+        Bounded summary dict, or None if no usable JSON was found
+    """
+    if not isinstance(text, str):
+        return None
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    summary = {}
+    for field in SUMMARY_FIELDS:
+        values = data.get(field) or []
+        if isinstance(values, str):
+            values = [values]
+        if not isinstance(values, list):
+            values = []
+        summary[field] = [
+            str(v).strip()[:MAX_ITEM_CHARS] for v in values if str(v).strip()
+        ][:MAX_ITEMS_PER_FIELD]
+    return summary
+
+
+def build_transcript(messages: List) -> str:
+    """
+    Flatten phase messages into a plain transcript, keeping the most recent text
+
+    Args:
+        messages: LangChain messages from the finished phase
+
+    Returns:
+        Transcript bounded to MAX_TRANSCRIPT_CHARS
+    """
+    roles = {HumanMessage: "User", AIMessage: "Coach", ToolMessage: "Tool"}
+    lines = []
+    for message in messages:
+        role = next((name for cls, name in roles.items() if isinstance(message, cls)), None)
+        content = message.content if isinstance(message.content, str) else ""
+        if role and content.strip():
+            lines.append(f"{role}: {content.strip()}")
+    transcript = "\n".join(lines)
+    return transcript[-MAX_TRANSCRIPT_CHARS:]
+
+
+class PhaseSummarizer:
+    """
+    Summarizes finished phases in the background and caches the results.
+
+    ``submit`` schedules a summary and returns immediately; ``collect`` is
+    called on later turns and returns whichever summaries have finished.
+    Each phase is summarized at most once per summarizer.
+    """
+
+    def __init__(self, llm: Any, max_tokens: int = 300,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Initialize the summarizer
+
+        Args:
+            llm: LangChain chat model used for compression
+            max_tokens: Response budget for a summary
+            executor: Optional executor (one worker thread by default)
+        """
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="phase-summary"
+        )
+        self._pending: Dict[str, Future] = {}
+        self.cache: Dict[str, str] = {}
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, phase: str, messages: List) -> None:
+        """
+        Schedule a summary of a finished phase
+
+        Args:
+            phase: Phase name
+            messages: Messages from the phase (copied before returning)
+        """
+        if phase in self.cache or phase in self._pending:
+            return
+        self.stats['submitted'] += 1
+        self._pending[phase] = self._executor.submit(self._summarize, phase, list(messages))
+
+    def _summarize(self, phase: str, messages: List) -> Optional[str]:
+        """Run the compression call (background thread)"""
+        transcript = build_transcript(messages)
+        if not transcript:
+            return None
+        response = self.llm.invoke(
+            [
+                SystemMessage(content=SUMMARY_INSTRUCTIONS),
+                HumanMessage(content=f"Phase: {phase}\n\nTranscript:\n{transcript}"),
+            ],
+            max_tokens=self.max_tokens,
+        )
+        summary = parse_summary(getattr(response, "content", None))
+        return format_summary(phase, summary) if summary is not None else None
+
+    def collect(self) -> Dict[str, str]:
+        """
+        Return summaries that finished since the last call (never blocks)
+
+        Returns:
+            Dict of phase name to summary string
+        """
+        ready = {}
+        for phase, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[phase]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"Phase summary for {phase} failed, keeping placeholder: {e}")
+                self.stats['failed'] += 1
+                continue
+            if result is None:
+                self.stats['failed'] += 1
+                continue
+            self.stats['completed'] += 1
+            self.cache[phase] = result
+            ready[phase] = result
+        return ready
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, str]:
+        """
+        Block until pending summaries finish, then collect them
+
+        Args:
+            timeout: Seconds to wait per pending summary
+
+        Returns:
+            Dict of phase name to summary string
+        """
+        for future in list(self._pending.values()):
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.collect()
+
+    def shutdown(self) -> None:
+        """Stop the worker thread without waiting for pending summaries"""
+        self._executor.shutdown(wait=False)
@@ -26,6 +26,7 @@ from gtd_coach.agent.state import AgentState
 # Import integrations
 from gtd_coach.integrations.graphiti import GraphitiMemory
 from gtd_coach.patterns.adhd_metrics import ADHDPatternDetector
+from gtd_coach.persistence.session_store import get_session_store
 
 # Import enhanced observability
 try:
@@ -57,6 +58,37 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Conversation-flow instructions appended to the weekly review system prompt.
+CONVERSATION_FLOW_INSTRUCTIONS = """
+
+CRITICAL INSTRUCTIONS FOR CONVERSATION FLOW:
+1. After calling transition_phase_v2, you MUST use one of the conversation tools to continue
+2. Use check_in_with_user_v2 for multiple questions in a phase
+3. Use wait_for_user_input_v2 for single questions
+4. Use confirm_with_user_v2 for yes/no confirmations
+
+PHASE-SPECIFIC BEHAVIOR:
+- STARTUP: After transitioning, use check_in_with_user_v2 with:
+  ["How's your energy level today on a scale of 1-10?",
+   "Do you have any concerns or blockers before we begin?",
+   "Are you ready to start the mind sweep phase?"]
+- MIND_SWEEP: Use wait_for_user_input_v2 to ask "What's been on your mind this week?"
+  IMPORTANT: Parse comma-separated items carefully. Each comma-separated phrase is one item.
+  Example: "gtd-coach, agentic-iam second call deck, ai-factory 2nd-call deck review" = 3 items
+- PROJECT_REVIEW: Use wait_for_user_input_v2 to ask about specific projects
+- PRIORITIZATION: Use check_in_with_user_v2 to identify top 3 priorities
+- WRAP_UP: Use confirm_with_user_v2 to confirm session completion
+  If user says NO: Ask "What else would you like to cover before we finish?" and handle their response
+  Only end the session after explicit confirmation or timeout
+
+AVAILABLE CONVERSATION TOOLS:
+- check_in_with_user_v2(phase, questions): Ask multiple questions
+- wait_for_user_input_v2(prompt): Ask single question and wait
+- confirm_with_user_v2(message): Get yes/no confirmation
+
+IMPORTANT: The conversation tools will pause execution and wait for user input.
+Never end the conversation without using these tools to engage the user."""
+
 
 class GTDAgentRunner:
     """
@@ -108,6 +140,12 @@ class GTDAgentRunner:
         self.memory = GraphitiMemory(session_id=self.session_id)
         self.pattern_detector = ADHDPatternDetector()
         
+        # Attribute capture tool writes to this session in the local store
+        try:
+            get_session_store().begin_session(self.session_id)
+        except Exception as e:
+            logger.warning(f"Session store unavailable: {e}")
+        
         # Initialize Graphiti memory connection asynchronously
         self.user_facts_cache = None
         self.cache_time = 0
@@ -395,35 +433,7 @@ class GTDAgentRunner:
                     system_prompt = system_prompt + user_context
                 
                 # Add critical instructions for conversation flow
-                system_prompt += """
-
-CRITICAL INSTRUCTIONS FOR CONVERSATION FLOW:
-1. After calling transition_phase_v2, you MUST use one of the conversation tools to continue
-2. Use check_in_with_user_v2 for multiple questions in a phase
-3. Use wait_for_user_input_v2 for single questions
-4. Use confirm_with_user_v2 for yes/no confirmations
-
-PHASE-SPECIFIC BEHAVIOR:
-- STARTUP: After transitioning, use check_in_with_user_v2 with:
-  ["How's your energy level today on a scale of 1-10?",
-   "Do you have any concerns or blockers before we begin?",
-   "Are you ready to start the mind sweep phase?"]
-- MIND_SWEEP: Use wait_for_user_input_v2 to ask "What's been on your mind this week?"
-  IMPORTANT: Parse comma-separated items carefully. Each comma-separated phrase is one item.
-  Example: "gtd-coach, agentic-iam second call deck, ai-factory 2nd-call deck review" = 3 items
-- PROJECT_REVIEW: Use wait_for_user_input_v2 to ask about specific projects
-- PRIORITIZATION: Use check_in_with_user_v2 to identify top 3 priorities
-- WRAP_UP: Use confirm_with_user_v2 to confirm session completion
-  If user says NO: Ask "What else would you like to cover before we finish?" and handle their response
-  Only end the session after explicit confirmation or timeout
-
-AVAILABLE CONVERSATION TOOLS:
-- check_in_with_user_v2(phase, questions): Ask multiple questions
-- wait_for_user_input_v2(prompt): Ask single question and wait
-- confirm_with_user_v2(message): Get yes/no confirmation
-
-IMPORTANT: The conversation tools will pause execution and wait for user input.
-Never end the conversation without using these tools to engage the user."""
+                system_prompt += CONVERSATION_FLOW_INSTRUCTIONS
                 
                 # Start with minimal state to debug streaming issue
                 state = {
@@ -493,7 +503,7 @@ Never end the conversation without using these tools to engage the user."""
             interrupt_count = 0
             last_result = None
             
-                logger.debug(f"Starting agent stream with config: {config}")
+            logger.debug(f"Starting agent stream with config: {config}")
             logger.debug(f"Session ID in metadata: {config.get('metadata', {}).get('langfuse_session_id')}")
             
             # Use interrupt debugger for comprehensive tracking
@@ -771,12 +781,19 @@ Ready to begin? Let's make this productive and fun!"""
         print(f"  • Total tokens used: {metrics.get('total_tokens', 0)}")
         print(f"  • Context overflows: {metrics.get('overflow_count', 0)}")
         
-        if 'phase_tokens' in metrics:
+        # Server-reported usage per phase; context sizes come from the context hook
+        phase_usage = metrics.get('phase_usage') or {}
+        phase_tokens = {phase: tokens for phase, tokens in metrics.get('phase_tokens', {}).items() if tokens}
+        if phase_usage or phase_tokens:
             print(f"\n  Token usage by phase:")
-            for phase, tokens in metrics['phase_tokens'].items():
-                if tokens:
-                    avg_tokens = sum(tokens) / len(tokens)
-                    print(f"    • {phase}: {avg_tokens:.0f} avg tokens")
+            for phase in dict.fromkeys([*phase_tokens, *phase_usage]):
+                parts = []
+                if phase in phase_usage:
+                    parts.append(f"{phase_usage[phase]} tokens used")
+                if phase in phase_tokens:
+                    tokens = phase_tokens[phase]
+                    parts.append(f"{sum(tokens) / len(tokens):.0f} avg context tokens")
+                print(f"    • {phase}: {', '.join(parts)}")
         
         print(f"\n✨ Great job completing your review!")
         print(f"Remember: Progress, not perfection!\n")
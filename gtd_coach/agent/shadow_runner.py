@@ -18,6 +18,7 @@ from dataclasses import dataclass, asdict
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from gtd_coach.config.features import should_use_agent, should_run_shadow, rollout_manager
+from gtd_coach.llm.gateway import Priority, request_priority
 
 logger = logging.getLogger(__name__)
 
@@ -508,11 +509,12 @@ class ShadowModeRunner:
         shadow_session_id = f"{session_id}_shadow"
         
         try:
-            # Run agent workflow
-            agent_result = await self.run_agent_workflow(
-                shadow_session_id, 
-                "weekly_review"
-            )
+            # Run agent workflow; its LLM calls yield to the user's session
+            with request_priority(Priority.BACKGROUND):
+                agent_result = await self.run_agent_workflow(
+                    shadow_session_id, 
+                    "weekly_review"
+                )
             
             # Compare results
             comparison = await self.metrics_logger.compare_sessions(
@@ -101,6 +101,7 @@ class AgentState(TypedDict):
     context_usage: Dict[str, int]  # Tokens used per phase
     message_summary: str  # Compressed history between phases
     phase_summary: str  # Summary of completed phases
+    phase_summaries: Dict[str, str]  # LLM summary per completed phase
     phase_changed: bool  # Flag to trigger context reset
     context_overflow_count: int  # Number of times we hit limit
     
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Incremental token accounting for the GTD agent context manager.
+Caches per-message token counts so each turn only tokenizes new messages,
+using the model's real tokenizer when one is available offline.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+logger = logging.getLogger(__name__)
+
+# Llama 3 chat template adds <|start_header_id|>role<|end_header_id|>\n\n ... <|eot_id|>
+LLAMA3_TOKENS_PER_MESSAGE = 4
+
+
+def load_tokenizer() -> Optional[Any]:
+    """
+    Load the model tokenizer from local files only (never downloads)
+
+    Environment variables:
+    - GTD_TOKENIZER_PATH: path to a HuggingFace tokenizer.json (needs `tokenizers`)
+    - GTD_TOKENIZER_NAME: model id or directory already in the local HF cache
+      (needs `transformers`)
+
+    Returns:
+        Tokenizer with an ``encode(text)`` method, or None if unavailable
+    """
+    tokenizer_path = os.getenv("GTD_TOKENIZER_PATH")
+    if tokenizer_path:
+        try:
+            from tokenizers import Tokenizer
+            tokenizer = Tokenizer.from_file(tokenizer_path)
+            logger.info(f"Loaded tokenizer from {tokenizer_path}")
+            return tokenizer
+        except ImportError:
+            logger.warning("GTD_TOKENIZER_PATH set but `tokenizers` is not installed")
+        except Exception as e:
+            logger.warning(f"Could not load tokenizer from {tokenizer_path}: {e}")
+
+    tokenizer_name = os.getenv("GTD_TOKENIZER_NAME")
+    if tokenizer_name:
+        try:
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, local_files_only=True)
+            logger.info(f"Loaded tokenizer {tokenizer_name} from local cache")
+            return tokenizer
+        except ImportError:
+            logger.warning("GTD_TOKENIZER_NAME set but `transformers` is not installed")
+        except Exception as e:
+            logger.warning(f"Could not load tokenizer {tokenizer_name} offline: {e}")
+
+    return None
+
+
+class TokenLedger:
+    """
+    Per-message token cache with an append-only running total.
+
+    Messages are keyed by their id (LangGraph assigns one to every message in
+    state) or by a content hash, so a message is tokenized once per session.
+    When a call's messages extend the previous call's, only the new tail is
+    looked up.
+    """
+
+    def __init__(self, tokenizer: Optional[Any] = None,
+                 tokens_per_message: int = LLAMA3_TOKENS_PER_MESSAGE):
+        """
+        Initialize the ledger
+
+        Args:
+            tokenizer: Object with ``encode(text)``; None uses the approximate counter
+            tokens_per_message: Chat template overhead added per message (tokenizer mode)
+        """
+        self.tokenizer = tokenizer
+        self.tokens_per_message = tokens_per_message
+        self._counts: Dict[str, int] = {}
+        # Keys and cumulative totals of the last sequence counted
+        self._sequence_keys: List[str] = []
+        self._cumulative: List[int] = []
+        self.stats = {'cache_hits': 0, 'cache_misses': 0}
+
+    @property
+    def mode(self) -> str:
+        """'tokenizer' when counting with a real tokenizer, else 'approximate'"""
+        return "tokenizer" if self.tokenizer is not None else "approximate"
+
+    def _key(self, message: BaseMessage) -> str:
+        """Stable cache key for a message"""
+        if getattr(message, "id", None):
+            return f"{message.type}:{message.id}"
+        digest = hashlib.sha1(self._text(message).encode("utf-8")).hexdigest()
+        return f"{message.type}:{digest}"
+
+    def _text(self, message: BaseMessage) -> str:
+        """Everything in the message that reaches the model as text"""
+        content = message.content
+        if not isinstance(content, str):
+            content = json.dumps(content, default=str)
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            content += json.dumps(tool_calls, default=str)
+        return content
+
+    def _encode_length(self, text: str) -> int:
+        encoded = self.tokenizer.encode(text)
+        # tokenizers.Encoding exposes .ids; transformers returns a list
+        return len(encoded.ids) if hasattr(encoded, "ids") else len(encoded)
+
+    def count(self, message: BaseMessage) -> int:
+        """
+        Token count for a single message (cached)
+
+        Args:
+            message: LangChain message
+
+        Returns:
+            Tokens including per-message template overhead
+        """
+        key = self._key(message)
+        cached = self._counts.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+
+        self.stats['cache_misses'] += 1
+        if self.tokenizer is not None:
+            try:
+                tokens = self._encode_length(self._text(message)) + self.tokens_per_message
+            except Exception as e:
+                logger.warning(f"Tokenizer failed, falling back to approximate counts: {e}")
+                self.tokenizer = None
+                self._counts.clear()
+                tokens = count_tokens_approximately([message])
+        else:
+            tokens = count_tokens_approximately([message])
+
+        self._counts[key] = tokens
+        return tokens
+
+    def count_text(self, text: str) -> int:
+        """
+        Token count for loose text (no template overhead, not cached)
+
+        Args:
+            text: Text appended to an existing message
+
+        Returns:
+            Tokens
+        """
+        if self.tokenizer is not None:
+            try:
+                return self._encode_length(text)
+            except Exception as e:
+                logger.debug(f"Tokenizer failed on text, using approximation: {e}")
+        return max(1, round(len(text) / 4))
+
+    def __call__(self, messages: Sequence[BaseMessage]) -> int:
+        """Total tokens for a message list (usable as trim_messages token_counter)"""
+        return sum(self.count(m) for m in messages)
+
+    def count_messages(self, messages: Sequence[BaseMessage]) -> int:
+        """
+        Total tokens for the conversation, reusing the previous call's totals
+
+        If ``messages`` starts with the previously counted sequence, only the
+        new tail is counted. Otherwise (trimming, phase reset) the running
+        totals are rebuilt from the per-message cache.
+
+        Args:
+            messages: Conversation history
+
+        Returns:
+            Total tokens
+        """
+        previous = len(self._sequence_keys)
+        if (previous and len(messages) >= previous
+                and self._key(messages[previous - 1]) == self._sequence_keys[-1]
+                and self._key(messages[0]) == self._sequence_keys[0]):
+            start = previous
+        else:
+            self._sequence_keys = []
+            self._cumulative = []
+            start = 0
+
+        total = self._cumulative[-1] if self._cumulative else 0
+        for message in messages[start:]:
+            total += self.count(message)
+            self._sequence_keys.append(self._key(message))
+            self._cumulative.append(total)
+
+        return total
+
+    def reset(self) -> None:
+        """Forget the running sequence (per-message cache is kept)"""
+        self._sequence_keys = []
+        self._cumulative = []
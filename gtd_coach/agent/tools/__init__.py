@@ -63,6 +63,7 @@ from .capture_v2 import (
     save_project_update_v2,
     save_user_response_v2,
     batch_save_mind_sweep_v2,
+    get_ingest_status_v2,
     get_saved_priorities_v2
 )
 
@@ -420,6 +421,7 @@ DATA_CAPTURE_TOOLS = [
     save_project_update_v2,
     save_user_response_v2,
     batch_save_mind_sweep_v2,
+    get_ingest_status_v2,
     get_saved_priorities_v2
 ]
 
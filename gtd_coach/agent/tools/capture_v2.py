@@ -10,14 +10,9 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from langchain_core.tools import tool
 
-# Import Graphiti if available
-try:
-    from gtd_coach.integrations import get_graphiti_client
-    GRAPHITI_AVAILABLE = True
-except ImportError:
-    GRAPHITI_AVAILABLE = False
-    def get_graphiti_client():
-        return None
+from gtd_coach.integrations.graphiti import GRAPHITI_AVAILABLE
+from gtd_coach.integrations.graphiti_ingest import get_ingest_queue
+from gtd_coach.persistence.session_store import get_session_store, iso_week
 
 logger = logging.getLogger(__name__)
 
@@ -50,36 +45,22 @@ def save_mind_sweep_item_v2(
         "category": category or "uncategorized",
         "timestamp": datetime.now().isoformat(),
         "saved": False,
-        "graphiti_saved": False
+        "ingest_job_id": None
     }
     
-    # Save to Graphiti if available
+    # Send to Graphiti in the background if available
     if GRAPHITI_AVAILABLE:
         try:
-            client = get_graphiti_client()
-            if client:
-                # Create episode for the mind sweep item
-                episode_data = {
-                    "source": "gtd_weekly_review",
-                    "description": f"Mind sweep item: {item}",
-                    "type": "mind_sweep",
-                    "category": category,
-                    "user_id": user_id or "default",
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-                client.add_episode(
-                    episode_data=episode_data,
-                    use_enhanced_extraction=True
-                )
-                
-                result["graphiti_saved"] = True
-                logger.info(f"Saved to Graphiti: {item}")
+            result["ingest_job_id"] = get_ingest_queue().submit([item], user_id=user_id, category=category)
         except Exception as e:
-            logger.error(f"Failed to save to Graphiti: {e}")
+            logger.error(f"Failed to queue mind sweep item for Graphiti: {e}")
     
-    # Mark as saved (in real implementation, would save to database)
-    result["saved"] = True
+    # Save to the local session store
+    try:
+        get_session_store().add_mind_sweep_item(item, category, user_id=user_id)
+        result["saved"] = True
+    except Exception as e:
+        logger.error(f"Failed to save mind sweep item to session store: {e}")
     
     logger.info(f"Mind sweep item saved: {result}")
     return result
@@ -114,41 +95,35 @@ def save_weekly_priority_v2(
         "priority": priority,
         "rank": rank,
         "commitment": commitment,
-        "week": datetime.now().strftime("%G-W%V"),  # ISO week format
+        "week": iso_week(),  # ISO week format
         "timestamp": datetime.now().isoformat(),
         "saved": False,
-        "graphiti_saved": False
+        "ingest_job_id": None
     }
     
-    # Save to Graphiti if available
+    # Send to Graphiti in the background if available
     if GRAPHITI_AVAILABLE:
         try:
-            client = get_graphiti_client()
-            if client:
-                # Create episode for the priority
-                episode_data = {
-                    "source": "gtd_weekly_review",
-                    "description": f"Weekly priority #{rank}: {priority}",
-                    "type": "weekly_priority",
+            result["ingest_job_id"] = get_ingest_queue().submit_episode({
+                "type": "weekly_priority",
+                "phase": "WEEKLY_PRIORITIES",
+                "data": {
+                    "priority": priority,
                     "rank": rank,
                     "commitment": commitment,
-                    "user_id": user_id or "default",
                     "week": result["week"],
-                    "timestamp": datetime.now().isoformat()
+                    "user_id": user_id or "default"
                 }
-                
-                client.add_episode(
-                    episode_data=episode_data,
-                    use_enhanced_extraction=True
-                )
-                
-                result["graphiti_saved"] = True
-                logger.info(f"Saved priority to Graphiti: {priority}")
+            })
         except Exception as e:
-            logger.error(f"Failed to save priority to Graphiti: {e}")
+            logger.error(f"Failed to queue priority for Graphiti: {e}")
     
-    # Mark as saved
-    result["saved"] = True
+    # Save to the local session store
+    try:
+        get_session_store().add_priority(priority, rank=rank, commitment=commitment, user_id=user_id)
+        result["saved"] = True
+    except Exception as e:
+        logger.error(f"Failed to save priority to session store: {e}")
     
     logger.info(f"Priority saved: {result}")
     return result
@@ -187,39 +162,34 @@ def save_project_update_v2(
         "notes": notes,
         "timestamp": datetime.now().isoformat(),
         "saved": False,
-        "graphiti_saved": False
+        "ingest_job_id": None
     }
     
-    # Save to Graphiti if available
+    # Send to Graphiti in the background if available
     if GRAPHITI_AVAILABLE:
         try:
-            client = get_graphiti_client()
-            if client:
-                # Create episode for the project update
-                episode_data = {
-                    "source": "gtd_weekly_review",
-                    "description": f"Project '{project_name}' is {status}. Next: {next_action}",
-                    "type": "project_update",
+            result["ingest_job_id"] = get_ingest_queue().submit_episode({
+                "type": "project_update",
+                "phase": "PROJECT_REVIEW",
+                "data": {
                     "project_name": project_name,
                     "status": status,
                     "next_action": next_action,
                     "notes": notes,
-                    "user_id": user_id or "default",
-                    "timestamp": datetime.now().isoformat()
+                    "user_id": user_id or "default"
                 }
-                
-                client.add_episode(
-                    episode_data=episode_data,
-                    use_enhanced_extraction=True
-                )
-                
-                result["graphiti_saved"] = True
-                logger.info(f"Saved project to Graphiti: {project_name}")
+            })
         except Exception as e:
-            logger.error(f"Failed to save project to Graphiti: {e}")
+            logger.error(f"Failed to queue project update for Graphiti: {e}")
     
-    # Mark as saved
-    result["saved"] = True
+    # Save to the local session store
+    try:
+        get_session_store().add_project_update(
+            project_name, status, next_action=next_action, notes=notes, user_id=user_id
+        )
+        result["saved"] = True
+    except Exception as e:
+        logger.error(f"Failed to save project update to session store: {e}")
     
     logger.info(f"Project update saved: {result}")
     return result
@@ -256,35 +226,23 @@ def save_user_response_v2(
         "response": response,
         "timestamp": datetime.now().isoformat(),
         "saved": False,
-        "graphiti_saved": False
+        "ingest_job_id": None
     }
     
-    # Save to Graphiti if available
+    # Send startup responses to Graphiti in the background if available
     if GRAPHITI_AVAILABLE and phase == "STARTUP":
         try:
-            client = get_graphiti_client()
-            if client:
-                # Create episode for startup responses
-                episode_data = {
-                    "source": "gtd_weekly_review",
-                    "description": f"{phase}: {question} - {response}",
-                    "type": "user_response",
-                    "phase": phase,
+            result["ingest_job_id"] = get_ingest_queue().submit_episode({
+                "type": "user_response",
+                "phase": phase,
+                "data": {
                     "question": question,
                     "response": response,
-                    "user_id": user_id or "default",
-                    "timestamp": datetime.now().isoformat()
+                    "user_id": user_id or "default"
                 }
-                
-                client.add_episode(
-                    episode_data=episode_data,
-                    use_enhanced_extraction=False  # Simple responses don't need entity extraction
-                )
-                
-                result["graphiti_saved"] = True
-                logger.info(f"Saved response to Graphiti")
+            })
         except Exception as e:
-            logger.error(f"Failed to save response to Graphiti: {e}")
+            logger.error(f"Failed to queue response for Graphiti: {e}")
     
     # Mark as saved
     result["saved"] = True
@@ -301,13 +259,15 @@ def batch_save_mind_sweep_v2(
     """
     Save multiple mind sweep items at once.
     Useful when user provides a list of items in one response.
+    Items are saved locally right away; the knowledge graph update runs
+    in the background and can be checked with get_ingest_status_v2.
     
     Args:
         items: List of mind sweep items
         user_id: Optional user identifier
         
     Returns:
-        Summary of saved items
+        Summary of saved items and the background ingestion job id
         
     Example:
         batch_save_mind_sweep_v2(["Task 1", "Idea 2", "Concern 3"])
@@ -317,16 +277,21 @@ def batch_save_mind_sweep_v2(
     saved_items = []
     failed_items = []
     
-    for item in items:
+    # Persist the whole batch locally in one transaction
+    try:
+        get_session_store().add_mind_sweep_items(items, user_id=user_id)
+        saved_items = list(items)
+    except Exception as e:
+        logger.error(f"Failed to save mind sweep batch to session store: {e}")
+        failed_items = list(items)
+    
+    # One grouped episode, sent to Graphiti off the request path
+    ingest_job_id = None
+    if GRAPHITI_AVAILABLE and items:
         try:
-            result = save_mind_sweep_item_v2(item, user_id=user_id)
-            if result["saved"]:
-                saved_items.append(item)
-            else:
-                failed_items.append(item)
+            ingest_job_id = get_ingest_queue().submit(items, user_id=user_id)
         except Exception as e:
-            logger.error(f"Failed to save item '{item}': {e}")
-            failed_items.append(item)
+            logger.error(f"Failed to queue Graphiti batch ingestion: {e}")
     
     return {
         "total": len(items),
@@ -334,10 +299,32 @@ def batch_save_mind_sweep_v2(
         "failed": len(failed_items),
         "saved_items": saved_items,
         "failed_items": failed_items,
+        "ingest_job_id": ingest_job_id,
+        "graphiti_status": "queued" if ingest_job_id else "disabled",
         "timestamp": datetime.now().isoformat()
     }
 
 
+@tool
+def get_ingest_status_v2(job_id: str) -> Dict[str, Any]:
+    """
+    Check a background knowledge graph ingestion started by a capture tool.
+    
+    Args:
+        job_id: The ingest_job_id returned by a capture tool
+        
+    Returns:
+        Job state: queued, running, done or failed (with error)
+        
+    Example:
+        get_ingest_status_v2("ingest_20240115_093000_1")
+    """
+    status = get_ingest_queue().status(job_id)
+    if status is None:
+        return {"job_id": job_id, "state": "unknown"}
+    return status
+
+
 @tool
 def get_saved_priorities_v2(
     user_id: Optional[str] = None,
@@ -358,13 +345,32 @@ def get_saved_priorities_v2(
     """
     logger.info(f"Retrieving priorities for week: {week or 'current'}")
     
-    # In a real implementation, this would query the database
-    # For now, return a placeholder
-    current_week = week or datetime.now().strftime("%Y-W%U")
+    current_week = week or iso_week()
+    try:
+        rows = get_session_store().get_priorities(current_week, user_id=user_id)
+    except Exception as e:
+        logger.error(f"Failed to read priorities from session store: {e}")
+        return {
+            "week": current_week,
+            "priorities": [],
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    priorities = [
+        {
+            "priority": row["priority"],
+            "rank": row["rank"],
+            "level": row["level"],
+            "commitment": row["commitment"],
+            "timestamp": row["created_at"]
+        }
+        for row in rows
+    ]
     
     return {
         "week": current_week,
-        "priorities": [],
-        "message": "Priorities would be retrieved from database",
+        "priorities": priorities,
+        "message": f"Found {len(priorities)} priorities for {current_week}",
         "timestamp": datetime.now().isoformat()
-    }
\ No newline at end of file
+    }
@@ -5,7 +5,7 @@ Tools for clarifying and organizing captured items
 """
 
 import logging
-from typing import Dict, List, Optional, Annotated
+from typing import Any, Dict, List, Optional, Tuple, Annotated
 from datetime import datetime, timedelta
 from langchain_core.tools import tool
 from langgraph.prebuilt import InjectedState
@@ -18,6 +18,7 @@ from gtd_coach.agent.state import AgentState, DailyCapture
 from gtd_coach.integrations.gtd_entities import (
     GTDAction, GTDProject, Priority, Energy, ProjectStatus
 )
+from gtd_coach.patterns.keywords import KEYWORDS, KeywordHits
 
 logger = logging.getLogger(__name__)
 
@@ -54,45 +55,8 @@ def clarify_items_tool(
             "clarified_count": 0
         }
     
-    clarified = {
-        'actions': [],
-        'projects': [],
-        'someday_maybe': [],
-        'reference': [],
-        'trash': [],
-        'questions': []
-    }
-    
-    for item in items:
-        content = item.get('content', '')
-        source = item.get('source', 'unknown')
-        
-        # Run through GTD clarification process
-        clarification = _clarify_single_item(content, source, state)
-        
-        # Sort into appropriate bucket
-        if clarification['actionable']:
-            if clarification['is_project']:
-                clarified['projects'].append(clarification)
-            else:
-                clarified['actions'].append(clarification)
-        elif clarification['category'] == 'someday':
-            clarified['someday_maybe'].append(clarification)
-        elif clarification['category'] == 'reference':
-            clarified['reference'].append(clarification)
-        elif clarification['category'] == 'trash':
-            clarified['trash'].append(clarification)
-        
-        # Add any questions
-        if clarification.get('needs_clarification'):
-            clarified['questions'].append({
-                'item': content,
-                'question': clarification['clarifying_question']
-            })
-        
-        # Mark item as processed in clarification result
-        clarification['original_content'] = content
-        clarification['processed'] = True
+    # Classify every item in one pass and bucket it directly
+    clarified, organization = _clarify_batch(items, state)
     
     # Generate insights
     insights = _generate_clarification_insights(clarified)
@@ -106,6 +70,7 @@ def clarify_items_tool(
         "trash": clarified['trash'],
         "questions": clarified['questions'],
         "insights": insights,
+        "organization": organization,
         "next_step": _suggest_next_step(clarified)
     }
 
@@ -141,32 +106,11 @@ def organize_tool(
             "organized_count": 0
         }
     
-    # Organize by context
-    by_context = {}
-    by_priority = {'A': [], 'B': [], 'C': []}
-    by_energy = {'high': [], 'medium': [], 'low': []}
-    quick_wins = []  # 2-minute rule items
-    
-    for item in actionable_items:
-        context = item.get('context_required', '@anywhere')
-        
-        # Add to context list
-        if context not in by_context:
-            by_context[context] = []
-        by_context[context].append(item)
-        
-        # Assign priority
-        priority = _assign_priority(item, state)
-        item['priority'] = priority
-        by_priority[priority].append(item)
-        
-        # Sort by energy
-        energy = item.get('energy_level', 'medium')
-        by_energy[energy].append(item)
-        
-        # Check for quick wins
-        if item.get('two_minute_rule') or item.get('time_estimate', 999) <= 5:
-            quick_wins.append(item)
+    # Group by context, priority and energy in one pass (sets item['priority'])
+    groups = _organize_batch(actionable_items, state)
+    by_context = groups['by_context']
+    by_priority = groups['by_priority']
+    quick_wins = groups['quick_wins']
     
     # Create GTDAction entities for processed items
     processed_actions = []
@@ -298,6 +242,86 @@ def prioritize_actions_tool(
 
 def _clarify_single_item(content: str, source: str, state: Optional[Dict]) -> Dict:
     """Clarify a single item through GTD questions"""
+    content_lower = content.lower()
+    return _clarify_scanned(content, content_lower, KEYWORDS.scan(content_lower))
+
+
+def _clarify_batch(items: List[Dict], state: Optional[Dict]) -> Tuple[Dict, Dict]:
+    """
+    Clarify a batch of captures in one pass
+    
+    Each content is lowercased and scanned once (duplicates share the scan),
+    classified with the same rules as _clarify_single_item, sorted into its
+    bucket, and the actionable items are grouped for organization.
+    
+    Returns:
+        (clarified buckets, organization counts by context/priority/energy)
+    """
+    clarified = {
+        'actions': [],
+        'projects': [],
+        'someday_maybe': [],
+        'reference': [],
+        'trash': [],
+        'questions': []
+    }
+    scans: Dict[str, KeywordHits] = {}
+    to_organize = []
+    organize_hits = []
+    
+    for item in items:
+        content = item.get('content', '')
+        content_lower = content.lower()
+        hits = scans.get(content_lower)
+        if hits is None:
+            hits = scans[content_lower] = KEYWORDS.scan(content_lower)
+        
+        clarification = _clarify_scanned(content, content_lower, hits)
+        
+        # Sort into appropriate bucket
+        if clarification['actionable']:
+            if clarification['is_project']:
+                clarified['projects'].append(clarification)
+            else:
+                clarified['actions'].append(clarification)
+            to_organize.append({
+                'content': content,
+                'context_required': clarification.get('context', '@anywhere'),
+                'energy_level': clarification.get('energy', 'medium'),
+                'time_estimate': clarification.get('time_estimate', 999),
+                'two_minute_rule': clarification.get('two_minute_rule', False)
+            })
+            organize_hits.append(hits)
+        elif clarification['category'] == 'someday':
+            clarified['someday_maybe'].append(clarification)
+        elif clarification['category'] == 'reference':
+            clarified['reference'].append(clarification)
+        elif clarification['category'] == 'trash':
+            clarified['trash'].append(clarification)
+        
+        # Add any questions
+        if clarification.get('needs_clarification'):
+            clarified['questions'].append({
+                'item': content,
+                'question': clarification['clarifying_question']
+            })
+        
+        # Mark item as processed in clarification result
+        clarification['original_content'] = content
+        clarification['processed'] = True
+    
+    groups = _organize_batch(to_organize, state, organize_hits)
+    organization = {
+        'by_context': {k: len(v) for k, v in groups['by_context'].items()},
+        'by_priority': {k: len(v) for k, v in groups['by_priority'].items()},
+        'by_energy': {k: len(v) for k, v in groups['by_energy'].items()},
+        'quick_wins': len(groups['quick_wins'])
+    }
+    return clarified, organization
+
+
+def _clarify_scanned(content: str, content_lower: str, hits: KeywordHits) -> Dict:
+    """Clarify an item whose keyword scan is already done"""
     result = {
         'original': content,
         'actionable': False,
@@ -306,37 +330,30 @@ def _clarify_single_item(content: str, source: str, state: Optional[Dict]) -> Di
         'needs_clarification': False
     }
     
-    content_lower = content.lower()
-    
     # Is it actionable?
-    action_indicators = ['need to', 'have to', 'should', 'must', 'will', 'want to', 'plan to']
-    if any(indicator in content_lower for indicator in action_indicators):
+    if hits.has('gtd_actionable'):
         result['actionable'] = True
         
         # Is it a project (multiple steps)?
-        project_indicators = ['project', 'implement', 'organize', 'create', 'build', 'develop', 'launch']
-        if any(indicator in content_lower for indicator in project_indicators) or len(content) > 100:
+        if hits.has('gtd_project') or len(content) > 100:
             result['is_project'] = True
             result['outcome'] = f"Complete: {content}"
-            result['next_action'] = _extract_next_action(content)
+            result['next_action'] = _extract_next_action(content, content_lower)
         else:
             # Single action
-            result['next_action'] = _extract_next_action(content)
-            result['context'] = _determine_context(content)
-            result['time_estimate'] = _estimate_time(content)
-            result['energy'] = _determine_energy(content)
+            result['next_action'] = _extract_next_action(content, content_lower)
+            result['context'] = _determine_context(content, hits)
+            result['time_estimate'] = _estimate_time(content, hits)
+            result['energy'] = _determine_energy(content, hits)
             
             # Check 2-minute rule
             if result['time_estimate'] <= 2:
                 result['two_minute_rule'] = True
     else:
         # Not actionable - determine category
-        if any(word in content_lower for word in ['someday', 'maybe', 'possibly', 'idea']):
-            result['category'] = 'someday'
-        elif any(word in content_lower for word in ['reference', 'info', 'note', 'fyi']):
-            result['category'] = 'reference'
-        elif any(word in content_lower for word in ['waiting', 'pending', 'need from']):
-            result['category'] = 'waiting'
+        category = hits.first('gtd_category')
+        if category:
+            result['category'] = category
         elif len(content) < 10 or content_lower in ['ok', 'done', 'n/a', 'nothing']:
             result['category'] = 'trash'
         else:
@@ -346,11 +363,54 @@ def _clarify_single_item(content: str, source: str, state: Optional[Dict]) -> Di
     return result
 
 
-def _extract_next_action(content: str) -> str:
+def _organize_batch(items: List[Dict], state: Optional[Dict],
+                    hits: Optional[List[KeywordHits]] = None) -> Dict[str, Any]:
+    """
+    Group actionable items by context, ABC priority and energy in one pass
+    
+    Args:
+        items: Clarified actionable items (each gets its 'priority' set)
+        state: Agent state (for user focus areas)
+        hits: Keyword scans of the items' content, if already done
+    
+    Returns:
+        Dict with by_context, by_priority, by_energy and quick_wins lists
+    """
+    by_context = {}
+    by_priority = {'A': [], 'B': [], 'C': []}
+    by_energy = {'high': [], 'medium': [], 'low': []}
+    quick_wins = []  # 2-minute rule items
+    
+    focus_areas = None
+    if state and 'user_context' in state:
+        focus_areas = [area.lower() for area in state['user_context'].get('focus_areas', [])]
+    
+    for index, item in enumerate(items):
+        context = item.get('context_required', '@anywhere')
+        by_context.setdefault(context, []).append(item)
+        
+        priority = _assign_priority(item, state, hits[index] if hits else None, focus_areas)
+        item['priority'] = priority
+        by_priority[priority].append(item)
+        
+        by_energy[item.get('energy_level', 'medium')].append(item)
+        
+        if item.get('two_minute_rule') or item.get('time_estimate', 999) <= 5:
+            quick_wins.append(item)
+    
+    return {
+        'by_context': by_context,
+        'by_priority': by_priority,
+        'by_energy': by_energy,
+        'quick_wins': quick_wins
+    }
+
+
+def _extract_next_action(content: str, content_lower: Optional[str] = None) -> str:
     """Extract concrete next action from content"""
     # Remove common prefixes
     prefixes = ['need to', 'have to', 'should', 'must', 'want to', 'plan to']
-    action = content.lower()
+    action = content_lower if content_lower is not None else content.lower()
     for prefix in prefixes:
         if action.startswith(prefix):
             action = action[len(prefix):].strip()
@@ -363,74 +423,42 @@ def _extract_next_action(content: str) -> str:
     return action.capitalize()
 
 
-def _determine_context(content: str) -> str:
+def _determine_context(content: str, hits: Optional[KeywordHits] = None) -> str:
     """Determine GTD context for action"""
-    content_lower = content.lower()
-    
-    if any(word in content_lower for word in ['call', 'phone', 'dial']):
-        return '@phone'
-    elif any(word in content_lower for word in ['email', 'send', 'reply']):
-        return '@computer'
-    elif any(word in content_lower for word in ['meeting', 'discuss', 'talk']):
-        return '@office'
-    elif any(word in content_lower for word in ['buy', 'shop', 'pick up']):
-        return '@errands'
-    elif any(word in content_lower for word in ['home', 'house', 'apartment']):
-        return '@home'
-    else:
-        return '@anywhere'
+    return (hits or KEYWORDS.scan(content)).first('gtd_context', '@anywhere')
 
 
-def _estimate_time(content: str) -> int:
+def _estimate_time(content: str, hits: Optional[KeywordHits] = None) -> int:
     """Estimate time in minutes for action"""
-    content_lower = content.lower()
-    
-    # Quick tasks
-    if any(word in content_lower for word in ['quick', 'simple', 'just']):
-        return 5
-    # Communication tasks
-    elif any(word in content_lower for word in ['email', 'call', 'message']):
-        return 10
-    # Review tasks
-    elif any(word in content_lower for word in ['review', 'read', 'check']):
-        return 20
-    # Complex tasks
-    elif any(word in content_lower for word in ['create', 'write', 'develop', 'analyze']):
-        return 45
-    else:
-        return 15  # Default
+    # Quick, communication, review or complex task; 15 minutes by default
+    return (hits or KEYWORDS.scan(content)).first('gtd_time_estimate', 15)
 
 
-def _determine_energy(content: str) -> str:
+def _determine_energy(content: str, hits: Optional[KeywordHits] = None) -> str:
     """Determine energy level required"""
-    content_lower = content.lower()
-    
-    if any(word in content_lower for word in ['create', 'analyze', 'design', 'write', 'develop']):
-        return 'high'
-    elif any(word in content_lower for word in ['review', 'organize', 'plan']):
-        return 'medium'
-    else:
-        return 'low'
+    return (hits or KEYWORDS.scan(content)).first('gtd_energy', 'low')
 
 
-def _assign_priority(item: Dict, state: Optional[Dict]) -> str:
+def _assign_priority(item: Dict, state: Optional[Dict], hits: Optional[KeywordHits] = None,
+                     focus_areas: Optional[List[str]] = None) -> str:
     """Assign ABC priority to item"""
     content = item.get('content', '').lower()
+    hits = hits or KEYWORDS.scan(content)
     
     # A priority indicators
-    if any(word in content for word in ['urgent', 'asap', 'today', 'deadline', 'critical']):
+    if hits.has('abc_priority', 'A'):
         return 'A'
     # Check if related to current focus areas
-    elif state and 'user_context' in state:
-        focus_areas = state['user_context'].get('focus_areas', [])
-        if any(area.lower() in content for area in focus_areas):
+    if state and 'user_context' in state:
+        if focus_areas is None:
+            focus_areas = [area.lower() for area in state['user_context'].get('focus_areas', [])]
+        if any(area in content for area in focus_areas):
             return 'A'
     # B priority for normal work
-    elif any(word in content for word in ['tomorrow', 'this week', 'soon']):
+    if hits.has('abc_priority', 'B'):
         return 'B'
     # C priority for everything else
-    else:
-        return 'C'
+    return 'C'
 
 
 def _generate_clarification_insights(clarified: Dict) -> Dict:
@@ -7,14 +7,13 @@ Tools for interacting with Todoist API for task management
 import os
 import logging
 from typing import Dict, List, Optional
-from datetime import datetime
 from langchain_core.tools import tool
 
 # Import Todoist client
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from gtd_coach.integrations.todoist import TodoistClient
+from gtd_coach.integrations.todoist import get_todoist_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +32,7 @@ def get_inbox_tasks_tool() -> List[Dict]:
         - labels: List of label names
     """
     try:
-        client = TodoistClient()
+        client = get_todoist_client()
         
         if not client.is_configured():
             return {
@@ -63,7 +62,8 @@ def get_inbox_tasks_tool() -> List[Dict]:
 def add_to_today_tool(
     content: str,
     is_deep_work: bool = False,
-    priority: Optional[int] = None
+    priority: Optional[int] = None,
+    source_task_id: Optional[str] = None
 ) -> Dict:
     """
     Add a task to today's list in Todoist.
@@ -72,15 +72,16 @@ def add_to_today_tool(
         content: Task description
         is_deep_work: Whether this is a deep work task (adds 2h duration label)
         priority: Priority level (1=urgent/important, 4=low priority)
+        source_task_id: Inbox task this was clarified from; adding it twice is a no-op
     
     Returns:
         Dictionary with:
         - success: Whether task was added successfully
-        - task_id: ID of created task
+        - task_id: ID of created task (temporary until the queue syncs)
         - message: Status message
     """
     try:
-        client = TodoistClient()
+        client = get_todoist_client(write_behind=True)
         
         if not client.is_configured():
             return {
@@ -89,16 +90,17 @@ def add_to_today_tool(
             }
         
         # Add task with appropriate settings
-        task_data = client.add_to_today(
+        task_id = client.add_to_today(
             content=content,
-            is_deep_work=is_deep_work
+            is_deep_work=is_deep_work,
+            source_id=source_task_id
         )
         
-        if task_data:
+        if task_id:
             logger.info(f"Added task to today: {content[:50]}...")
             return {
                 "success": True,
-                "task_id": task_data.get('id'),
+                "task_id": task_id,
                 "message": f"Added {'deep work' if is_deep_work else 'task'}: {content}"
             }
         else:
@@ -129,7 +131,7 @@ def mark_task_complete_tool(task_id: str) -> Dict:
         - message: Status message
     """
     try:
-        client = TodoistClient()
+        client = get_todoist_client(write_behind=True)
         
         if not client.is_configured():
             return {
@@ -171,7 +173,7 @@ def check_deep_work_limit_tool() -> Dict:
         - message: Status message
     """
     try:
-        client = TodoistClient()
+        client = get_todoist_client()
         
         if not client.is_configured():
             return {
@@ -181,10 +183,10 @@ def check_deep_work_limit_tool() -> Dict:
             }
         
         # Get today's tasks and count deep work
-        today_tasks = client.get_tasks_for_date(datetime.now())
+        today_tasks = client.get_today_tasks()
         deep_work_count = sum(
             1 for task in today_tasks 
-            if any('deep_work' in label or '2h' in label 
+            if any('deep' in label or '2h' in label 
                    for label in task.get('labels', []))
         )
         
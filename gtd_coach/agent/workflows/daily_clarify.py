@@ -4,9 +4,12 @@ Daily Clarify Workflow - Agent-First Implementation
 Processes Todoist inbox with keep/delete decisions
 """
 
+import hashlib
 import logging
-from typing import Dict, List, TypedDict, Literal, Optional
-from datetime import datetime
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, TypedDict, Literal, Optional, Tuple
+from datetime import date, datetime
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, END, START
@@ -33,15 +36,32 @@ from gtd_coach.agent.tools.clarify_v3 import (
     clarify_session_summary_v3
 )
 from gtd_coach.integrations.graphiti import GraphitiMemory
+from gtd_coach.integrations.todoist_queue import flush_write_queue
+from gtd_coach.persistence.checkpointer import open_sqlite_saver
+from gtd_coach.persistence.session_store import DEFAULT_USER
 
 logger = logging.getLogger(__name__)
 
+# Upcoming inbox tasks analyzed in the background while the user decides on the current one
+PREFETCH_DEPTH = int(os.getenv('GTD_CLARIFY_PREFETCH', '3'))
+
+
+def _analyze_deep_work(content: str) -> Dict:
+    return analyze_task_for_deep_work_tool.invoke({"content": content})
+
+
+def clarify_thread_id(user_id: Optional[str] = None, day: Optional[date] = None) -> str:
+    """Checkpoint thread for one user's clarify session on one day"""
+    return f"clarify-{user_id or DEFAULT_USER}-{(day or date.today()).isoformat()}"
+
 
 class ClarifyState(TypedDict):
     """State for the daily clarify workflow"""
     # Task management
     inbox_tasks: List[Dict]
     current_task_index: int
+    last_decision: str
+    is_deep_work: bool
     
     # Metrics
     processed_count: int
@@ -63,15 +83,31 @@ class DailyClarifyWorkflow:
     Agent workflow for daily clarify - processing Todoist inbox
     """
     
-    def __init__(self, use_graphiti: bool = True):
+    def __init__(self, use_graphiti: bool = True, prefetch_depth: Optional[int] = None,
+                 analyzer: Optional[Callable[[str], Dict]] = None,
+                 user_id: Optional[str] = None, checkpointer=None,
+                 ask: Callable[[str], str] = input):
         """
         Initialize the clarify workflow
         
         Args:
             use_graphiti: Whether to save metrics to Graphiti
+            prefetch_depth: Upcoming tasks to analyze ahead (default: GTD_CLARIFY_PREFETCH, 0 disables)
+            analyzer: Deep work analysis for task content (default: analyze_task_for_deep_work_tool)
+            user_id: Whose session this is; part of the checkpoint thread id
+            checkpointer: LangGraph checkpointer (default: SQLite at GTD_CHECKPOINT_DB)
+            ask: Shows an interrupt prompt and returns the user's answer
         """
         self.use_graphiti = use_graphiti
-        self.checkpointer = InMemorySaver()
+        self.user_id = user_id or DEFAULT_USER
+        self.ask = ask
+        self.prefetch_depth = PREFETCH_DEPTH if prefetch_depth is None else prefetch_depth
+        self.analyzer = analyzer or _analyze_deep_work
+        # Per-session analyses keyed by (task id, content hash), so an edited task is re-analyzed
+        self._analyses: Dict[Tuple[str, str], Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Durable, so a crash mid-inbox can be resumed; in memory if SQLite checkpointing is unavailable
+        self.checkpointer = checkpointer or open_sqlite_saver() or InMemorySaver()
         self.graph = self._build_graph()
         
         # Initialize Graphiti if configured
@@ -178,11 +214,9 @@ class DailyClarifyWorkflow:
             else:
                 return "done"
         elif last_decision == "keep":
-            # Check if it might be deep work
+            # Check if it might be deep work (usually prefetched while the user decided)
             current_task = state["inbox_tasks"][state["current_task_index"] - 1]
-            analysis = analyze_task_for_deep_work_tool.invoke(
-                {"content": current_task["content"]}
-            )
+            analysis = self._deep_work_analysis(current_task)
             if analysis["is_deep_work"] and state["deep_work_count"] < 2:
                 return "check_deep"
             else:
@@ -190,6 +224,46 @@ class DailyClarifyWorkflow:
         else:
             return "done"
     
+    # ----- deep work analysis prefetch -----
+    
+    @staticmethod
+    def _analysis_key(task: Dict) -> Tuple[str, str]:
+        digest = hashlib.sha1(task["content"].encode("utf-8")).hexdigest()[:16]
+        return str(task["id"]), digest
+    
+    def _submit_analysis(self, task: Dict) -> Future:
+        """Start (or reuse) the analysis of one task"""
+        key = self._analysis_key(task)
+        future = self._analyses.get(key)
+        if future is None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="clarify-prefetch")
+            future = self._executor.submit(self.analyzer, task["content"])
+            self._analyses[key] = future
+        return future
+    
+    def _prefetch_analyses(self, tasks: List[Dict], start: int) -> None:
+        """Analyze the next prefetch_depth tasks from start in the background"""
+        for task in tasks[start:start + self.prefetch_depth]:
+            self._submit_analysis(task)
+    
+    def _deep_work_analysis(self, task: Dict) -> Dict:
+        """Analysis for a task, waiting only if its prefetch hasn't finished"""
+        if self.prefetch_depth <= 0:
+            return self.analyzer(task["content"])
+        try:
+            return self._submit_analysis(task).result()
+        except Exception as e:
+            logger.warning(f"Deep work analysis failed, treating as regular task: {e}")
+            return {"is_deep_work": False}
+    
+    def _stop_prefetch(self) -> None:
+        """Drop pending analyses and the session cache"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._analyses.clear()
+    
     def load_inbox_node(self, state: ClarifyState) -> Dict:
         """Load tasks from Todoist inbox"""
         logger.info("Loading Todoist inbox")
@@ -207,6 +281,10 @@ class DailyClarifyWorkflow:
         tasks = result.get("tasks", [])
         logger.info(f"Loaded {len(tasks)} tasks from inbox")
         
+        # New session: analyze the first tasks while the preview is shown
+        self._stop_prefetch()
+        self._prefetch_analyses(tasks, 0)
+        
         return {
             "inbox_tasks": tasks,
             "current_task_index": 0,
@@ -256,6 +334,9 @@ class DailyClarifyWorkflow:
         
         current_task = tasks[idx]
         
+        # Analyze this and the upcoming tasks while the user decides
+        self._prefetch_analyses(tasks, idx)
+        
         # Get user decision
         decision = clarify_decision_v3.invoke({
             "task_content": current_task["content"],
@@ -263,7 +344,7 @@ class DailyClarifyWorkflow:
             "total_tasks": len(tasks)
         })
         
-        # Mark task complete in inbox (achieve inbox zero)
+        # Mark task complete in inbox (achieve inbox zero) - queued, sent in the background
         mark_task_complete_tool.invoke({"task_id": current_task["id"]})
         
         updates = {
@@ -305,7 +386,8 @@ class DailyClarifyWorkflow:
         # Add to today
         result = add_to_today_tool.invoke({
             "content": current_task["content"],
-            "is_deep_work": is_deep
+            "is_deep_work": is_deep,
+            "source_task_id": current_task["id"]
         })
         
         updates = {}
@@ -342,7 +424,10 @@ class DailyClarifyWorkflow:
         return {}  # Continue processing
     
     def save_metrics_node(self, state: ClarifyState) -> Dict:
-        """Save session metrics to Graphiti"""
+        """Send queued Todoist changes and save session metrics to Graphiti"""
+        if not flush_write_queue():
+            logger.warning("Some Todoist changes are still queued; they'll sync on next start")
+        
         if self.memory:
             try:
                 metrics = {
@@ -386,10 +471,28 @@ class DailyClarifyWorkflow:
             ]
         }
     
+    def _config(self, day: Optional[date] = None) -> Dict:
+        return {"configurable": {"thread_id": clarify_thread_id(self.user_id, day)}}
+    
+    def _drive(self, payload, config: Dict) -> Dict:
+        """Invoke the graph, answering each interrupt with self.ask until it finishes"""
+        result = self.graph.invoke(payload, config=config)
+        while result.get("__interrupt__"):
+            answer = self.ask(result["__interrupt__"][0].value)
+            result = self.graph.invoke(Command(resume=answer), config=config)
+        return result
+    
+    def has_resumable_session(self, day: Optional[date] = None) -> bool:
+        """Whether today's session (or day's) stopped before its summary"""
+        return bool(self.graph.get_state(self._config(day)).next)
+    
     def run(self, config: Optional[Dict] = None) -> Dict:
         """
         Run the clarify workflow
         
+        Starts a new session on today's thread; every step is checkpointed,
+        so an interrupted session can be continued with resume().
+        
         Args:
             config: Optional configuration overrides
         
@@ -407,24 +510,61 @@ class DailyClarifyWorkflow:
             "needs_break": False,
             "messages": []
         }
+        run_config = self._config()
+        if config:
+            run_config = {**config, "configurable": {**run_config["configurable"],
+                                                     **config.get("configurable", {})}}
         
         try:
             # Run the workflow
-            final_state = self.graph.invoke(
-                initial_state,
-                config={"configurable": {"thread_id": "clarify-session"}}
-            )
-            
-            return final_state
+            return self._drive(initial_state, run_config)
             
         except KeyboardInterrupt:
             logger.info("Session interrupted by user")
             # Still show summary of what was processed
-            self.show_summary_node(initial_state)
-            return initial_state
+            state = self.graph.get_state(run_config).values or initial_state
+            self.show_summary_node(state)
+            print("Progress is saved - continue with: gtd-coach clarify --resume")
+            return state
         except Exception as e:
             logger.error(f"Workflow failed: {e}")
             raise
+        finally:
+            self._stop_prefetch()
+    
+    def resume(self, day: Optional[date] = None) -> Optional[Dict]:
+        """
+        Continue an interrupted session from its last checkpoint.
+        
+        Tasks already decided are not asked again: the graph restarts at the
+        step that was in progress, with the saved task index and counts.
+        
+        Args:
+            day: Session date (default: today)
+        
+        Returns:
+            Final state, or None if there is nothing to resume
+        """
+        config = self._config(day)
+        snapshot = self.graph.get_state(config)
+        if not snapshot.next:
+            logger.info("No unfinished clarify session to resume")
+            return None
+        
+        values = snapshot.values
+        logger.info(f"Resuming clarify session at task {values.get('current_task_index', 0) + 1}"
+                    f"/{len(values.get('inbox_tasks', []))}")
+        try:
+            pending = [i for task in snapshot.tasks for i in task.interrupts]
+            if pending:
+                # Re-ask the question the session stopped on
+                payload = Command(resume=self.ask(pending[0].value))
+            else:
+                payload = None
+            return self._drive(payload, config)
+        finally:
+            self._stop_prefetch()
+
 
 
 def main():
@@ -435,6 +575,8 @@ def main():
     parser = argparse.ArgumentParser(description="Daily Clarify Workflow")
     parser.add_argument("--no-graphiti", action="store_true", 
                        help="Skip Graphiti metrics")
+    parser.add_argument("--resume", action="store_true",
+                       help="Continue today's interrupted session")
     args = parser.parse_args()
     
     load_dotenv()
@@ -447,7 +589,11 @@ def main():
     
     # Run workflow
     workflow = DailyClarifyWorkflow(use_graphiti=not args.no_graphiti)
-    workflow.run()
+    if args.resume:
+        if workflow.resume() is None:
+            print("Nothing to resume today")
+    else:
+        workflow.run()
 
 
 if __name__ == "__main__":
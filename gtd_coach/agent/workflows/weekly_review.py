@@ -14,7 +14,6 @@ from pathlib import Path
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, END, START
 from langgraph.prebuilt import ToolNode
-from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.types import Command
 from langgraph.types import interrupt
 # RetryPolicy is now configured differently in v0.6
@@ -37,6 +36,7 @@ from gtd_coach.agent.tools import (
     create_project_tool,
     provide_intervention_tool
 )
+from gtd_coach.persistence.checkpointer import open_sqlite_saver
 
 logger = logging.getLogger(__name__)
 
@@ -113,7 +113,7 @@ class WeeklyReviewWorkflow:
         # Use SqliteSaver for persistence across interrupts
         db_path = DATA_DIR / "gtd_coach.db"
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.checkpointer = SqliteSaver.from_conn_string(str(db_path))
+        self.checkpointer = open_sqlite_saver(db_path)
         
         # Get available tools (must be before building graph)
         self.tools = self._get_workflow_tools()
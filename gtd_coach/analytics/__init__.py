@@ -1,8 +1,12 @@
 """
 GTD Coach Analytics Module
-Provides evaluation analytics and insight generation
+Provides evaluation analytics, insight generation, the artifact warehouse
+and the local Langfuse trace mirror
 """
 
 from gtd_coach.analytics.evaluation_analytics import EvaluationAnalytics
+from gtd_coach.analytics.warehouse import ArtifactWarehouse, get_warehouse
+from gtd_coach.analytics.trace_mirror import TraceMirror, get_trace_mirror, sync_trace_mirror
 
-__all__ = ['EvaluationAnalytics']
\ No newline at end of file
+__all__ = ['EvaluationAnalytics', 'ArtifactWarehouse', 'get_warehouse',
+           'TraceMirror', 'get_trace_mirror', 'sync_trace_mirror']
\ No newline at end of file
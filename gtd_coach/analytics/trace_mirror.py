@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Local Mirror of Langfuse Traces
+Pulls traces with their observations and scores into SQLite, paging and
+fetching trace details concurrently, and only refetching traces whose
+updated-at (or observation/score set) changed since the last sync, so
+analysis scripts can re-run offline against the mirror
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS traces (
+    id TEXT PRIMARY KEY,
+    session_id TEXT,
+    name TEXT,
+    user_id TEXT,
+    ts TEXT,
+    version TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_traces_session ON traces(session_id, ts);
+CREATE INDEX IF NOT EXISTS idx_traces_ts ON traces(ts);
+
+CREATE TABLE IF NOT EXISTS observations (
+    id TEXT PRIMARY KEY,
+    trace_id TEXT NOT NULL,
+    start_time TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_trace ON observations(trace_id, start_time);
+
+CREATE TABLE IF NOT EXISTS scores (
+    id TEXT PRIMARY KEY,
+    trace_id TEXT NOT NULL,
+    name TEXT,
+    value REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_trace ON scores(trace_id);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Traces keep changing for a while after they start (observations and
+# scores arrive late), so incremental syncs re-list this far before the
+# newest trace already mirrored
+SYNC_OVERLAP = timedelta(hours=6)
+
+# Record attributes the analysis scripts read, defaulted to None
+TRACE_FIELDS = ('id', 'name', 'session_id', 'user_id', 'timestamp', 'tags', 'metadata',
+                'input', 'output', 'latency')
+OBSERVATION_FIELDS = ('id', 'trace_id', 'name', 'type', 'start_time', 'end_time',
+                      'input', 'output', 'metadata', 'level', 'status_message')
+SCORE_FIELDS = ('id', 'trace_id', 'name', 'value', 'comment', 'timestamp')
+TIME_FIELDS = ('timestamp', 'start_time', 'end_time')
+
+_CAMEL = re.compile(r'(?<!^)(?=[A-Z])')
+
+
+def default_mirror_path() -> Path:
+    """Mirror database path (GTD_TRACE_MIRROR_DB, else data/langfuse_mirror.db)"""
+    configured = os.getenv("GTD_TRACE_MIRROR_DB")
+    if configured:
+        return Path(configured)
+    base = Path("/app") if os.environ.get("IN_DOCKER") else Path.home() / "gtd-coach"
+    return base / "data" / "langfuse_mirror.db"
+
+
+def _to_dict(obj: Any) -> Dict[str, Any]:
+    """API model -> dict with snake_case top-level keys and JSON-safe values"""
+    if isinstance(obj, dict):
+        data = obj
+    elif hasattr(obj, 'model_dump'):
+        data = obj.model_dump()
+    elif hasattr(obj, 'dict'):
+        data = obj.dict()
+    else:
+        data = dict(vars(obj))
+    data = json.loads(json.dumps(data, default=str))
+    return {_CAMEL.sub('_', key).lower(): value for key, value in data.items()}
+
+
+def _iso(value: Any) -> Optional[str]:
+    """Timestamp as a UTC ISO string (sortable in SQL)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    # Naive datetimes are local time, like datetime.now() in the scripts
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _version(summary: Dict[str, Any]) -> str:
+    """Change marker for a trace summary: updated-at, else its child ids"""
+    updated = summary.get('updated_at')
+    if updated:
+        return str(updated)
+    children = sorted(map(str, summary.get('observations') or [])) + sorted(map(str, summary.get('scores') or []))
+    return hashlib.sha1(json.dumps([children, summary.get('latency')]).encode()).hexdigest()
+
+
+def _record(data: Dict[str, Any], fields: Iterable[str]) -> SimpleNamespace:
+    """Attribute-style record like the SDK's, with parsed timestamps"""
+    values = {field: None for field in fields}
+    values.update(data)
+    for field in TIME_FIELDS:
+        if isinstance(values.get(field), str):
+            try:
+                values[field] = datetime.fromisoformat(values[field].replace('Z', '+00:00'))
+            except ValueError:
+                pass
+    return SimpleNamespace(**values)
+
+
+class TraceMirror:
+    """
+    SQLite mirror of Langfuse traces, observations and scores
+
+    ``sync()`` talks to the Langfuse public API through ``client.api``
+    (``trace.list`` for paged summaries, ``trace.get`` for a trace with its
+    observations and scores); the query methods never touch the network.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Args:
+            db_path: SQLite file (default: default_mirror_path())
+        """
+        self.db_path = Path(db_path) if db_path else default_mirror_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # ----- sync -----
+
+    def _state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def sync(self, client: Any, since: Optional[datetime] = None, session_id: Optional[str] = None,
+             max_workers: int = 8, page_size: int = 50) -> Dict[str, int]:
+        """
+        Bring the mirror up to date
+
+        Lists trace summaries page by page (pages after the first in
+        parallel), then fetches full details only for new or changed traces,
+        ``max_workers`` at a time.
+
+        Args:
+            client: Langfuse client (anything with ``api.trace.list/get``)
+            since: Only traces from this time (default: overlap before the
+                newest mirrored trace, or everything on the first sync)
+            session_id: Only this session's traces
+            max_workers: Concurrent API requests
+            page_size: Traces per list page
+
+        Returns:
+            Counts of traces listed, fetched (new or changed) and failed
+        """
+        if since is None and session_id is None:
+            watermark = self._state('watermark')
+            if watermark:
+                since = datetime.fromisoformat(watermark) - SYNC_OVERLAP
+
+        params: Dict[str, Any] = {'limit': page_size}
+        if since is not None:
+            params['from_timestamp'] = since.astimezone(timezone.utc)
+        if session_id:
+            params['session_id'] = session_id
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trace-sync") as pool:
+            first = client.api.trace.list(page=1, **params)
+            pages = [first]
+            total_pages = getattr(getattr(first, 'meta', None), 'total_pages', 1) or 1
+            if total_pages > 1:
+                pages += pool.map(lambda page: client.api.trace.list(page=page, **params),
+                                  range(2, total_pages + 1))
+            summaries = [_to_dict(trace) for page in pages for trace in (getattr(page, 'data', None) or [])]
+
+            with self._lock:
+                known = {row['id']: row['version'] for row in self._conn.execute(
+                    "SELECT id, version FROM traces WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps([s['id'] for s in summaries]),)
+                )}
+            stale = [s for s in summaries if known.get(s['id']) != _version(s)]
+            details = list(pool.map(lambda s: self._fetch(client, s['id']), stale))
+
+        stats = {'listed': len(summaries), 'fetched': 0, 'failed': 0}
+        with self._lock:
+            for summary, detail in zip(stale, details):
+                if detail is None:
+                    stats['failed'] += 1
+                    continue
+                self._store(summary, detail)
+                stats['fetched'] += 1
+            newest = max((_iso(s.get('timestamp')) for s in summaries if s.get('timestamp')), default=None)
+            if newest and session_id is None:
+                row = self._conn.execute("SELECT value FROM sync_state WHERE key = 'watermark'").fetchone()
+                if row is None or newest > row['value']:
+                    self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('watermark', ?)",
+                                       (newest,))
+            self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_sync', ?)",
+                               (datetime.now(timezone.utc).isoformat(),))
+            self._conn.commit()
+        logger.info(f"Trace mirror sync: {stats}")
+        return stats
+
+    def sync_trace(self, client: Any, trace_id: str) -> bool:
+        """
+        Fetch one trace by id, for lookups that miss the mirror
+
+        Returns:
+            True if the trace was fetched and stored
+        """
+        detail = self._fetch(client, trace_id)
+        if detail is None:
+            return False
+        # Summary as the list endpoint returns it: child ids, not objects
+        summary = {**detail, 'id': detail.get('id', trace_id)}
+        for key in ('observations', 'scores'):
+            summary[key] = [child.get('id') if isinstance(child, dict) else child
+                            for child in detail.get(key) or []]
+        with self._lock:
+            self._store(summary, detail)
+            self._conn.commit()
+        return True
+
+    @staticmethod
+    def _fetch(client: Any, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Full trace with observations and scores (None on API errors)"""
+        try:
+            return _to_dict(client.api.trace.get(trace_id))
+        except Exception as e:
+            logger.warning(f"Could not fetch trace {trace_id}: {e}")
+            return None
+
+    def _store(self, summary: Dict[str, Any], detail: Dict[str, Any]) -> None:
+        """Replace one trace and its children (lock held)"""
+        trace_id = summary['id']
+        observations = [_to_dict(o) for o in detail.pop('observations', None) or []]
+        scores = [_to_dict(s) for s in detail.pop('scores', None) or []]
+        trace = {**summary, **detail}
+        trace.pop('observations', None)
+        trace.pop('scores', None)
+
+        self._conn.execute("DELETE FROM observations WHERE trace_id = ?", (trace_id,))
+        self._conn.execute("DELETE FROM scores WHERE trace_id = ?", (trace_id,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO traces (id, session_id, name, user_id, ts, version, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (trace_id, trace.get('session_id'), trace.get('name'), trace.get('user_id'),
+             _iso(trace.get('timestamp')), _version(summary), json.dumps(trace))
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO observations (id, trace_id, start_time, data) VALUES (?, ?, ?, ?)",
+            [(o['id'], trace_id, _iso(o.get('start_time')), json.dumps({**o, 'trace_id': trace_id}))
+             for o in observations]
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO scores (id, trace_id, name, value, data) VALUES (?, ?, ?, ?, ?)",
+            [(s['id'], trace_id, s.get('name'),
+              s.get('value') if isinstance(s.get('value'), (int, float)) else None,
+              json.dumps({**s, 'trace_id': trace_id}))
+             for s in scores]
+        )
+
+    # ----- queries -----
+
+    def traces(self, session_id: Optional[str] = None, since: Optional[datetime] = None,
+               until: Optional[datetime] = None, tag: Optional[str] = None,
+               limit: Optional[int] = None) -> List[SimpleNamespace]:
+        """
+        Mirrored traces, newest first
+
+        Args:
+            session_id: Only this session
+            since: Only traces at or after this time
+            until: Only traces at or before this time
+            tag: Only traces carrying this tag
+            limit: Maximum number of traces
+
+        Returns:
+            Trace records (id, name, session_id, timestamp, tags, metadata, ...)
+        """
+        clauses, params = [], []
+        if session_id:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if since:
+            clauses.append("ts >= ?")
+            params.append(_iso(since))
+        if until:
+            clauses.append("ts <= ?")
+            params.append(_iso(until))
+        if tag:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(data, '$.tags') WHERE value = ?)")
+            params.append(tag)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT data FROM traces{where} ORDER BY ts DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_record(json.loads(row['data']), TRACE_FIELDS) for row in rows]
+
+    def get_trace(self, trace_id: str) -> Optional[SimpleNamespace]:
+        """One mirrored trace, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM traces WHERE id = ?", (trace_id,)).fetchone()
+        return _record(json.loads(row['data']), TRACE_FIELDS) if row else None
+
+    def observations(self, trace_ids: Iterable[str]) -> Dict[str, List[SimpleNamespace]]:
+        """Observations of several traces in one query, in start order per trace"""
+        ids = list(trace_ids)
+        grouped: Dict[str, List[SimpleNamespace]] = {trace_id: [] for trace_id in ids}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT trace_id, data FROM observations WHERE trace_id IN (SELECT value FROM json_each(?)) "
+                "ORDER BY start_time", (json.dumps(ids),)
+            ).fetchall()
+        for row in rows:
+            grouped[row['trace_id']].append(_record(json.loads(row['data']), OBSERVATION_FIELDS))
+        return grouped
+
+    def scores(self, trace_ids: Iterable[str]) -> Dict[str, List[SimpleNamespace]]:
+        """Scores of several traces in one query"""
+        ids = list(trace_ids)
+        grouped: Dict[str, List[SimpleNamespace]] = {trace_id: [] for trace_id in ids}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT trace_id, data FROM scores WHERE trace_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),)
+            ).fetchall()
+        for row in rows:
+            grouped[row['trace_id']].append(_record(json.loads(row['data']), SCORE_FIELDS))
+        return grouped
+
+    def last_sync(self) -> Optional[datetime]:
+        """Time of the last successful sync, or None"""
+        value = self._state('last_sync')
+        return datetime.fromisoformat(value) if value else None
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_mirror: Optional[TraceMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_trace_mirror() -> TraceMirror:
+    """
+    Get singleton trace mirror
+
+    Returns:
+        TraceMirror instance
+    """
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = TraceMirror()
+        return _mirror
+
+
+def sync_trace_mirror(since: Optional[datetime] = None, session_id: Optional[str] = None,
+                      mirror: Optional[TraceMirror] = None, trace_id: Optional[str] = None,
+                      **kwargs) -> Optional[Dict[str, int]]:
+    """
+    Sync the mirror with a Langfuse client built from the environment
+
+    Args:
+        since: Only traces from this time
+        session_id: Only this session's traces
+        mirror: Mirror to update (default: get_trace_mirror())
+        trace_id: Fetch just this trace instead of listing
+        **kwargs: Passed to TraceMirror.sync (max_workers, page_size)
+
+    Returns:
+        Sync counts, or None when Langfuse is not installed, not configured
+        or unreachable (callers then read whatever the mirror already has)
+    """
+    if not os.getenv("LANGFUSE_PUBLIC_KEY") or not os.getenv("LANGFUSE_SECRET_KEY"):
+        return None
+    try:
+        from langfuse import Langfuse
+    except ImportError:
+        return None
+    try:
+        client = Langfuse(
+            public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
+            secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
+            host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
+        )
+        mirror = mirror or get_trace_mirror()
+        if trace_id:
+            fetched = mirror.sync_trace(client, trace_id)
+            return {'listed': 0, 'fetched': int(fetched), 'failed': int(not fetched)}
+        return mirror.sync(client, since=since, session_id=session_id, **kwargs)
+    except Exception as e:
+        logger.warning(f"Trace mirror sync failed, using mirrored data: {e}")
+        return None
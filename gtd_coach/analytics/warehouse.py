@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Local Analytics Warehouse for Session Artifacts
+Incrementally loads review logs, mind sweeps, Graphiti batch backups,
+evaluations and North Star metrics into one SQLite database keyed by file
+mtime, so reports query a time window instead of re-parsing every file
+
+The warehouse is a derived cache: the artifact files (indexed by the week
+manifests of gtd_coach.persistence.artifacts) are authoritative for what
+was written, and the session store (sessions.db) is authoritative for
+captured mind sweep items, priorities and project updates. warehouse.db can
+be deleted at any time and is rebuilt from the files on the next query.
+"""
+
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from gtd_coach.persistence.jsonl import load_document
+
+logger = logging.getLogger(__name__)
+
+# Week partitions written by gtd_coach.persistence.artifacts
+PARTITION_GLOB = "[0-9][0-9][0-9][0-9]/W[0-9][0-9]"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    session_id TEXT,
+    ts TEXT NOT NULL,
+    week TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_ts ON artifacts(kind, ts);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_week ON artifacts(kind, week);
+CREATE INDEX IF NOT EXISTS idx_artifacts_kind_name ON artifacts(kind, name);
+CREATE INDEX IF NOT EXISTS idx_artifacts_path ON artifacts(path);
+
+CREATE TABLE IF NOT EXISTS episodes (
+    artifact_id INTEGER NOT NULL,
+    session_id TEXT,
+    ts TEXT NOT NULL,
+    week TEXT NOT NULL,
+    type TEXT,
+    pattern_type TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_type_ts ON episodes(type, ts);
+CREATE INDEX IF NOT EXISTS idx_episodes_artifact ON episodes(artifact_id);
+"""
+
+
+def _stamp_from_name(name: str) -> Optional[datetime]:
+    """Parse the trailing YYYYmmdd_HHMMSS of a file stem, if any"""
+    parts = Path(name).stem.split('_')
+    if len(parts) >= 2:
+        try:
+            return datetime.strptime(f"{parts[-2]}_{parts[-1]}", "%Y%m%d_%H%M%S")
+        except ValueError:
+            pass
+    return None
+
+
+def _stamp_from_field(field: str) -> Callable[[Dict[str, Any], Path], Optional[datetime]]:
+    """Timestamp taken from an ISO field of the payload, else the file name"""
+    def extract(data: Dict[str, Any], path: Path) -> Optional[datetime]:
+        value = data.get(field) if isinstance(data, dict) else None
+        if value:
+            try:
+                return datetime.fromisoformat(str(value))
+            except ValueError:
+                pass
+        return _stamp_from_name(path.name)
+    return extract
+
+
+@dataclass(frozen=True)
+class ArtifactSource:
+    """A family of JSON artifact files"""
+    kind: str
+    root: str           # 'data' or 'logs'
+    subdir: str
+    pattern: str
+    timestamp: Callable[[Dict[str, Any], Path], Optional[datetime]]
+    session_field: Optional[str] = 'session_id'
+
+
+SOURCES = (
+    # review_*.json* and graphiti_batch_*.json* include the streamed .jsonl logs
+    ArtifactSource('review', 'logs', '', 'review_*.json*',
+                   lambda data, path: _stamp_from_name(path.name)),
+    ArtifactSource('mindsweep', 'data', '', 'mindsweep_*.json',
+                   lambda data, path: _stamp_from_name(path.name), session_field=None),
+    ArtifactSource('graphiti_batch', 'data', '', 'graphiti_batch_*.json*',
+                   lambda data, path: _stamp_from_name(path.name)),
+    ArtifactSource('evaluation', 'data', 'evaluations', 'eval_*.json',
+                   _stamp_from_field('timestamp')),
+    ArtifactSource('north_star', 'data', '', 'north_star_metrics_*.json',
+                   _stamp_from_field('session_start')),
+)
+
+
+class ArtifactWarehouse:
+    """
+    Query layer over incrementally ingested session artifacts
+
+    ``ingest()`` stats every source file but only parses files whose mtime
+    or size changed since the last run; deleted files are dropped. Queries
+    hit indexed (kind, ts) / (kind, week) columns, so a weekly report reads
+    only the rows in its window. A kind is ingested on its first query after
+    ``mark_stale()``, so callers only pay for the kinds they read.
+    """
+
+    def __init__(self, data_dir: Optional[Path] = None, logs_dir: Optional[Path] = None,
+                 db_path: Optional[Path] = None):
+        """
+        Initialize the warehouse
+
+        Args:
+            data_dir: Directory with data artifacts (default ~/gtd-coach/data)
+            logs_dir: Directory with review logs (default: sibling 'logs')
+            db_path: SQLite file (default: data_dir/warehouse.db)
+        """
+        self.data_dir = Path(data_dir) if data_dir else Path.home() / "gtd-coach" / "data"
+        self.logs_dir = Path(logs_dir) if logs_dir else self.data_dir.parent / "logs"
+        self.db_path = Path(db_path) if db_path else self.data_dir / "warehouse.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        # Kinds ingested since the last mark_stale()
+        self._fresh: set = set()
+
+    def _source_dir(self, source: ArtifactSource) -> Path:
+        root = self.logs_dir if source.root == 'logs' else self.data_dir
+        return root / source.subdir if source.subdir else root
+
+    def ingest(self, kinds: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Load new and changed artifact files
+
+        Args:
+            kinds: Restrict to these artifact kinds (default: all)
+
+        Returns:
+            Counts of files loaded, removed and failed to parse
+        """
+        stats = {'loaded': 0, 'removed': 0, 'failed': 0}
+        with self._lock:
+            known: Dict[str, Dict[str, tuple]] = {}
+            for row in self._conn.execute("SELECT path, kind, mtime, size FROM ingested_files"):
+                known.setdefault(row['kind'], {})[row['path']] = (row['mtime'], row['size'])
+            for source in SOURCES:
+                if kinds and source.kind not in kinds:
+                    continue
+                directory = self._source_dir(source)
+                files = known.get(source.kind, {})
+                seen = set()
+                if directory.exists():
+                    # Flat legacy files plus the week partitions (YYYY/Www/)
+                    paths = itertools.chain(directory.glob(source.pattern),
+                                            directory.glob(f"{PARTITION_GLOB}/{source.pattern}"))
+                    for path in paths:
+                        try:
+                            stat = path.stat()
+                        except OSError:
+                            continue
+                        key = str(path)
+                        seen.add(key)
+                        if files.get(key) == (stat.st_mtime, stat.st_size):
+                            continue
+                        if self._load_file(source, path, stat):
+                            stats['loaded'] += 1
+                        else:
+                            stats['failed'] += 1
+                for key in [k for k in files if k not in seen]:
+                    self._forget(key)
+                    stats['removed'] += 1
+            self._conn.commit()
+            self._fresh.update(source.kind for source in SOURCES if not kinds or source.kind in kinds)
+        if stats['loaded'] or stats['removed']:
+            logger.info(f"Warehouse ingest: {stats}")
+        return stats
+
+    def mark_stale(self) -> None:
+        """Re-ingest each kind on its next query"""
+        with self._lock:
+            self._fresh.clear()
+
+    def _refresh(self, kind: str) -> None:
+        if kind not in self._fresh:
+            self.ingest([kind])
+
+    def _forget(self, path: str) -> None:
+        """Drop all rows of a file (lock held)"""
+        self._conn.execute(
+            "DELETE FROM episodes WHERE artifact_id IN (SELECT id FROM artifacts WHERE path = ?)", (path,)
+        )
+        self._conn.execute("DELETE FROM artifacts WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM ingested_files WHERE path = ?", (path,))
+
+    def _load_file(self, source: ArtifactSource, path: Path, stat: os.stat_result) -> bool:
+        """Parse one file and replace its rows (lock held)"""
+        try:
+            data = load_document(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Warehouse skipped {path.name}: {e}")
+            return False
+        if data is None:
+            logger.warning(f"Warehouse skipped {path.name}: no header line")
+            return False
+
+        when = source.timestamp(data, path) or datetime.fromtimestamp(stat.st_mtime)
+        ts, week = when.isoformat(), when.strftime("%G-W%V")
+        session_id = data.get(source.session_field) if source.session_field and isinstance(data, dict) else None
+
+        self._forget(str(path))
+        cursor = self._conn.execute(
+            "INSERT INTO artifacts (kind, path, name, session_id, ts, week, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (source.kind, str(path), path.name, session_id, ts, week, json.dumps(data))
+        )
+        if source.kind == 'graphiti_batch':
+            rows = []
+            for episode in data.get('episodes', []):
+                episode_data = episode.get('data') if isinstance(episode.get('data'), dict) else {}
+                rows.append((cursor.lastrowid, session_id, episode.get('timestamp') or ts, week,
+                             episode.get('type'), episode_data.get('pattern_type'), json.dumps(episode)))
+            self._conn.executemany(
+                "INSERT INTO episodes (artifact_id, session_id, ts, week, type, pattern_type, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO ingested_files (path, kind, mtime, size) VALUES (?, ?, ?, ?)",
+            (str(path), source.kind, stat.st_mtime, stat.st_size)
+        )
+        return True
+
+    def query(self, kind: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+              week: Optional[str] = None, limit: Optional[int] = None,
+              order: str = 'ts') -> List[Dict[str, Any]]:
+        """
+        Artifacts of one kind in a window
+
+        Args:
+            kind: Artifact kind (review, mindsweep, graphiti_batch, evaluation, north_star)
+            since: Only artifacts at or after this time
+            until: Only artifacts before this time
+            week: Only artifacts of this ISO week (YYYY-Www)
+            limit: Keep only the most recent N (still returned oldest first)
+            order: 'ts' (artifact time) or 'name' (file name)
+
+        Returns:
+            Dicts with path, name, session_id, timestamp, week and parsed data
+        """
+        column = {'ts': 'ts', 'name': 'name'}[order]
+        self._refresh(kind)
+        clauses, params = ["kind = ?"], [kind]
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until.isoformat())
+        if week:
+            clauses.append("week = ?")
+            params.append(week)
+        sql = f"SELECT * FROM artifacts WHERE {' AND '.join(clauses)} ORDER BY {column} DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                'path': row['path'],
+                'name': row['name'],
+                'session_id': row['session_id'],
+                'timestamp': datetime.fromisoformat(row['ts']),
+                'week': row['week'],
+                'data': json.loads(row['data'])
+            }
+            for row in reversed(rows)
+        ]
+
+    def episodes(self, episode_type: Optional[str] = None, since: Optional[datetime] = None,
+                 pattern_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Episodes from Graphiti batch backups
+
+        Args:
+            episode_type: Episode 'type' (e.g. behavior_pattern)
+            since: Only episodes at or after this time
+            pattern_type: Only behavior patterns of this pattern_type
+
+        Returns:
+            Episode dicts as written to the batch files, oldest first
+        """
+        self._refresh('graphiti_batch')
+        clauses, params = [], []
+        if episode_type:
+            clauses.append("type = ?")
+            params.append(episode_type)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since.isoformat())
+        if pattern_type:
+            clauses.append("pattern_type = ?")
+            params.append(pattern_type)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT data FROM episodes{where} ORDER BY ts", params).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_warehouses: Dict[str, ArtifactWarehouse] = {}
+_warehouses_lock = threading.Lock()
+
+
+def get_warehouse(data_dir: Optional[Path] = None, logs_dir: Optional[Path] = None,
+                  refresh: bool = True) -> ArtifactWarehouse:
+    """
+    Get the warehouse for a data directory
+
+    Args:
+        data_dir: Data directory (default ~/gtd-coach/data)
+        logs_dir: Logs directory (default: sibling 'logs')
+        refresh: Pick up new files: each kind is ingested incrementally on
+            its next query, so only the kinds the caller reads are scanned
+
+    Returns:
+        ArtifactWarehouse instance (one per data directory)
+    """
+    key = str(Path(data_dir) if data_dir else Path.home() / "gtd-coach" / "data")
+    with _warehouses_lock:
+        warehouse = _warehouses.get(key)
+        if warehouse is None:
+            warehouse = _warehouses[key] = ArtifactWarehouse(data_dir, logs_dir)
+    if refresh:
+        warehouse.mark_stale()
+    return warehouse
@@ -14,8 +14,17 @@ from dataclasses import dataclass, field
 import json
 from pathlib import Path
 
+from gtd_coach.metrics.registry import counter, gauge, histogram
+
 logger = logging.getLogger(__name__)
 
+CIRCUIT_CALLS = counter("gtd_circuit_calls_total", "Agent calls through the circuit breaker by outcome",
+                        ["outcome"])
+CIRCUIT_LATENCY = histogram("gtd_circuit_call_duration_seconds", "Latency of successful agent calls")
+CIRCUIT_STATE = gauge("gtd_circuit_state", "Circuit breaker state (0 closed, 1 half open, 2 open)")
+CIRCUIT_TRANSITIONS = counter("gtd_circuit_transitions_total", "Circuit breaker state changes by new state",
+                              ["state"])
+
 
 class CircuitState(Enum):
     """Circuit breaker states"""
@@ -24,6 +33,10 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing recovery
 
 
+# Exported values of the gtd_circuit_state gauge
+STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
 @dataclass
 class CircuitStats:
     """Statistics for circuit breaker monitoring"""
@@ -220,6 +233,8 @@ class AgentCircuitBreaker:
         self.stats.consecutive_failures = 0
         self.stats.last_success_time = datetime.now()
         self.stats.total_latency_ms += latency_ms
+        CIRCUIT_CALLS.labels("success").inc()
+        CIRCUIT_LATENCY.observe(latency_ms / 1000)
         
         # Check if we should close circuit (in half-open state)
         if self.state == CircuitState.HALF_OPEN:
@@ -231,6 +246,7 @@ class AgentCircuitBreaker:
         self.stats.failed_calls += 1
         self.stats.consecutive_failures += 1
         self.stats.last_failure_time = datetime.now()
+        CIRCUIT_CALLS.labels("failure").inc()
         
         # Check if we should open circuit
         if self.state == CircuitState.CLOSED:
@@ -263,6 +279,7 @@ class AgentCircuitBreaker:
         self.logger.warning(f"⚠️ Circuit breaker OPEN: {reason}")
         self.state = CircuitState.OPEN
         self.last_state_change = datetime.now()
+        self._export_state()
         self.stats.state_changes.append({
             'timestamp': self.last_state_change.isoformat(),
             'transition': f"{self.state.value} -> OPEN",
@@ -276,6 +293,7 @@ class AgentCircuitBreaker:
         previous_state = self.state
         self.state = CircuitState.CLOSED
         self.last_state_change = datetime.now()
+        self._export_state()
         self.half_open_calls = 0
         self.stats.consecutive_failures = 0
         self.stats.state_changes.append({
@@ -290,6 +308,7 @@ class AgentCircuitBreaker:
         self.logger.info("🔄 Circuit breaker HALF_OPEN: Testing recovery")
         self.state = CircuitState.HALF_OPEN
         self.last_state_change = datetime.now()
+        self._export_state()
         self.half_open_calls = 0
         self.stats.state_changes.append({
             'timestamp': self.last_state_change.isoformat(),
@@ -297,6 +316,11 @@ class AgentCircuitBreaker:
             'reason': f"Cooldown period ({self.cooldown_seconds}s) elapsed"
         })
     
+    def _export_state(self):
+        """Publish the current state to the metrics registry"""
+        CIRCUIT_STATE.set(STATE_GAUGE_VALUES[self.state])
+        CIRCUIT_TRANSITIONS.labels(self.state.value).inc()
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current circuit breaker status"""
         error_rate = (
@@ -330,6 +354,7 @@ class AgentCircuitBreaker:
         self.stats = CircuitStats()
         self.half_open_calls = 0
         self.last_state_change = datetime.now()
+        CIRCUIT_STATE.set(STATE_GAUGE_VALUES[self.state])
         self.logger.info("Circuit breaker reset")
     
     def _save_metrics(self):
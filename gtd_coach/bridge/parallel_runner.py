@@ -15,6 +15,7 @@ import traceback
 from dataclasses import dataclass, asdict
 
 from gtd_coach.bridge.state_converter import StateBridge
+from gtd_coach.llm.gateway import Priority, request_priority
 
 logger = logging.getLogger(__name__)
 
@@ -172,69 +173,71 @@ class ParallelRunner:
         start_time = time.perf_counter()
         start_memory = self._get_memory_usage()
         
-        try:
-            if not coach_instance.agent_workflow:
-                raise ValueError("Agent workflow not initialized")
+        # The agent is the comparison run here; legacy serves the user first
+        with request_priority(Priority.BACKGROUND):
+            try:
+                if not coach_instance.agent_workflow:
+                    raise ValueError("Agent workflow not initialized")
             
-            # Convert input to agent state
-            agent_state = self.bridge.legacy_to_agent(input_data)
-            agent_state['current_phase'] = phase
+                # Convert input to agent state
+                agent_state = self.bridge.legacy_to_agent(input_data)
+                agent_state['current_phase'] = phase
             
-            # Map phase to agent node
-            phase_nodes = {
-                'startup': 'startup',
-                'mind_sweep': 'mind_sweep',
-                'project_review': 'project_review',
-                'prioritization': 'prioritization',
-                'wrapup': 'wrapup'
-            }
+                # Map phase to agent node
+                phase_nodes = {
+                    'startup': 'startup',
+                    'mind_sweep': 'mind_sweep',
+                    'project_review': 'project_review',
+                    'prioritization': 'prioritization',
+                    'wrapup': 'wrapup'
+                }
             
-            node = phase_nodes.get(phase)
-            if not node:
-                raise ValueError(f"Unknown phase: {phase}")
+                node = phase_nodes.get(phase)
+                if not node:
+                    raise ValueError(f"Unknown phase: {phase}")
             
-            # Execute the specific node
-            config = {
-                "configurable": {
-                    "thread_id": coach_instance.session_id,
-                    "checkpoint_ns": phase
+                # Execute the specific node
+                config = {
+                    "configurable": {
+                        "thread_id": coach_instance.session_id,
+                        "checkpoint_ns": phase
+                    }
                 }
-            }
             
-            # Stream the graph execution for this phase
-            result_state = None
-            async for event in coach_instance.agent_workflow.graph.astream(
-                agent_state,
-                config,
-                stream_mode="values"
-            ):
-                result_state = event
-                # Break after first phase completes
-                if event.get('current_phase') != phase:
-                    break
+                # Stream the graph execution for this phase
+                result_state = None
+                async for event in coach_instance.agent_workflow.graph.astream(
+                    agent_state,
+                    config,
+                    stream_mode="values"
+                ):
+                    result_state = event
+                    # Break after first phase completes
+                    if event.get('current_phase') != phase:
+                        break
             
-            end_time = time.perf_counter()
-            end_memory = self._get_memory_usage()
+                end_time = time.perf_counter()
+                end_memory = self._get_memory_usage()
             
-            return ExecutionResult(
-                success=True,
-                output=result_state,
-                error=None,
-                latency_ms=(end_time - start_time) * 1000,
-                memory_usage_mb=end_memory - start_memory,
-                phase_timings=result_state.get('phase_timings', {})
-            )
+                return ExecutionResult(
+                    success=True,
+                    output=result_state,
+                    error=None,
+                    latency_ms=(end_time - start_time) * 1000,
+                    memory_usage_mb=end_memory - start_memory,
+                    phase_timings=result_state.get('phase_timings', {})
+                )
             
-        except Exception as e:
-            self.logger.error(f"Agent execution failed for {phase}: {e}")
-            return ExecutionResult(
-                success=False,
-                output=None,
-                error=str(e),
-                latency_ms=0,
-                memory_usage_mb=0,
-                phase_timings={}
-            )
+            except Exception as e:
+                self.logger.error(f"Agent execution failed for {phase}: {e}")
+                return ExecutionResult(
+                    success=False,
+                    output=None,
+                    error=str(e),
+                    latency_ms=0,
+                    memory_usage_mb=0,
+                    phase_timings={}
+                )
     
     def compare_outputs(self,
                        legacy_result: ExecutionResult,
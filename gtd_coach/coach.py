@@ -5,7 +5,6 @@ Orchestrates the review process with LM Studio
 """
 
 import requests
-import json
 import subprocess
 import time
 import sys
@@ -15,6 +14,7 @@ import asyncio
 import random
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 # Import memory integration modules
@@ -45,6 +45,23 @@ except ImportError:
 from gtd_coach.integrations.timing import TimingAPI, get_mock_projects
 from gtd_coach.integrations.timing_comparison import compare_time_with_priorities, generate_simple_time_summary, suggest_time_adjustments
 
+# Shared LM Studio request queue (priorities, coalescing)
+from gtd_coach.llm.gateway import gateway_http_client
+
+# Process-wide metrics registry (Prometheus text export)
+from gtd_coach.metrics.registry import counter, histogram
+
+# Indexed local store for captures and priorities
+from gtd_coach.persistence.session_store import get_session_store
+from gtd_coach.persistence.artifacts import get_artifact_store
+from gtd_coach.persistence.jsonl import StreamingDocument, load_document
+
+# Import precompiled per-phase prompt assembly
+from gtd_coach.prompts.compiled import (
+    precompile_phase_prompts, precompile_phase_prompt, format_time_status,
+    get_phase_time_limit, resolve_prompt_layout
+)
+
 # Import Langfuse for LLM observability
 try:
     from gtd_coach.integrations.langfuse import get_langfuse_client, score_response, validate_configuration
@@ -62,8 +79,26 @@ except ImportError:
     EVALUATION_AVAILABLE = False
 
 # Configuration
-API_URL = "http://localhost:1234/v1/chat/completions"
+LM_STUDIO_URL = os.environ.get("LM_STUDIO_URL", "http://localhost:1234/v1").rstrip("/")
+if not LM_STUDIO_URL.endswith("/v1"):
+    LM_STUDIO_URL = f"{LM_STUDIO_URL}/v1"
+API_URL = f"{LM_STUDIO_URL}/chat/completions"
 MODEL_NAME = "meta-llama-3.1-8b-instruct"  # Actual model name for API
+# "inline" substitutes the time values into the system prompt itself.
+# "prefix_stable" keeps the system prompt byte-identical within a phase and appends
+# the time check to the latest user turn, so LM Studio can reuse its prompt cache.
+PROMPT_LAYOUT = os.environ.get("GTD_PROMPT_LAYOUT", "inline")
+
+# Same families as the agent's LLMClient, told apart by the client label
+LLM_REQUESTS = counter("gtd_llm_requests_total", "Chat completion requests by client and outcome",
+                       ["client", "outcome"])
+LLM_LATENCY = histogram("gtd_llm_request_duration_seconds", "Chat completion latency by client",
+                        ["client"])
+_LLM_SUCCESS = LLM_REQUESTS.labels("legacy", "success")
+_LLM_FAILURE = LLM_REQUESTS.labels("legacy", "error")
+_LLM_LATENCY = LLM_LATENCY.labels("legacy")
+PHASE_DURATION = histogram("gtd_review_phase_duration_seconds", "Weekly review phase durations",
+                           ["phase"], buckets=(30, 60, 120, 300, 600, 900, 1200, 1800, 3600))
 # Handle Docker vs local paths
 if os.environ.get("IN_DOCKER"):
     COACH_DIR = Path("/app")
@@ -96,6 +131,9 @@ class GTDCoach:
         asyncio.set_event_loop(self.loop)
         
         self.messages = []
+        # Review log streamed to disk as the conversation goes (see _stream_review_log)
+        self.review_log: Optional[StreamingDocument] = None
+        self._logged_messages = 1  # The system prompt is not logged
         self.review_start_time = None
         self.review_data = {
             "projects_reviewed": 0,
@@ -168,6 +206,8 @@ class GTDCoach:
         self.langfuse_enabled = False
         self.langfuse_client = None
         self.langfuse_prompts = None  # For prompt management
+        self.phase_prompts = {}  # Precompiled per-phase system prompts
+        self.prompt_layout = resolve_prompt_layout(PROMPT_LAYOUT)
         self.prompt_tone = None  # For A/B testing tracking
         self.openai_client = None  # OpenAI client for LLM calls
         self.current_graphiti_batch_id = None  # Track current Graphiti batch
@@ -244,15 +284,17 @@ class GTDCoach:
             if LANGFUSE_OPENAI_AVAILABLE:
                 # Use Langfuse OpenAI wrapper for automatic trace linking
                 self.openai_client = LangfuseOpenAI(
-                    base_url="http://localhost:1234/v1",  # LM Studio endpoint
-                    api_key="lm-studio"  # Required but unused by LM Studio
+                    base_url=LM_STUDIO_URL,  # LM Studio endpoint
+                    api_key="lm-studio",  # Required but unused by LM Studio
+                    http_client=gateway_http_client()  # Shared LM Studio queue
                 )
                 self.logger.info("Initialized Langfuse OpenAI SDK wrapper for trace linking")
             elif STANDARD_OPENAI_AVAILABLE:
                 # Fall back to standard OpenAI SDK
                 self.openai_client = StandardOpenAI(
-                    base_url="http://localhost:1234/v1",
-                    api_key="lm-studio"
+                    base_url=LM_STUDIO_URL,
+                    api_key="lm-studio",
+                    http_client=gateway_http_client()
                 )
                 self.logger.info("Initialized standard OpenAI SDK (no automatic trace linking)")
             else:
@@ -315,8 +357,15 @@ class GTDCoach:
                 self.model_config = self.system_prompt.config
                 self.model_name = self.model_config.get("model", MODEL_NAME)
                 
+                # Split each phase's prompt into static text and time fields once
+                self.phase_prompts = precompile_phase_prompts(self.system_prompt, self.model_config)
+                
                 # Initialize with compiled prompt for startup phase
-                initial_prompt = self.compile_prompt("STARTUP", time_remaining=30)
+                initial_prompt = self.compile_prompt(
+                    "STARTUP",
+                    time_remaining=30,
+                    static_only=self.prompt_layout == "prefix_stable"
+                )
                 self.messages.append({"role": "system", "content": initial_prompt})
                 
                 prompt_loaded = True
@@ -351,40 +400,31 @@ class GTDCoach:
                 print(f"Error: System prompt not found")
                 sys.exit(1)
     
-    def compile_prompt(self, phase_name, time_remaining=None, time_elapsed=0):
-        """Compile prompt with dynamic variables"""
+    def compile_prompt(self, phase_name, time_remaining=None, time_elapsed=0, static_only=False):
+        """Assemble the phase prompt from its precompiled template
+        
+        With static_only=True the time fields are left as a stable reference,
+        so the result only changes when the phase does.
+        """
         if not self.langfuse_prompts or not hasattr(self, 'system_prompt'):
             return None
         
         try:
-            # Get phase instructions from config
-            phase_instructions = self.model_config.get("phase_instructions", {}).get(
-                phase_name,
-                "Guide the user through this phase of the GTD review."
-            )
+            template = self.phase_prompts.get(phase_name)
+            if template is None:
+                # Phase missing from config - compile it once and keep it
+                template = precompile_phase_prompt(self.system_prompt, phase_name, self.model_config)
+                self.phase_prompts[phase_name] = template
             
-            # Get phase time limit from config
-            phase_times = self.model_config.get("phase_times", {})
-            phase_time_limit = phase_times.get(phase_name, 5)
+            if static_only:
+                return template.static_body
             
             # Calculate time remaining if not provided
             if time_remaining is None:
+                phase_time_limit = get_phase_time_limit(self.model_config, phase_name)
                 time_remaining = phase_time_limit - time_elapsed
             
-            # Compile the prompt with variables
-            compiled = self.system_prompt.compile(
-                total_time=30,
-                phase_name=phase_name,
-                phase_time_limit=phase_time_limit,
-                time_remaining=max(0, time_remaining),
-                time_elapsed=time_elapsed,
-                phase_instructions=phase_instructions
-            )
-            
-            # Return the content of the compiled message
-            if isinstance(compiled, list) and len(compiled) > 0:
-                return compiled[0].get("content", "")
-            return compiled
+            return template.render(time_remaining=time_remaining, time_elapsed=time_elapsed)
             
         except Exception as e:
             self.logger.warning(f"Failed to compile prompt: {e}")
@@ -397,17 +437,19 @@ class GTDCoach:
         
         # Get phase time limit from config or defaults
         if self.langfuse_prompts and hasattr(self, 'model_config'):
-            phase_times = self.model_config.get("phase_times", {})
+            phase_config = self.model_config
         else:
-            phase_times = {
-                "STARTUP": 2,
-                "MIND_SWEEP": 10,
-                "PROJECT_REVIEW": 12,
-                "PRIORITIZATION": 5,
-                "WRAP_UP": 3
+            phase_config = {
+                "phase_times": {
+                    "STARTUP": 2,
+                    "MIND_SWEEP": 10,
+                    "PROJECT_REVIEW": 12,
+                    "PRIORITIZATION": 5,
+                    "WRAP_UP": 3
+                }
             }
         
-        phase_limit = phase_times.get(phase_name.upper(), 5)
+        phase_limit = get_phase_time_limit(phase_config, phase_name.upper())
         
         # Calculate time elapsed
         if phase_name in self.phase_start_times:
@@ -511,7 +553,8 @@ class GTDCoach:
                 response_time = time.time() - message_start_time
                 pattern_data = None
                 if hasattr(self, 'pattern_detector') and self.mindsweep_items:
-                    pattern_data = self.pattern_detector.analyze_mindsweep_coherence(self.mindsweep_items)
+                    # Only items added since the last message are analyzed
+                    pattern_data = self.pattern_detector.update_mindsweep(self.mindsweep_items)
                 
                 state_changes = self.state_monitor.update_from_interaction(
                     response_time=response_time,
@@ -568,12 +611,21 @@ class GTDCoach:
                 self.logger.debug(f"Applied prompt adaptations: {adaptations.get('flags', set())}")
         
         # Update system prompt for current phase if using Langfuse
+        time_status = None
         if self.langfuse_prompts and phase_name:
-            compiled_prompt = self.compile_prompt(
-                phase_name,
-                time_remaining=self.get_time_remaining(phase_name),
-                time_elapsed=self.get_time_elapsed()
-            )
+            time_remaining = self.get_time_remaining(phase_name)
+            time_elapsed = self.get_time_elapsed()
+            if self.prompt_layout == "prefix_stable" and self.messages and self.messages[-1].get('role') == 'user':
+                # Keep the system prompt fixed for the phase; time goes in the last user turn
+                compiled_prompt = self.compile_prompt(phase_name, static_only=True)
+                if compiled_prompt:
+                    time_status = format_time_status(phase_name, time_remaining, time_elapsed)
+            else:
+                compiled_prompt = self.compile_prompt(
+                    phase_name,
+                    time_remaining=time_remaining,
+                    time_elapsed=time_elapsed
+                )
             if compiled_prompt:
                 # Update the system message with the compiled prompt
                 if self.messages and self.messages[0].get('role') == 'system':
@@ -584,6 +636,12 @@ class GTDCoach:
             try:
                 # Use current messages for this attempt
                 current_messages = self.messages.copy()
+                if time_status:
+                    # Volatile time check rides on the latest user turn (request copy only)
+                    current_messages[-1] = {
+                        **current_messages[-1],
+                        "content": f"{current_messages[-1]['content']}\n\n[{time_status}]"
+                    }
                 
                 # Try to use OpenAI client (with or without Langfuse wrapper)
                 if self.openai_client:
@@ -678,6 +736,7 @@ class GTDCoach:
                 
                 if save_to_history:
                     self.messages.append({"role": "assistant", "content": assistant_message})
+                    self._stream_review_log()
                     
                     # Calculate response metrics
                     response_time = time.time() - message_start_time
@@ -717,6 +776,8 @@ class GTDCoach:
                     response_time = time.time() - message_start_time
                     score_response(self.current_phase, True, response_time, session_id=self.session_id)
                 
+                _LLM_SUCCESS.inc()
+                _LLM_LATENCY.observe(time.time() - message_start_time)
                 return assistant_message
                 
             except requests.exceptions.Timeout:
@@ -748,8 +809,11 @@ class GTDCoach:
                             
                             if save_to_history:
                                 self.messages.append({"role": "assistant", "content": assistant_message})
+                                self._stream_review_log()
                             
                             self.logger.info("Simple prompt attempt succeeded")
+                            _LLM_SUCCESS.inc()
+                            _LLM_LATENCY.observe(time.time() - message_start_time)
                             return assistant_message
                         except Exception as e:
                             self.logger.error(f"Final attempt with simple prompt failed: {e}")
@@ -772,6 +836,8 @@ class GTDCoach:
                         response_time = time.time() - message_start_time
                         score_response(self.current_phase, False, response_time, session_id=self.session_id)
                     
+                    _LLM_FAILURE.inc()
+                    _LLM_LATENCY.observe(time.time() - message_start_time)
                     return None
         
         # Score the failure if we got here
@@ -779,6 +845,8 @@ class GTDCoach:
             response_time = time.time() - message_start_time
             score_response(self.current_phase, False, response_time)
         
+        _LLM_FAILURE.inc()
+        _LLM_LATENCY.observe(time.time() - message_start_time)
         return None
     
     async def handle_intervention(self, message: str):
@@ -876,6 +944,7 @@ class GTDCoach:
         """Record phase completion"""
         duration = time.time() - phase_start
         self.review_data["phase_durations"][phase_name] = duration
+        PHASE_DURATION.labels(phase_name.upper().replace(" ", "_")).observe(duration)
         self.logger.info(f"Phase completed: {phase_name} - Duration: {duration/60:.1f} minutes")
         print(f"\n✓ {phase_name} completed in {duration/60:.1f} minutes")
         
@@ -1268,11 +1337,11 @@ Mind sweep phase is now complete. Please provide encouragement and prepare me fo
             time_summary = generate_simple_time_summary(self.timing_projects)
             if time_summary:
                 print(time_summary)
-        
-        # Compare priorities with actual time spent
-        comparison = compare_time_with_priorities(priorities)
-        if comparison:
-            print(comparison)
+            
+            # Compare priorities with actual time spent
+            comparison = compare_time_with_priorities(self.timing_projects, priorities)
+            if priorities:
+                print(f"\n🎯 Priority alignment with last week: {comparison.get('alignment_score', 0):.0f}%")
         
         self.end_phase("Prioritization", phase_start)
     
@@ -1386,19 +1455,23 @@ Items captured: {self.review_data['items_captured']}"""
         validated_items = validate_mindsweep_items(items)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = DATA_DIR / f"mindsweep_{timestamp}.json"
-        
-        # Ensure data directory exists
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
         
-        with open(filepath, 'w') as f:
-            json.dump({
-                "timestamp": timestamp,
-                "items": validated_items,
-                "count": len(validated_items)
-            }, f, indent=2)
+        # Written into the week partition (data/YYYY/Www/) and the manifest
+        filepath = get_artifact_store(DATA_DIR).write_json("mindsweep", f"mindsweep_{timestamp}.json", {
+            "timestamp": timestamp,
+            "items": validated_items,
+            "count": len(validated_items)
+        }, session_id=self.session_id)
         
         self.logger.info(f"Saved {len(validated_items)} mindsweep items to {filepath.name}")
+        
+        # Index in the local session store for pattern detection and summaries
+        try:
+            get_session_store().add_mind_sweep_items(
+                validated_items, session_id=self.session_id, source_file=filepath.name
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to save mindsweep items to session store: {e}")
     
     def load_projects(self):
         """Load project list from Timing API or use mock data"""
@@ -1426,41 +1499,82 @@ Items captured: {self.review_data['items_captured']}"""
     def save_priorities(self, priorities):
         """Save prioritized actions"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = DATA_DIR / f"priorities_{timestamp}.json"
         
-        # Ensure data directory exists
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w') as f:
-            json.dump({
-                "timestamp": timestamp,
-                "priorities": priorities
-            }, f, indent=2)
+        filepath = get_artifact_store(DATA_DIR).write_json("priorities", f"priorities_{timestamp}.json", {
+            "timestamp": timestamp,
+            "priorities": priorities
+        }, session_id=self.session_id)
         
         self.logger.info(f"Saved {len(priorities)} priorities to {filepath.name}")
+        
+        try:
+            get_session_store().add_priorities(
+                [{"priority": p["action"], "rank": i, "level": p.get("priority")}
+                 for i, p in enumerate(priorities, 1)],
+                session_id=self.session_id,
+                source_file=filepath.name
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to save priorities to session store: {e}")
+    
+    def _stream_review_log(self) -> None:
+        """
+        Append messages not yet on disk to the review log (review_<session>.jsonl)
+        
+        Called once a turn is complete, so in-place prompt adaptations of the
+        user message are already applied when it is written.
+        """
+        try:
+            if self.review_log is None:
+                store = get_artifact_store(LOGS_DIR)
+                path = store.path_for(f"review_{self.session_id}.jsonl")
+                self.review_log = StreamingDocument(path, "messages", session_id=self.session_id)
+                store.record("review", path, session_id=self.session_id)
+            elif self.review_log.closed:
+                # Saved once already (e.g. wrap-up, then an interrupt): keep appending
+                self.review_log = StreamingDocument(self.review_log.path, "messages", session_id=self.session_id)
+            for message in self.messages[self._logged_messages:]:
+                self.review_log.add(message)
+            self._logged_messages = len(self.messages)
+        except OSError as e:
+            # Unwritten messages stay in self.messages and go out on the next call
+            self.logger.warning(f"Could not stream review log: {e}")
     
     def save_review_log(self):
         """Save complete review log"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = LOGS_DIR / f"review_{timestamp}.json"
-        
-        # Ensure logs directory exists
-        LOGS_DIR.mkdir(parents=True, exist_ok=True)
-        
-        # Create session data and validate
-        session_data = {
-            "timestamp": timestamp,
-            "session_id": self.session_id,
-            "review_data": self.review_data,
-            "messages": self.messages[1:]  # Exclude system prompt
-        }
-        validated_data = validate_session_data(session_data)
         
         # Save North Star metrics
         self.north_star.save_metrics()
         
-        with open(filepath, 'w') as f:
-            json.dump(validated_data, f, indent=2)
+        # Messages are already on disk; finish the document with the summary fields
+        self._stream_review_log()
+        filepath = None
+        if self.review_log is not None:
+            try:
+                self.review_log.set("timestamp", timestamp)
+                self.review_log.set("review_data", self.review_data)
+                # Same checks as the one-shot log, on the document as it reads back
+                document = load_document(self.review_log.path) or {}
+                for field, value in validate_session_data(dict(document)).items():
+                    if field not in document:
+                        self.review_log.set(field, value)
+                self.review_log.close()
+                filepath = self.review_log.path
+                get_artifact_store(LOGS_DIR).record("review", filepath, session_id=self.session_id)
+            except OSError as e:
+                self.logger.warning(f"Could not finish streamed review log: {e}")
+        if filepath is None:
+            # Streaming unavailable: write the whole session as one document
+            validated_data = validate_session_data({
+                "timestamp": timestamp,
+                "session_id": self.session_id,
+                "review_data": self.review_data,
+                "messages": self.messages[1:]  # Exclude system prompt
+            })
+            filepath = get_artifact_store(LOGS_DIR).write_json(
+                "review", f"review_{timestamp}.json", validated_data, session_id=self.session_id
+            )
         
         # Create session summary in memory with timing data
         timing_data = self.review_data.get('timing_analysis')
@@ -1741,7 +1855,7 @@ def check_server():
     """Check if LM Studio server is running and accessible"""
     try:
         # Try to get models list
-        response = session.get("http://localhost:1234/v1/models", timeout=5)
+        response = session.get(f"{LM_STUDIO_URL}/models", timeout=5)
         if response.status_code != 200:
             return False, "Server returned non-200 status code"
         
@@ -769,31 +769,30 @@ class WhisperTranscriber:
     def transcribe(self, audio_file: Path) -> Optional[str]:
         """Transcribe audio file using Whisper
         
+        The model stays loaded in a shared worker process between calls,
+        and long recordings are transcribed in chunks.
+        
         Args:
             audio_file: Path to audio file
         
         Returns:
             Transcribed text or None if failed
         """
+        from gtd_coach.integrations.transcription import TranscriptionError, get_transcription_worker
+        
         try:
-            import whisper
-            
-            # Load base model for speed
-            model = whisper.load_model("base")
-            
-            # Transcribe
-            result = model.transcribe(str(audio_file))
+            text = " ".join(get_transcription_worker().stream(audio_file))
             
             # Clean up audio file
             audio_file.unlink()
             
-            return result["text"]
+            return text.strip()
             
-        except ImportError:
-            self.logger.error("Whisper not installed. Run: pip install openai-whisper")
-            return None
-        except Exception as e:
-            self.logger.error(f"Transcription failed: {e}")
+        except TranscriptionError as e:
+            if "No module named 'whisper'" in str(e):
+                self.logger.error("Whisper not installed. Run: pip install openai-whisper")
+            else:
+                self.logger.error(f"Transcription failed: {e}")
             return None
 
 
@@ -14,7 +14,7 @@ from typing import List, Dict, Optional
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from gtd_coach.integrations.todoist import TodoistClient
+from gtd_coach.integrations.todoist import get_todoist_client
 from gtd_coach.integrations.graphiti import GraphitiMemory
 from gtd_coach.deprecation.decorator import deprecate_daily_clarify
 
@@ -25,7 +25,8 @@ class DailyClarify:
     def __init__(self):
         """Initialize with minimal setup"""
         self.logger = logging.getLogger(__name__)
-        self.todoist = TodoistClient()
+        # Keep/delete decisions are journaled locally and sent in the background
+        self.todoist = get_todoist_client(write_behind=True)
         
         # Optional Graphiti for future pattern tracking
         session_id = f"clarify_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -83,11 +84,11 @@ class DailyClarify:
                 
                 # Add to today with appropriate settings
                 if is_deep and self.metrics['deep_work'] < 2:  # Max 2 deep work per day
-                    self.todoist.add_to_today(task['content'], is_deep_work=True)
+                    self.todoist.add_to_today(task['content'], is_deep_work=True, source_id=task['id'])
                     self.metrics['deep_work'] += 1
                     print("  → Added as DEEP WORK (2h block)")
                 else:
-                    self.todoist.add_to_today(task['content'], is_deep_work=False)
+                    self.todoist.add_to_today(task['content'], is_deep_work=False, source_id=task['id'])
                     self.metrics['quick_tasks'] += 1
                     print("  → Added to today")
             else:
@@ -117,6 +118,11 @@ class DailyClarify:
             else:
                 print("  Please enter 'y' for yes or 'n' for no")
     
+    def sync_changes(self):
+        """Wait for queued Todoist changes before reporting inbox zero"""
+        if not self.todoist.flush():
+            print("\n⏳ Some changes haven't reached Todoist yet - they'll sync next time.")
+    
     def show_summary(self):
         """Show session summary"""
         print("\n" + "=" * 50)
@@ -171,6 +177,7 @@ class DailyClarify:
         try:
             # Process inbox
             self.process_inbox()
+            self.sync_changes()
             
             # Show summary
             self.show_summary()
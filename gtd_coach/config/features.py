@@ -6,9 +6,34 @@ Enables gradual rollout and emergency rollback capabilities.
 import os
 import hashlib
 import json
+import logging
+import math
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends stay whole, compaction is not coordinated across processes
+    fcntl = None
+
+from gtd_coach.metrics.registry import counter, histogram
+
+ROLLOUT_SESSIONS = counter("gtd_rollout_sessions_total", "Weekly review sessions by system and outcome",
+                           ["system", "outcome"])
+ROLLOUT_LATENCY = histogram("gtd_rollout_session_duration_seconds", "Weekly review session latency by system",
+                            ["system"], buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600))
+
+logger = logging.getLogger(__name__)
+
+
+def _nearest_rank(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values (0 when empty)"""
+    if not values:
+        return 0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
 
 
 class FeatureFlags:
@@ -34,7 +59,8 @@ class FeatureFlags:
     
     # Rollback thresholds
     ERROR_RATE_THRESHOLD = float(os.getenv("ERROR_RATE_THRESHOLD", "0.1"))  # 10%
-    LATENCY_THRESHOLD_MS = int(os.getenv("LATENCY_THRESHOLD_MS", "5000"))  # 5 seconds
+    LATENCY_THRESHOLD_MS = int(os.getenv("LATENCY_THRESHOLD_MS", "5000"))  # 5 seconds (p95)
+    ROLLBACK_WINDOW_SESSIONS = int(os.getenv("ROLLBACK_WINDOW_SESSIONS", "50"))  # recent sessions checked
     
     @classmethod
     def should_use_agent(cls, session_id: str) -> bool:
@@ -96,6 +122,7 @@ class FeatureFlags:
             "compare_outputs": cls.COMPARE_OUTPUTS,
             "error_threshold": cls.ERROR_RATE_THRESHOLD,
             "latency_threshold_ms": cls.LATENCY_THRESHOLD_MS,
+            "rollback_window_sessions": cls.ROLLBACK_WINDOW_SESSIONS,
             "timestamp": datetime.now().isoformat()
         }
     
@@ -186,126 +213,320 @@ class FeatureFlags:
 
 
 class RolloutManager:
-    """Manages gradual rollout with monitoring and automatic rollback"""
-    
-    def __init__(self, data_dir: Optional[Path] = None):
+    """
+    Manages gradual rollout with monitoring and automatic rollback
+
+    Every session and rollback is appended as one line to
+    ``rollout_events.jsonl`` (a single write on an O_APPEND handle, under a
+    shared file lock), so concurrent sessions never overwrite each other.
+    Counters, lifetime mean latency and the recent-session window used for
+    rollback live in ``rollout_snapshot.json``. Every COMPACT_EVERY events a
+    writer takes the lock exclusively, folds the log into the snapshot and
+    starts a fresh log. Readers load the snapshot only when it changes and
+    otherwise read just the log lines appended since their last look.
+    """
+
+    EVENTS_NAME = "rollout_events.jsonl"
+    SNAPSHOT_NAME = "rollout_snapshot.json"
+    LOCK_NAME = ".rollout.lock"
+    SYSTEMS = ("agent", "legacy")
+    # Events in the log before a writer compacts it into the snapshot
+    COMPACT_EVERY = 200
+    # Agent sessions in the window before rollback conditions are checked
+    MIN_WINDOW_SESSIONS = 10
+
+    def __init__(self, data_dir: Optional[Path] = None, window: Optional[int] = None,
+                 compact_every: Optional[int] = None):
+        """
+        Args:
+            data_dir: Directory for the event log and snapshot
+            window: Recent sessions per system used for rollback (default ROLLBACK_WINDOW_SESSIONS)
+            compact_every: Log events between compactions (default COMPACT_EVERY)
+        """
         self.data_dir = data_dir or Path.home() / ".gtd-coach" / "rollout"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.window = window or FeatureFlags.ROLLBACK_WINDOW_SESSIONS
+        self.compact_every = compact_every or self.COMPACT_EVERY
+        self.events_file = self.data_dir / self.EVENTS_NAME
+        self.snapshot_file = self.data_dir / self.SNAPSHOT_NAME
+        # Written by earlier versions; seeds the snapshot once
         self.metrics_file = self.data_dir / "rollout_metrics.json"
+
+        self._lock = threading.Lock()
+        self._lock_fd = os.open(self.data_dir / self.LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+        self._state = self._empty_state()
+        self._snapshot_sig = None
+        self._offset = 0
+        self._log_events = 0
+        self._log_stale = False
+
+        if not self.snapshot_file.exists():
+            self.compact()
         self.load_metrics()
-    
-    def load_metrics(self):
-        """Load rollout metrics from file"""
-        if self.metrics_file.exists():
+
+    def close(self):
+        """Release the lock file handle"""
+        with self._lock:
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    # ----- storage -----
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool = False):
+        """Shared lock for appends and reads, exclusive for compaction"""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _empty_state(self) -> Dict[str, Any]:
+        return {
+            "log_inode": None,
+            "systems": {system: {"sessions": 0, "errors": 0, "latency_ms_total": 0.0, "recent": []}
+                        for system in self.SYSTEMS},
+            "rollout_history": [],
+        }
+
+    def _legacy_state(self) -> Dict[str, Any]:
+        """Lifetime totals from a rollout_metrics.json written by earlier versions"""
+        state = self._empty_state()
+        try:
             with open(self.metrics_file, 'r') as f:
-                self.metrics = json.load(f)
-        else:
-            self.metrics = {
-                "sessions_total": 0,
-                "sessions_agent": 0,
-                "sessions_legacy": 0,
-                "errors_agent": 0,
-                "errors_legacy": 0,
-                "avg_latency_agent_ms": 0,
-                "avg_latency_legacy_ms": 0,
-                "rollout_history": []
-            }
-    
-    def save_metrics(self):
-        """Save metrics to file"""
-        with open(self.metrics_file, 'w') as f:
-            json.dump(self.metrics, f, indent=2)
-    
-    def record_session(self, used_agent: bool, success: bool, latency_ms: float):
-        """Record metrics for a session"""
-        self.metrics["sessions_total"] += 1
-        
-        if used_agent:
-            self.metrics["sessions_agent"] += 1
-            if not success:
-                self.metrics["errors_agent"] += 1
-            
-            # Update average latency
-            prev_avg = self.metrics["avg_latency_agent_ms"]
-            count = self.metrics["sessions_agent"]
-            self.metrics["avg_latency_agent_ms"] = (
-                (prev_avg * (count - 1) + latency_ms) / count
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return state
+        for system in self.SYSTEMS:
+            totals = state["systems"][system]
+            totals["sessions"] = legacy.get(f"sessions_{system}", 0)
+            totals["errors"] = legacy.get(f"errors_{system}", 0)
+            totals["latency_ms_total"] = legacy.get(f"avg_latency_{system}_ms", 0) * totals["sessions"]
+        state["rollout_history"] = legacy.get("rollout_history", [])
+        return state
+
+    def _apply(self, event: Dict[str, Any]):
+        """Fold one log event into the in-memory state"""
+        if event.get("event") == "rollback":
+            self._state["rollout_history"].append(event)
+            return
+        totals = self._state["systems"][event["system"]]
+        totals["sessions"] += 1
+        totals["errors"] += 0 if event["success"] else 1
+        totals["latency_ms_total"] += event["latency_ms"]
+        totals["recent"].append([1 if event["success"] else 0, event["latency_ms"]])
+        if len(totals["recent"]) > self.window:
+            del totals["recent"][:-self.window]
+
+    def _refresh(self):
+        """Bring the state up to date; caller holds both locks"""
+        try:
+            stat = os.stat(self.snapshot_file)
+            sig = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            sig = None
+        if sig != self._snapshot_sig:
+            if sig is None:
+                self._state = self._empty_state()
+            else:
+                with open(self.snapshot_file, 'r') as f:
+                    self._state = json.load(f)
+                for totals in self._state["systems"].values():
+                    del totals["recent"][:-self.window]
+            self._snapshot_sig = sig
+            self._offset = 0
+            self._log_events = 0
+
+        try:
+            f = open(self.events_file, 'rb')
+        except FileNotFoundError:
+            self._log_stale = self._state["log_inode"] is not None
+            return
+        with f:
+            # A log the snapshot does not name is left over from a compaction that
+            # stopped before starting the new log; its events are already folded in
+            self._log_stale = self._state["log_inode"] not in (None, os.fstat(f.fileno()).st_ino)
+            if self._log_stale:
+                return
+            f.seek(self._offset)
+            data = f.read()
+        # A line without its newline is still being written (or was torn by a crash)
+        complete = data[:data.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                logger.debug(f"Skipping bad rollout event in {self.events_file}")
+                continue
+            self._log_events += 1
+
+    def _append(self, event: Dict[str, Any]):
+        """Append one event line to the log"""
+        line = (json.dumps(event) + "\n").encode()
+        while True:
+            with self._lock, self._file_lock():
+                self._refresh()
+                if not self._log_stale:
+                    fd = os.open(self.events_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    try:
+                        # One write per line on an O_APPEND handle keeps concurrent appends whole
+                        os.write(fd, line)
+                    finally:
+                        os.close(fd)
+                    due = self._log_events + 1 >= self.compact_every
+                    break
+            # Start a log the snapshot names before appending
+            self.compact()
+        if due:
+            self.compact()
+
+    def compact(self):
+        """Fold the event log into the snapshot and start a new, empty log"""
+        with self._lock, self._file_lock(exclusive=True):
+            seeding = not self.snapshot_file.exists()
+            if seeding:
+                # First compaction: start from the totals earlier versions kept, if any
+                self._state = self._legacy_state()
+                self._snapshot_sig = None
+                self._offset = 0
+                self._log_events = 0
+            self._refresh()
+            if not seeding and self._log_events == 0 and not self._log_stale:
+                return
+
+            fresh = self.events_file.with_suffix(".jsonl.tmp")
+            open(fresh, 'wb').close()
+            self._state["log_inode"] = os.stat(fresh).st_ino
+            tmp = self.snapshot_file.with_suffix(".json.tmp")
+            with open(tmp, 'w') as f:
+                json.dump(self._state, f)
+            os.replace(tmp, self.snapshot_file)
+            os.replace(fresh, self.events_file)
+
+            stat = os.stat(self.snapshot_file)
+            self._snapshot_sig = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._offset = 0
+            self._log_events = 0
+            self._log_stale = False
+
+    # ----- aggregates -----
+
+    def load_metrics(self):
+        """Refresh self.metrics from the snapshot and the log appended since"""
+        with self._lock, self._file_lock():
+            self._refresh()
+            self.metrics = self._derive()
+        return self.metrics
+
+    def _derive(self) -> Dict[str, Any]:
+        """Counters, lifetime means and windowed error rate / latency percentiles"""
+        systems = self._state["systems"]
+        metrics = {
+            "sessions_total": sum(totals["sessions"] for totals in systems.values()),
+            "rollout_history": list(self._state["rollout_history"]),
+        }
+        for system, totals in systems.items():
+            recent = totals["recent"]
+            latencies = sorted(latency for _, latency in recent)
+            metrics[f"sessions_{system}"] = totals["sessions"]
+            metrics[f"errors_{system}"] = totals["errors"]
+            metrics[f"avg_latency_{system}_ms"] = (
+                totals["latency_ms_total"] / totals["sessions"] if totals["sessions"] else 0
             )
-        else:
-            self.metrics["sessions_legacy"] += 1
-            if not success:
-                self.metrics["errors_legacy"] += 1
-            
-            # Update average latency
-            prev_avg = self.metrics["avg_latency_legacy_ms"]
-            count = self.metrics["sessions_legacy"]
-            self.metrics["avg_latency_legacy_ms"] = (
-                (prev_avg * (count - 1) + latency_ms) / count
+            metrics[f"window_sessions_{system}"] = len(recent)
+            metrics[f"window_error_rate_{system}"] = (
+                sum(1 - ok for ok, _ in recent) / len(recent) if recent else 0
             )
-        
-        self.save_metrics()
+            metrics[f"p95_latency_{system}_ms"] = _nearest_rank(latencies, 0.95)
+        return metrics
+
+    def record_session(self, used_agent: bool, success: bool, latency_ms: float):
+        """Record metrics for a session"""
+        system = "agent" if used_agent else "legacy"
+        ROLLOUT_SESSIONS.labels(system, "success" if success else "error").inc()
+        ROLLOUT_LATENCY.labels(system).observe(latency_ms / 1000)
+        self._append({
+            "timestamp": datetime.now().isoformat(),
+            "system": system,
+            "success": bool(success),
+            "latency_ms": float(latency_ms),
+        })
+        self.load_metrics()
         self.check_rollback_conditions()
-    
+
     def check_rollback_conditions(self):
-        """Check if automatic rollback should be triggered"""
-        if self.metrics["sessions_agent"] < 10:
+        """Check if automatic rollback should be triggered by the recent agent sessions"""
+        if FeatureFlags.KILL_SWITCH:
+            # Already rolled back
+            return
+
+        if self.metrics["window_sessions_agent"] < self.MIN_WINDOW_SESSIONS:
             # Not enough data yet
             return
-        
-        # Calculate error rates
-        agent_error_rate = (
-            self.metrics["errors_agent"] / self.metrics["sessions_agent"]
-            if self.metrics["sessions_agent"] > 0 else 0
-        )
-        
+
         # Check error rate threshold
+        agent_error_rate = self.metrics["window_error_rate_agent"]
         if agent_error_rate > FeatureFlags.ERROR_RATE_THRESHOLD:
-            print(f"⚠️ High error rate detected: {agent_error_rate:.1%}")
+            print(f"⚠️ High error rate detected: {agent_error_rate:.1%} "
+                  f"over the last {self.metrics['window_sessions_agent']} agent sessions")
             print("🔄 Triggering automatic rollback")
             FeatureFlags.activate_kill_switch()
             self.record_rollback("high_error_rate", agent_error_rate)
-        
+            return
+
         # Check latency threshold
-        if self.metrics["avg_latency_agent_ms"] > FeatureFlags.LATENCY_THRESHOLD_MS:
-            print(f"⚠️ High latency detected: {self.metrics['avg_latency_agent_ms']:.0f}ms")
+        p95_latency = self.metrics["p95_latency_agent_ms"]
+        if p95_latency > FeatureFlags.LATENCY_THRESHOLD_MS:
+            print(f"⚠️ High latency detected: p95 {p95_latency:.0f}ms "
+                  f"over the last {self.metrics['window_sessions_agent']} agent sessions")
             print("🔄 Triggering automatic rollback")
             FeatureFlags.activate_kill_switch()
-            self.record_rollback("high_latency", self.metrics["avg_latency_agent_ms"])
-    
+            self.record_rollback("high_latency", p95_latency)
+
     def record_rollback(self, reason: str, value: float):
         """Record a rollback event"""
-        self.metrics["rollout_history"].append({
+        self._append({
             "timestamp": datetime.now().isoformat(),
             "event": "rollback",
             "reason": reason,
             "value": value,
             "rollout_pct": FeatureFlags.AGENT_ROLLOUT_PCT
         })
-        self.save_metrics()
-    
+        self.load_metrics()
+
     def get_comparison_report(self) -> str:
         """Generate comparison report between agent and legacy"""
+        self.load_metrics()
         if self.metrics["sessions_agent"] == 0:
             return "No agent sessions recorded yet"
-        
+
         if self.metrics["sessions_legacy"] == 0:
             return "No legacy sessions for comparison"
-        
+
         agent_error_rate = (
             self.metrics["errors_agent"] / self.metrics["sessions_agent"]
         )
         legacy_error_rate = (
             self.metrics["errors_legacy"] / self.metrics["sessions_legacy"]
         )
-        
+
         lines = [
             "Agent vs Legacy Comparison",
             "=" * 40,
             f"Sessions: {self.metrics['sessions_agent']} agent, {self.metrics['sessions_legacy']} legacy",
             f"Error rate: {agent_error_rate:.1%} vs {legacy_error_rate:.1%}",
-            f"Avg latency: {self.metrics['avg_latency_agent_ms']:.0f}ms vs {self.metrics['avg_latency_legacy_ms']:.0f}ms"
+            f"Avg latency: {self.metrics['avg_latency_agent_ms']:.0f}ms vs {self.metrics['avg_latency_legacy_ms']:.0f}ms",
+            f"Recent p95 latency: {self.metrics['p95_latency_agent_ms']:.0f}ms vs "
+            f"{self.metrics['p95_latency_legacy_ms']:.0f}ms (last {self.window} sessions each)"
         ]
-        
+
         # Performance comparison
         if self.metrics["avg_latency_agent_ms"] < self.metrics["avg_latency_legacy_ms"]:
             improvement = (
@@ -319,7 +540,7 @@ class RolloutManager:
                 / self.metrics["avg_latency_legacy_ms"] * 100
             )
             lines.append(f"⚠️ Agent is {degradation:.1f}% slower")
-        
+
         return "\n".join(lines)
 
 
@@ -402,7 +402,23 @@ class NOf1Experimenter:
         Override Active: {self.should_override()}
         ====================================
         """)
-    
+
+    def log_session_complete(self, review_data: Dict[str, Any]) -> None:
+        """Log the outcome of an experimental session"""
+        condition = self.get_condition_for_session()
+        experiment_name = self.current_experiment.get('name') if self.current_experiment else 'None'
+
+        logger.info(f"""
+        ===== EXPERIMENT SESSION COMPLETE =====
+        Week: {self.current_week}
+        Experiment: {experiment_name}
+        Condition: {condition.get('value')}
+        Items Captured: {review_data.get('items_captured', 0)}
+        Projects Reviewed: {review_data.get('projects_reviewed', 0)}
+        Decisions Made: {review_data.get('decisions_made', 0)}
+        =======================================
+        """)
+
     def get_success_criteria(self, metric_name: str) -> Dict[str, float]:
         """
         Get success criteria for a specific metric
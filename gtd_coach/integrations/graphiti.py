@@ -13,6 +13,10 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from gtd_coach.metrics.registry import counter, histogram
+from gtd_coach.persistence.artifacts import get_artifact_store
+from gtd_coach.persistence.jsonl import StreamingDocument
+
 try:
     from gtd_coach.integrations.graphiti_client import GraphitiClient
     from graphiti_core.nodes import EpisodeType
@@ -24,6 +28,30 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+EPISODES = counter("gtd_graphiti_episodes_total", "Episodes sent to Graphiti by type and outcome",
+                   ["episode_type", "outcome"])
+EPISODE_RETRIES = counter("gtd_graphiti_episode_retries_total", "Graphiti add_episode retries by episode type",
+                          ["episode_type"])
+EPISODE_DURATION = histogram("gtd_graphiti_episode_duration_seconds",
+                             "Graphiti add_episode time including entity extraction and retries",
+                             ["episode_type"])
+CONTEXT_DURATION = histogram("gtd_graphiti_context_duration_seconds",
+                             "Next-session context preparation and startup loading time", ["operation"])
+# (success, error, duration, retries) children per episode type, resolved once
+_episode_metrics: Dict[str, tuple] = {}
+
+
+def _metrics_for_episode(episode_type: str) -> tuple:
+    children = _episode_metrics.get(episode_type)
+    if children is None:
+        children = _episode_metrics[episode_type] = (
+            EPISODES.labels(episode_type, "success"),
+            EPISODES.labels(episode_type, "error"),
+            EPISODE_DURATION.labels(episode_type),
+            EPISODE_RETRIES.labels(episode_type),
+        )
+    return children
+
 # Handle Docker vs local paths
 def get_base_dir():
     if os.environ.get("IN_DOCKER"):
@@ -40,7 +68,11 @@ class GraphitiMemory:
         # Use shared group_id from environment for shared knowledge across all agents
         # Falls back to session-specific if GRAPHITI_GROUP_ID not set
         self.session_group_id = os.getenv('GRAPHITI_GROUP_ID', f"gtd_review_{session_id}")
+        # Episodes are streamed to a JSONL backup as they are queued; this
+        # only holds episodes whose write failed, retried on the next flush
         self.pending_episodes: List[Dict[str, Any]] = []
+        self.episode_log: Optional[StreamingDocument] = None
+        self._unflushed_episodes = 0
         self.phase_start_times: Dict[str, datetime] = {}
         self.interaction_count = 0
         self.enable_json_backup = enable_json_backup
@@ -187,9 +219,10 @@ class GraphitiMemory:
         episode_data['group_id'] = self.session_group_id
         episode_data['timestamp'] = datetime.now().isoformat()
         
-        # Always queue for JSON backup if enabled
+        # Always stream to the JSON backup if enabled
         if self.enable_json_backup:
             self.pending_episodes.append(episode_data)
+            self._write_backup()
         
         # Send to Graphiti if available
         if self.graphiti_client:
@@ -467,6 +500,13 @@ class GraphitiMemory:
         
         # Track metrics if Langfuse is available (after retry loop completes)
         latency = time.perf_counter() - start_time
+        succeeded, failed, duration, retries = _metrics_for_episode(
+            episode_type if episode_type in self.extraction_metrics else "other"
+        )
+        (succeeded if success else failed).inc()
+        duration.observe(latency)
+        if retry_count:
+            retries.inc(retry_count)
         try:
             from gtd_coach.integrations.langfuse import score_graphiti_operation
             from gtd_coach.integrations.gtd_entity_config import estimate_extraction_cost
@@ -541,10 +581,32 @@ class GraphitiMemory:
         
         logger.info(f"Smart flush completed: {total_sent} episodes sent to Graphiti")
     
+    def _write_backup(self) -> None:
+        """Append pending episodes to this session's JSONL backup"""
+        try:
+            if self.episode_log is None:
+                # Backup in the week partition (data/YYYY/Www/)
+                store = get_artifact_store(get_base_dir() / "data")
+                name = f"graphiti_batch_{self.session_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+                self.episode_log = StreamingDocument(
+                    store.path_for(name), "episodes",
+                    session_id=self.session_id, group_id=self.session_group_id
+                )
+            while self.pending_episodes:
+                self.episode_log.add(self.pending_episodes[0])
+                self.pending_episodes.pop(0)
+                self._unflushed_episodes += 1
+        except OSError as e:
+            # Kept in pending_episodes and retried on the next episode or flush
+            logger.error(f"Failed to write episodes to JSON backup: {e}")
+    
     async def flush_episodes(self) -> int:
         """
         Flush pending episodes to JSON backup file and Graphiti batches
         
+        Episodes are already on disk once queued; this syncs the backup file
+        and records it in the artifact manifest.
+        
         Returns:
             Number of episodes flushed
         """
@@ -552,31 +614,25 @@ class GraphitiMemory:
         if self.graphiti_client:
             await self._flush_graphiti_batch()
         
-        if not self.enable_json_backup or not self.pending_episodes:
+        if not self.enable_json_backup:
+            return 0
+        if self.pending_episodes:
+            self._write_backup()
+        if not self._unflushed_episodes:
             return 0
-            
-        episodes_to_save = self.pending_episodes.copy()
-        self.pending_episodes.clear()
-        
-        # Save to JSON backup file
-        temp_file = get_base_dir() / "data" / f"graphiti_batch_{self.session_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
         try:
-            with open(temp_file, 'w') as f:
-                json.dump({
-                    "session_id": self.session_id,
-                    "group_id": self.session_group_id,
-                    "episodes": episodes_to_save
-                }, f, indent=2)
-            
-            logger.info(f"Flushed {len(episodes_to_save)} episodes to JSON backup: {temp_file.name}")
-            return len(episodes_to_save)
-            
-        except Exception as e:
+            self.episode_log.sync()
+            get_artifact_store(get_base_dir() / "data").record(
+                "graphiti_batch", self.episode_log.path, session_id=self.session_id
+            )
+        except OSError as e:
             logger.error(f"Failed to flush episodes to JSON: {e}")
-            # Re-queue episodes on failure
-            self.pending_episodes = episodes_to_save + self.pending_episodes
             return 0
+        
+        flushed, self._unflushed_episodes = self._unflushed_episodes, 0
+        logger.info(f"Flushed {flushed} episodes to JSON backup: {self.episode_log.path.name}")
+        return flushed
             
     async def add_timing_analysis(self, timing_data: Dict[str, Any], 
                                  adhd_analysis: Dict[str, Any]) -> None:
@@ -1124,6 +1180,7 @@ class GraphitiMemory:
                 json.dump(next_context, f, indent=2)
             
             elapsed = time.perf_counter() - start_time
+            CONTEXT_DURATION.labels("prepare").observe(elapsed)
             logger.info(f"✅ Prepared next session context in {elapsed:.2f}s")
             
         except Exception as e:
@@ -1183,6 +1240,7 @@ class GraphitiMemory:
             
             # Performance check
             elapsed = time.perf_counter() - start_time
+            CONTEXT_DURATION.labels("startup").observe(elapsed)
             if elapsed > 1.0:
                 logger.warning(f"⚠️ Startup context took {elapsed:.2f}s (target < 1s)")
             else:
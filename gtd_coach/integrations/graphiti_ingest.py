@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Background ingestion of captured review data into Graphiti.
+Capture tools hand episodes to a worker thread that sends them through
+GraphitiMemory (JSON backup plus Graphiti when configured), so they return
+immediately with a job id the agent can poll instead of waiting on an
+extraction round trip; a mind sweep batch becomes one grouped episode.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for status polling
+MAX_TRACKED_JOBS = 256
+
+# Items listed in the batch description (all items go in the episode body)
+DESCRIPTION_ITEMS = 20
+
+
+def build_batch_metrics(items: List[str], user_id: Optional[str] = None,
+                        category: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Phase metrics recorded with a grouped mind sweep episode
+
+    Args:
+        items: Mind sweep item texts
+        user_id: Optional user identifier
+        category: Optional category shared by the items
+
+    Returns:
+        phase_metrics for GraphitiMemory.add_mindsweep_batch
+    """
+    listed = "; ".join(items[:DESCRIPTION_ITEMS])
+    if len(items) > DESCRIPTION_ITEMS:
+        listed += f"; ... (+{len(items) - DESCRIPTION_ITEMS} more)"
+    return {
+        "source": "batch_save_mind_sweep_v2",
+        "description": f"Mind sweep batch ({len(items)} items): {listed}",
+        "category": category,
+        "user_id": user_id or "default"
+    }
+
+
+def default_memory_factory() -> Any:
+    """GraphitiMemory for captures made outside a coach session"""
+    from gtd_coach.integrations.graphiti import GraphitiMemory
+    return GraphitiMemory(f"capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+
+class GraphitiIngestQueue:
+    """
+    Single-worker queue that sends episodes through one GraphitiMemory
+
+    The memory and its event loop live on the worker thread, so the
+    Graphiti connection is opened once and reused by every job.
+    """
+
+    def __init__(self, memory_factory: Callable[[], Any] = default_memory_factory,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Initialize the queue
+
+        Args:
+            memory_factory: Returns the GraphitiMemory to send through
+                (or None when unavailable); called once, on the worker
+            executor: Optional executor (default: one background worker)
+        """
+        self.memory_factory = memory_factory
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="graphiti-ingest"
+        )
+        self._memory = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._futures: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, items: List[str], user_id: Optional[str] = None,
+               category: Optional[str] = None) -> str:
+        """
+        Queue a mind sweep batch as one grouped episode (returns immediately)
+
+        Args:
+            items: Mind sweep item texts
+            user_id: Optional user identifier
+            category: Optional category shared by the items
+
+        Returns:
+            Job id for status()
+        """
+        metrics = build_batch_metrics(items, user_id, category)
+        return self._submit(len(items), lambda memory: memory.add_mindsweep_batch(list(items), metrics))
+
+    def submit_episode(self, episode_data: Dict[str, Any]) -> str:
+        """
+        Queue one episode (type, phase and data, as GraphitiMemory.queue_episode takes)
+
+        Returns:
+            Job id for status()
+        """
+        return self._submit(1, lambda memory: memory.queue_episode(episode_data))
+
+    def _submit(self, item_count: int, send: Callable[[Any], Any]) -> str:
+        job_id = f"ingest_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._ids)}"
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "state": "queued",
+                "item_count": item_count,
+                "submitted_at": datetime.now().isoformat(),
+                "finished_at": None,
+                "graphiti": None,
+                "error": None
+            }
+            self._trim()
+            self.stats['submitted'] += 1
+        future = self._executor.submit(self._ingest, job_id, send)
+        with self._lock:
+            self._futures[job_id] = future
+        return job_id
+
+    def _get_memory(self) -> Any:
+        """The worker's GraphitiMemory, initialized on first use"""
+        if self._memory is None:
+            memory = self.memory_factory()
+            if memory is None:
+                raise RuntimeError("Graphiti memory unavailable")
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(memory.initialize())
+            self._memory = memory
+        return self._memory
+
+    def _ingest(self, job_id: str, send: Callable[[Any], Any]) -> None:
+        """Send one job and flush it to the backup and Graphiti (runs on the worker thread)"""
+        self._update(job_id, state="running")
+        try:
+            memory = self._get_memory()
+            self._loop.run_until_complete(send(memory))
+            self._loop.run_until_complete(memory.flush_episodes())
+        except Exception as e:
+            logger.error(f"Graphiti ingestion {job_id} failed: {e}")
+            self._update(job_id, state="failed", error=str(e))
+            with self._lock:
+                self.stats['failed'] += 1
+        else:
+            # graphiti is False when only the JSON backup was written
+            self._update(job_id, state="done", graphiti=memory.is_configured())
+            with self._lock:
+                self.stats['completed'] += 1
+            logger.info(f"Graphiti ingestion {job_id} sent")
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            if fields.get("state") in ("done", "failed"):
+                job["finished_at"] = datetime.now().isoformat()
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond MAX_TRACKED_JOBS (lock held)"""
+        excess = len(self._jobs) - MAX_TRACKED_JOBS
+        for job_id in [j for j, job in self._jobs.items()
+                       if job["state"] in ("done", "failed")][:max(excess, 0)]:
+            del self._jobs[job_id]
+            self._futures.pop(job_id, None)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Current state of a job
+
+        Returns:
+            Copy of the job record (state: queued, running, done or failed),
+            or None for unknown ids
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until a job finishes (for shutdown paths and tests)"""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.status(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker, finishing queued jobs when wait is True"""
+        self._executor.shutdown(wait=wait)
+        if wait and self._loop is not None:
+            self._loop.close()
+
+
+_ingest_queue: Optional[GraphitiIngestQueue] = None
+_ingest_queue_lock = threading.Lock()
+
+
+def get_ingest_queue(memory_factory: Optional[Callable[[], Any]] = None) -> GraphitiIngestQueue:
+    """
+    Get singleton ingestion queue
+
+    Args:
+        memory_factory: GraphitiMemory factory (only used on first call)
+
+    Returns:
+        GraphitiIngestQueue instance
+    """
+    global _ingest_queue
+    with _ingest_queue_lock:
+        if _ingest_queue is None:
+            _ingest_queue = GraphitiIngestQueue(memory_factory or default_memory_factory)
+        return _ingest_queue
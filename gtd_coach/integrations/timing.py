@@ -22,7 +22,7 @@ class TimingAPI:
             api_key: Timing API key (or reads from TIMING_API_KEY env var)
         """
         self.api_key = api_key or os.getenv('TIMING_API_KEY')
-        self.base_url = "https://web.timingapp.com/api/v1"
+        self.base_url = os.getenv('TIMING_API_URL', 'https://web.timingapp.com/api/v1').rstrip('/')
         self.session = requests.Session()
         self.logger = logging.getLogger(__name__)
         
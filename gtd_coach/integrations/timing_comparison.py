@@ -9,6 +9,8 @@ import os
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from gtd_coach.patterns.keywords import KEYWORDS
+
 def load_timing_analysis() -> Optional[Dict]:
     """Load the most recent Timing analysis data"""
     analysis_file = Path("data/timing_analysis.json")
@@ -139,23 +141,8 @@ def compare_time_with_priorities(timing_projects: List[Dict],
     }
 
 def _categorize_time_sink(project_name: str) -> str:
-    """Categorize a time sink project"""
-    name_lower = project_name.lower()
-    
-    if any(x in name_lower for x in ['safari', 'chrome', 'firefox', 'browser']):
-        return 'browsing'
-    elif any(x in name_lower for x in ['mail', 'email', 'slack', 'discord', 'messages']):
-        return 'communication'
-    elif any(x in name_lower for x in ['youtube', 'netflix', 'spotify', 'music']):
-        return 'entertainment'
-    elif any(x in name_lower for x in ['code', 'xcode', 'terminal', 'docker', 'git']):
-        return 'development'
-    elif any(x in name_lower for x in ['word', 'docs', 'notion', 'obsidian', 'notes']):
-        return 'documentation'
-    elif any(x in name_lower for x in ['zoom', 'meet', 'teams', 'webex']):
-        return 'meetings'
-    else:
-        return 'other'
+    """Categorize a time sink project (rules in patterns/keywords.py)"""
+    return KEYWORDS.scan(project_name).first('time_sink', 'other')
 
 def _generate_alignment_recommendations(aligned: List, untracked: List, 
                                        sinks: List, priority_time: Dict,
@@ -6,71 +6,208 @@ Just the essentials: fetch inbox, mark complete, add to today
 
 import os
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
+import threading
+import time
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from datetime import date, datetime
+
+# Seconds project, inbox and label metadata is reused before refetching
+CACHE_TTL = float(os.getenv('TODOIST_CACHE_TTL', '300'))
+
+# Seconds inbox/today reads are answered from the local mirror before an incremental sync
+MIRROR_STALENESS = float(os.getenv('TODOIST_MIRROR_STALENESS', '60'))
+MIRROR_ENABLED = os.getenv('TODOIST_MIRROR', 'true').lower() != 'false'
+
+API_HOST = "https://api.todoist.com"
+
+
+def _collect(paginator) -> List:
+    """Flatten a Todoist paginator (which yields lists, or items on older SDKs)"""
+    items = []
+    for batch in paginator:
+        if isinstance(batch, list):
+            items.extend(batch)
+        else:
+            items.append(batch)
+    return items
+
 
 class TodoistClient:
     """Minimal Todoist integration - path of least resistance"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize with API key from env or parameter"""
+    def __init__(self, api_key: Optional[str] = None, write_behind: bool = False,
+                 http_client: Any = None, cache_ttl: Optional[float] = None):
+        """
+        Initialize with API key from env or parameter
+        
+        Prefer get_todoist_client(), which shares one client (and its
+        connection pool and metadata cache) per token across the process.
+        
+        Args:
+            api_key: Todoist API token (default: TODOIST_API_KEY)
+            write_behind: Queue add_to_today/mark_complete in the local journal
+                and send them in the background (see todoist_queue.py)
+            http_client: httpx.Client for the SDK (default: a keep-alive pool)
+            cache_ttl: Metadata cache lifetime in seconds (default: TODOIST_CACHE_TTL)
+        """
         self.api_key = api_key or os.getenv('TODOIST_API_KEY')
         self.logger = logging.getLogger(__name__)
         self.api = None
+        self.http = None
+        self.write_queue = None
+        self.cache_ttl = CACHE_TTL if cache_ttl is None else cache_ttl
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self.mirror = None
+        self.mirror_staleness = MIRROR_STALENESS
+        self._mirror_lock = threading.Lock()
         
         if self.api_key:
             try:
                 from todoist_api_python.api import TodoistAPI
-                self.api = TodoistAPI(self.api_key)
+                self.api = self._create_api(TodoistAPI, http_client)
                 self.logger.info("Todoist API initialized successfully")
             except ImportError:
                 self.logger.warning("todoist-api-python not installed. Run: pip install todoist-api-python")
             except Exception as e:
                 self.logger.error(f"Failed to initialize Todoist API: {e}")
+            
+            if write_behind:
+                from gtd_coach.integrations.todoist_queue import get_write_queue
+                self.write_queue = get_write_queue(self.api_key)
+            
+            if MIRROR_ENABLED and self.http is not None:
+                from gtd_coach.integrations.todoist_mirror import get_todoist_mirror
+                self.mirror = get_todoist_mirror()
+    
+    def _create_api(self, api_class, http_client: Any = None):
+        """SDK instance on a pooled keep-alive HTTP client where the SDK supports one"""
+        if http_client is None:
+            try:
+                import httpx
+            except ImportError:
+                return api_class(self.api_key)
+            event_hooks = {}
+            base_url = os.getenv('TODOIST_API_URL')
+            if base_url:
+                # The SDK builds absolute URLs; send them to the configured host instead
+                def redirect(request):
+                    request.url = httpx.URL(str(request.url).replace(API_HOST, base_url.rstrip('/'), 1))
+                event_hooks['request'] = [redirect]
+            http_client = httpx.Client(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0),
+                event_hooks=event_hooks
+            )
+        try:
+            api = api_class(self.api_key, client=http_client)
+            self.http = http_client
+            return api
+        except TypeError:
+            # todoist-api-python < 3 manages its own requests session
+            http_client.close()
+            return api_class(self.api_key)
     
     def is_configured(self) -> bool:
         """Check if Todoist is properly configured"""
         return self.api is not None
     
+    # ----- local mirror -----
+    
+    def _refresh_mirror(self) -> bool:
+        """
+        Bring the mirror within mirror_staleness with an incremental sync
+        
+        Returns:
+            True if reads can be answered from the mirror
+        """
+        if self.mirror is None:
+            return False
+        from gtd_coach.integrations.todoist_mirror import account_key
+        from gtd_coach.integrations.todoist_queue import DEFAULT_SYNC_URL
+        
+        account = account_key(self.api_key)
+        if self.mirror.is_fresh(self.mirror_staleness, account):
+            return True
+        with self._mirror_lock:
+            if self.mirror.is_fresh(self.mirror_staleness, account):
+                return True  # another thread synced while we waited
+            try:
+                # Checked before the request: these adds are in its response
+                confirmed = self._confirmed_local_tasks()
+                response = self.http.post(
+                    os.getenv('TODOIST_SYNC_URL', DEFAULT_SYNC_URL),
+                    json={'sync_token': self.mirror.sync_token(account),
+                          'resource_types': ['items', 'projects']}
+                )
+                response.raise_for_status()
+                changes = self.mirror.apply(response.json(), account=account)
+                if confirmed:
+                    self.mirror.drop_local(confirmed)
+                self.logger.debug(f"Todoist mirror synced: {changes}")
+                return True
+            except Exception as e:
+                self.logger.warning(f"Todoist mirror sync failed, reading from the API: {e}")
+                return False
+    
+    # ----- metadata cache -----
+    
+    def _cached(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Value of a metadata lookup, reloaded once older than cache_ttl"""
+        with self._cache_lock:
+            hit = self._cache.get(name)
+            if hit is not None and time.monotonic() - hit[0] < self.cache_ttl:
+                return hit[1]
+        value = loader()
+        with self._cache_lock:
+            self._cache[name] = (time.monotonic(), value)
+        return value
+    
+    def invalidate_cache(self, *names: str) -> None:
+        """Drop cached metadata (all of it when no names are given)"""
+        with self._cache_lock:
+            if not names:
+                self._cache.clear()
+            for name in names:
+                self._cache.pop(name, None)
+    
+    def get_projects(self) -> List:
+        """All projects (cached)"""
+        return self._cached('projects', lambda: _collect(self.api.get_projects()))
+    
+    def get_inbox_project(self):
+        """The inbox project, or None (cached)"""
+        def find_inbox():
+            return next((p for p in self.get_projects()
+                         if getattr(p, 'is_inbox_project', False)), None)
+        return self._cached('inbox_project', find_inbox)
+    
+    def get_labels(self) -> List[str]:
+        """Names of the user's personal labels (cached)"""
+        return self._cached('labels', lambda: [label.name for label in _collect(self.api.get_labels())])
+    
     def get_inbox_tasks(self) -> List[Dict]:
         """Get all tasks from inbox - simple and direct"""
         if not self.is_configured():
             self.logger.warning("Todoist not configured, returning empty list")
             return []
         
+        if self._refresh_mirror():
+            return self.mirror.inbox_tasks()
+        
         try:
-            # First, find the inbox project ID
-            # The projects API returns a paginator that yields lists
-            projects_paginator = self.api.get_projects()
-            inbox_project = None
-            
-            # Handle the paginator properly
-            for batch in projects_paginator:
-                if isinstance(batch, list):
-                    for project in batch:
-                        if hasattr(project, 'is_inbox_project') and project.is_inbox_project:
-                            inbox_project = project
-                            break
-                else:
-                    if hasattr(batch, 'is_inbox_project') and batch.is_inbox_project:
-                        inbox_project = batch
-                        break
-                if inbox_project:
-                    break
+            # First, find the inbox project (cached - it never changes in practice)
+            inbox_project = self.get_inbox_project()
             
             if not inbox_project:
+                self.invalidate_cache('projects', 'inbox_project')
                 self.logger.warning("Could not find inbox project")
                 return []
             
-            self.logger.info(f"Found inbox project '{inbox_project.name}' with ID: {inbox_project.id}")
+            self.logger.debug(f"Using inbox project '{inbox_project.name}' with ID: {inbox_project.id}")
             
-            # Now get tasks from the inbox project - also returns a paginator
-            inbox_tasks = []
-            for batch in self.api.get_tasks(project_id=inbox_project.id):
-                if isinstance(batch, list):
-                    inbox_tasks.extend(batch)
-                else:
-                    inbox_tasks.append(batch)
+            # Now get tasks from the inbox project - returns a paginator
+            inbox_tasks = _collect(self.api.get_tasks(project_id=inbox_project.id))
             
             self.logger.info(f"Found {len(inbox_tasks)} tasks in inbox")
             
@@ -91,59 +228,113 @@ class TodoistClient:
         if not self.is_configured():
             return False
         
+        if self.write_queue is not None:
+            self.write_queue.close_item(task_id)
+            self._mirror_completed(task_id)
+            return True
+        
         try:
             # The correct method is complete_task, not close_task
             self.api.complete_task(task_id=task_id)
+            self._mirror_completed(task_id)
             return True
         except Exception as e:
             self.logger.error(f"Failed to complete task {task_id}: {e}")
             return False
     
-    def add_to_today(self, content: str, is_deep_work: bool = False) -> Optional[str]:
-        """Add task to today with optional time block for deep work"""
+    def _mirror_completed(self, task_id: str) -> None:
+        """Hide a completed task from mirror reads before the next sync confirms it"""
+        if self.mirror is not None:
+            self.mirror.mark_completed(task_id)
+    
+    def _mirror_added(self, task_id: str, content: str, labels: List[str], due_string: str,
+                      local: bool = False) -> None:
+        """Show an added task in mirror reads before the next sync confirms it"""
+        if self.mirror is not None:
+            self.mirror.add_task(task_id, content, labels, due_string=due_string,
+                                 due_date=date.today(), local=local)
+    
+    def _confirmed_local_tasks(self) -> List[str]:
+        """Temporary mirror tasks whose queued add Todoist has acknowledged"""
+        local = self.mirror.local_tasks()
+        if not local or self.write_queue is None:
+            return local
+        rejected = {row['temp_id'] for row in self.write_queue.failed()}
+        return [task_id for task_id in local
+                if task_id in rejected or self.write_queue.resolve(task_id)]
+    
+    def add_to_today(self, content: str, is_deep_work: bool = False,
+                     source_id: Optional[str] = None) -> Optional[str]:
+        """
+        Add task to today with optional time block for deep work
+        
+        With write-behind enabled this returns a temporary id right away;
+        source_id (e.g. the inbox task being clarified) makes a repeated
+        add of the same item a no-op.
+        """
         if not self.is_configured():
             return None
         
+        if is_deep_work:
+            # Adding a task with a new label creates that label
+            self.invalidate_cache('labels')
+        due_string = "today 10am for 2h" if is_deep_work else "today"
+        labels = ["deep"] if is_deep_work else []
+        
+        if self.write_queue is not None:
+            temp_id = self.write_queue.add_item(
+                content,
+                due_string=due_string,
+                labels=labels or None,
+                key=f"item_add:{source_id}" if source_id else None
+            )
+            self._mirror_added(temp_id, content, labels, due_string, local=True)
+            return temp_id
+        
         try:
             if is_deep_work:
                 # Add with 2-hour time block for deep work
                 # User can adjust time in Todoist if needed
                 task = self.api.add_task(
                     content=content,
-                    due_string="today 10am for 2h",
-                    labels=["deep"]
+                    due_string=due_string,
+                    labels=labels
                 )
             else:
                 # Just add to today without specific time
                 task = self.api.add_task(
                     content=content,
-                    due_string="today"
+                    due_string=due_string
                 )
             
             self.logger.info(f"Added task to today: {content[:50]}...")
+            self._mirror_added(task.id, content, labels, due_string)
             return task.id
             
         except Exception as e:
             self.logger.error(f"Failed to add task: {e}")
             return None
     
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait for queued changes to reach Todoist; True if none are left"""
+        if self.write_queue is None:
+            return True
+        return self.write_queue.flush(timeout)
+    
     def get_today_tasks(self) -> List[Dict]:
         """Get all tasks in Today view - includes overdue and today's tasks"""
         if not self.is_configured():
             return []
         
+        if self._refresh_mirror():
+            return self.mirror.today_tasks()
+        
         try:
             from datetime import date
             today = date.today()
             
             # Get all tasks - API returns a paginator that yields lists
-            all_tasks = []
-            for batch in self.api.get_tasks():
-                # Each batch is a list of tasks
-                if isinstance(batch, list):
-                    all_tasks.extend(batch)
-                else:
-                    all_tasks.append(batch)
+            all_tasks = _collect(self.api.get_tasks())
             
             # Filter for Today view: tasks due today OR overdue tasks
             today_tasks = []
@@ -186,6 +377,34 @@ class TodoistClient:
             return []
 
 
+# Process-wide clients, one per (token, write_behind)
+_clients: Dict[Tuple[Optional[str], bool], TodoistClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_todoist_client(api_key: Optional[str] = None, write_behind: bool = False) -> TodoistClient:
+    """
+    Get the shared client for a token, creating it on first use.
+    
+    Reusing the client keeps its HTTP connections alive between tool calls
+    and shares the project/inbox/label cache.
+    
+    Args:
+        api_key: Todoist API token (default: TODOIST_API_KEY)
+        write_behind: Route mutations through the write-behind queue
+    
+    Returns:
+        TodoistClient instance
+    """
+    key = (api_key or os.getenv('TODOIST_API_KEY'), write_behind)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = TodoistClient(api_key=key[0], write_behind=write_behind)
+            _clients[key] = client
+        return client
+
+
 def get_mock_tasks() -> List[Dict]:
     """Get mock tasks for testing when API unavailable"""
     return [
@@ -0,0 +1,297 @@
+"""
+Local SQLite mirror of Todoist tasks and projects.
+The mirror is kept current with the Sync API's incremental sync tokens: the
+first sync downloads everything, later ones only what changed since the last
+token. Inbox and Today queries are indexed SQL lookups instead of a full task
+download filtered client-side on every call.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Force a full sync this often so local-only edits (optimistic completions) can't drift
+FULL_SYNC_INTERVAL = 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    description TEXT,
+    project_id TEXT,
+    labels TEXT,
+    due_date TEXT,
+    due_string TEXT,
+    checked INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(checked, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project_id, checked);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    inbox INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Tasks added under a write-behind temporary id, until Todoist confirms them
+CREATE TABLE IF NOT EXISTS local_tasks (
+    id TEXT PRIMARY KEY
+);
+"""
+
+# Update in place so a task keeps its rowid (and with it its inbox position)
+TASK_UPSERT = """
+INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    content = excluded.content, description = excluded.description,
+    project_id = excluded.project_id, labels = excluded.labels,
+    due_date = excluded.due_date, due_string = excluded.due_string,
+    checked = excluded.checked
+"""
+
+TIME_HINTS = ('am', 'pm', ':', 'morning', 'afternoon', 'evening')
+
+
+def default_mirror_path() -> Path:
+    """Mirror path from GTD_TODOIST_MIRROR_DB, else data/todoist_mirror.db in the coach dir"""
+    env_path = os.getenv("GTD_TODOIST_MIRROR_DB")
+    if env_path:
+        return Path(env_path)
+    base = Path("/app") if os.environ.get("IN_DOCKER") else Path.home() / "gtd-coach"
+    return base / "data" / "todoist_mirror.db"
+
+
+def account_key(api_token: str) -> str:
+    """Short fingerprint of a token, so a mirror never mixes two accounts"""
+    return hashlib.sha256(api_token.encode()).hexdigest()[:12]
+
+
+class TodoistMirror:
+    """
+    Tasks and projects from Sync API responses, queryable offline.
+
+    apply() takes a sync response as-is: a full sync replaces the contents,
+    an incremental one upserts changed rows and drops deleted ones.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (and create if needed) the mirror.
+
+        Args:
+            db_path: SQLite database file (default: see default_mirror_path)
+        """
+        self.db_path = Path(db_path) if db_path else default_mirror_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # ----- sync state -----
+
+    def _state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, **values: Any) -> None:
+        self._conn.executemany("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                               [(k, None if v is None else str(v)) for k, v in values.items()])
+
+    def sync_token(self, account: Optional[str] = None) -> str:
+        """
+        Token for the next sync request
+
+        Returns "*" (full sync) when the mirror is empty, belongs to another
+        account or hasn't had a full sync within FULL_SYNC_INTERVAL.
+        """
+        token = self._state("sync_token")
+        last_full = float(self._state("last_full_sync") or 0)
+        if not token or (account and self._state("account") != account) \
+                or time.time() - last_full > FULL_SYNC_INTERVAL:
+            return "*"
+        return token
+
+    def last_sync(self) -> Optional[float]:
+        """Epoch seconds of the last applied sync, or None"""
+        value = self._state("last_sync")
+        return float(value) if value else None
+
+    def is_fresh(self, max_age: float, account: Optional[str] = None) -> bool:
+        """Whether the last sync (for this account, if given) is within max_age seconds"""
+        if account and self._state("account") != account:
+            return False
+        last = self.last_sync()
+        return last is not None and time.time() - last <= max_age
+
+    def expire(self) -> None:
+        """Make the next read sync first (after a change made elsewhere)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM sync_state WHERE key = 'last_sync'")
+            self._conn.commit()
+
+    # ----- updates -----
+
+    def apply(self, response: Dict[str, Any], account: Optional[str] = None) -> Dict[str, int]:
+        """
+        Apply a Sync API response in one transaction.
+
+        Args:
+            response: Sync response with 'items', 'projects', 'sync_token', 'full_sync'
+            account: Fingerprint of the token the response was fetched with
+
+        Returns:
+            Counts of rows upserted and deleted
+        """
+        upserts, deletes = [], []
+        for item in response.get('items', []):
+            if item.get('is_deleted'):
+                deletes.append((str(item['id']),))
+                continue
+            due = item.get('due') or {}
+            upserts.append((
+                str(item['id']), item.get('content', ''), item.get('description', ''),
+                str(item['project_id']) if item.get('project_id') is not None else None,
+                json.dumps(item.get('labels') or []),
+                (due.get('date') or '')[:10] or None, due.get('string'),
+                int(bool(item.get('checked')))
+            ))
+        projects = response.get('projects', [])
+        now = time.time()
+
+        with self._lock:
+            if response.get('full_sync'):
+                self._conn.execute("DELETE FROM tasks WHERE id NOT IN (SELECT id FROM local_tasks)")
+                self._conn.execute("DELETE FROM projects")
+                self._set_state(last_full_sync=now, account=account)
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", deletes)
+            self._conn.executemany(TASK_UPSERT, upserts)
+            self._conn.executemany("DELETE FROM projects WHERE id = ?",
+                                   [(str(p['id']),) for p in projects
+                                    if p.get('is_deleted') or p.get('is_archived')])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?)",
+                [(str(p['id']), p.get('name'), int(bool(p.get('inbox_project'))))
+                 for p in projects if not (p.get('is_deleted') or p.get('is_archived'))]
+            )
+            self._set_state(sync_token=response.get('sync_token'), last_sync=now)
+            self._conn.commit()
+        return {'upserted': len(upserts), 'deleted': len(deletes)}
+
+    def mark_completed(self, task_id: str) -> None:
+        """Record a completion made by this process before the next sync sees it"""
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET checked = 1 WHERE id = ?", (str(task_id),))
+            self._conn.commit()
+
+    def add_task(self, task_id: str, content: str, labels: Optional[List[str]] = None,
+                 due_string: Optional[str] = None, due_date: Optional[date] = None,
+                 local: bool = False) -> None:
+        """
+        Record a task added by this process before the next sync sees it
+
+        The task goes to the inbox project. local marks a write-behind
+        temporary id: the row is kept until drop_local() once the add is
+        confirmed, as the synced task arrives under its real id.
+        """
+        with self._lock:
+            inbox = self._conn.execute("SELECT id FROM projects WHERE inbox = 1 LIMIT 1").fetchone()
+            self._conn.execute(TASK_UPSERT, (
+                str(task_id), content, '', inbox[0] if inbox else None, json.dumps(labels or []),
+                due_date.isoformat() if due_date else None, due_string, 0
+            ))
+            if local:
+                self._conn.execute("INSERT OR IGNORE INTO local_tasks VALUES (?)", (str(task_id),))
+            self._conn.commit()
+
+    def local_tasks(self) -> List[str]:
+        """Temporary ids of added tasks not yet confirmed"""
+        return [row[0] for row in self._query("SELECT id FROM local_tasks")]
+
+    def drop_local(self, task_ids: List[str]) -> None:
+        """Remove confirmed (or rejected) temporary tasks"""
+        params = [(str(task_id),) for task_id in task_ids]
+        with self._lock:
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", params)
+            self._conn.executemany("DELETE FROM local_tasks WHERE id = ?", params)
+            self._conn.commit()
+
+    # ----- queries -----
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def inbox_tasks(self) -> List[Dict[str, Any]]:
+        """Open inbox tasks, in the shape TodoistClient.get_inbox_tasks returns"""
+        rows = self._query(
+            "SELECT t.* FROM tasks t JOIN projects p ON p.id = t.project_id "
+            "WHERE p.inbox = 1 AND t.checked = 0 ORDER BY t.rowid"
+        )
+        return [{
+            "id": row['id'],
+            "content": row['content'],
+            "labels": json.loads(row['labels'] or '[]'),
+            "description": row['description'] or ""
+        } for row in rows]
+
+    def today_tasks(self, today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Open tasks due today or overdue, in the shape of TodoistClient.get_today_tasks"""
+        today_str = (today or date.today()).isoformat()
+        rows = self._query(
+            "SELECT * FROM tasks WHERE checked = 0 AND due_date <= ? "
+            "ORDER BY due_date, COALESCE(due_string, '')", (today_str,)
+        )
+        return [{
+            "id": row['id'],
+            "content": row['content'],
+            "labels": json.loads(row['labels'] or '[]'),
+            "has_time": any(hint in (row['due_string'] or "").lower() for hint in TIME_HINTS),
+            "is_overdue": row['due_date'] < today_str,
+            "due_string": row['due_string'] or ""
+        } for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance
+_mirror: Optional[TodoistMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_todoist_mirror(db_path: Optional[Path] = None) -> TodoistMirror:
+    """
+    Get singleton mirror instance.
+
+    Args:
+        db_path: Optional database path (only used on first call)
+
+    Returns:
+        TodoistMirror instance
+    """
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = TodoistMirror(db_path)
+        return _mirror
@@ -0,0 +1,352 @@
+"""
+Write-behind queue for Todoist mutations.
+Adding tasks and closing inbox items are recorded in an append-only SQLite
+journal and return immediately; a background thread sends them to the
+Todoist Sync API in batches of commands. Each command carries a uuid that
+Todoist uses as an idempotency key, so commands left unacknowledged by a
+crash are replayed safely the next time the queue starts.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_URL = "https://api.todoist.com/api/v1/sync"
+MAX_COMMANDS = 100  # Sync API limit per request
+MAX_BACKOFF = 60.0
+
+# Stable namespace so the same idempotency key always maps to the same command uuid
+KEY_NAMESPACE = uuid.UUID("6f1c3a52-5d0e-4b8e-9a47-3f2d8c1b7e90")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mutations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    args TEXT NOT NULL,
+    temp_id TEXT,
+    queued_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS acks (
+    uuid TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    remote_id TEXT,
+    error TEXT,
+    acked_at TEXT NOT NULL
+);
+"""
+
+
+def default_journal_path() -> Path:
+    """Journal path from GTD_TODOIST_JOURNAL, else data/todoist_journal.db in the coach dir"""
+    env_path = os.getenv("GTD_TODOIST_JOURNAL")
+    if env_path:
+        return Path(env_path)
+    base = Path("/app") if os.environ.get("IN_DOCKER") else Path.home() / "gtd-coach"
+    return base / "data" / "todoist_journal.db"
+
+
+class TodoistWriteQueue:
+    """
+    Journal-backed batch sender for Todoist Sync API commands.
+
+    Both tables are append-only: a mutation is pending until a row for its
+    uuid exists in ``acks``. Commands are sent in journal order by a single
+    sender, so a task added before an item is closed reaches Todoist first.
+    """
+
+    def __init__(
+        self,
+        api_token: str,
+        db_path: Optional[Path] = None,
+        sync_url: Optional[str] = None,
+        batch_size: int = MAX_COMMANDS,
+        flush_interval: float = 0.5,
+        autostart: bool = True
+    ):
+        """
+        Open the journal and (by default) start the background sender.
+
+        Args:
+            api_token: Todoist API token
+            db_path: SQLite journal file (default: see default_journal_path)
+            sync_url: Sync API endpoint (default: TODOIST_SYNC_URL or the public API)
+            batch_size: Commands per request (at most MAX_COMMANDS)
+            flush_interval: Seconds the sender waits for more mutations
+            autostart: Start the sender thread, which first replays anything
+                left unacknowledged by a previous process
+        """
+        self.db_path = Path(db_path) if db_path else default_journal_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sync_url = sync_url or os.getenv("TODOIST_SYNC_URL", DEFAULT_SYNC_URL)
+        self.batch_size = min(batch_size, MAX_COMMANDS)
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        self._http = requests.Session()
+        self._http.headers.update({'Authorization': f'Bearer {api_token}'})
+        self._send_lock = threading.Lock()  # one batch in flight keeps commands ordered
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        replay = self.pending_count()
+        if replay:
+            logger.info(f"Replaying {replay} unacknowledged Todoist mutations")
+        if autostart:
+            self.start()
+
+    # ----- enqueue -----
+
+    def enqueue(self, command_type: str, args: Dict[str, Any], key: Optional[str] = None,
+                temp_id: Optional[str] = None) -> str:
+        """
+        Record a Sync API command and return without waiting for the network.
+
+        Args:
+            command_type: Sync API command type (e.g. 'item_add', 'item_close')
+            args: Command arguments
+            key: Idempotency key; enqueueing the same key again is a no-op
+            temp_id: Temporary id for commands that create objects
+
+        Returns:
+            The command uuid
+        """
+        command_uuid = str(uuid.uuid5(KEY_NAMESPACE, key)) if key else str(uuid.uuid4())
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO mutations (uuid, type, args, temp_id, queued_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (command_uuid, command_type, json.dumps(args), temp_id, datetime.now().isoformat())
+            )
+            self._conn.commit()
+        if cursor.rowcount == 0:
+            logger.debug(f"Duplicate Todoist mutation ignored: {key}")
+        self._wake.set()
+        return command_uuid
+
+    def add_item(self, content: str, due_string: Optional[str] = None,
+                 labels: Optional[List[str]] = None, key: Optional[str] = None) -> str:
+        """
+        Queue a new task.
+
+        Returns:
+            Temporary id of the task (see resolve)
+        """
+        args: Dict[str, Any] = {'content': content}
+        if due_string:
+            args['due'] = {'string': due_string}
+        if labels:
+            args['labels'] = labels
+        temp_id = str(uuid.uuid4())
+        command_uuid = self.enqueue('item_add', args, key=key, temp_id=temp_id)
+        # A duplicate keeps the temp id it was first queued with
+        row = self._query("SELECT temp_id FROM mutations WHERE uuid = ?", (command_uuid,))
+        return row[0]['temp_id'] if row else temp_id
+
+    def close_item(self, task_id: str) -> str:
+        """Queue completing a task; closing the same task twice is sent once"""
+        return self.enqueue('item_close', {'id': task_id}, key=f"item_close:{task_id}")
+
+    # ----- state -----
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def pending(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Unacknowledged mutations in journal order"""
+        sql = ("SELECT m.* FROM mutations m LEFT JOIN acks a ON a.uuid = m.uuid "
+               "WHERE a.uuid IS NULL ORDER BY m.seq")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql)
+
+    def pending_count(self) -> int:
+        """Number of unacknowledged mutations"""
+        return self._query(
+            "SELECT COUNT(*) AS n FROM mutations m LEFT JOIN acks a ON a.uuid = m.uuid "
+            "WHERE a.uuid IS NULL"
+        )[0]['n']
+
+    def failed(self) -> List[Dict[str, Any]]:
+        """Mutations Todoist rejected (these are not retried)"""
+        return self._query(
+            "SELECT m.*, a.error FROM mutations m JOIN acks a ON a.uuid = m.uuid "
+            "WHERE a.status = 'error' ORDER BY m.seq"
+        )
+
+    def resolve(self, temp_id: str) -> Optional[str]:
+        """Real Todoist id for a temporary id, once the add has been acknowledged"""
+        row = self._query(
+            "SELECT a.remote_id FROM mutations m JOIN acks a ON a.uuid = m.uuid "
+            "WHERE m.temp_id = ?", (temp_id,)
+        )
+        return row[0]['remote_id'] if row else None
+
+    # ----- sending -----
+
+    def send_batch(self) -> Optional[int]:
+        """
+        Send the oldest pending commands in one Sync API request.
+
+        Returns:
+            Number of commands acknowledged, or None if the request failed
+            (the commands stay pending and are resent with the same uuids)
+        """
+        with self._send_lock:
+            if self._closed:
+                return None
+            rows = self.pending(self.batch_size)
+            if not rows:
+                return 0
+            commands = []
+            for row in rows:
+                command = {'type': row['type'], 'uuid': row['uuid'], 'args': json.loads(row['args'])}
+                if row['temp_id']:
+                    command['temp_id'] = row['temp_id']
+                commands.append(command)
+
+            try:
+                response = self._http.post(self.sync_url, json={'commands': commands}, timeout=10)
+                response.raise_for_status()
+                result = response.json()
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"Todoist sync of {len(commands)} commands failed: {e}")
+                return None
+
+            status = result.get('sync_status', {})
+            mapping = result.get('temp_id_mapping', {})
+            now = datetime.now().isoformat()
+            acks = []
+            for row in rows:
+                outcome = status.get(row['uuid'])
+                if outcome is None:
+                    continue  # not processed; resent next batch
+                if outcome == 'ok':
+                    acks.append((row['uuid'], 'ok', mapping.get(row['temp_id']), None, now))
+                else:
+                    logger.warning(f"Todoist rejected {row['type']}: {outcome}")
+                    acks.append((row['uuid'], 'error', None, json.dumps(outcome), now))
+            with self._lock:
+                self._conn.executemany("INSERT OR IGNORE INTO acks VALUES (?, ?, ?, ?, ?)", acks)
+                self._conn.commit()
+            return len(acks)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Send pending commands until none are left or the timeout passes.
+
+        Returns:
+            True if everything queued so far has been acknowledged
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.25
+        while self.pending_count():
+            if self.send_batch() is None:
+                if time.monotonic() + delay >= deadline:
+                    return False
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_BACKOFF)
+            elif time.monotonic() >= deadline:
+                return not self.pending_count()
+        return True
+
+    def _run(self) -> None:
+        delay = self.flush_interval
+        while not self._stopping.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            while not self._stopping.is_set():
+                sent = self.send_batch()
+                if sent is None:
+                    # Back off while Todoist is unreachable; the journal holds the commands
+                    delay = min(max(delay, self.flush_interval) * 2, MAX_BACKOFF)
+                    break
+                delay = self.flush_interval
+                if sent == 0:
+                    break
+
+    def start(self) -> None:
+        """Start the background sender"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="todoist-write-queue", daemon=True)
+            self._thread.start()
+            self._wake.set()
+
+    def stop(self, flush_timeout: float = 5.0) -> bool:
+        """
+        Stop the sender after a final flush.
+
+        Returns:
+            True if nothing was left pending
+        """
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=flush_timeout)
+        done = self.flush(flush_timeout) if flush_timeout > 0 else not self.pending_count()
+        if not done:
+            logger.info(f"{self.pending_count()} Todoist mutations will be sent on next start")
+        return done
+
+    def close(self) -> None:
+        """Stop without flushing and close the journal"""
+        if self._closed:
+            return
+        self.stop(flush_timeout=0)
+        with self._send_lock:  # let an in-flight batch record its acks
+            self._closed = True
+            self._http.close()
+            with self._lock:
+                self._conn.close()
+
+
+# Singleton instance
+_write_queue: Optional[TodoistWriteQueue] = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue(api_token: str) -> TodoistWriteQueue:
+    """
+    Get singleton write queue, starting it (and replaying the journal) on first use.
+
+    Args:
+        api_token: Todoist API token (only used on first call)
+
+    Returns:
+        TodoistWriteQueue instance
+    """
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = TodoistWriteQueue(api_token)
+            atexit.register(_write_queue.stop)
+        return _write_queue
+
+
+def flush_write_queue(timeout: float = 10.0) -> bool:
+    """Flush the singleton queue if one was started; True if nothing is pending"""
+    return _write_queue.flush(timeout) if _write_queue is not None else True
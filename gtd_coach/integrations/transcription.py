@@ -0,0 +1,297 @@
+"""
+Warm speech-to-text worker for voice capture.
+A long-lived child process loads the Whisper model once and transcribes clips
+from a request queue, so only the first voice note of a session pays the model
+load. Requests from any thread are multiplexed over the one process, long
+recordings are split into chunks whose text streams back as each finishes, and
+the process exits (freeing the model) after an idle timeout and is restarted
+on the next request.
+"""
+
+import atexit
+import functools
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+WHISPER_MODEL = os.getenv('GTD_WHISPER_MODEL', 'base')
+# Seconds without a request before the worker exits and frees the model
+IDLE_TIMEOUT = float(os.getenv('GTD_STT_IDLE_TIMEOUT', '300'))
+# Recordings longer than this are transcribed in chunks of this length
+CHUNK_SECONDS = float(os.getenv('GTD_STT_CHUNK_SECONDS', '30'))
+# Worker exits in a row without finishing a request before queued requests are failed
+MAX_RESTARTS = 3
+
+
+class TranscriptionError(Exception):
+    """A clip could not be transcribed"""
+
+
+def load_whisper_model(model_name: str = WHISPER_MODEL) -> Any:
+    """Load a Whisper model (runs in the worker process)"""
+    import whisper
+    return whisper.load_model(model_name)
+
+
+def _serve(model_factory: Callable[[], Any], requests, conn, idle_timeout: float) -> None:
+    """
+    Worker process loop.
+
+    Messages sent back are (kind, request id, value) tuples: "start" before a
+    request is worked on, "loaded" with the model load time, "result" or
+    "error", and "idle" just before exiting on the idle timeout.
+    """
+    model = None
+    while True:
+        try:
+            item = requests.get(timeout=idle_timeout) if idle_timeout > 0 else requests.get()
+        except queue.Empty:
+            conn.send(("idle", None, None))
+            break
+        if item is None:
+            break
+        req_id, audio_file = item
+        conn.send(("start", req_id, None))
+        try:
+            if model is None:
+                started = time.monotonic()
+                model = model_factory()
+                conn.send(("loaded", None, time.monotonic() - started))
+            result = model.transcribe(audio_file)
+            conn.send(("result", req_id, result["text"].strip()))
+        except Exception as e:
+            conn.send(("error", req_id, f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+def split_wav(audio_file: Path, chunk_seconds: float, out_dir: Path) -> List[Path]:
+    """
+    Split a WAV recording into chunk files of at most chunk_seconds.
+
+    Returns [audio_file] for short recordings and anything that isn't a
+    readable WAV file.
+    """
+    try:
+        source = wave.open(str(audio_file), 'rb')
+    except (wave.Error, EOFError, OSError):
+        return [audio_file]
+    with source:
+        frames_per_chunk = max(1, int(source.getframerate() * chunk_seconds))
+        if source.getnframes() <= frames_per_chunk:
+            return [audio_file]
+        chunks = []
+        for index in itertools.count():
+            frames = source.readframes(frames_per_chunk)
+            if not frames:
+                break
+            chunk = out_dir / f"{audio_file.stem}_{index:03d}.wav"
+            with wave.open(str(chunk), 'wb') as out:
+                out.setparams(source.getparams())
+                out.writeframes(frames)
+            chunks.append(chunk)
+    return chunks
+
+
+class TranscriptionWorker:
+    """
+    Client for the warm transcription process.
+
+    Thread-safe: submit() from any thread; one dispatcher thread per worker
+    process routes results to the waiting futures. If the process dies, the
+    request it was working on fails and the ones still queued are replayed to
+    a fresh process.
+    """
+
+    def __init__(self, model_factory: Optional[Callable[[], Any]] = None,
+                 idle_timeout: Optional[float] = None,
+                 chunk_seconds: Optional[float] = None):
+        """
+        Args:
+            model_factory: Picklable callable returning an object with
+                transcribe(path) -> {"text": ...} (default: Whisper GTD_WHISPER_MODEL)
+            idle_timeout: Seconds idle before the process exits (default: GTD_STT_IDLE_TIMEOUT, 0 never)
+            chunk_seconds: Chunk length for stream() (default: GTD_STT_CHUNK_SECONDS)
+        """
+        self.model_factory = model_factory or functools.partial(load_whisper_model, WHISPER_MODEL)
+        self.idle_timeout = IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.chunk_seconds = CHUNK_SECONDS if chunk_seconds is None else chunk_seconds
+        self._ctx = multiprocessing.get_context("spawn")  # no forking a threaded parent
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Tuple[str, Future]] = {}  # in submission order
+        self._process = None
+        self._requests = None
+        self._restarts = 0
+        self._closed = False
+        self.starts = 0        # worker processes started
+        self.model_loads = 0   # model loads reported by workers
+
+    # ----- process management -----
+
+    def _start_process(self) -> None:
+        """Start a worker and hand it every pending request (caller holds the lock)"""
+        requests = self._ctx.Queue()
+        reader, writer = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_serve, args=(self.model_factory, requests, writer, self.idle_timeout),
+            name="gtd-stt-worker", daemon=True
+        )
+        process.start()
+        writer.close()  # only the child writes, so its exit shows up as EOF here
+        self._process, self._requests = process, requests
+        self.starts += 1
+        threading.Thread(target=self._dispatch, args=(process, reader),
+                         name="gtd-stt-dispatch", daemon=True).start()
+        for req_id, (audio_file, _) in self._pending.items():
+            requests.put((req_id, audio_file))
+
+    def _dispatch(self, process, reader) -> None:
+        """Route one worker's messages to futures until it exits"""
+        current = None
+        idle = False
+        while True:
+            try:
+                kind, req_id, value = reader.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "start":
+                current = req_id
+            elif kind == "loaded":
+                self.model_loads += 1
+                logger.info(f"Transcription model loaded in {value:.1f}s")
+            elif kind == "idle":
+                idle = True
+            else:
+                current = None
+                with self._lock:
+                    self._restarts = 0
+                    entry = self._pending.pop(req_id, None)
+                if entry is None or entry[1].done():
+                    continue
+                if kind == "result":
+                    entry[1].set_result(value)
+                else:
+                    entry[1].set_exception(TranscriptionError(f"{entry[0]}: {value}"))
+        reader.close()
+        process.join(timeout=5)
+        self._worker_exited(process, current, idle)
+
+    def _worker_exited(self, process, current: Optional[int], idle: bool) -> None:
+        with self._lock:
+            if self._process is process:
+                self._process = self._requests = None
+            if idle:
+                logger.debug("Transcription worker idle, model unloaded")
+            elif not self._closed:
+                logger.warning(f"Transcription worker exited with code {process.exitcode}")
+                self._restarts += 1
+            failed = []
+            if current is not None and current in self._pending:
+                failed.append(self._pending.pop(current))
+            if self._restarts >= MAX_RESTARTS or self._closed:
+                failed.extend(self._pending.values())
+                self._pending.clear()
+            for audio_file, future in failed:
+                if not future.done():
+                    future.set_exception(TranscriptionError(
+                        f"{audio_file}: worker exited with code {process.exitcode}"))
+            if self._pending and self._process is None:
+                self._start_process()  # replay what the old worker never started
+
+    # ----- requests -----
+
+    def submit(self, audio_file: Union[str, Path]) -> Future:
+        """Queue a clip; the future resolves to its text or a TranscriptionError"""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise TranscriptionError("Transcription worker is closed")
+            req_id = next(self._ids)
+            self._pending[req_id] = (str(audio_file), future)
+            if self._process is None:
+                self._start_process()
+            else:
+                self._requests.put((req_id, str(audio_file)))
+        return future
+
+    def transcribe(self, audio_file: Union[str, Path], timeout: Optional[float] = None) -> str:
+        """
+        Transcribe one clip.
+
+        Raises:
+            TranscriptionError: The model failed or the worker died on this clip
+            TimeoutError: No result within timeout seconds (the clip stays queued)
+        """
+        return self.submit(audio_file).result(timeout)
+
+    def stream(self, audio_file: Union[str, Path], timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Transcribe a recording chunk by chunk, yielding each chunk's text in order.
+
+        All chunks are queued up front, so later ones are transcribed while
+        earlier text is being consumed.
+        """
+        audio_file = Path(audio_file)
+        chunk_dir = Path(tempfile.mkdtemp(prefix="gtd_stt_"))
+        chunks = split_wav(audio_file, self.chunk_seconds, chunk_dir)
+        try:
+            futures = [self.submit(chunk) for chunk in chunks]
+            for future in futures:
+                yield future.result(timeout)
+        finally:
+            for chunk in chunks:
+                if chunk != audio_file:
+                    chunk.unlink(missing_ok=True)
+            chunk_dir.rmdir()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Worker process id, or None while no worker is running"""
+        process = self._process
+        return process.pid if process is not None else None
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the worker once queued clips are done, terminating it after timeout"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            process, requests = self._process, self._requests
+        if process is None:
+            return
+        requests.put(None)
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+
+
+# Singleton instance
+_worker: Optional[TranscriptionWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_transcription_worker() -> TranscriptionWorker:
+    """
+    Get the shared transcription worker (started on first request, stopped at exit).
+
+    Returns:
+        TranscriptionWorker instance
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = TranscriptionWorker()
+            atexit.register(_worker.close)
+        return _worker
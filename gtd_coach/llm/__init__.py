@@ -9,10 +9,24 @@ from .client import (
     get_llm_client,
     get_evaluation_client
 )
+from .gateway import (
+    LLMGateway,
+    Priority,
+    request_priority,
+    get_llm_gateway,
+    gateway_http_client,
+    gateway_http_async_client
+)
 
 __all__ = [
     'LLMClient',
     'EvaluationClient',
     'get_llm_client',
-    'get_evaluation_client'
+    'get_evaluation_client',
+    'LLMGateway',
+    'Priority',
+    'request_priority',
+    'get_llm_gateway',
+    'gateway_http_client',
+    'gateway_http_async_client'
 ]
\ No newline at end of file
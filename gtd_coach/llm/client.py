@@ -18,8 +18,16 @@ except ImportError:
     print("⚠️ Langfuse not available - using standard OpenAI client")
     print("Install with: pip install 'langfuse[openai]'")
 
+from gtd_coach.metrics.registry import counter, histogram
+from .gateway import Priority, gateway_enabled, gateway_http_client, get_llm_gateway
+
 logger = logging.getLogger(__name__)
 
+LLM_REQUESTS = counter("gtd_llm_requests_total", "Chat completion requests by client and outcome",
+                       ["client", "outcome"])
+LLM_LATENCY = histogram("gtd_llm_request_duration_seconds", "Chat completion latency by client",
+                        ["client"])
+
 
 class LLMClient:
     """
@@ -70,7 +78,8 @@ class LLMClient:
                     # Use Langfuse-wrapped client
                     self._client = OpenAI(
                         base_url=self.base_url,
-                        api_key=self.api_key
+                        api_key=self.api_key,
+                        http_client=gateway_http_client()
                     )
                     
                     # Also initialize Langfuse client for additional tracking
@@ -85,7 +94,8 @@ class LLMClient:
                 # Use standard OpenAI client
                 self._client = OpenAI(
                     base_url=self.base_url,
-                    api_key=self.api_key
+                    api_key=self.api_key,
+                    http_client=gateway_http_client()
                 )
                 logger.info("Standard LLM client initialized")
                 
@@ -94,7 +104,8 @@ class LLMClient:
             # Fallback to standard client
             self._client = OpenAI(
                 base_url=self.base_url,
-                api_key=self.api_key
+                api_key=self.api_key,
+                http_client=gateway_http_client()
             )
     
     def chat_completion(
@@ -167,6 +178,8 @@ class LLMClient:
             latency_ms = (datetime.now() - start_time).total_seconds() * 1000
             self.call_count += 1
             self.total_latency_ms += latency_ms
+            LLM_REQUESTS.labels("agent", "success").inc()
+            LLM_LATENCY.labels("agent").observe(latency_ms / 1000)
             
             # Log performance if not streaming
             if not stream:
@@ -188,7 +201,10 @@ class LLMClient:
             return response
             
         except Exception as e:
+            latency_ms = (datetime.now() - start_time).total_seconds() * 1000
             self.error_count += 1
+            LLM_REQUESTS.labels("agent", "error").inc()
+            LLM_LATENCY.labels("agent").observe(latency_ms / 1000)
             logger.error(f"LLM call failed: {e}")
             
             # Score failure in Langfuse
@@ -196,7 +212,7 @@ class LLMClient:
                 self._score_response(
                     phase=phase,
                     success=False,
-                    latency_ms=(datetime.now() - start_time).total_seconds() * 1000,
+                    latency_ms=latency_ms,
                     session_id=session_id
                 )
             
@@ -243,7 +259,8 @@ class LLMClient:
             "average_latency_ms": round(avg_latency, 1),
             "langfuse_enabled": self.enable_langfuse,
             "model": self.model,
-            "base_url": self.base_url
+            "base_url": self.base_url,
+            "gateway": get_llm_gateway().get_statistics() if gateway_enabled() else None
         }
     
     def test_connection(self) -> bool:
@@ -306,9 +323,11 @@ class EvaluationClient:
         
         # Always use standard client for evaluations (no Langfuse wrapping)
         from openai import OpenAI as StandardOpenAI
+        # Evaluation traffic yields to interactive turns at the shared gateway
         self._client = StandardOpenAI(
             base_url=self.base_url,
-            api_key=self.api_key
+            api_key=self.api_key,
+            http_client=gateway_http_client(Priority.EVALUATION)
         )
         
         logger.info(f"Evaluation client initialized with model: {self.model}")
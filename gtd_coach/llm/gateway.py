@@ -0,0 +1,516 @@
+"""
+Local LLM gateway shared by every client that talks to LM Studio.
+
+LM Studio serves one request at a time, so when the legacy coach and the
+agent run side by side (shadow mode, ParallelRunner) their requests queue
+on the server. The gateway admits requests in priority order (interactive
+user turns before shadow and evaluation traffic), coalesces identical
+in-flight non-streaming requests, and records queue wait times.
+
+Clients opt in by passing ``gateway_http_client()`` as their httpx client
+(and ``gateway_http_async_client()`` for SDKs that also make async calls).
+Shadow code marks its traffic with ``request_priority(Priority.BACKGROUND)``.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from gtd_coach.metrics.registry import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+# Endpoints that reach the model; everything else (e.g. /models) passes straight through
+GATED_PATHS = ("/chat/completions", "/completions", "/embeddings")
+
+# Recent queue waits kept per priority for the metrics
+WAIT_SAMPLES = 1000
+
+# Seconds a request waits for a slot before it is let through anyway. A caller
+# that opens a second request while its own stream still holds the only slot
+# would otherwise wait forever.
+DEFAULT_ACQUIRE_TIMEOUT = 60.0
+
+QUEUE_WAIT = histogram("gtd_llm_gateway_wait_seconds", "Time LM Studio requests waited for a gateway slot",
+                       ["priority"], buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+COALESCED = counter("gtd_llm_gateway_coalesced_total", "Requests answered by an identical in-flight request")
+
+
+class Priority(IntEnum):
+    """Admission priority (lower is served first)"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    EVALUATION = 2
+
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "gtd_llm_priority", default=None
+)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """
+    Run LLM calls made inside the block at the given priority
+
+    Args:
+        priority: Priority for requests issued in this context
+    """
+    token = _current_priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class _Flight:
+    """An in-flight request that identical requests can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMGateway:
+    """
+    Priority admission queue with single-flight request coalescing
+    """
+
+    def __init__(self, max_concurrency: int = 1,
+                 acquire_timeout: Optional[float] = DEFAULT_ACQUIRE_TIMEOUT):
+        """
+        Initialize the gateway
+
+        Args:
+            max_concurrency: Requests allowed at LM Studio at once
+            acquire_timeout: Seconds to wait for a slot before admitting the
+                request over the limit (None waits indefinitely)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.acquire_timeout = acquire_timeout
+        self._cond = threading.Condition()
+        self._waiting: List[tuple] = []
+        self._active = 0
+        self._sequence = itertools.count()
+        self._inflight: Dict[str, _Flight] = {}
+        self._waits: Dict[str, deque] = {
+            p.name.lower(): deque(maxlen=WAIT_SAMPLES) for p in Priority
+        }
+        self.stats = {'requests': 0, 'coalesced': 0, 'max_queue_depth': 0, 'overflow': 0}
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE) -> Callable[[], None]:
+        """
+        Wait for a slot, highest priority first (FIFO within a priority)
+
+        After acquire_timeout seconds the request is admitted over the limit,
+        so a caller still holding a slot (an unclosed stream) cannot deadlock.
+
+        Args:
+            priority: Request priority
+
+        Returns:
+            Release function (safe to call more than once)
+        """
+        start = time.perf_counter()
+        deadline = None if self.acquire_timeout is None else start + self.acquire_timeout
+        ticket = (int(priority), next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], len(self._waiting))
+            while self._active >= self.max_concurrency or self._waiting[0] != ticket:
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    self.stats['overflow'] += 1
+                    logger.warning(f"No LM Studio slot after {self.acquire_timeout:.0f}s "
+                                   f"({self._active} active) - sending {Priority(priority).name.lower()} "
+                                   "request over the concurrency limit")
+                    break
+                self._cond.wait(remaining)
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            self._active += 1
+            self.stats['requests'] += 1
+            waited = time.perf_counter() - start
+            self._waits[Priority(priority).name.lower()].append(waited)
+            # Wake the next waiter in case another slot is free
+            self._cond.notify_all()
+        QUEUE_WAIT.labels(Priority(priority).name.lower()).observe(waited)
+
+        released = threading.Event()
+
+        def release():
+            if released.is_set():
+                return
+            released.set()
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+        return release
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.INTERACTIVE):
+        """Hold a slot for the duration of the block"""
+        release = self.acquire(priority)
+        try:
+            yield
+        finally:
+            release()
+
+    async def aacquire(self, priority: Priority = Priority.INTERACTIVE) -> Callable[[], None]:
+        """
+        acquire() for coroutines: waits in a worker thread, not on the event loop
+
+        Args:
+            priority: Request priority
+
+        Returns:
+            Release function (safe to call more than once)
+        """
+        waiter = asyncio.ensure_future(asyncio.to_thread(self.acquire, priority))
+        try:
+            return await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The slot may still be granted after the caller gave up; hand it back
+            waiter.add_done_callback(
+                lambda f: f.cancelled() or f.exception() is not None or f.result()()
+            )
+            raise
+
+    def _join_flight(self, key: Optional[str]):
+        """Register as leader for key, or return the flight to wait on"""
+        if key is None:
+            return True, None
+        with self._cond:
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = self._inflight[key] = _Flight()
+                return True, flight
+            self.stats['coalesced'] += 1
+        COALESCED.inc()
+        return False, flight
+
+    def _finish_flight(self, key: Optional[str], flight: Optional[_Flight]) -> None:
+        if key is None:
+            return
+        with self._cond:
+            self._inflight.pop(key, None)
+        flight.done.set()
+
+    def run(self, fn: Callable[[], Any], priority: Optional[Priority] = None,
+            key: Optional[str] = None) -> Any:
+        """
+        Run ``fn`` in a slot, sharing the result with identical in-flight calls
+
+        Args:
+            fn: Call to make (runs in the caller's thread)
+            priority: Request priority (defaults to the context priority)
+            key: Identity of the request; calls with the same key while one is
+                in flight wait for and reuse its result
+
+        Returns:
+            Result of ``fn``
+        """
+        if priority is None:
+            priority = current_priority()
+
+        leader, flight = self._join_flight(key)
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            with self.slot(priority):
+                result = fn()
+        except BaseException as e:
+            if flight is not None:
+                flight.error = e
+            raise
+        else:
+            if flight is not None:
+                flight.result = result
+            return result
+        finally:
+            self._finish_flight(key, flight)
+
+    async def arun(self, fn: Callable[[], Any], priority: Optional[Priority] = None,
+                   key: Optional[str] = None) -> Any:
+        """
+        run() for coroutines: ``fn`` returns an awaitable
+
+        Args:
+            fn: Coroutine function making the call
+            priority: Request priority (defaults to the context priority)
+            key: Identity of the request for coalescing
+
+        Returns:
+            Result of ``await fn()``
+        """
+        if priority is None:
+            priority = current_priority()
+
+        leader, flight = self._join_flight(key)
+        if not leader:
+            await asyncio.to_thread(flight.done.wait)
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            release = await self.aacquire(priority)
+            try:
+                result = await fn()
+            finally:
+                release()
+        except BaseException as e:
+            if flight is not None:
+                flight.error = e
+            raise
+        else:
+            if flight is not None:
+                flight.result = result
+            return result
+        finally:
+            self._finish_flight(key, flight)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Queue wait metrics per priority
+
+        Returns:
+            Dict with request counts, coalesced requests, queue depth and
+            mean/p95/max wait in milliseconds per priority (recent requests)
+        """
+        with self._cond:
+            waits = {name: sorted(values) for name, values in self._waits.items()}
+            stats = dict(self.stats, queue_depth=len(self._waiting), active=self._active)
+
+        stats['wait_ms'] = {}
+        for name, values in waits.items():
+            if not values:
+                continue
+            stats['wait_ms'][name] = {
+                'count': len(values),
+                'mean': round(sum(values) / len(values) * 1000, 2),
+                'p95': round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 2),
+                'max': round(values[-1] * 1000, 2),
+            }
+        return stats
+
+
+def current_priority(default: Priority = Priority.INTERACTIVE) -> Priority:
+    """Priority set by the innermost request_priority block"""
+    priority = _current_priority.get()
+    return default if priority is None else priority
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response stream that frees the gateway slot when it is closed"""
+
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        # httpx closes the stream once it is exhausted, which frees the slot
+        return iter(self._stream)
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    """Async response stream that frees the gateway slot when it is closed"""
+
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    def __aiter__(self):
+        return self._stream.__aiter__()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+def _is_streaming(body: bytes) -> bool:
+    """Whether a request body asks for a streamed response"""
+    try:
+        return bool(json.loads(body).get("stream"))
+    except (ValueError, AttributeError):
+        return False
+
+
+def _coalesce_key(request: httpx.Request, body: bytes) -> str:
+    return hashlib.sha1(str(request.url).encode("utf-8") + b"\n" + body).hexdigest()
+
+
+def _is_gated(request: httpx.Request) -> bool:
+    return request.method == "POST" and request.url.path.endswith(GATED_PATHS)
+
+
+class GatewayTransport(httpx.BaseTransport):
+    """
+    httpx transport that routes model requests through an LLMGateway
+
+    Non-streaming requests with identical bodies are coalesced. Streaming
+    requests hold their slot until the stream is consumed or closed.
+    """
+
+    def __init__(self, gateway: LLMGateway, priority: Priority = Priority.INTERACTIVE,
+                 transport: Optional[httpx.BaseTransport] = None):
+        self.gateway = gateway
+        self.priority = priority
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not _is_gated(request):
+            return self._transport.handle_request(request)
+
+        priority = current_priority(self.priority)
+        body = request.read()
+
+        if _is_streaming(body):
+            release = self.gateway.acquire(priority)
+            try:
+                response = self._transport.handle_request(request)
+            except BaseException:
+                release()
+                raise
+            response.stream = _ReleasingStream(response.stream, release)
+            return response
+
+        def send():
+            response = self._transport.handle_request(request)
+            try:
+                raw = b"".join(response.stream)
+            finally:
+                response.close()
+            return response.status_code, response.headers.multi_items(), raw, response.extensions
+
+        status, headers, raw, extensions = self.gateway.run(send, priority, _coalesce_key(request, body))
+        return httpx.Response(status, headers=headers, content=raw,
+                              request=request, extensions=extensions)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncGatewayTransport(httpx.AsyncBaseTransport):
+    """
+    Async counterpart of GatewayTransport, for SDK calls made with await
+    (e.g. LangGraph's astream/ainvoke). Shares the same gateway, so async
+    and sync requests queue together.
+    """
+
+    def __init__(self, gateway: LLMGateway, priority: Priority = Priority.INTERACTIVE,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.gateway = gateway
+        self.priority = priority
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not _is_gated(request):
+            return await self._transport.handle_async_request(request)
+
+        priority = current_priority(self.priority)
+        body = await request.aread()
+
+        if _is_streaming(body):
+            release = await self.gateway.aacquire(priority)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except BaseException:
+                release()
+                raise
+            response.stream = _AsyncReleasingStream(response.stream, release)
+            return response
+
+        async def send():
+            response = await self._transport.handle_async_request(request)
+            try:
+                raw = b"".join([chunk async for chunk in response.stream])
+            finally:
+                await response.aclose()
+            return response.status_code, response.headers.multi_items(), raw, response.extensions
+
+        status, headers, raw, extensions = await self.gateway.arun(
+            send, priority, _coalesce_key(request, body)
+        )
+        return httpx.Response(status, headers=headers, content=raw,
+                              request=request, extensions=extensions)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get singleton gateway instance (GTD_LLM_GATEWAY_CONCURRENCY slots)"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            timeout = float(os.getenv("GTD_LLM_GATEWAY_ACQUIRE_TIMEOUT", str(DEFAULT_ACQUIRE_TIMEOUT)))
+            _gateway = LLMGateway(int(os.getenv("GTD_LLM_GATEWAY_CONCURRENCY", "1")),
+                                  acquire_timeout=timeout if timeout > 0 else None)
+        return _gateway
+
+
+def gateway_enabled() -> bool:
+    """Whether GTD_LLM_GATEWAY allows routing through the gateway (default on)"""
+    return os.getenv("GTD_LLM_GATEWAY", "true").lower() not in ("0", "false", "no", "off")
+
+
+def gateway_http_client(priority: Priority = Priority.INTERACTIVE) -> Optional[httpx.Client]:
+    """
+    httpx client for OpenAI-compatible SDKs that routes through the gateway
+
+    Args:
+        priority: Default priority for this client's requests
+
+    Returns:
+        httpx.Client, or None when the gateway is disabled (SDK default client)
+    """
+    if not gateway_enabled():
+        return None
+    return httpx.Client(transport=GatewayTransport(get_llm_gateway(), priority))
+
+
+def gateway_http_async_client(priority: Priority = Priority.INTERACTIVE) -> Optional[httpx.AsyncClient]:
+    """
+    Async httpx client for OpenAI-compatible SDKs that routes through the gateway
+
+    Args:
+        priority: Default priority for this client's requests
+
+    Returns:
+        httpx.AsyncClient, or None when the gateway is disabled (SDK default client)
+    """
+    if not gateway_enabled():
+        return None
+    return httpx.AsyncClient(transport=AsyncGatewayTransport(get_llm_gateway(), priority))
@@ -4,5 +4,21 @@ Tracks performance metrics for optimization
 """
 
 from gtd_coach.metrics.north_star import NorthStarMetrics
+from gtd_coach.metrics.registry import (
+    MetricsRegistry,
+    counter,
+    gauge,
+    get_registry,
+    histogram,
+    start_metrics_export,
+)
 
-__all__ = ['NorthStarMetrics']
\ No newline at end of file
+__all__ = [
+    'NorthStarMetrics',
+    'MetricsRegistry',
+    'counter',
+    'gauge',
+    'get_registry',
+    'histogram',
+    'start_metrics_export',
+]
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Set, Any
 from pathlib import Path
 import json
 
+from gtd_coach.persistence.artifacts import get_artifact_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -210,23 +212,18 @@ class NorthStarMetrics:
         if not data_dir:
             data_dir = Path.home() / "gtd-coach" / "data"
         
-        data_dir.mkdir(parents=True, exist_ok=True)
-        
-        metrics_file = data_dir / f"north_star_metrics_{self.session_id}.json"
-        
         try:
-            with open(metrics_file, 'w') as f:
-                json.dump({
-                    "session_id": self.session_id,
-                    "session_start": self.session_start_time.isoformat(),
-                    "metrics": self.metrics,
-                    "details": {
-                        "shown_memories": list(self.shown_memories),
-                        "used_memories": list(self.used_memories),
-                        "planned_tasks": self.planned_tasks,
-                        "completed_tasks": self.completed_tasks
-                    }
-                }, f, indent=2)
+            metrics_file = get_artifact_store(data_dir).write_json("north_star", f"north_star_metrics_{self.session_id}.json", {
+                "session_id": self.session_id,
+                "session_start": self.session_start_time.isoformat(),
+                "metrics": self.metrics,
+                "details": {
+                    "shown_memories": list(self.shown_memories),
+                    "used_memories": list(self.used_memories),
+                    "planned_tasks": self.planned_tasks,
+                    "completed_tasks": self.completed_tasks
+                }
+            }, session_id=self.session_id, when=self.session_start_time)
             
             logger.info(f"North Star metrics saved to {metrics_file.name}")
         except Exception as e:
@@ -247,7 +244,20 @@ class NorthStarMetrics:
         if not data_dir:
             data_dir = Path.home() / "gtd-coach" / "data"
         
-        metrics_file = data_dir / f"north_star_metrics_{session_id}.json"
+        store = get_artifact_store(data_dir)
+        entries = []
+        try:
+            # Timestamp-shaped session ids point straight at their week partition
+            started = datetime.strptime(session_id, "%Y%m%d_%H%M%S")
+            entries = store.find("north_star", session_id=session_id,
+                                 since=started, until=started + timedelta(days=1))
+        except ValueError:
+            pass
+        if not entries:
+            entries = store.find("north_star", session_id=session_id)
+        
+        # Flat layout written before week partitions
+        metrics_file = entries[-1]["file"] if entries else data_dir / f"north_star_metrics_{session_id}.json"
         
         if not metrics_file.exists():
             return None
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+In-process metrics registry with Prometheus text exposition
+
+Counters, gauges and fixed-bucket histograms shared by the coach, the agent
+and their integrations, replacing per-module counters and ad-hoc timing
+dicts. Counters and histograms write to per-thread shards, so recording a
+value never takes a lock; shards are only summed when the registry is
+rendered. Export is pull-only: render the text format, write it to a file
+(node_exporter textfile collector) or serve it on a localhost port.
+
+GTD_METRICS_PORT and GTD_METRICS_FILE enable export from the CLI, see
+start_metrics_export().
+"""
+
+import atexit
+import bisect
+import logging
+import math
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond bookkeeping up to slow local model turns
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_NAME_RE = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class _Shards:
+    """
+    Per-thread value arrays, summed on read
+
+    Each thread adds into its own list, so concurrent writers never contend
+    and no update can be lost between them. Arrays of finished threads are
+    folded into a retired total when read so short-lived threads don't pile up.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * size
+
+    def mine(self) -> List[float]:
+        """This thread's array"""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0.0] * self._size
+            with self._lock:
+                self._live.append((threading.current_thread(), values))
+            self._local.values = values
+            return values
+
+    def totals(self) -> List[float]:
+        """Sum over all threads"""
+        with self._lock:
+            live = []
+            for thread, values in self._live:
+                if thread.is_alive():
+                    live.append((thread, values))
+                else:
+                    self._retired = [a + b for a, b in zip(self._retired, values)]
+            self._live = live
+            totals = list(self._retired)
+            for _, values in live:
+                totals = [a + b for a, b in zip(totals, values)]
+        return totals
+
+
+class CounterChild:
+    """Monotonic counter for one label combination"""
+
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._shards.mine()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+class GaugeChild:
+    """Value that can go up and down for one label combination"""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _Timer:
+    """Observes the seconds spent inside a with block"""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+class HistogramChild:
+    """Fixed-bucket histogram for one label combination"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self._upper = list(buckets)
+        # One slot per bucket, one for +Inf, then the running sum
+        self._shards = _Shards(len(self._upper) + 2)
+
+    def observe(self, value: float) -> None:
+        values = self._shards.mine()
+        values[bisect.bisect_left(self._upper, value)] += 1
+        values[-1] += value
+
+    def time(self) -> _Timer:
+        """Context manager observing the duration of its block"""
+        return _Timer(self)
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Current state
+
+        Returns:
+            Dict with cumulative bucket counts keyed by upper bound
+            (math.inf last), total count and sum
+        """
+        totals = self._shards.totals()
+        cumulative, running = {}, 0.0
+        for bound, count in zip(self._upper + [math.inf], totals[:-1]):
+            running += count
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": running, "sum": totals[-1]}
+
+
+class _Metric:
+    """Named metric family with optional labels"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if not _NAME_RE.match(name):
+            raise ValueError(f"Invalid metric name: {name}")
+        for label in labelnames:
+            if not _LABEL_RE.match(label) or label.startswith("__") or label == "le":
+                raise ValueError(f"Invalid label name for {name}: {label}")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self.labels()  # exported as zero before first use
+
+    def labels(self, *values, **kwargs):
+        """
+        Child for one label combination (created on first use)
+
+        Args:
+            *values: Label values in labelnames order
+            **kwargs: Label values by name (instead of positional values)
+        """
+        child = self._children.get(values)
+        if child is not None:
+            # Fast path: positional string values of an existing child
+            return child
+        if kwargs:
+            if values or set(kwargs) != set(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            values = tuple(kwargs[name] for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _child_samples(self, child) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+    def samples(self) -> Iterator[Sample]:
+        """(sample name, labels, value) for every child"""
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, child in children:
+            base = dict(zip(self.labelnames, key))
+            for suffix, extra, value in self._child_samples(child):
+                yield self.name + suffix, {**base, **extra}, value
+
+
+class Counter(_Metric):
+    """Monotonic counter family"""
+
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+    def _child_samples(self, child):
+        yield "", {}, child.value
+
+
+class Gauge(_Metric):
+    """Gauge family"""
+
+    kind = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabelled().dec(amount)
+
+    def _child_samples(self, child):
+        yield "", {}, child.value
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram family"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        buckets = sorted(float(b) for b in buckets if b != math.inf)
+        if not buckets:
+            raise ValueError(f"{name} needs at least one finite bucket")
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled().observe(value)
+
+    def time(self) -> _Timer:
+        return self._unlabelled().time()
+
+    def _child_samples(self, child):
+        snapshot = child.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            yield "_bucket", {"le": _format_value(bound)}, count
+        yield "_sum", {}, snapshot["sum"]
+        yield "_count", {}, snapshot["count"]
+
+
+class MetricsRegistry:
+    """Set of metric families rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str,
+                       labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"{name} is already registered as a {metric.kind} "
+                                 f"with labels {metric.labelnames}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register (or fetch the already registered) counter"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register (or fetch the already registered) gauge"""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Register (or fetch the already registered) histogram"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                    name = f"{name}{{{rendered}}}"
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_textfile(self, path: Path) -> None:
+        """
+        Write the exposition to a file atomically
+
+        Args:
+            path: Target file (e.g. in a node_exporter textfile directory)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temp.write_text(self.render())
+        os.replace(temp, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve GET /metrics from a daemon thread
+
+        Args:
+            port: Port to listen on (0 picks a free one, see server_port)
+            host: Interface to bind; localhost unless deliberately exposed
+
+        Returns:
+            The running server (call shutdown() to stop it)
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide registry used by the coach and its integrations"""
+    return _registry
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Counter on the process-wide registry"""
+    return _registry.counter(name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """Gauge on the process-wide registry"""
+    return _registry.gauge(name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Histogram on the process-wide registry"""
+    return _registry.histogram(name, documentation, labelnames, buckets)
+
+
+def start_metrics_export() -> Optional[ThreadingHTTPServer]:
+    """
+    Start the exports configured in the environment
+
+    GTD_METRICS_PORT serves the registry on that localhost port for the life
+    of the process; GTD_METRICS_FILE writes it to that file at exit.
+
+    Returns:
+        The HTTP server when GTD_METRICS_PORT is set, else None
+    """
+    server = None
+    port = os.getenv("GTD_METRICS_PORT")
+    if port:
+        try:
+            server = _registry.serve(int(port))
+            logger.info(f"Serving metrics on http://127.0.0.1:{server.server_port}/metrics")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not serve metrics on port {port}: {e}")
+
+    path = os.getenv("GTD_METRICS_FILE")
+    if path:
+        def write_metrics():
+            try:
+                _registry.write_textfile(Path(path).expanduser())
+            except OSError as e:
+                logger.warning(f"Could not write metrics to {path}: {e}")
+        atexit.register(write_metrics)
+    return server
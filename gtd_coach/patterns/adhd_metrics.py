@@ -4,43 +4,44 @@ ADHD Pattern Detection for GTD Coach
 Analyzes linguistic markers and behavioral patterns based on research
 """
 
-import re
 import time
 import logging
 from typing import List, Dict, Tuple, Optional, Set
-from collections import Counter
 from datetime import datetime
 
+from gtd_coach.patterns.keywords import KEYWORDS, RULE_TABLES, KeywordHits
+
 logger = logging.getLogger(__name__)
 
 
+class _MindsweepState:
+    """Running counters for incremental mindsweep coherence"""
+    
+    def __init__(self):
+        self.item_count = 0
+        self.topic_sequence: List[str] = []
+        self.topic_switches = 0
+        self.word_count = 0
+        self.unique_words: Set[str] = set()
+        self.item_word_total = 0
+        self.fragmentation_indicators: List[Dict] = []
+        self.first_item: Optional[str] = None
+        self.last_item: Optional[str] = None
+
+
 class ADHDPatternDetector:
     """Detects ADHD-related patterns in user interactions"""
     
     def __init__(self):
-        # Common confusion expressions from research
-        self.confusion_markers = [
-            r"i don'?t know",
-            r"not sure",
-            r"maybe",
-            r"confused",
-            r"forgot",
-            r"can'?t remember",
-            r"what was",
-            r"um+",
-            r"uh+",
-            r"hmm+"
-        ]
+        # Common confusion expressions from research (literal forms in
+        # patterns/keywords.py, matched by the shared compiled matcher)
+        self.confusion_markers = list(RULE_TABLES['confusion_marker'])
         
         # Topic categories for detecting switches
-        self.topic_keywords = {
-            'work': ['project', 'task', 'meeting', 'deadline', 'boss', 'client', 'email', 'report'],
-            'personal': ['home', 'family', 'friend', 'personal', 'hobby', 'exercise', 'health'],
-            'financial': ['money', 'pay', 'bill', 'budget', 'expense', 'save', 'cost'],
-            'learning': ['learn', 'study', 'course', 'book', 'skill', 'practice', 'read'],
-            'admin': ['appointment', 'schedule', 'calendar', 'plan', 'organize', 'clean'],
-            'tech': ['computer', 'software', 'app', 'phone', 'website', 'code', 'system']
-        }
+        self.topic_keywords = RULE_TABLES['topic']
+        
+        # Running mindsweep state for incremental analysis
+        self.reset_mindsweep()
         
     def analyze_mindsweep_coherence(self, items: List[str]) -> Dict[str, any]:
         """
@@ -52,7 +53,100 @@ class ADHDPatternDetector:
         Returns:
             Dictionary of analysis metrics
         """
-        if not items:
+        state = _MindsweepState()
+        for item in items:
+            self._ingest_item(state, item)
+        return self._mindsweep_metrics(state)
+    
+    def reset_mindsweep(self) -> None:
+        """Clear the running mindsweep state used by add_mindsweep_item"""
+        self._mindsweep = _MindsweepState()
+    
+    def add_mindsweep_item(self, item: str) -> Dict[str, any]:
+        """
+        Ingest one mindsweep item and return metrics for all items so far
+        
+        Cost depends only on the new item, not on how many were captured
+        before it. Results match analyze_mindsweep_coherence on the same items.
+        
+        Args:
+            item: New mindsweep item
+            
+        Returns:
+            Dictionary of analysis metrics (list values are shared with the
+            running state; copy before modifying)
+        """
+        self._ingest_item(self._mindsweep, item)
+        return self._mindsweep_metrics(self._mindsweep)
+    
+    def update_mindsweep(self, items: List[str]) -> Dict[str, any]:
+        """
+        Bring the running state up to date with a growing item list
+        
+        Only items added since the last call are ingested. If ``items`` no
+        longer extends what was seen (replaced or reordered list) the state
+        is rebuilt from scratch.
+        
+        Args:
+            items: Current mindsweep items
+            
+        Returns:
+            Dictionary of analysis metrics
+        """
+        state = self._mindsweep
+        seen = state.item_count
+        if seen and (len(items) < seen or items[0] != state.first_item
+                     or items[seen - 1] != state.last_item):
+            self.reset_mindsweep()
+            state = self._mindsweep
+            seen = 0
+        
+        for item in items[seen:]:
+            self._ingest_item(state, item)
+        return self._mindsweep_metrics(state)
+    
+    def _ingest_item(self, state: '_MindsweepState', item: str) -> None:
+        """Update running mindsweep counters with one item"""
+        index = state.item_count
+        lowered = item.lower()
+        
+        hits = KEYWORDS.scan(lowered)
+        topic = self._categorize_topic(lowered, hits)
+        if state.topic_sequence and state.topic_sequence[-1] != topic:
+            state.topic_switches += 1
+        state.topic_sequence.append(topic)
+        
+        words = lowered.split()
+        state.word_count += len(words)
+        state.unique_words.update(words)
+        state.item_word_total += len(item.split())
+        
+        # Detect fragmentation
+        if len(item.split()) < 3:  # Very short items
+            state.fragmentation_indicators.append({
+                'index': index,
+                'type': 'short_fragment',
+                'content': item
+            })
+        
+        # Check for confusion markers
+        marker = hits.first('confusion_marker')
+        if marker:
+            state.fragmentation_indicators.append({
+                'index': index,
+                'type': 'confusion_expression',
+                'marker': marker,
+                'content': item
+            })
+        
+        if index == 0:
+            state.first_item = item
+        state.last_item = item
+        state.item_count += 1
+    
+    def _mindsweep_metrics(self, state: '_MindsweepState') -> Dict[str, any]:
+        """Build the coherence metrics dict from running counters"""
+        if not state.item_count:
             return {
                 'coherence_score': 0,
                 'topic_switches': 0,
@@ -60,52 +154,22 @@ class ADHDPatternDetector:
                 'fragmentation_indicators': []
             }
         
-        # Analyze topic switches
-        topic_sequence = []
-        for item in items:
-            topic = self._categorize_topic(item.lower())
-            topic_sequence.append(topic)
-        
-        topic_switches = self._count_topic_switches(topic_sequence)
-        
         # Calculate lexical diversity
-        all_words = ' '.join(items).lower().split()
-        unique_words = set(all_words)
-        lexical_diversity = len(unique_words) / len(all_words) if all_words else 0
-        
-        # Detect fragmentation
-        fragmentation_indicators = []
-        for i, item in enumerate(items):
-            if len(item.split()) < 3:  # Very short items
-                fragmentation_indicators.append({
-                    'index': i,
-                    'type': 'short_fragment',
-                    'content': item
-                })
-            
-            # Check for confusion markers
-            for marker in self.confusion_markers:
-                if re.search(marker, item.lower()):
-                    fragmentation_indicators.append({
-                        'index': i,
-                        'type': 'confusion_expression',
-                        'marker': marker,
-                        'content': item
-                    })
-                    break
+        lexical_diversity = len(state.unique_words) / state.word_count if state.word_count else 0
         
         # Calculate coherence score (0-1)
-        coherence_score = self._calculate_coherence_score(
-            items, topic_switches, lexical_diversity, fragmentation_indicators
+        coherence_score = self._score_coherence(
+            state.item_count, state.topic_switches, lexical_diversity,
+            len(state.fragmentation_indicators)
         )
         
         return {
             'coherence_score': coherence_score,
-            'topic_switches': topic_switches,
-            'topic_sequence': topic_sequence,
+            'topic_switches': state.topic_switches,
+            'topic_sequence': state.topic_sequence,
             'lexical_diversity': round(lexical_diversity, 3),
-            'fragmentation_indicators': fragmentation_indicators,
-            'average_item_length': sum(len(item.split()) for item in items) / len(items)
+            'fragmentation_indicators': state.fragmentation_indicators,
+            'average_item_length': state.item_word_total / state.item_count
         }
     
     def calculate_focus_score(self, phase_data: Dict[str, any]) -> Dict[str, float]:
@@ -186,7 +250,7 @@ class ADHDPatternDetector:
             }
             
             # Check if the switch seems fragmented
-            if any(re.search(marker, current_item.lower()) for marker in self.confusion_markers):
+            if KEYWORDS.scan(current_item).has('confusion_marker'):
                 switch_data['includes_confusion'] = True
             
             return switch_data
@@ -209,15 +273,15 @@ class ADHDPatternDetector:
         
         for interaction in interactions:
             content = interaction.get('content', '').lower()
+            hits = KEYWORDS.scan(content)
             
             # Count clarification requests
-            if any(phrase in content for phrase in ['what do you mean', 'can you explain', 
-                                                   'not sure what', "don't understand"]):
+            if hits.has('clarification_request'):
                 clarification_requests += 1
             
             # Detect potential off-topic responses
             if interaction.get('role') == 'user' and 'expected_topic' in interaction:
-                actual_topic = self._categorize_topic(content)
+                actual_topic = self._categorize_topic(content, hits)
                 if actual_topic != interaction['expected_topic']:
                     off_topic_count += 1
             
@@ -234,14 +298,9 @@ class ADHDPatternDetector:
             'total_interactions': len(interactions)
         }
     
-    def _categorize_topic(self, text: str) -> str:
+    def _categorize_topic(self, text: str, hits: Optional[KeywordHits] = None) -> str:
         """Categorize text into a topic based on keywords"""
-        topic_scores = Counter()
-        
-        for topic, keywords in self.topic_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    topic_scores[topic] += 1
+        topic_scores = (hits or KEYWORDS.scan(text)).counts('topic')
         
         if topic_scores:
             return topic_scores.most_common(1)[0][0]
@@ -266,11 +325,17 @@ class ADHDPatternDetector:
         Calculate overall coherence score (0-1)
         Higher score = more coherent
         """
+        return self._score_coherence(len(items), topic_switches, lexical_diversity,
+                                     len(fragmentation_indicators))
+    
+    def _score_coherence(self, item_count: int, topic_switches: int,
+                         lexical_diversity: float, fragment_count: int) -> float:
+        """Coherence score from counts (see _calculate_coherence_score)"""
         # Base score
         score = 1.0
         
         # Penalize for topic switches (normalized by number of items)
-        switch_penalty = (topic_switches / max(len(items) - 1, 1)) * 0.3
+        switch_penalty = (topic_switches / max(item_count - 1, 1)) * 0.3
         score -= switch_penalty
         
         # Penalize for low lexical diversity (indicates repetition)
@@ -280,7 +345,7 @@ class ADHDPatternDetector:
             score -= 0.1  # Too high might indicate disconnected thoughts
         
         # Penalize for fragmentation
-        fragmentation_penalty = (len(fragmentation_indicators) / len(items)) * 0.4
+        fragmentation_penalty = (fragment_count / item_count) * 0.4
         score -= fragmentation_penalty
         
         return max(0, min(1, score))
@@ -5,33 +5,62 @@ Provides zero-friction memory retrieval for ADHD support
 """
 
 import json
-import glob
 from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
 
+from gtd_coach.persistence.artifacts import get_artifact_store
+
 class PatternDetector:
     """Lightweight pattern detection for recurring GTD items"""
     
-    def __init__(self, data_dir: Path = None):
+    def __init__(self, data_dir: Path = None, store=None):
+        """
+        Args:
+            data_dir: Data directory holding mindsweep artifacts
+            store: SessionStore to query; when neither is given the shared
+                session store is used, falling back to the default data dir
+        """
+        self.store = store
+        self._use_shared_store = data_dir is None and store is None
         self.data_dir = data_dir or Path.home() / "gtd-coach" / "data"
     
-    def find_recurring_patterns(self, weeks_back: int = 4) -> List[Dict[str, Any]]:
-        """Find items that appear across multiple mindsweep sessions"""
-        all_items = []
-        
-        # Load recent mindsweep files
-        mindsweep_files = sorted(glob.glob(str(self.data_dir / "mindsweep_*.json")))[-weeks_back:]
-        
-        for file_path in mindsweep_files:
+    def _get_store(self):
+        """Session store to read from, if any"""
+        if self.store is None and self._use_shared_store:
             try:
-                with open(file_path) as f:
-                    data = json.load(f)
-                    items = data.get('items', [])
-                    all_items.extend([(item.lower(), file_path) for item in items])
-            except (json.JSONDecodeError, FileNotFoundError):
+                from gtd_coach.persistence.session_store import get_session_store
+                self.store = get_session_store()
+                self.store.import_legacy_files(self.data_dir)
+            except Exception:
+                self._use_shared_store = False
+        return self.store
+    
+    def _load_recent_items(self, weeks_back: int) -> List[Tuple[str, str]]:
+        """
+        (lowercased item, session) pairs of the last N ISO weeks (including
+        the current one), from the store, else from the JSON artifacts
+        """
+        store = self._get_store()
+        if store is not None and store.has_items():
+            return [(row['item'].lower(), row['session_id'])
+                    for row in store.get_items(weeks=weeks_back)]
+        
+        all_items = []
+        artifacts = get_artifact_store(self.data_dir)
+        for entry in artifacts.find("mindsweep", weeks=weeks_back):
+            data = artifacts.load(entry)
+            if data is None:
                 continue
+            items = data.get('items', [])
+            all_items.extend([(item.lower(), str(entry['file'])) for item in items])
+        return all_items
+    
+    def find_recurring_patterns(self, weeks_back: int = 4) -> List[Dict[str, Any]]:
+        """Find items that appear across multiple mindsweep sessions"""
+        # Load recent mindsweep items (session store, or legacy JSON files)
+        all_items = self._load_recent_items(weeks_back)
         
         # Find recurring themes using key phrase extraction
         patterns = {}
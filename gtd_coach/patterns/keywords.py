@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Compiled keyword matching for the heuristic classifiers
+All keyword rule tables live here and are compiled once at import into a
+single regex, so a text is classified against every table in one pass
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+
+# Rule tables: table name -> label -> keywords. Labels are checked in order,
+# so ``first()`` returns the same label as the original if/elif chains.
+# Matching is case-insensitive substring matching (like ``word in text``).
+RULE_TABLES: Dict[str, Dict[Any, List[str]]] = {
+    # ADHDPatternDetector topic categories
+    'topic': {
+        'work': ['project', 'task', 'meeting', 'deadline', 'boss', 'client', 'email', 'report'],
+        'personal': ['home', 'family', 'friend', 'personal', 'hobby', 'exercise', 'health'],
+        'financial': ['money', 'pay', 'bill', 'budget', 'expense', 'save', 'cost'],
+        'learning': ['learn', 'study', 'course', 'book', 'skill', 'practice', 'read'],
+        'admin': ['appointment', 'schedule', 'calendar', 'plan', 'organize', 'clean'],
+        'tech': ['computer', 'software', 'app', 'phone', 'website', 'code', 'system'],
+    },
+    # ADHDPatternDetector confusion markers: regex -> literal strings it can match
+    # (re.search(r"um+", text) matches exactly when "um" is in text)
+    'confusion_marker': {
+        r"i don'?t know": ["i don't know", "i dont know"],
+        r"not sure": ["not sure"],
+        r"maybe": ["maybe"],
+        r"confused": ["confused"],
+        r"forgot": ["forgot"],
+        r"can'?t remember": ["can't remember", "cant remember"],
+        r"what was": ["what was"],
+        r"um+": ["um"],
+        r"uh+": ["uh"],
+        r"hmm+": ["hmm"],
+    },
+    # UserStateMonitor confusion phrases
+    'confusion_phrase': {
+        'confused': [
+            "i don't understand", "confused", "not sure",
+            "what do you mean", "can you explain", "lost",
+            "don't get it", "huh", "wait what"
+        ],
+    },
+    # ADHDPatternDetector.analyze_interaction_patterns clarification requests
+    'clarification_request': {
+        'clarification': ['what do you mean', 'can you explain', 'not sure what', "don't understand"],
+    },
+    # agent/tools/gtd.py clarification
+    'gtd_actionable': {
+        'actionable': ['need to', 'have to', 'should', 'must', 'will', 'want to', 'plan to'],
+    },
+    'gtd_project': {
+        'project': ['project', 'implement', 'organize', 'create', 'build', 'develop', 'launch'],
+    },
+    'gtd_category': {
+        'someday': ['someday', 'maybe', 'possibly', 'idea'],
+        'reference': ['reference', 'info', 'note', 'fyi'],
+        'waiting': ['waiting', 'pending', 'need from'],
+    },
+    'gtd_context': {
+        '@phone': ['call', 'phone', 'dial'],
+        '@computer': ['email', 'send', 'reply'],
+        '@office': ['meeting', 'discuss', 'talk'],
+        '@errands': ['buy', 'shop', 'pick up'],
+        '@home': ['home', 'house', 'apartment'],
+    },
+    'gtd_time_estimate': {
+        5: ['quick', 'simple', 'just'],           # Quick tasks
+        10: ['email', 'call', 'message'],         # Communication tasks
+        20: ['review', 'read', 'check'],          # Review tasks
+        45: ['create', 'write', 'develop', 'analyze'],  # Complex tasks
+    },
+    'gtd_energy': {
+        'high': ['create', 'analyze', 'design', 'write', 'develop'],
+        'medium': ['review', 'organize', 'plan'],
+    },
+    'abc_priority': {
+        'A': ['urgent', 'asap', 'today', 'deadline', 'critical'],
+        'B': ['tomorrow', 'this week', 'soon'],
+    },
+    # integrations/timing_comparison.py time sink categories
+    'time_sink': {
+        'browsing': ['safari', 'chrome', 'firefox', 'browser'],
+        'communication': ['mail', 'email', 'slack', 'discord', 'messages'],
+        'entertainment': ['youtube', 'netflix', 'spotify', 'music'],
+        'development': ['code', 'xcode', 'terminal', 'docker', 'git'],
+        'documentation': ['word', 'docs', 'notion', 'obsidian', 'notes'],
+        'meetings': ['zoom', 'meet', 'teams', 'webex'],
+    },
+}
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie of the words
+
+    Branches start with distinct characters, so at most one branch can
+    continue at each step and the greedy match is the longest word.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordHits:
+    """Result of scanning one text: which labels of which tables matched"""
+
+    __slots__ = ('keywords', '_labels', '_matcher')
+
+    def __init__(self, matcher: 'KeywordMatcher', keywords: FrozenSet[str]):
+        self.keywords = keywords
+        self._matcher = matcher
+        # table -> {label index: distinct keywords matched}
+        self._labels: Dict[str, Dict[int, int]] = {}
+        for keyword in keywords:
+            for table, index in matcher._owners[keyword]:
+                labels = self._labels.setdefault(table, {})
+                labels[index] = labels.get(index, 0) + 1
+
+    def first(self, table: str, default: Any = None) -> Any:
+        """First label (in table order) with any keyword in the text"""
+        labels = self._labels.get(table)
+        if not labels:
+            return default
+        return self._matcher.labels[table][min(labels)]
+
+    def has(self, table: str, label: Any = None) -> bool:
+        """Whether the label (or any label of the table) matched"""
+        labels = self._labels.get(table)
+        if not labels:
+            return False
+        if label is None:
+            return True
+        return self._matcher.labels[table].index(label) in labels
+
+    def counts(self, table: str) -> Counter:
+        """Distinct keywords matched per label, in table order"""
+        labels = self._labels.get(table, {})
+        names = self._matcher.labels[table]
+        return Counter({names[index]: labels[index] for index in sorted(labels)})
+
+
+class KeywordMatcher:
+    """
+    Classifies text against many keyword tables with one compiled regex
+
+    A zero-width lookahead finds the longest keyword starting at every
+    position; shorter keywords starting at the same position are its
+    prefixes and are added from a precomputed table. The result is the
+    exact set of keywords occurring as substrings, as ``word in text``
+    would report for each keyword.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[Any, List[str]]]):
+        """
+        Compile the rule tables
+
+        Args:
+            tables: Table name -> label -> keywords (lowercase)
+        """
+        self.tables = tables
+        self.labels: Dict[str, List[Any]] = {
+            table: list(rules.keys()) for table, rules in tables.items()
+        }
+        owners: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        for table, rules in tables.items():
+            for index, keywords in enumerate(rules.values()):
+                for keyword in keywords:
+                    owner = (table, index)
+                    if owner not in owners[keyword.lower()]:
+                        owners[keyword.lower()].append(owner)
+        self._owners = dict(owners)
+
+        keywords = sorted(self._owners)
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(k for k in keywords if keyword.startswith(k))
+            for keyword in keywords
+        }
+        self._pattern = re.compile(f"(?=({_trie_regex(keywords)}))")
+
+    def scan(self, text: str) -> KeywordHits:
+        """
+        Find every keyword of every table in the text (single pass)
+
+        Args:
+            text: Text to classify (case-insensitive)
+
+        Returns:
+            KeywordHits for label lookups
+        """
+        found = set()
+        prefixes = self._prefixes
+        for match in self._pattern.finditer(text.lower()):
+            found.update(prefixes[match.group(1)])
+        return KeywordHits(self, frozenset(found))
+
+
+# Shared matcher compiled once at import
+KEYWORDS = KeywordMatcher(RULE_TABLES)
+
+
+def scan(text: str) -> KeywordHits:
+    """Scan text with the shared matcher"""
+    return KEYWORDS.scan(text)
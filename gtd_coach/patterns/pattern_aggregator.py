@@ -12,7 +12,8 @@ from datetime import datetime, timedelta
 import numpy as np
 from scipy import stats
 from collections import deque
-import glob
+
+from gtd_coach.analytics.warehouse import get_warehouse
 
 logger = logging.getLogger(__name__)
 
@@ -43,18 +44,9 @@ class EvaluationAggregator:
         Returns:
             List of evaluation data dictionaries
         """
-        eval_files = sorted(glob.glob(str(self.eval_dir / "eval_*.json")))[-limit:]
-        evaluations = []
-        
-        for file_path in eval_files:
-            try:
-                with open(file_path) as f:
-                    eval_data = json.load(f)
-                    evaluations.append(eval_data)
-            except Exception as e:
-                logger.error(f"Failed to load {file_path}: {e}")
-        
-        return evaluations
+        # Most recent by file name, as the eval_<session_id>.json files sort by time
+        warehouse = get_warehouse(self.data_dir)
+        return [row['data'] for row in warehouse.query('evaluation', limit=limit, order='name')]
     
     def calculate_rolling_average(self, metric_name: str, 
                                  evaluations: Optional[List[Dict]] = None) -> Dict[str, float]:
@@ -6,18 +6,83 @@ Provides lightweight cross-session tracking of ADHD patterns
 
 import json
 import logging
+import sqlite3
+import threading
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from collections import defaultdict
+
+from gtd_coach.persistence.artifacts import get_artifact_store
 
 logger = logging.getLogger(__name__)
 
+# Timestamps are UTC epoch seconds; day is the UTC date (YYYY-MM-DD)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    effectiveness REAL,
+    intervention_types TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp);
+
+CREATE TABLE IF NOT EXISTS session_patterns (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    pattern_type TEXT NOT NULL,
+    severity TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_patterns_timestamp_type ON session_patterns(timestamp, pattern_type);
+CREATE INDEX IF NOT EXISTS idx_patterns_type_timestamp ON session_patterns(pattern_type, timestamp);
+
+CREATE TABLE IF NOT EXISTS session_interventions (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    intervention_type TEXT NOT NULL,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_interventions_session ON session_interventions(session_id);
+
+-- Running pattern counts per UTC day, updated with every saved session
+CREATE TABLE IF NOT EXISTS pattern_daily (
+    pattern_type TEXT NOT NULL,
+    day TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    last_timestamp REAL NOT NULL,
+    last_severity TEXT,
+    PRIMARY KEY (day, pattern_type)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _epoch(timestamp: str) -> float:
+    """UTC epoch seconds of an ISO timestamp (naive means UTC)"""
+    when = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def _utc_day(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d')
+
 
 class PatternPersistence:
     """
-    Lightweight JSON-based persistence for ADHD patterns
-    Tracks patterns across sessions without complex database dependencies
+    Cross-session persistence for ADHD patterns
+    
+    Each session is written as a JSON file (week-partitioned artifacts) and
+    indexed in an embedded SQLite database (patterns.db in the data
+    directory), which answers every query. Recurring-pattern counts are
+    kept per day as sessions are saved, so lookups cost the same however
+    much history has built up. Session files written before the index
+    existed are imported once, when the index is created.
     """
     
     def __init__(self, data_dir: Optional[Path] = None):
@@ -35,6 +100,18 @@ class PatternPersistence:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.sessions_dir = self.data_dir / 'sessions'
         self.sessions_dir.mkdir(exist_ok=True)
+        # Session files live in week partitions (sessions/YYYY/Www/) with a manifest
+        self.artifacts = get_artifact_store(self.sessions_dir)
+        
+        self.db_path = self.data_dir / 'patterns.db'
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        if not self._meta('json_imported'):
+            self.import_json_sessions()
         
         # Cache for current session
         self.current_session_patterns = []
@@ -56,26 +133,151 @@ class PatternPersistence:
         """
         import uuid
         # Use timestamp plus UUID suffix to ensure uniqueness
-        timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+        now = datetime.now(timezone.utc)
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         unique_suffix = str(uuid.uuid4())[:8]
         session_id = f"{timestamp}_{unique_suffix}"
-        session_file = self.sessions_dir / f'{session_id}.json'
         
         session_data = {
             'session_id': session_id,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': now.isoformat(),
             'patterns': patterns,
             'interventions': interventions,
             'outcomes': outcomes,
             'effectiveness': self._calculate_effectiveness(patterns, outcomes)
         }
         
-        with open(session_file, 'w') as f:
-            json.dump(session_data, f, indent=2)
+        session_file = self.artifacts.write_json(
+            'pattern_session', f'{session_id}.json', session_data, session_id=session_id, when=now
+        )
+        with self._lock:
+            self._index_session(session_data, now.timestamp())
+            self._conn.commit()
         
         logger.info(f"Saved session patterns to {session_file}")
         return session_id
     
+    def _index_session(self, session_data: Dict[str, Any], timestamp: float) -> bool:
+        """
+        Add one session to the index and the daily pattern counts (caller holds
+        the lock and commits)
+        
+        Returns:
+            False if the session was already indexed
+        """
+        session_id = session_data['session_id']
+        interventions = [i for i in session_data.get('interventions', []) if isinstance(i, dict)]
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO sessions (session_id, timestamp, effectiveness, intervention_types) "
+            "VALUES (?, ?, ?, ?)",
+            (session_id, timestamp, session_data.get('effectiveness', 0.5),
+             json.dumps([i.get('type') for i in interventions]))
+        )
+        if cursor.rowcount == 0:
+            return False
+        
+        patterns = [p for p in session_data.get('patterns', []) if isinstance(p, dict)]
+        self._conn.executemany(
+            "INSERT INTO session_patterns (session_id, timestamp, pattern_type, severity) "
+            "VALUES (?, ?, ?, ?)",
+            [(session_id, timestamp, p.get('type', 'unknown'), p.get('severity', 'unknown'))
+             for p in patterns]
+        )
+        self._conn.executemany(
+            "INSERT INTO session_interventions (session_id, intervention_type, context) VALUES (?, ?, ?)",
+            [(session_id, i.get('type'), json.dumps(i.get('context', {}), default=str))
+             for i in interventions]
+        )
+        # The first pattern of a type in the newest session supplies its details
+        day = _utc_day(timestamp)
+        self._conn.executemany(
+            "INSERT INTO pattern_daily (pattern_type, day, count, last_timestamp, last_severity) "
+            "VALUES (?, ?, 1, ?, ?) "
+            "ON CONFLICT (day, pattern_type) DO UPDATE SET count = count + 1, "
+            "last_severity = CASE WHEN excluded.last_timestamp > last_timestamp "
+            "THEN excluded.last_severity ELSE last_severity END, "
+            "last_timestamp = MAX(last_timestamp, excluded.last_timestamp)",
+            [(p.get('type', 'unknown'), day, timestamp, p.get('severity', 'unknown')) for p in patterns]
+        )
+        return True
+    
+    def import_json_sessions(self) -> int:
+        """
+        Index session files that are not in the database yet
+        
+        Runs automatically when the index is first created; safe to run again
+        (already indexed sessions are skipped).
+        
+        Returns:
+            Number of sessions imported
+        """
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT session_id FROM sessions")}
+        
+        imported = 0
+        for entry in self.artifacts.find('pattern_session'):
+            session_id = entry.get('session') or entry['file'].stem
+            if session_id in known:
+                continue
+            session_data = self.artifacts.load(entry)
+            if not isinstance(session_data, dict):
+                logger.warning(f"Skipping unreadable pattern session {entry.get('path')}")
+                continue
+            session_data.setdefault('session_id', session_id)
+            try:
+                if session_data.get('timestamp'):
+                    timestamp = _epoch(session_data['timestamp'])
+                else:
+                    # Manifest times are local and naive
+                    timestamp = datetime.fromisoformat(entry['timestamp']).timestamp()
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping pattern session {session_id} without a valid timestamp: {e}")
+                continue
+            with self._lock:
+                if self._index_session(session_data, timestamp):
+                    imported += 1
+            known.add(session_id)
+        
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                               (datetime.now(timezone.utc).isoformat(),))
+            self._conn.commit()
+        if imported:
+            logger.info(f"Imported {imported} pattern sessions into {self.db_path.name}")
+        return imported
+    
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def close(self) -> None:
+        """Close the index database"""
+        with self._lock:
+            self._conn.close()
+    
+    def session_file(self, session_id: str) -> Optional[Path]:
+        """
+        Path of a saved session's file
+        
+        Args:
+            session_id: Session ID returned by save_session_patterns
+        
+        Returns:
+            Path of the session file, or None if not found
+        """
+        try:
+            # Session ids start with their UTC timestamp, which picks the partition
+            started = datetime.strptime(session_id[:15], '%Y%m%d_%H%M%S').replace(tzinfo=timezone.utc)
+            entries = self.artifacts.find('pattern_session', session_id=session_id,
+                                          since=started, until=started + timedelta(seconds=1))
+        except ValueError:
+            entries = self.artifacts.find('pattern_session', session_id=session_id)
+        if entries:
+            return entries[-1]['file']
+        legacy = self.sessions_dir / f'{session_id}.json'
+        return legacy if legacy.exists() else None
+    
     def load_recent_patterns(self, weeks_back: int = 4) -> List[Dict[str, Any]]:
         """
         Load patterns from recent sessions
@@ -86,53 +288,49 @@ class PatternPersistence:
         Returns:
             List of patterns that appeared 3+ times
         """
-        cutoff_date = datetime.now(timezone.utc) - timedelta(weeks=weeks_back)
-        pattern_counts = defaultdict(int)
-        pattern_details = {}
-        
-        # Scan session files
-        for session_file in sorted(self.sessions_dir.glob('*.json'), reverse=True):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                
-                # Check if session is within time range - handle both string and missing timestamp
-                timestamp = session_data.get('timestamp')
-                if timestamp:
-                    session_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    if session_time < cutoff_date:
-                        continue
-                
-                # Count patterns
-                for pattern in session_data.get('patterns', []):
-                    pattern_key = pattern.get('type', 'unknown')
-                    pattern_counts[pattern_key] += 1
-                    
-                    # Store latest details
-                    if pattern_key not in pattern_details:
-                        pattern_details[pattern_key] = pattern
-                
-            except Exception as e:
-                logger.debug(f"Failed to load session {session_file}: {e}")
+        cutoff = (datetime.now(timezone.utc) - timedelta(weeks=weeks_back)).timestamp()
+        cutoff_day = _utc_day(cutoff)
+        next_day = (datetime.strptime(cutoff_day, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+                    + timedelta(days=1)).timestamp()
+        
+        with self._lock:
+            # Whole days after the cutoff come from the running daily counts;
+            # only the cutoff day itself is counted from its sessions
+            rows = self._conn.execute(
+                "SELECT pattern_type, SUM(count), MAX(last_timestamp), last_severity "
+                "FROM pattern_daily WHERE day > ? GROUP BY pattern_type",
+                (cutoff_day,)
+            ).fetchall()
+            rows += self._conn.execute(
+                "SELECT pattern_type, COUNT(*), MAX(timestamp), severity FROM session_patterns "
+                "WHERE timestamp >= ? AND timestamp < ? GROUP BY pattern_type",
+                (cutoff, next_day)
+            ).fetchall()
+        
+        # pattern type -> [count, latest timestamp, latest severity]
+        pattern_counts: Dict[str, list] = {}
+        for pattern_type, count, latest, severity in rows:
+            current = pattern_counts.setdefault(pattern_type, [0, latest, severity])
+            current[0] += count
+            if latest > current[1]:
+                current[1:] = [latest, severity]
         
         # Find recurring patterns (3+ appearances) OR all patterns if threshold not met
         recurring = []
-        min_count = 3 if sum(pattern_counts.values()) >= 9 else 1  # Adaptive threshold
+        min_count = 3 if sum(c[0] for c in pattern_counts.values()) >= 9 else 1  # Adaptive threshold
         
-        for pattern_type, count in pattern_counts.items():
+        # Most frequent first, most recently seen first among equals
+        for pattern_type, (count, _, severity) in sorted(pattern_counts.items(),
+                                                        key=lambda item: (-item[1][0], -item[1][1])):
             if count >= min_count:
-                details = pattern_details.get(pattern_type, {})
                 recurring.append({
                     'pattern': pattern_type,
                     'frequency': count,
                     'weeks_seen': min(weeks_back, count),  # Approximate
-                    'severity': details.get('severity', 'unknown'),
+                    'severity': severity or 'unknown',
                     'recommendation': self._get_recommendation(pattern_type)
                 })
         
-        # Sort by frequency
-        recurring.sort(key=lambda x: x['frequency'], reverse=True)
-        
         return recurring
     
     def track_intervention(self, intervention_type: str, context: Dict[str, Any]) -> None:
@@ -169,24 +367,19 @@ class PatternPersistence:
         Returns:
             History with effectiveness metrics
         """
-        effectiveness_scores = []
-        contexts = []
-        
-        # Scan recent sessions
-        for session_file in sorted(self.sessions_dir.glob('*.json'), reverse=True)[:20]:
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                
-                # Find interventions of this type
-                for intervention in session_data.get('interventions', []):
-                    if intervention.get('type') == intervention_type:
-                        effectiveness = session_data.get('effectiveness', 0.5)
-                        effectiveness_scores.append(effectiveness)
-                        contexts.append(intervention.get('context', {}))
-                
-            except Exception as e:
-                logger.warning(f"Failed to analyze session {session_file}: {e}")
+        # Uses of this intervention in the 20 most recent sessions, newest first
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.effectiveness, i.context FROM "
+                "(SELECT session_id, timestamp, effectiveness FROM sessions "
+                " ORDER BY timestamp DESC LIMIT 20) s "
+                "JOIN session_interventions i ON i.session_id = s.session_id "
+                "WHERE i.intervention_type = ? ORDER BY s.timestamp DESC, i.id",
+                (intervention_type,)
+            ).fetchall()
+        
+        effectiveness_scores = [0.5 if effectiveness is None else effectiveness for effectiveness, _ in rows]
+        contexts = [json.loads(context) if context else {} for _, context in rows]
         
         if not effectiveness_scores:
             return {'found': False}
@@ -254,33 +447,27 @@ class PatternPersistence:
         Returns:
             Evolution history
         """
-        evolution = []
-        cutoff_date = datetime.now(timezone.utc) - timedelta(weeks=weeks)
-        
-        for session_file in sorted(self.sessions_dir.glob('*.json')):
-            try:
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-                
-                session_time = datetime.fromisoformat(session_data['timestamp'].replace('Z', '+00:00'))
-                if session_time < cutoff_date:
-                    continue
-                
-                # Find this pattern type
-                for pattern in session_data.get('patterns', []):
-                    if pattern.get('type') == pattern_type:
-                        evolution.append({
-                            'date': session_time.date().isoformat(),
-                            'severity': pattern.get('severity', 'unknown'),
-                            'interventions': [i['type'] for i in session_data.get('interventions', [])],
-                            'effectiveness': session_data.get('effectiveness', 0.5)
-                        })
-                        break
-                
-            except Exception as e:
-                logger.warning(f"Failed to analyze evolution from {session_file}: {e}")
-        
-        return evolution
+        cutoff = (datetime.now(timezone.utc) - timedelta(weeks=weeks)).timestamp()
+        
+        # First pattern of the type per session (bare columns follow MIN(p.id)), oldest first
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT MIN(p.id), p.timestamp, p.severity, s.intervention_types, s.effectiveness "
+                "FROM session_patterns p JOIN sessions s ON s.session_id = p.session_id "
+                "WHERE p.pattern_type = ? AND p.timestamp >= ? "
+                "GROUP BY p.session_id ORDER BY p.timestamp, MIN(p.id)",
+                (pattern_type, cutoff)
+            ).fetchall()
+        
+        return [
+            {
+                'date': datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat(),
+                'severity': severity or 'unknown',
+                'interventions': json.loads(intervention_types),
+                'effectiveness': 0.5 if effectiveness is None else effectiveness
+            }
+            for _, timestamp, severity, intervention_types, effectiveness in rows
+        ]
     
     def clear_current_session(self) -> None:
         """Clear current session cache"""
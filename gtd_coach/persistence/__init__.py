@@ -1,16 +1,35 @@
 """
 Persistence layer for GTD Coach agent system.
-Provides checkpointing and state recovery capabilities.
+Provides checkpointing, state recovery, the local session store and the
+week-partitioned artifact layout.
 """
 
 from .checkpointer import (
     CheckpointerManager,
     get_checkpointer_manager,
-    get_checkpointer
+    get_checkpointer,
+    open_sqlite_saver
+)
+from .session_store import (
+    SessionStore,
+    get_session_store,
+    iso_week
+)
+from .artifacts import (
+    ArtifactStore,
+    get_artifact_store,
+    partition_name
 )
 
 __all__ = [
     'CheckpointerManager',
     'get_checkpointer_manager',
-    'get_checkpointer'
+    'get_checkpointer',
+    'open_sqlite_saver',
+    'SessionStore',
+    'get_session_store',
+    'iso_week',
+    'ArtifactStore',
+    'get_artifact_store',
+    'partition_name'
 ]
\ No newline at end of file
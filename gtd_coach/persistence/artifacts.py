@@ -0,0 +1,320 @@
+"""
+Week-partitioned artifact storage with append-only manifests.
+Session artifacts are written to ``<root>/YYYY/Www/`` and every write
+appends one line (type, session, timestamp, size, path) to that week's
+``manifest.jsonl``. Lookups for the last N weeks read N small manifests
+instead of listing and parsing every file name in a flat directory.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.jsonl"
+# Kept in its own directory so updating it does not change the root's mtime
+LEGACY_MARKER = Path(".index") / "legacy.json"
+
+# Flat-layout file name patterns indexed by index_legacy_files: type -> regex
+LEGACY_PATTERNS = {
+    "mindsweep": r"mindsweep_(\d{8}_\d{6})\.json",
+    "priorities": r"priorities_(\d{8}_\d{6})\.json",
+    "graphiti_batch": r"graphiti_batch_(.+)_(\d{8}_\d{6})\.json",
+    "north_star": r"north_star_metrics_(.+)\.json",
+    "review": r"review_(\d{8}_\d{6})\.json",
+    "pattern_session": r"(\d{8}_\d{6})_[0-9a-f]{8}\.json",
+}
+
+
+def _naive(when: datetime) -> datetime:
+    """Local naive datetime (aware timestamps are converted to local time)"""
+    if when.tzinfo is not None:
+        return when.astimezone().replace(tzinfo=None)
+    return when
+
+
+def partition_name(when: datetime) -> str:
+    """Partition path for a timestamp, e.g. '2025/W07' (ISO year and week)"""
+    return _naive(when).strftime("%G/W%V")
+
+
+class ArtifactStore:
+    """
+    Writes artifacts into week partitions and looks them up by manifest
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Directory holding the YYYY/Www partitions
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    # ----- writes -----
+
+    def path_for(self, name: str, when: Optional[datetime] = None) -> Path:
+        """Partitioned path for a new artifact (creates the partition)"""
+        directory = self.root / partition_name(when or datetime.now())
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / name
+
+    def write_json(self, artifact_type: str, name: str, data: Any,
+                   session_id: Optional[str] = None, when: Optional[datetime] = None,
+                   indent: Optional[int] = 2) -> Path:
+        """
+        Write a JSON artifact into its week partition and record it
+
+        Args:
+            artifact_type: Artifact type (mindsweep, priorities, review, ...)
+            name: File name within the partition
+            data: JSON-serializable payload
+            session_id: Session the artifact belongs to
+            when: Artifact time (default now); picks the partition
+            indent: JSON indentation
+
+        Returns:
+            Path of the written file
+        """
+        when = when or datetime.now()
+        path = self.path_for(name, when)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=indent)
+        self.record(artifact_type, path, session_id=session_id, when=when)
+        return path
+
+    def record(self, artifact_type: str, path: Path, session_id: Optional[str] = None,
+               when: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Append a manifest entry for a file already written
+
+        The entry goes to the manifest of the partition for ``when``, so
+        files outside the partitions (legacy flat files) can be indexed too.
+
+        Returns:
+            The manifest entry
+        """
+        when = _naive(when or datetime.now())
+        path = Path(path)
+        entry = {
+            "type": artifact_type,
+            "session": session_id,
+            "timestamp": when.isoformat(),
+            "size": path.stat().st_size if path.exists() else 0,
+            "path": os.path.relpath(path, self.root),
+        }
+        manifest = self.root / partition_name(when) / MANIFEST_NAME
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            # One write per line on an O_APPEND handle keeps concurrent appends whole
+            with open(manifest, 'a') as f:
+                f.write(line)
+        return entry
+
+    # ----- lookups -----
+
+    def _partitions(self, since: Optional[datetime], until: Optional[datetime]) -> List[Path]:
+        """Partition directories covering [since, until], oldest first"""
+        if since is None:
+            partitions = sorted(p for p in self.root.glob("[0-9][0-9][0-9][0-9]/W[0-9][0-9]") if p.is_dir())
+            if until is not None:
+                last = partition_name(until)
+                partitions = [p for p in partitions
+                              if f"{p.parent.name}/{p.name}" <= last]
+            return partitions
+
+        start, end = _naive(since), _naive(until or datetime.now())
+        names = []
+        day = start - timedelta(days=start.weekday())
+        while day <= end:
+            names.append(partition_name(day))
+            day += timedelta(weeks=1)
+        if partition_name(end) not in names:
+            names.append(partition_name(end))
+        return [self.root / name for name in names if (self.root / name).is_dir()]
+
+    def _entries(self, partition: Path) -> Iterator[Dict[str, Any]]:
+        manifest = partition / MANIFEST_NAME
+        if not manifest.exists():
+            return
+        with open(manifest) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn last line from a crashed writer
+                    logger.debug(f"Skipping bad manifest line in {manifest}")
+
+    def find(self, artifact_type: Optional[str] = None, weeks: Optional[int] = None,
+             since: Optional[datetime] = None, until: Optional[datetime] = None,
+             session_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Manifest entries matching the filters, oldest first
+
+        Args:
+            artifact_type: Only this artifact type
+            weeks: Only the last N ISO weeks (including the current one)
+            since: Only artifacts at or after this time
+            until: Only artifacts at or before this time
+            session_id: Only artifacts of this session
+            limit: Keep only the most recent N entries
+
+        Returns:
+            Entries with type, session, timestamp, size, path and the
+            resolved absolute 'file' Path
+        """
+        if weeks is not None:
+            now = datetime.now()
+            week_start = now - timedelta(days=now.weekday(), weeks=max(weeks - 1, 0))
+            week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
+            since = max(_naive(since), week_start) if since else week_start
+        since_s = _naive(since).isoformat() if since else None
+        until_s = _naive(until).isoformat() if until else None
+
+        entries = []
+        for partition in self._partitions(since, until):
+            for entry in self._entries(partition):
+                if artifact_type and entry.get("type") != artifact_type:
+                    continue
+                if session_id and entry.get("session") != session_id:
+                    continue
+                if since_s and entry["timestamp"] < since_s:
+                    continue
+                if until_s and entry["timestamp"] > until_s:
+                    continue
+                entry["file"] = (self.root / entry["path"]).resolve()
+                entries.append(entry)
+
+        entries.sort(key=lambda e: e["timestamp"])
+        # The latest entry for a path wins (a file re-recorded after rewriting)
+        latest = {}
+        for entry in entries:
+            latest[entry["path"]] = entry
+        entries = sorted(latest.values(), key=lambda e: e["timestamp"])
+        return entries[-limit:] if limit else entries
+
+    def recent(self, artifact_type: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        The most recent N entries of a type, oldest first
+
+        Walks partitions newest first and stops once N are found.
+        """
+        found: List[Dict[str, Any]] = []
+        for partition in reversed(self._partitions(None, None)):
+            batch = [dict(e, file=(self.root / e["path"]).resolve())
+                     for e in self._entries(partition) if e.get("type") == artifact_type]
+            found = batch + found
+            if len(found) >= limit:
+                break
+        found.sort(key=lambda e: e["timestamp"])
+        return found[-limit:]
+
+    def load(self, entry: Dict[str, Any]) -> Optional[Any]:
+        """Parse the JSON file of a manifest entry (None if missing or invalid)"""
+        try:
+            with open(entry["file"]) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not load artifact {entry.get('path')}: {e}")
+            return None
+
+    # ----- legacy flat files -----
+
+    def index_legacy_files(self, directory: Optional[Path] = None,
+                           types: Optional[List[str]] = None) -> int:
+        """
+        Record flat-layout files (mindsweep_*.json, ...) in the manifests
+
+        Files stay where they are; each is recorded once, in the partition of
+        the timestamp in its name (file mtime otherwise). The directory's
+        mtime is remembered, so repeated calls skip the listing until a file
+        is added to the flat directory.
+
+        Args:
+            directory: Flat directory to index (default: the root)
+            types: Artifact types to index (default: all LEGACY_PATTERNS)
+
+        Returns:
+            Number of files recorded
+        """
+        directory = Path(directory or self.root)
+        if not directory.is_dir():
+            return 0
+        marker_path = self.root / LEGACY_MARKER
+        marker_path.parent.mkdir(exist_ok=True)
+        try:
+            with open(marker_path) as f:
+                marker = json.load(f)
+        except (OSError, ValueError):
+            marker = {}
+        key = str(directory.resolve())
+        state = marker.get(key, {"mtime": None, "files": []})
+        mtime = directory.stat().st_mtime
+        if state["mtime"] == mtime:
+            return 0
+
+        done = set(state["files"])
+        patterns = {t: re.compile(p) for t, p in LEGACY_PATTERNS.items() if not types or t in types}
+        recorded = 0
+        for entry in os.scandir(directory):
+            if not entry.is_file() or entry.name in done:
+                continue
+            for artifact_type, pattern in patterns.items():
+                match = pattern.fullmatch(entry.name)
+                if not match:
+                    continue
+                stamp = match.groups()[-1]
+                try:
+                    when = datetime.strptime(stamp, "%Y%m%d_%H%M%S")
+                except ValueError:
+                    when = datetime.fromtimestamp(entry.stat().st_mtime)
+                if artifact_type in ("graphiti_batch", "north_star"):
+                    session = match.group(1)
+                elif artifact_type == "pattern_session":
+                    session = entry.name[:-len(".json")]
+                else:
+                    session = stamp
+                self.record(artifact_type, Path(entry.path), session_id=session, when=when)
+                done.add(entry.name)
+                recorded += 1
+                break
+
+        marker[key] = {"mtime": mtime, "files": sorted(done)}
+        with open(marker_path, 'w') as f:
+            json.dump(marker, f)
+        if recorded:
+            logger.info(f"Indexed {recorded} legacy files from {directory}")
+        return recorded
+
+
+_stores: Dict[str, ArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_artifact_store(root: Path) -> ArtifactStore:
+    """
+    Get the artifact store for a root directory (one instance per root)
+
+    Legacy flat files in the root are indexed on first use.
+    """
+    key = str(Path(root).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ArtifactStore(root)
+            try:
+                store.index_legacy_files()
+            except OSError as e:
+                logger.warning(f"Could not index legacy files in {root}: {e}")
+        return store
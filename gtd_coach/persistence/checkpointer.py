@@ -3,6 +3,7 @@ SQLite-based checkpointing for LangGraph agent persistence.
 Enables resumable sessions that survive process restarts.
 """
 
+import os
 import sqlite3
 import json
 from pathlib import Path
@@ -21,6 +22,40 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def default_checkpoint_path() -> Path:
+    """Checkpoint database from GTD_CHECKPOINT_DB, else data/checkpoints.db in the coach dir"""
+    env_path = os.getenv("GTD_CHECKPOINT_DB")
+    if env_path:
+        return Path(env_path)
+    base = Path("/app") if os.environ.get("IN_DOCKER") else Path.home() / "gtd-coach"
+    return base / "data" / "checkpoints.db"
+
+
+def open_sqlite_saver(db_path: Optional[Path] = None) -> Optional['SqliteSaver']:
+    """
+    SqliteSaver on one long-lived connection, tuned for a checkpoint per graph step.
+    
+    WAL with synchronous=NORMAL makes each commit an append to the log without
+    an fsync; a crash can lose at most the last few steps, never corrupt earlier ones.
+    
+    Args:
+        db_path: SQLite database file (default: see default_checkpoint_path)
+    
+    Returns:
+        SqliteSaver instance or None if langgraph-checkpoint-sqlite is not installed
+    """
+    if not LANGGRAPH_AVAILABLE:
+        return None
+    db_path = Path(db_path) if db_path else default_checkpoint_path()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    saver = SqliteSaver(conn)
+    saver.setup()
+    return saver
+
+
 class CheckpointerManager:
     """
     Manages SQLite-based checkpointing for LangGraph agents.
@@ -60,15 +95,10 @@ class CheckpointerManager:
         
         if self._checkpointer is None:
             try:
-                # Create SQLite checkpointer
-                self._checkpointer = SqliteSaver.from_conn_string(
-                    self.connection_string
-                )
+                # Create SQLite checkpointer (from_conn_string is a context manager
+                # in current langgraph-checkpoint-sqlite, so open the connection directly)
+                self._checkpointer = open_sqlite_saver(self.db_path)
                 logger.info(f"SQLite checkpointer initialized at {self.db_path}")
-                
-                # Setup tables if needed
-                if hasattr(self._checkpointer, 'setup'):
-                    self._checkpointer.setup()
                     
             except Exception as e:
                 logger.error(f"Failed to create SQLite checkpointer: {e}")
@@ -0,0 +1,143 @@
+"""
+Append-only JSONL documents for session logs.
+A document is written as one line per event - a header with its top-level
+fields, one line per list item (messages, episodes) and one line per field
+set later - so nothing is buffered in memory and a crash loses at most the
+line being written. load_document() rebuilds the nested dict that the old
+pretty-printed JSON files held, and reads those files too.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def dumps_line(record: Any) -> bytes:
+    """Compact one-line encoding of a record, newline included"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(record, default=str,
+                                option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib handles those
+    return json.dumps(record, separators=(',', ':'), default=str).encode() + b"\n"
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records of a JSONL file, skipping blank and torn lines"""
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.debug(f"Skipping bad line in {Path(path).name}")
+
+
+class StreamingDocument:
+    """
+    JSONL writer for one document with a growing item list
+
+    Lines are ``{"record": "header", "items_key": ..., **fields}``, then
+    ``{"record": "item", "value": ...}`` per add() and
+    ``{"record": "set", "key": ..., "value": ...}`` per set().
+    """
+
+    def __init__(self, path: Path, items_key: str, **fields):
+        """
+        Create the file and write the header
+
+        Args:
+            path: JSONL file to create (appended to if it already exists)
+            items_key: Top-level key the items are rebuilt under
+            **fields: Top-level fields known up front
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.items_key = items_key
+        self.items_written = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'ab')
+        self._write({"record": "header", "items_key": items_key, **fields})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = dumps_line(record)
+        with self._lock:
+            # One write per line on an append handle, flushed to the OS right away
+            self._file.write(line)
+            self._file.flush()
+
+    def add(self, item: Any) -> None:
+        """Append one item to the document's list"""
+        self._write({"record": "item", "value": item})
+        self.items_written += 1
+
+    def set(self, key: str, value: Any) -> None:
+        """Set (or replace) a top-level field"""
+        self._write({"record": "set", "key": key, "value": value})
+
+    def sync(self) -> None:
+        """Force written lines to stable storage"""
+        with self._lock:
+            if not self._file.closed:
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Sync and close the file"""
+        with self._lock:
+            if not self._file.closed:
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+
+def load_document(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load a JSON document or rebuild one from its JSONL stream
+
+    Args:
+        path: ``.json`` file, or ``.jsonl`` file written by StreamingDocument
+
+    Returns:
+        The nested document (e.g. {"session_id", "review_data", "messages"}),
+        or None for a JSONL file without a header
+    """
+    path = Path(path)
+    if path.suffix != ".jsonl":
+        with open(path) as f:
+            return json.load(f)
+
+    document: Optional[Dict[str, Any]] = None
+    items = []
+    for record in read_jsonl(path):
+        kind = record.pop("record", None)
+        if kind == "header":
+            items_key = record.pop("items_key")
+            if document is None:
+                document = {**record, items_key: items}
+            else:
+                # Reopened for appending: later header fields win, items carry on
+                document.update(record)
+        elif document is None:
+            continue
+        elif kind == "item":
+            items.append(record.get("value"))
+        elif kind == "set":
+            document[record["key"]] = record.get("value")
+    return document
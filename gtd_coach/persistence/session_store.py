@@ -0,0 +1,367 @@
+"""
+Local SQLite session store for captured review data.
+Mind sweep items, weekly priorities and project updates from every capture
+path (agent tools and the legacy coach) land in one indexed database, so
+pattern detection and summaries can query by week, session, user or
+category instead of globbing per-session JSON files.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER = "default"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mind_sweep_items (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    item TEXT NOT NULL,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_week ON mind_sweep_items(week);
+CREATE INDEX IF NOT EXISTS idx_items_session ON mind_sweep_items(session_id);
+CREATE INDEX IF NOT EXISTS idx_items_user_week ON mind_sweep_items(user_id, week);
+CREATE INDEX IF NOT EXISTS idx_items_category ON mind_sweep_items(category);
+
+CREATE TABLE IF NOT EXISTS weekly_priorities (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    rank INTEGER,
+    priority TEXT NOT NULL,
+    level TEXT,
+    commitment TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_priorities_week ON weekly_priorities(week);
+CREATE INDEX IF NOT EXISTS idx_priorities_session ON weekly_priorities(session_id);
+CREATE INDEX IF NOT EXISTS idx_priorities_user_week ON weekly_priorities(user_id, week);
+
+CREATE TABLE IF NOT EXISTS project_updates (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    project TEXT NOT NULL,
+    status TEXT,
+    next_action TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_projects_week ON project_updates(week);
+CREATE INDEX IF NOT EXISTS idx_projects_session ON project_updates(session_id);
+CREATE INDEX IF NOT EXISTS idx_projects_user_week ON project_updates(user_id, week);
+CREATE INDEX IF NOT EXISTS idx_projects_project ON project_updates(project);
+
+CREATE TABLE IF NOT EXISTS imported_files (
+    name TEXT PRIMARY KEY
+);
+"""
+
+
+def iso_week(when: Optional[datetime] = None) -> str:
+    """ISO week identifier (YYYY-Www) for a timestamp"""
+    return (when or datetime.now()).strftime("%G-W%V")
+
+
+def default_db_path() -> Path:
+    """Database path from GTD_SESSION_DB, else data/sessions.db in the coach dir"""
+    env_path = os.getenv("GTD_SESSION_DB")
+    if env_path:
+        return Path(env_path)
+    base = Path("/app") if os.environ.get("IN_DOCKER") else Path.home() / "gtd-coach"
+    return base / "data" / "sessions.db"
+
+
+class SessionStore:
+    """
+    Embedded store for review captures, indexed by week, session, user and category.
+
+    Writes go straight to SQLite on one shared connection (WAL journal,
+    synchronous=NORMAL), so a capture is durable before the tool returns
+    and costs tens of microseconds rather than a file write per session.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            db_path: SQLite database file (default: see default_db_path)
+        """
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def begin_session(self, session_id: str) -> None:
+        """Attribute subsequent writes without an explicit session to session_id"""
+        self.session_id = session_id
+
+    def _insert(self, sql: str, rows: List[tuple], source_file: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            if source_file:
+                self._conn.execute("INSERT OR IGNORE INTO imported_files (name) VALUES (?)",
+                                   (source_file,))
+            self._conn.commit()
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, tuple(params))]
+
+    # ----- writes -----
+
+    def add_mind_sweep_items(
+        self,
+        items: List[str],
+        category: Optional[str] = None,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        source_file: Optional[str] = None
+    ) -> int:
+        """
+        Save mind sweep items in one transaction.
+
+        Args:
+            source_file: Legacy JSON file these items were also written to,
+                recorded so import_legacy_files skips it
+
+        Returns:
+            Number of items saved
+        """
+        when = timestamp or datetime.now()
+        row = (user_id or DEFAULT_USER, session_id or self.session_id, iso_week(when),
+               when.isoformat())
+        self._insert(
+            "INSERT INTO mind_sweep_items (user_id, session_id, week, captured_at, item, category) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [row + (item, category) for item in items],
+            source_file
+        )
+        return len(items)
+
+    def add_mind_sweep_item(self, item: str, category: Optional[str] = None, **kwargs) -> None:
+        """Save one mind sweep item (see add_mind_sweep_items)"""
+        self.add_mind_sweep_items([item], category, **kwargs)
+
+    def add_priorities(
+        self,
+        priorities: List[Dict[str, Any]],
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        source_file: Optional[str] = None
+    ) -> int:
+        """
+        Save weekly priorities in one transaction.
+
+        Args:
+            priorities: Dicts with 'priority' and optional 'rank', 'level'
+                (A/B/C) and 'commitment'
+            source_file: Legacy JSON file also written (see add_mind_sweep_items)
+
+        Returns:
+            Number of priorities saved
+        """
+        when = timestamp or datetime.now()
+        row = (user_id or DEFAULT_USER, session_id or self.session_id, iso_week(when),
+               when.isoformat())
+        self._insert(
+            "INSERT INTO weekly_priorities "
+            "(user_id, session_id, week, created_at, rank, priority, level, commitment) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [row + (p.get('rank'), p['priority'], p.get('level'), p.get('commitment'))
+             for p in priorities],
+            source_file
+        )
+        return len(priorities)
+
+    def add_priority(self, priority: str, rank: Optional[int] = None, level: Optional[str] = None,
+                     commitment: Optional[str] = None, **kwargs) -> None:
+        """Save one weekly priority (see add_priorities)"""
+        self.add_priorities([{'priority': priority, 'rank': rank, 'level': level,
+                              'commitment': commitment}], **kwargs)
+
+    def add_project_update(
+        self,
+        project: str,
+        status: Optional[str] = None,
+        next_action: Optional[str] = None,
+        notes: Optional[str] = None,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """Save a project status update"""
+        when = timestamp or datetime.now()
+        self._insert(
+            "INSERT INTO project_updates "
+            "(user_id, session_id, week, created_at, project, status, next_action, notes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(user_id or DEFAULT_USER, session_id or self.session_id, iso_week(when),
+              when.isoformat(), project, status, next_action, notes)]
+        )
+
+    def import_legacy_files(self, data_dir: Path) -> int:
+        """
+        Import mindsweep_*.json and priorities_*.json files not yet in the store.
+
+        Each file becomes one session named after its timestamp. Files are
+        recorded as imported, so calling this repeatedly is cheap.
+
+        Args:
+            data_dir: Directory holding the legacy per-session files
+
+        Returns:
+            Number of files imported
+        """
+        data_dir = Path(data_dir)
+        if not data_dir.exists():
+            return 0
+        with self._lock:
+            done = {row[0] for row in self._conn.execute("SELECT name FROM imported_files")}
+
+        imported = 0
+        for path in sorted(data_dir.glob("mindsweep_*.json")) + sorted(data_dir.glob("priorities_*.json")):
+            if path.name in done:
+                continue
+            stamp = path.stem.split('_', 1)[1]
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                when = datetime.strptime(stamp, "%Y%m%d_%H%M%S")
+            except (ValueError, OSError) as e:
+                logger.warning(f"Skipping legacy file {path.name}: {e}")
+                continue
+            if path.name.startswith("mindsweep_"):
+                self.add_mind_sweep_items(data.get('items', []), session_id=stamp,
+                                          timestamp=when, source_file=path.name)
+            else:
+                self.add_priorities(
+                    [{'priority': p.get('action', ''), 'rank': i, 'level': p.get('priority')}
+                     for i, p in enumerate(data.get('priorities', []), 1)],
+                    session_id=stamp, timestamp=when, source_file=path.name
+                )
+            imported += 1
+        if imported:
+            logger.info(f"Imported {imported} legacy session files into {self.db_path.name}")
+        return imported
+
+    # ----- queries -----
+
+    def get_priorities(self, week: Optional[str] = None,
+                       user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Priorities saved in a week, in rank order.
+
+        Args:
+            week: ISO week (YYYY-Www), default current week
+            user_id: Restrict to one user (default: all users)
+        """
+        sql = "SELECT * FROM weekly_priorities WHERE week = ?"
+        params: List[Any] = [week or iso_week()]
+        if user_id:
+            sql += " AND user_id = ?"
+            params.append(user_id)
+        return self._query(sql + " ORDER BY rank IS NULL, rank, id", params)
+
+    def get_items(
+        self,
+        weeks: Optional[int] = None,
+        since: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Mind sweep items, oldest first.
+
+        Args:
+            weeks: Only the last N ISO weeks (including the current one)
+            since: Only items captured at or after this time
+            user_id: Restrict to one user
+            category: Restrict to one category
+        """
+        clauses, params = [], []
+        if weeks is not None:
+            clauses.append("week >= ?")
+            params.append(iso_week(datetime.now() - timedelta(weeks=max(weeks - 1, 0))))
+        if since is not None:
+            clauses.append("captured_at >= ?")
+            params.append(since.isoformat())
+        if user_id:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT * FROM mind_sweep_items{where} ORDER BY captured_at, id", params)
+
+    def get_items_by_session(self, **filters) -> Dict[str, List[str]]:
+        """Mind sweep item texts grouped by session (filters as in get_items)"""
+        sessions: Dict[str, List[str]] = {}
+        for row in self.get_items(**filters):
+            sessions.setdefault(row['session_id'], []).append(row['item'])
+        return sessions
+
+    def get_project_updates(self, week: Optional[str] = None, project: Optional[str] = None,
+                            user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Project updates, optionally for one week, project or user"""
+        clauses, params = [], []
+        for column, value in (("week", week), ("project", project), ("user_id", user_id)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT * FROM project_updates{where} ORDER BY created_at, id", params)
+
+    def has_items(self) -> bool:
+        """Whether any mind sweep items have been stored"""
+        return bool(self._query("SELECT 1 FROM mind_sweep_items LIMIT 1"))
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store(db_path: Optional[Path] = None) -> SessionStore:
+    """
+    Get singleton session store instance.
+
+    Args:
+        db_path: Optional database path (only used on first call)
+
+    Returns:
+        SessionStore instance
+    """
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = SessionStore(db_path)
+        return _session_store
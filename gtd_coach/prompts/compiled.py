@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Precompiled phase prompts for GTD Coach
+Splits each phase's system prompt into static text and time fields once per session,
+so per-turn assembly only substitutes the time values
+"""
+
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Variables that change on every turn; everything else is fixed for a phase
+DYNAMIC_FIELDS = ("time_remaining", "time_elapsed")
+
+# Review phases precompiled at session start (others are compiled on first use)
+REVIEW_PHASES = ("STARTUP", "MIND_SWEEP", "PROJECT_REVIEW", "PRIORITIZATION", "WRAP_UP")
+
+# Phase limit (minutes) when the prompt config has no entry for a phase
+DEFAULT_PHASE_LIMIT = 5
+
+# Supported GTD_PROMPT_LAYOUT values
+PROMPT_LAYOUTS = ("inline", "prefix_stable")
+
+DEFAULT_PHASE_INSTRUCTIONS = "Guide the user through this phase of the GTD review."
+
+# Placeholder left in the static body when time values are moved out of it
+STABLE_TIME_REFERENCE = "(see time check)"
+
+# Sentinels survive Langfuse's mustache compile untouched and mark split points
+_SENTINEL = "\x00{}\x00"
+_SENTINEL_PATTERN = re.compile("\x00(" + "|".join(DYNAMIC_FIELDS) + ")\x00")
+
+
+def get_phase_time_limit(config: Optional[Dict], phase_name: str) -> float:
+    """
+    Look up a phase's time limit from the prompt config
+
+    Single source for the prompt's "Time limit" and the coach's time remaining.
+
+    Args:
+        config: Prompt config with ``phase_times``
+        phase_name: Phase to look up
+
+    Returns:
+        Time limit in minutes
+    """
+    return (config or {}).get("phase_times", {}).get(phase_name, DEFAULT_PHASE_LIMIT)
+
+
+def resolve_prompt_layout(value: Optional[str]) -> str:
+    """
+    Validate a GTD_PROMPT_LAYOUT value
+
+    Args:
+        value: Raw setting (may be None or empty)
+
+    Returns:
+        The layout, or "inline" if the value is not recognised
+    """
+    layout = (value or "inline").strip().lower()
+    if layout not in PROMPT_LAYOUTS:
+        logger.warning(
+            f"Unknown GTD_PROMPT_LAYOUT '{value}', expected one of {PROMPT_LAYOUTS}; using 'inline'"
+        )
+        return "inline"
+    return layout
+
+
+def format_minutes(value: Optional[float]) -> str:
+    """
+    Format a minute value for the prompt
+
+    Whole minutes keep the rendered prompt identical for up to a minute
+    instead of changing on every call.
+
+    Args:
+        value: Minutes (may be fractional or None)
+
+    Returns:
+        Whole-minute string, never negative
+    """
+    if value is None:
+        return "0"
+    return str(max(0, int(round(value))))
+
+
+def format_time_status(phase_name: str, time_remaining: Optional[float],
+                       time_elapsed: Optional[float]) -> str:
+    """
+    Build the short, volatile time check appended to the latest user turn
+
+    Args:
+        phase_name: Current phase
+        time_remaining: Minutes left in the phase
+        time_elapsed: Minutes elapsed in the review
+
+    Returns:
+        One-line time status
+    """
+    return (
+        f"TIME CHECK ({phase_name}): {format_minutes(time_elapsed)} minutes elapsed, "
+        f"{format_minutes(time_remaining)} minutes remaining."
+    )
+
+
+class PhasePromptTemplate:
+    """
+    System prompt for a single phase, pre-split into static segments and time fields
+
+    ``segments`` always has one more entry than ``fields``; rendering interleaves them.
+    """
+
+    def __init__(self, phase_name: str, segments: List[str], fields: List[str]):
+        if len(segments) != len(fields) + 1:
+            raise ValueError("segments must have exactly one more entry than fields")
+        self.phase_name = phase_name
+        self.segments = segments
+        self.fields = fields
+        # The static body never changes for the phase, so build it once
+        self._static_body = STABLE_TIME_REFERENCE.join(segments)
+
+    @property
+    def static_prefix(self) -> str:
+        """Text before the first time field (identical on every turn)"""
+        return self.segments[0]
+
+    @property
+    def static_body(self) -> str:
+        """Full prompt with time fields replaced by a stable reference"""
+        return self._static_body
+
+    def render(self, time_remaining: Optional[float] = None,
+               time_elapsed: Optional[float] = 0) -> str:
+        """
+        Render the prompt with time values inline
+
+        Args:
+            time_remaining: Minutes left in the phase
+            time_elapsed: Minutes elapsed in the review
+
+        Returns:
+            Prompt text
+        """
+        if not self.fields:
+            return self.segments[0]
+
+        values = {
+            "time_remaining": format_minutes(time_remaining),
+            "time_elapsed": format_minutes(time_elapsed)
+        }
+        parts = [self.segments[0]]
+        for field, segment in zip(self.fields, self.segments[1:]):
+            parts.append(values[field])
+            parts.append(segment)
+        return "".join(parts)
+
+
+def _compiled_content(compiled: Any) -> str:
+    """Extract text from a Langfuse compile() result (text or chat prompt)"""
+    if isinstance(compiled, list):
+        if not compiled:
+            return ""
+        first = compiled[0]
+        return first.get("content", "") if isinstance(first, dict) else str(first)
+    return compiled if isinstance(compiled, str) else str(compiled)
+
+
+def precompile_phase_prompt(prompt: Any, phase_name: str, config: Optional[Dict] = None,
+                            total_time: int = 30) -> PhasePromptTemplate:
+    """
+    Compile a Langfuse prompt for one phase, leaving time fields open
+
+    Args:
+        prompt: Langfuse prompt object (anything with ``compile(**variables)``)
+        phase_name: Phase to compile for
+        config: Prompt config with ``phase_times`` and ``phase_instructions``
+        total_time: Total review time in minutes
+
+    Returns:
+        PhasePromptTemplate for the phase
+    """
+    config = config or {}
+    phase_instructions = config.get("phase_instructions", {}).get(
+        phase_name, DEFAULT_PHASE_INSTRUCTIONS
+    )
+    phase_time_limit = get_phase_time_limit(config, phase_name)
+
+    compiled = prompt.compile(
+        total_time=total_time,
+        phase_name=phase_name,
+        phase_time_limit=phase_time_limit,
+        phase_instructions=phase_instructions,
+        **{field: _SENTINEL.format(field) for field in DYNAMIC_FIELDS}
+    )
+
+    # re.split with a capture group alternates text, field, text, ...
+    pieces = _SENTINEL_PATTERN.split(_compiled_content(compiled))
+    return PhasePromptTemplate(phase_name, pieces[0::2], pieces[1::2])
+
+
+def precompile_phase_prompts(prompt: Any, config: Optional[Dict] = None,
+                             total_time: int = 30) -> Dict[str, PhasePromptTemplate]:
+    """
+    Precompile the prompt for every configured phase at session start
+
+    Args:
+        prompt: Langfuse prompt object
+        config: Prompt config with ``phase_times`` and ``phase_instructions``
+        total_time: Total review time in minutes
+
+    Returns:
+        Mapping of phase name to PhasePromptTemplate
+    """
+    config = config or {}
+    phases = list(REVIEW_PHASES)
+    for phase_name in config.get("phase_times", {}):
+        if phase_name not in phases:
+            phases.append(phase_name)
+
+    templates = {}
+    for phase_name in phases:
+        templates[phase_name] = precompile_phase_prompt(prompt, phase_name, config, total_time)
+
+    logger.debug(f"Precompiled system prompt for {len(templates)} phases")
+    return templates
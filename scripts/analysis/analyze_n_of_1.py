@@ -16,6 +16,9 @@ from collections import defaultdict
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from gtd_coach.analytics.warehouse import get_warehouse
+from gtd_coach.analytics.trace_mirror import get_trace_mirror, sync_trace_mirror
+
 try:
     from langfuse import Langfuse
     LANGFUSE_AVAILABLE = True
@@ -68,10 +71,25 @@ class NOf1Analyzer:
             return self._load_local_traces()
         
         try:
-            # In real implementation, use Langfuse API to fetch traces
-            # For now, return mock data or local files
             print(f"{BLUE}Fetching traces for week {self.week}...{RESET}")
-            return self._load_local_traces()
+            week_start = datetime.strptime(f"{self.week}-1", "%G-W%V-%u")
+            week_end = week_start + timedelta(weeks=1)
+            
+            # Sync only new or changed traces, then read the week from the mirror
+            mirror = get_trace_mirror()
+            sync_trace_mirror(since=week_start, mirror=mirror)
+            traces = [t for t in mirror.traces(since=week_start, until=week_end)
+                      if isinstance(t.metadata, dict) and 'experiment_value' in t.metadata]
+            if not traces:
+                return self._load_local_traces()
+            
+            scores = mirror.scores([t.id for t in traces])
+            return [{
+                'session_id': t.session_id,
+                'timestamp': t.timestamp.isoformat() if t.timestamp else None,
+                'metadata': t.metadata,
+                'metrics': {score.name: score.value for score in scores[t.id]}
+            } for t in reversed(traces)]
             
         except Exception as e:
             print(f"{RED}Error fetching traces from Langfuse: {e}{RESET}")
@@ -79,24 +97,9 @@ class NOf1Analyzer:
     
     def _load_local_traces(self) -> List[Dict[str, Any]]:
         """Load traces from local JSON files"""
-        traces = []
-        data_dir = Path.home() / "gtd-coach" / "data"
-        
-        # Load North Star metrics files for the week
-        for metrics_file in data_dir.glob("north_star_metrics_*.json"):
-            try:
-                with open(metrics_file, 'r') as f:
-                    data = json.load(f)
-                    
-                    # Check if it's from the current week
-                    session_date = datetime.fromisoformat(data.get('session_start', ''))
-                    session_week = session_date.strftime("%G-W%V")
-                    
-                    if session_week == self.week:
-                        traces.append(data)
-                        
-            except Exception as e:
-                print(f"Warning: Could not load {metrics_file}: {e}")
+        # North Star metrics files for the week, via the local warehouse
+        warehouse = get_warehouse(Path.home() / "gtd-coach" / "data")
+        traces = [row['data'] for row in warehouse.query('north_star', week=self.week)]
         
         print(f"Loaded {len(traces)} traces for week {self.week}")
         return traces
@@ -12,6 +12,11 @@ import statistics
 import json
 from pathlib import Path
 
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.analytics.trace_mirror import get_trace_mirror, sync_trace_mirror
+
 # Try to import Langfuse
 try:
     from langfuse import Langfuse
@@ -48,17 +53,22 @@ class PromptPerformanceAnalyzer:
         self.start_date = self.end_date - timedelta(days=7)
     
     def fetch_traces(self):
-        """Fetch GTD review traces from Langfuse"""
+        """Fetch GTD review traces from the local Langfuse trace mirror"""
         print(f"{BLUE}Fetching traces from Langfuse...{RESET}")
         
         try:
-            # The Langfuse Python SDK uses fetch_traces method
-            # Note: This may not return traces if none exist yet
-            # For testing, we'll return mock data if no traces found
-            traces = []
+            # Sync only new or changed traces, then read the period locally
+            mirror = get_trace_mirror()
+            sync_trace_mirror(since=self.start_date, mirror=mirror)
+            traces = mirror.traces(since=self.start_date, until=self.end_date, tag="gtd-review")
+            if traces:
+                scores = mirror.scores([trace.id for trace in traces])
+                for trace in traces:
+                    trace.scores = scores[trace.id]
+                print(f"Found {len(traces)} GTD review traces")
+                return traces
             
-            # Try to fetch real traces (this API may vary by SDK version)
-            # For now, return mock data for testing
+            # Nothing mirrored for the period yet: use mock data for demonstration
             print(f"{YELLOW}Note: Using mock trace data for demonstration{RESET}")
             
             # Create mock traces for testing
@@ -138,9 +148,9 @@ class PromptPerformanceAnalyzer:
         metrics = {}
         
         # Latency (response time)
-        if hasattr(trace, 'latency'):
+        if getattr(trace, 'latency', None) is not None:
             metrics['latency'] = trace.latency
-        elif hasattr(trace, 'duration'):
+        elif getattr(trace, 'duration', None) is not None:
             metrics['latency'] = trace.duration
         
         # Success/failure
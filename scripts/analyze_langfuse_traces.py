@@ -1,51 +1,62 @@
 #!/usr/bin/env python3
 """
 Analyze Langfuse traces to understand interrupt behavior in GTD Coach
+
+Traces are read from the local trace mirror (gtd_coach.analytics.trace_mirror),
+which is synced from Langfuse first when credentials are available, so
+repeated runs only fetch new or changed traces and --offline runs need no
+network at all.
 """
 
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
 import json
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv("/Users/adeel/.env")
 
-# Import Langfuse client
-try:
-    from langfuse import Langfuse
-except ImportError:
-    print("Error: langfuse package not installed")
-    print("Install with: pip install langfuse")
-    sys.exit(1)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gtd_coach.analytics.trace_mirror import get_trace_mirror, sync_trace_mirror
 
 
-def analyze_recent_traces(hours_back: int = 1, session_id: Optional[str] = None):
+def load_traces(session_id: Optional[str] = None, since: Optional[datetime] = None,
+                limit: Optional[int] = None, offline: bool = False) -> Tuple[List[Any], Dict[str, List[Any]], Dict[str, List[Any]]]:
+    """
+    Load traces with their observations and scores from the local mirror
+    
+    Args:
+        session_id: Only this session's traces
+        since: Only traces from this time
+        limit: Maximum number of traces (newest first)
+        offline: Skip syncing from Langfuse
+    
+    Returns:
+        (traces, observations by trace id, scores by trace id)
+    """
+    mirror = get_trace_mirror()
+    if not offline and sync_trace_mirror(since=since, session_id=session_id, mirror=mirror) is None:
+        print("Langfuse not reachable or not configured - using the local trace mirror")
+    traces = mirror.traces(session_id=session_id, since=since, limit=limit)
+    trace_ids = [trace.id for trace in traces]
+    return traces, mirror.observations(trace_ids), mirror.scores(trace_ids)
+
+
+def analyze_recent_traces(hours_back: int = 1, session_id: Optional[str] = None, offline: bool = False):
     """
     Analyze recent Langfuse traces to understand interrupt patterns
     
     Args:
         hours_back: How many hours back to look for traces
         session_id: Optional specific session ID to analyze
+        offline: Only read the local trace mirror
     """
-    # Initialize Langfuse client
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
     host = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
     
-    if not public_key or not secret_key:
-        print("Error: LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY not found in environment")
-        return
-    
-    # Initialize client
-    langfuse = Langfuse(
-        public_key=public_key,
-        secret_key=secret_key,
-        host=host
-    )
-    
     print(f"Fetching traces from Langfuse...")
     print(f"Host: {host}")
     print(f"Looking back {hours_back} hours")
@@ -54,10 +65,9 @@ def analyze_recent_traces(hours_back: int = 1, session_id: Optional[str] = None)
     # Get recent traces
     from_timestamp = datetime.now() - timedelta(hours=hours_back)
     
-    # Fetch traces - using the simple client interface
-    traces = langfuse.get_traces(
-        from_timestamp=from_timestamp,
-        limit=10  # Get last 10 traces
+    # Last 10 traces, with observations and scores in the same pass
+    traces, observations_by_trace, scores_by_trace = load_traces(
+        since=from_timestamp, limit=10, offline=offline
     )
     
     if not traces:
@@ -80,10 +90,7 @@ def analyze_recent_traces(hours_back: int = 1, session_id: Optional[str] = None)
             print(f"  Skipping (not matching session {session_id})")
             continue
         
-        # Get observations for this trace
-        observations = langfuse.get_observations(
-            trace_id=trace.id
-        )
+        observations = observations_by_trace[trace.id]
         
         print(f"  Observations: {len(observations)}")
         
@@ -123,7 +130,7 @@ def analyze_recent_traces(hours_back: int = 1, session_id: Optional[str] = None)
         print(f"    - Interrupt detected: {'Yes' if interrupt_found else 'No'}")
         
         # Check for scores (might indicate completion or errors)
-        scores = langfuse.get_scores(trace_id=trace.id)
+        scores = scores_by_trace[trace.id]
         if scores:
             print(f"    - Scores: {len(scores)}")
             for score in scores:
@@ -131,33 +138,24 @@ def analyze_recent_traces(hours_back: int = 1, session_id: Optional[str] = None)
         
         print("-" * 80)
     
-    # Flush any pending events
-    langfuse.flush()
     print("\nAnalysis complete!")
 
 
-def get_trace_details(trace_id: str):
+def get_trace_details(trace_id: str, offline: bool = False):
     """
     Get detailed information about a specific trace
     
     Args:
         trace_id: The trace ID to analyze
+        offline: Only read the local trace mirror
     """
-    # Initialize Langfuse client
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
-    host = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
-    
-    langfuse = Langfuse(
-        public_key=public_key,
-        secret_key=secret_key,
-        host=host
-    )
-    
     print(f"Fetching trace {trace_id}...")
     
-    # Get the trace
-    trace = langfuse.get_trace(trace_id)
+    # Get the trace, fetching it by id if it is not mirrored yet
+    mirror = get_trace_mirror()
+    trace = mirror.get_trace(trace_id)
+    if not trace and not offline and sync_trace_mirror(mirror=mirror, trace_id=trace_id) is not None:
+        trace = mirror.get_trace(trace_id)
     
     if not trace:
         print(f"Trace {trace_id} not found")
@@ -168,7 +166,7 @@ def get_trace_details(trace_id: str):
     print(f"Timestamp: {trace.timestamp}")
     
     # Get all observations
-    observations = langfuse.get_observations(trace_id=trace_id)
+    observations = mirror.observations([trace_id])[trace_id]
     
     print(f"\nObservations ({len(observations)}):")
     for obs in observations:
@@ -186,8 +184,6 @@ def get_trace_details(trace_id: str):
             print(f"    Metadata: {json.dumps(obs.metadata, indent=4)[:500]}")
         
         print()
-    
-    langfuse.flush()
 
 
 def analyze_phase_transition(trace_id: str, observations: List[Any]) -> Dict[str, Any]:
@@ -449,13 +445,14 @@ def validate_state_continuity(observations: List[Any]) -> Dict[str, Any]:
     return validation_results
 
 
-def analyze_test_failure(session_id: str, return_data: bool = False):
+def analyze_test_failure(session_id: str, return_data: bool = False, offline: bool = False):
     """
     Analyze Langfuse traces for a failed test session - AI-optimized output
     
     Args:
         session_id: The test session ID to analyze
         return_data: If True, return data instead of printing (for fixture use)
+        offline: Only read the local trace mirror
     
     Returns:
         Dict with analysis data if return_data=True, None otherwise
@@ -465,24 +462,6 @@ def analyze_test_failure(session_id: str, return_data: bool = False):
     if os.path.exists(home_env):
         load_dotenv(home_env)
     
-    # Initialize Langfuse client
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
-    host = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
-    
-    if not public_key or not secret_key:
-        msg = "ERROR: Langfuse API keys not found. Check ~/.env or environment variables."
-        if return_data:
-            return {"error": msg}
-        print(msg)
-        return
-    
-    langfuse = Langfuse(
-        public_key=public_key,
-        secret_key=secret_key,
-        host=host
-    )
-    
     analysis = {
         "session_id": session_id,
         "traces": [],
@@ -492,11 +471,16 @@ def analyze_test_failure(session_id: str, return_data: bool = False):
         "state_transitions": []
     }
     
-    # Fetch traces for this session
-    traces = langfuse.get_traces(
-        session_id=session_id,
-        limit=50  # Get up to 50 traces for comprehensive analysis
-    )
+    # Fetch up to 50 traces for this session, with their observations
+    traces, observations_by_trace, _ = load_traces(session_id=session_id, limit=50, offline=offline)
+    
+    if not traces and not offline and not (os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY")):
+        # Nothing mirrored and nothing to sync from
+        msg = "ERROR: Langfuse API keys not found. Check ~/.env or environment variables."
+        if return_data:
+            return {"error": msg}
+        print(msg)
+        return
     
     if not traces:
         msg = f"No traces found for session {session_id}"
@@ -516,7 +500,7 @@ def analyze_test_failure(session_id: str, return_data: bool = False):
         }
         
         # Get observations for detailed analysis
-        observations = langfuse.get_observations(trace_id=trace.id)
+        observations = observations_by_trace[trace.id]
         
         for obs in observations:
             obs_data = {
@@ -571,8 +555,6 @@ def analyze_test_failure(session_id: str, return_data: bool = False):
         
         analysis["traces"].append(trace_data)
     
-    langfuse.flush()
-    
     if return_data:
         return analysis
     
@@ -627,36 +609,24 @@ def analyze_test_failure(session_id: str, return_data: bool = False):
     print("="*80)
 
 
-def debug_session(session_id: str, focus: str = "all"):
+def debug_session(session_id: str, focus: str = "all", offline: bool = False):
     """
     Comprehensive debug mode for a session - combines all analysis features
     
     Args:
         session_id: The session ID to debug
         focus: What to focus on ('transitions', 'prompts', 'conversation', 'state', 'all')
+        offline: Only read the local trace mirror
     """
     print("\n" + "="*80)
     print(f"🔍 DEBUGGING SESSION: {session_id}")
     print("="*80)
     
-    # Initialize Langfuse client
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY")
-    host = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
-    
-    if not public_key or not secret_key:
-        print("❌ Error: LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY not found")
-        return
-    
-    langfuse = Langfuse(
-        public_key=public_key,
-        secret_key=secret_key,
-        host=host
+    # Fetch traces for this session, with observations and scores
+    traces, observations_by_trace, scores_by_trace = load_traces(
+        session_id=session_id, limit=50, offline=offline
     )
     
-    # Fetch traces for this session
-    traces = langfuse.get_traces(session_id=session_id, limit=50)
-    
     if not traces:
         print(f"❌ No traces found for session {session_id}")
         return
@@ -669,14 +639,14 @@ def debug_session(session_id: str, focus: str = "all"):
         print(f"\n--- Analyzing Trace: {trace.name} ({trace.id[:8]}...) ---")
         
         # Get observations for detailed analysis
-        observations = langfuse.get_observations(trace_id=trace.id)
+        observations = observations_by_trace[trace.id]
         
         if not observations:
             print("  ⚠️ No observations found for this trace")
             continue
         
         # Get scores for this trace
-        scores = langfuse.get_scores(trace_id=trace.id)
+        scores = scores_by_trace[trace.id]
         score_dict = {}
         if scores:
             for score in scores:
@@ -784,7 +754,6 @@ def debug_session(session_id: str, focus: str = "all"):
     else:
         print("\n✅ No critical issues detected in this session")
     
-    langfuse.flush()
     print("\n" + "="*80)
     print("Debug analysis complete!")
     print("="*80)
@@ -806,8 +775,21 @@ if __name__ == "__main__":
     parser.add_argument("--show-conversation", action="store_true", help="Display conversation flow")
     parser.add_argument("--validate-state", action="store_true", help="Check for state continuity issues")
     
+    # Local trace mirror
+    parser.add_argument("--offline", action="store_true", help="Only use the local trace mirror (no Langfuse calls)")
+    parser.add_argument("--sync-days", type=int, help="Sync the last N days of traces into the local mirror and exit")
+    
     args = parser.parse_args()
     
+    if args.sync_days:
+        stats = sync_trace_mirror(since=datetime.now() - timedelta(days=args.sync_days))
+        if stats is None:
+            print("Error: Langfuse credentials not found or Langfuse unreachable")
+            sys.exit(1)
+        print(f"Synced trace mirror: {stats['listed']} traces listed, "
+              f"{stats['fetched']} fetched, {stats['failed']} failed")
+        sys.exit(0)
+    
     # Handle new debug modes
     if args.debug:
         # Determine focus based on other flags
@@ -821,11 +803,11 @@ if __name__ == "__main__":
         elif args.validate_state:
             focus = "state"
         
-        debug_session(args.debug, focus)
+        debug_session(args.debug, focus, offline=args.offline)
     elif args.test_failure:
-        analyze_test_failure(args.test_failure)
+        analyze_test_failure(args.test_failure, offline=args.offline)
     elif args.trace:
-        get_trace_details(args.trace)
+        get_trace_details(args.trace, offline=args.offline)
     elif args.session:
         # If specific analysis flags are set with session
         if args.show_transitions or args.prompt_analysis or args.show_conversation or args.validate_state:
@@ -840,9 +822,9 @@ if __name__ == "__main__":
                 focus.append("state")
             
             # Use debug_session with specific focus
-            debug_session(args.session, focus=",".join(focus) if focus else "all")
+            debug_session(args.session, focus=",".join(focus) if focus else "all", offline=args.offline)
         else:
             # Default session analysis
-            analyze_recent_traces(hours_back=args.hours, session_id=args.session)
+            analyze_recent_traces(hours_back=args.hours, session_id=args.session, offline=args.offline)
     else:
-        analyze_recent_traces(hours_back=args.hours, session_id=args.session)
\ No newline at end of file
+        analyze_recent_traces(hours_back=args.hours, session_id=args.session, offline=args.offline)
\ No newline at end of file
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Clarify Checkpoint Benchmark
+Runs a scripted daily clarify session with Todoist and the user stubbed out,
+once on the in-memory checkpointer and once on the durable SQLite one, and
+reports the time spent writing checkpoints per inbox item.
+
+Every graph step is checkpointed, so one item costs several writes (decision,
+add to today, break check). The target is under 5 ms per item in total.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from gtd_coach.agent.workflows import daily_clarify
+from gtd_coach.persistence.checkpointer import open_sqlite_saver
+import logging
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TARGET_MS_PER_ITEM = 5.0
+
+
+class StubTool:
+    """Stands in for a Todoist tool with a fixed result"""
+
+    def __init__(self, result: Any):
+        self.result = result
+
+    def invoke(self, _args: Dict) -> Any:
+        return self.result
+
+
+class WriteTimer:
+    """Adds up the time a checkpointer spends in its write methods"""
+
+    def __init__(self, saver):
+        self.seconds = 0.0
+        self.writes = 0
+        for name in ("put", "put_writes"):
+            # Instance attributes, so LangGraph still sees the saver's own class
+            setattr(saver, name, self._timed(getattr(saver, name)))
+
+    def _timed(self, method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+                self.writes += 1
+        return wrapper
+
+
+def measure(name: str, saver, items: int) -> Dict[str, Any]:
+    """One full session of items kept tasks"""
+    tasks = [{"id": str(i), "content": f"Inbox item {i}"} for i in range(items)]
+    daily_clarify.get_inbox_tasks_tool = StubTool({"tasks": tasks})
+    daily_clarify.mark_task_complete_tool = StubTool({"success": True})
+    daily_clarify.add_to_today_tool = StubTool({"success": True})
+    daily_clarify.flush_write_queue = lambda: True
+
+    timed = WriteTimer(saver)
+    workflow = daily_clarify.DailyClarifyWorkflow(
+        use_graphiti=False, prefetch_depth=0, checkpointer=saver, ask=lambda _prompt: "y"
+    )
+    start = time.perf_counter()
+    final = workflow.run()
+    elapsed = time.perf_counter() - start
+    assert final["processed_count"] == items
+
+    return {
+        "checkpointer": name,
+        "items": items,
+        "checkpoint_writes": timed.writes,
+        "checkpoint_ms_per_item": round(timed.seconds * 1000 / items, 3),
+        "session_ms_per_item": round(elapsed * 1000 / items, 3),
+    }
+
+
+def run(items: int) -> Dict[str, Any]:
+    """Benchmark both checkpointers"""
+    memory = measure("memory", InMemorySaver(), items)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        saver = open_sqlite_saver(Path(temp_dir) / "checkpoints.db")
+        try:
+            sqlite = measure("sqlite", saver, items)
+        finally:
+            saver.conn.close()
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "memory": memory,
+        "sqlite": sqlite,
+        "added_ms_per_item": round(sqlite["session_ms_per_item"] - memory["session_ms_per_item"], 3),
+        "target_ms_per_item": TARGET_MS_PER_ITEM,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark durable clarify checkpointing')
+    parser.add_argument('--items', type=int, default=40, help='Inbox items in the session')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    results = run(args.items)
+    for key in ("memory", "sqlite"):
+        r = results[key]
+        print(f"{key:>7}: {r['checkpoint_writes']:4d} writes, {r['checkpoint_ms_per_item']:.2f} ms/item "
+              f"checkpointing, {r['session_ms_per_item']:.2f} ms/item overall")
+    print(f"{'':>7}  SQLite adds {results['added_ms_per_item']:.2f} ms/item "
+          f"(target < {TARGET_MS_PER_ITEM} ms)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    return 0 if results['sqlite']['checkpoint_ms_per_item'] < TARGET_MS_PER_ITEM else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
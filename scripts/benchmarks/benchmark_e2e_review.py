@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+End-to-End Review Benchmark
+Runs full weekly reviews offline: GTDAgentRunner.run_weekly_review (the
+LangGraph agent) and the legacy GTDCoach phase-by-phase review, each against
+local fake LM Studio and Timing servers and an in-process fake Graphiti, with
+a scripted user at every prompt. Reports p50/p95/p99 wall time per phase and
+per review, plus LLM calls, tokens and Graphiti episodes per review, as JSON.
+
+With --baseline the results are compared to a stored run and the script exits
+1 when a phase percentile or a per-review count grows by more than
+--threshold. Everything the reviews write goes to a temporary home directory.
+"""
+
+import asyncio
+import builtins
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from unittest.mock import patch
+
+# Add repository root to path
+REPO_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_services import FakeGraphiti, FakeLLMServer, FakeTimingServer
+import logging
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class _Quiet(logging.Filter):
+    """Drop Langfuse's missing-key warnings (there are no keys offline, by design)"""
+
+    def filter(self, record):
+        return not record.name.startswith("langfuse")
+
+
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(_Quiet())
+
+PHASES = ["STARTUP", "MIND_SWEEP", "PROJECT_REVIEW", "PRIORITIZATION", "WRAP_UP"]
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "e2e_review.json"
+DEFAULT_THRESHOLD = 0.2
+# Percentile growth below this many milliseconds is treated as noise
+MIN_DELTA_MS = 25.0
+
+# (phase, tool, arguments) for each agent turn; answers for its questions in order
+AGENT_SCRIPT = [
+    ("STARTUP", "check_time_tool", {}),
+    ("STARTUP", "ask_question_v3", {"question": "How's your energy level today on a scale of 1-10?",
+                                    "context": "STARTUP"}),
+    ("MIND_SWEEP", "transition_phase_tool", {"next_phase": "MIND_SWEEP"}),
+    ("MIND_SWEEP", "ask_question_v3", {"question": "What's been on your mind this week?"}),
+    ("MIND_SWEEP", "save_mind_sweep_item_v2", {"item": "Finish client slides", "category": "task"}),
+    ("MIND_SWEEP", "save_mind_sweep_item_v2", {"item": "Call the dentist", "category": "task"}),
+    ("MIND_SWEEP", "save_mind_sweep_item_v2", {"item": "Plan team offsite", "category": "project"}),
+    ("PROJECT_REVIEW", "transition_phase_tool", {"next_phase": "PROJECT_REVIEW"}),
+    ("PROJECT_REVIEW", "ask_question_v3", {"question": "What's the next action for Client Platform?"}),
+    ("PROJECT_REVIEW", "save_project_update_v2", {"project_name": "Client Platform", "status": "active",
+                                                  "next_action": "Send the deck to the client"}),
+    ("PRIORITIZATION", "transition_phase_tool", {"next_phase": "PRIORITIZATION"}),
+    ("PRIORITIZATION", "ask_question_v3", {"question": "What is your top priority this week?"}),
+    ("PRIORITIZATION", "save_weekly_priority_v2", {"priority": "Ship the platform release", "rank": 1}),
+    ("WRAP_UP", "transition_phase_tool", {"next_phase": "WRAP_UP"}),
+    ("WRAP_UP", "save_memory_tool", {"episode_type": "session", "description": "Weekly review summary",
+                                     "episode_data": {"captures": 3, "priorities": 1}}),
+    ("WRAP_UP", "ask_yes_no_v3", {"question": "Ready to finish the review?"}),
+]
+AGENT_ANSWERS = ["7", "Finish client slides, call the dentist, plan team offsite",
+                 "Send the deck to the client", "Ship the platform release", "y"]
+
+MINDSWEEP_ITEMS = ["Finish client slides", "Call the dentist", "Plan team offsite",
+                   "Renew passport", "Book flights for conference", "Review hiring pipeline"]
+
+
+def percentiles(samples: Iterable[float]) -> Dict[str, float]:
+    """p50/p95/p99 (linear interpolation between closest ranks), in the samples' unit"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    def at(q: float) -> float:
+        position = (len(ordered) - 1) * q
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    return {name: round(at(q), 3) for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))}
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = DEFAULT_THRESHOLD,
+                        min_delta_ms: float = MIN_DELTA_MS) -> List[str]:
+    """
+    Regressions of results against baseline.
+
+    A percentile regresses when it is more than threshold (a fraction) above
+    the baseline and at least min_delta_ms slower; a per-review count (LLM
+    calls, tokens, episodes) when it is more than threshold above the baseline.
+    Flows or phases missing from the baseline are skipped.
+    """
+    regressions = []
+    for flow, current in results.get("flows", {}).items():
+        previous = baseline.get("flows", {}).get(flow)
+        if previous is None:
+            continue
+        timings = {**current["phases_ms"], "TOTAL": current["total_ms"]}
+        before = {**previous.get("phases_ms", {}), "TOTAL": previous.get("total_ms", {})}
+        for phase, stats in timings.items():
+            for name, value in stats.items():
+                old = before.get(phase, {}).get(name)
+                if old is None:
+                    continue
+                if value > old * (1 + threshold) and value - old >= min_delta_ms:
+                    regressions.append(f"{flow} {phase} {name}: {old:.1f} ms -> {value:.1f} ms")
+        for name, value in current["per_review"].items():
+            old = previous.get("per_review", {}).get(name)
+            if old is not None and value > old * (1 + threshold):
+                regressions.append(f"{flow} {name} per review: {old} -> {value}")
+    return regressions
+
+
+class ScriptedUser:
+    """Answers input() prompts for one review"""
+
+    def __init__(self, agent_answers: Optional[List[str]] = None):
+        self.agent_answers = list(agent_answers or [])
+        self.capture = list(MINDSWEEP_ITEMS)
+        self.action = 0
+
+    def __call__(self, prompt: str = "") -> str:
+        text = prompt.strip()
+        if text.startswith("👤"):
+            return self.agent_answers.pop(0) if self.agent_answers else "y"
+        if text in (">", ""):
+            # Mind sweep capture (and its follow-up clarifications): items, then a blank line
+            return self.capture.pop(0) if self.capture else ""
+        if text.startswith("Finish capture early"):
+            return "y"
+        if text.startswith("Top items"):
+            return "1,2,3"
+        if text.startswith("Next action"):
+            return "Send the deck to the client"
+        if text.startswith("Action"):
+            self.action += 1
+            return f"Priority action {self.action}" if self.action <= 3 else ""
+        if text.startswith("Priority"):
+            return "A"
+        return ""
+
+
+class Run:
+    """Counter snapshots around one review"""
+
+    def __init__(self, llm: FakeLLMServer, graph: FakeGraphiti):
+        self.llm, self.graph = llm, graph
+        self.calls = sum(llm.calls.values())
+        self.tokens = llm.total_tokens
+        self.episodes = len(graph.episodes)
+        self.turns = len(llm.agent_turns)
+        self.start = time.perf_counter()
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "llm_calls": sum(self.llm.calls.values()) - self.calls,
+            "tokens": self.llm.total_tokens - self.tokens,
+            "episodes": len(self.graph.episodes) - self.episodes,
+        }
+
+
+def run_agent_review(llm: FakeLLMServer, graph: FakeGraphiti) -> Dict[str, Any]:
+    """One GTDAgentRunner.run_weekly_review; phase times come from the scripted model's turns"""
+    from gtd_coach.agent import runner
+
+    run = Run(llm, graph)
+    with patch.object(runner, "OBSERVABILITY_AVAILABLE", False), \
+            patch.object(runner, "DISK_MONITOR_AVAILABLE", False), \
+            patch.object(builtins, "input", ScriptedUser(AGENT_ANSWERS)):
+        review = runner.GTDAgentRunner()
+        exit_code = review.run_weekly_review()
+    end = time.perf_counter()
+    if exit_code != 0:
+        raise RuntimeError(f"Agent review exited with {exit_code}")
+
+    starts: Dict[str, float] = {}
+    for at, phase in llm.agent_turns[run.turns:]:
+        starts.setdefault(phase, at)
+    starts[PHASES[0]] = run.start  # startup includes building the agent
+    bounds = sorted((at, phase) for phase, at in starts.items()) + [(end, None)]
+    phases = {phase: (bounds[i + 1][0] - at) * 1000 for i, (at, phase) in enumerate(bounds[:-1])}
+    return {"phases_ms": phases, "total_ms": (end - run.start) * 1000, **run.counts()}
+
+
+def run_legacy_review(llm: FakeLLMServer, graph: FakeGraphiti) -> Dict[str, Any]:
+    """One legacy GTDCoach.run_legacy_review, timing each phase method"""
+    from gtd_coach import coach as legacy
+
+    run = Run(llm, graph)
+    phases: Dict[str, float] = {}
+    with ExitStack() as stack:
+        for flag in ("LANGFUSE_AVAILABLE", "LANGFUSE_PROMPTS_AVAILABLE", "EVALUATION_AVAILABLE"):
+            stack.enter_context(patch.object(legacy, flag, False))
+        # The phase timer shells out to a sound script
+        stack.enter_context(patch.object(legacy.GTDCoach, "start_timer", lambda *args, **kwargs: None))
+        stack.enter_context(patch.object(builtins, "input", ScriptedUser()))
+        review = legacy.GTDCoach()
+        review.interventions_enabled = False  # grounding exercises sleep for 25 s
+        built = time.perf_counter()
+        for phase, method in zip(PHASES, ("run_startup_phase", "run_mindsweep_phase",
+                                          "run_project_review_phase", "run_prioritization_phase",
+                                          "run_wrapup_phase")):
+            stack.enter_context(patch.object(review, method, _timed(getattr(review, method), phase, phases)))
+        review.run_legacy_review()
+        # Wrap-up queues its phase transition and episode flush after the log is saved
+        drain = time.perf_counter()
+        pending = asyncio.all_tasks(review.loop)
+        if pending:
+            review.loop.run_until_complete(asyncio.gather(*pending))
+        review.loop.close()
+    end = time.perf_counter()
+    phases[PHASES[-1]] += (end - drain) * 1000
+    phases[PHASES[0]] += (built - run.start) * 1000  # startup includes building the coach
+    return {"phases_ms": phases, "total_ms": (end - run.start) * 1000, **run.counts()}
+
+
+def _timed(method, phase: str, phases: Dict[str, float]):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            phases[phase] = (time.perf_counter() - start) * 1000
+    return wrapper
+
+
+FLOWS = {"agent": run_agent_review, "legacy": run_legacy_review}
+
+
+def _prepare_home(home: Path) -> None:
+    """Temporary ~/gtd-coach with the prompt files the legacy coach loads"""
+    prompts = home / "gtd-coach" / "prompts"
+    prompts.mkdir(parents=True)
+    shutil.copy(REPO_ROOT / "config" / "prompts" / "simple.txt", prompts / "system-prompt-simple.txt")
+    shutil.copy(REPO_ROOT / "config" / "prompts" / "system.txt", prompts / "system-prompt.txt")
+
+
+def run(iterations: int, llm_ms: float, graphiti_ms: float, timing_ms: float,
+        flows: List[str], warmup: int = 1, verbose: bool = False) -> Dict[str, Any]:
+    """Benchmark the selected flows against fresh fake backends"""
+    llm = FakeLLMServer(latency_ms=llm_ms, agent_script=AGENT_SCRIPT)
+    timing = FakeTimingServer(latency_ms=timing_ms)
+    graph = FakeGraphiti(latency_ms=graphiti_ms)
+    home = Path(tempfile.mkdtemp(prefix="gtd_e2e_"))
+    _prepare_home(home)
+    environment = {
+        "HOME": str(home), "LM_STUDIO_URL": f"{llm.url}/v1", "TIMING_API_URL": f"{timing.url}/api/v1",
+        "TIMING_API_KEY": "fake", "GRAPHITI_ENABLED": "true", "GRAPHITI_BATCH_SIZE": "5",
+    }
+    samples: Dict[str, List[Dict[str, Any]]] = {flow: [] for flow in flows}
+    try:
+        with patch.dict(os.environ, environment), graph.installed(), \
+                redirect_stdout(sys.stdout if verbose else io.StringIO()):
+            for key in [key for key in os.environ if key.startswith("LANGFUSE_")]:
+                del os.environ[key]  # no tracing offline; restored on exit
+            for iteration in range(warmup + iterations):
+                for flow in flows:
+                    result = FLOWS[flow](llm, graph)
+                    if iteration >= warmup:  # warm-up reviews pay one-off imports
+                        samples[flow].append(result)
+    finally:
+        llm.shutdown()
+        timing.shutdown()
+        shutil.rmtree(home, ignore_errors=True)
+
+    report = {}
+    for flow, runs in samples.items():
+        report[flow] = {
+            "reviews": len(runs),
+            "phases_ms": {phase: percentiles(r["phases_ms"].get(phase, 0.0) for r in runs)
+                          for phase in PHASES},
+            "total_ms": percentiles(r["total_ms"] for r in runs),
+            "per_review": {name: round(statistics.mean(r[name] for r in runs), 1)
+                           for name in ("llm_calls", "tokens", "episodes")},
+        }
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "latency_ms": {"llm": llm_ms, "graphiti": graphiti_ms, "timing": timing_ms},
+        "flows": report,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark full weekly reviews against fake backends')
+    parser.add_argument('--iterations', type=int, default=5, help='Reviews per flow')
+    parser.add_argument('--warmup', type=int, default=1, help='Unmeasured reviews per flow first')
+    parser.add_argument('--flow', choices=sorted(FLOWS), action='append',
+                        help='Flow to run (repeatable; default: both)')
+    parser.add_argument('--llm-ms', type=float, default=50.0, help='Fake LLM latency per request')
+    parser.add_argument('--graphiti-ms', type=float, default=20.0, help='Fake Graphiti latency per call')
+    parser.add_argument('--timing-ms', type=float, default=20.0, help='Fake Timing latency per request')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Stored results to compare with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed growth over the baseline, as a fraction')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    parser.add_argument('--verbose', action='store_true', help="Show the reviews' console output")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.llm_ms, args.graphiti_ms, args.timing_ms,
+                  args.flow or sorted(FLOWS), args.warmup, args.verbose)
+    for flow, r in results["flows"].items():
+        print(f"{flow}: {r['reviews']} reviews, {r['per_review']['llm_calls']:.0f} LLM calls, "
+              f"{r['per_review']['tokens']:.0f} tokens, {r['per_review']['episodes']:.0f} episodes per review")
+        for phase, stats in {**r["phases_ms"], "TOTAL": r["total_ms"]}.items():
+            print(f"  {phase:<15} p50 {stats['p50']:9.1f} ms  p95 {stats['p95']:9.1f} ms  "
+                  f"p99 {stats['p99']:9.1f} ms")
+
+    regressions = []
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline.exists():
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("latency_ms") != results["latency_ms"]:
+            print("⚠️  Baseline was recorded with different fake latencies")
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        results["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if not regressions:
+            print(f"No regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Benchmark
+Compares the compiled shared matcher (gtd_coach.patterns.keywords) with the
+per-table ``any(word in text ...)`` scans it replaced, on a synthetic corpus
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.patterns.keywords import KEYWORDS, RULE_TABLES
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FILLER = [
+    "the", "a", "to", "for", "and", "with", "about", "my", "our", "mom", "car",
+    "kitchen", "friday", "next", "week", "tomorrow", "after", "lunch", "team",
+    "quarterly", "dentist", "insurance", "groceries", "garage", "Sam", "offsite",
+]
+
+
+def build_corpus(size: int, seed: int = 42) -> List[str]:
+    """Mind-sweep-like items mixing filler words with rule keywords"""
+    rng = random.Random(seed)
+    keywords = sorted({k for rules in RULE_TABLES.values() for ks in rules.values() for k in ks})
+    corpus = []
+    for _ in range(size):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(2, 9))]
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def classify_naive(text: str) -> Dict[str, Any]:
+    """Every table as its own if/elif chain of substring scans"""
+    lowered = text.lower()
+    result = {}
+    for table, rules in RULE_TABLES.items():
+        result[table] = None
+        for label, keywords in rules.items():
+            if any(keyword in lowered for keyword in keywords):
+                result[table] = label
+                break
+    return result
+
+
+def classify_compiled(text: str) -> Dict[str, Any]:
+    """One scan, then label lookups per table"""
+    hits = KEYWORDS.scan(text)
+    return {table: hits.first(table) for table in RULE_TABLES}
+
+
+def run(size: int) -> Dict[str, Any]:
+    """Time both classifiers over the corpus and check they agree"""
+    corpus = build_corpus(size)
+
+    start = time.perf_counter()
+    naive = [classify_naive(text) for text in corpus]
+    naive_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [classify_compiled(text) for text in corpus]
+    compiled_s = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(naive, compiled) if a != b)
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "items": size,
+        "tables": len(RULE_TABLES),
+        "naive_s": round(naive_s, 3),
+        "compiled_s": round(compiled_s, 3),
+        "speedup": round(naive_s / compiled_s, 2) if compiled_s else None,
+        "items_per_s": round(size / compiled_s) if compiled_s else None,
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the compiled keyword matcher')
+    parser.add_argument('--items', type=int, default=100_000, help='Synthetic corpus size')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    results = run(args.items)
+    print(f"\nItems:      {results['items']:,} across {results['tables']} rule tables")
+    print(f"any() scans: {results['naive_s']:.2f}s")
+    print(f"Compiled:    {results['compiled_s']:.2f}s ({results['speedup']}x)")
+    print(f"Mismatches:  {results['mismatches']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    return 0 if results['mismatches'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+Measures what the metrics registry adds to the two hottest instrumented call
+sites: GTDCoach.send_message (one counter increment and one latency
+observation per LLM turn) and GraphitiMemory._send_single_episode (the same,
+by episode type). The exact registry calls each site makes are timed in a
+tight loop and compared with the fastest those calls can possibly be: a
+round trip to a zero-latency local fake LLM, and _send_single_episode itself
+against a zero-latency fake Graphiti client. The target is under 1% of that.
+
+Also compares concurrent histogram writes against a lock-guarded histogram
+to show the per-thread shards don't contend.
+"""
+
+import asyncio
+import bisect
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import requests
+
+from fake_services import FakeGraphiti, FakeLLMServer
+from gtd_coach.metrics.registry import DEFAULT_BUCKETS, HistogramChild, get_registry
+import logging
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class _Quiet(logging.Filter):
+    """Drop Langfuse's missing-key warnings (there are no keys offline, by design)"""
+
+    def filter(self, record):
+        return not record.name.startswith("langfuse")
+
+
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(_Quiet())
+
+# Instrumentation may add at most this fraction of the fastest possible call
+TARGET_FRACTION = 0.01
+
+
+class LockedHistogram:
+    """Baseline: one lock around shared buckets, as a naive histogram would do"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._upper = list(buckets)
+        self._counts = [0] * (len(self._upper) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self._upper, value)] += 1
+            self._sum += value
+
+
+def ns_per_call(fn: Callable[[], Any], calls: int, repeats: int = 5) -> float:
+    """Best-of-repeats nanoseconds per call of fn"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter_ns() - start) / calls)
+    return best
+
+
+def instrumentation_ns(calls: int) -> Dict[str, float]:
+    """Registry work each call site does per call"""
+    registry = get_registry()
+    import gtd_coach.coach  # noqa: F401 (registers the legacy coach's families)
+    from gtd_coach.integrations.graphiti import _metrics_for_episode
+
+    requests_total = registry.get("gtd_llm_requests_total")
+    llm_latency = registry.get("gtd_llm_request_duration_seconds")
+    success, latency = requests_total.labels("legacy", "success"), llm_latency.labels("legacy")
+
+    def send_message():
+        success.inc()
+        latency.observe(0.42)
+
+    def send_single_episode():
+        succeeded, _failed, duration, _retries = _metrics_for_episode("interaction")
+        succeeded.inc()
+        duration.observe(0.42)
+
+    return {
+        "send_message": ns_per_call(send_message, calls),
+        "send_single_episode": ns_per_call(send_single_episode, calls),
+    }
+
+
+def fastest_llm_call_ns(calls: int) -> float:
+    """One chat completion round trip to a zero-latency local server"""
+    server = FakeLLMServer()
+    session = requests.Session()
+    body = {"model": "m", "messages": [{"role": "user", "content": "Next project?"}]}
+    try:
+        return ns_per_call(lambda: session.post(f"{server.url}/v1/chat/completions",
+                                                json=body, timeout=5).raise_for_status(),
+                           calls, repeats=3)
+    finally:
+        session.close()
+        server.shutdown()
+
+
+def fastest_episode_ns(calls: int) -> float:
+    """_send_single_episode against a zero-latency Graphiti client"""
+    from gtd_coach.integrations.graphiti import GraphitiMemory
+
+    fake = FakeGraphiti()
+    with fake.installed():
+        memory = GraphitiMemory("bench", enable_json_backup=False)
+        memory.graphiti_client = fake
+        episode = {"type": "interaction", "timestamp": datetime.now().isoformat(),
+                   "phase": "MIND_SWEEP", "data": {"role": "user", "content": "Call dentist"}}
+        loop = asyncio.new_event_loop()
+        try:
+            return ns_per_call(lambda: loop.run_until_complete(memory._send_single_episode(episode)),
+                               calls, repeats=3)
+        finally:
+            loop.close()
+
+
+def contention(threads: int, observations: int) -> Dict[str, float]:
+    """Wall time for threads writing one histogram at once, sharded vs locked"""
+    results = {}
+    for name, histogram in (("sharded", HistogramChild(DEFAULT_BUCKETS)), ("locked", LockedHistogram())):
+        def work():
+            observe = histogram.observe
+            for i in range(observations):
+                observe(i * 1e-4)
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        results[f"{name}_ns_per_observe"] = round(elapsed * 1e9 / (threads * observations), 1)
+    return results
+
+
+def run(calls: int, round_trips: int, threads: int) -> Dict[str, Any]:
+    """Instrumentation cost against the fastest real calls"""
+    cost = instrumentation_ns(calls)
+    floors = {"send_message": fastest_llm_call_ns(round_trips),
+              "send_single_episode": fastest_episode_ns(round_trips)}
+    sites = {
+        site: {
+            "instrumentation_ns": round(cost[site], 1),
+            "fastest_call_ns": round(floors[site], 1),
+            "fraction": cost[site] / floors[site],
+        }
+        for site in cost
+    }
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "sites": sites,
+        "contention": {"threads": threads, **contention(threads, calls // threads)},
+        "target_fraction": TARGET_FRACTION,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark metrics registry overhead at its call sites')
+    parser.add_argument('--calls', type=int, default=200000, help='Timed registry calls per measurement')
+    parser.add_argument('--round-trips', type=int, default=300, help='Timed fake LLM / Graphiti calls')
+    parser.add_argument('--threads', type=int, default=8, help='Writers in the contention test')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    results = run(args.calls, args.round_trips, args.threads)
+    for site, r in results["sites"].items():
+        print(f"{site:>20}: {r['instrumentation_ns'] / 1000:6.2f} µs of metrics per call, fastest call "
+              f"{r['fastest_call_ns'] / 1000:8.1f} µs ({r['fraction']:.3%}, target < {TARGET_FRACTION:.0%})")
+    c = results["contention"]
+    print(f"{'contention':>20}: {c['threads']} threads, {c['sharded_ns_per_observe']:.0f} ns/observe sharded "
+          f"vs {c['locked_ns_per_observe']:.0f} ns/observe locked")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    return 0 if all(r["fraction"] < TARGET_FRACTION for r in results["sites"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
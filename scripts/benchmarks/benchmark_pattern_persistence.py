@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Pattern Persistence Benchmark
+Builds synthetic pattern-session histories of growing length (up to 5,000
+sessions, a steady SESSIONS_PER_DAY reaching further back as history grows),
+imports them into the SQLite index and times the lookups the coach makes at
+startup: recurring patterns over 4 weeks, intervention history and pattern
+evolution over 8 weeks.
+
+For comparison the same recurring-pattern lookup is timed the way it used
+to work, opening and parsing every session file in the window. The target
+is that all three lookups stay flat: at most 1.5x slower on the largest
+history than on the smallest.
+"""
+
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.patterns.pattern_persistence import PatternPersistence
+import logging
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PATTERN_TYPES = ['fragmented_capture', 'low_focus', 'task_switching',
+                 'confusion_expression', 'rushed_completion', 'topic_jumps']
+INTERVENTION_TYPES = ['timer_alert', 'context_grouping', 'break_prompt']
+SEVERITIES = ['low', 'medium', 'high']
+# 5,000 sessions reach back about two years
+SESSIONS_PER_DAY = 7
+MAX_FLAT_RATIO = 1.5
+LOOKUPS = ("recent_patterns_ms", "intervention_history_ms", "pattern_evolution_ms")
+
+
+def write_history(sessions_dir: Path, sessions: int, seed: int = 7) -> None:
+    """Session files in the flat layout older versions wrote"""
+    rng = random.Random(seed)
+    sessions_dir.mkdir(parents=True, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=1) / SESSIONS_PER_DAY
+    for i in range(sessions):
+        when = now - step * (i + 1)
+        session_id = f"{when.strftime('%Y%m%d_%H%M%S')}_{i:08x}"
+        data = {
+            'session_id': session_id,
+            'timestamp': when.isoformat(),
+            'patterns': [{'type': t, 'severity': rng.choice(SEVERITIES)}
+                         for t in rng.sample(PATTERN_TYPES, rng.randint(1, 3))],
+            'interventions': [{'type': t, 'context': {'phase': 'MIND_SWEEP'}}
+                              for t in rng.sample(INTERVENTION_TYPES, rng.randint(0, 2))],
+            'outcomes': {'focus_score': rng.randint(30, 90)},
+            'effectiveness': round(rng.uniform(0.2, 0.9), 2),
+        }
+        with open(sessions_dir / f'{session_id}.json', 'w') as f:
+            json.dump(data, f)
+
+
+def scan_recent_patterns(persistence: PatternPersistence, weeks_back: int = 4) -> Dict[str, int]:
+    """The previous implementation: parse every session file in the window"""
+    cutoff = datetime.now(timezone.utc) - timedelta(weeks=weeks_back)
+    counts: Dict[str, int] = defaultdict(int)
+    for entry in persistence.artifacts.find('pattern_session', since=cutoff):
+        with open(entry['file']) as f:
+            session_data = json.load(f)
+        if datetime.fromisoformat(session_data['timestamp']) < cutoff:
+            continue
+        for pattern in session_data.get('patterns', []):
+            counts[pattern.get('type', 'unknown')] += 1
+    return dict(counts)
+
+
+def median_ms(fn: Callable[[], Any], repeats: int) -> float:
+    """Median wall time of fn in milliseconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def measure(sessions: int, repeats: int) -> Dict[str, Any]:
+    """Import one history and time the lookups on it"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        write_history(Path(temp_dir) / 'sessions', sessions)
+        start = time.perf_counter()
+        persistence = PatternPersistence(data_dir=Path(temp_dir))  # imports the files
+        import_s = time.perf_counter() - start
+        try:
+            recurring = persistence.load_recent_patterns(weeks_back=4)
+            scanned = scan_recent_patterns(persistence, weeks_back=4)
+            assert {r['pattern']: r['frequency'] for r in recurring} == scanned, "index disagrees with files"
+            return {
+                "sessions": sessions,
+                "history_days": round(sessions / SESSIONS_PER_DAY),
+                "import_s": round(import_s, 3),
+                "recent_patterns_ms": round(median_ms(lambda: persistence.load_recent_patterns(4), repeats), 3),
+                "intervention_history_ms": round(
+                    median_ms(lambda: persistence.get_intervention_history('timer_alert'), repeats), 3),
+                "pattern_evolution_ms": round(
+                    median_ms(lambda: persistence.get_pattern_evolution('low_focus', 8), repeats), 3),
+                "json_scan_recent_patterns_ms": round(
+                    median_ms(lambda: scan_recent_patterns(persistence, 4), max(3, repeats // 10)), 3),
+            }
+        finally:
+            persistence.close()
+
+
+def run(sizes: List[int], repeats: int) -> Dict[str, Any]:
+    """Benchmark every history size"""
+    results = [measure(size, repeats) for size in sizes]
+    smallest, largest = results[0], results[-1]
+    ratios = {key: round(largest[key] / max(smallest[key], 1e-6), 2)
+              for key in LOOKUPS + ("json_scan_recent_patterns_ms",)}
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "sessions_per_day": SESSIONS_PER_DAY,
+        "results": results,
+        "growth_ratios": ratios,
+        "max_flat_ratio": MAX_FLAT_RATIO,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark indexed pattern persistence lookups')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 2500, 5000],
+                        help='History sizes (sessions) to benchmark')
+    parser.add_argument('--repeats', type=int, default=50, help='Timed lookups per measurement')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    results = run(sorted(args.sizes), args.repeats)
+    print(f"{'sessions':>8} {'days':>5} {'import':>8} {'recurring':>10} {'interv.':>8} "
+          f"{'evolution':>10} {'JSON scan':>10}")
+    for r in results["results"]:
+        print(f"{r['sessions']:>8} {r['history_days']:>5} {r['import_s']:>7.2f}s "
+              f"{r['recent_patterns_ms']:>8.3f}ms {r['intervention_history_ms']:>6.3f}ms "
+              f"{r['pattern_evolution_ms']:>8.3f}ms {r['json_scan_recent_patterns_ms']:>8.2f}ms")
+    ratios = results["growth_ratios"]
+    print(f"Largest/smallest history: recurring {ratios['recent_patterns_ms']}x, "
+          f"intervention history {ratios['intervention_history_ms']}x, "
+          f"evolution {ratios['pattern_evolution_ms']}x, JSON scan {ratios['json_scan_recent_patterns_ms']}x "
+          f"(target <= {MAX_FLAT_RATIO}x)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    return 0 if all(ratios[key] <= MAX_FLAT_RATIO for key in LOOKUPS) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
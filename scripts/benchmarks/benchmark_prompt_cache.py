@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Prompt Cache Benchmark for the GTD Agent context layouts
+Measures prompt-processing time per turn on LM Studio for the inline and
+prefix-stable layouts of GTDAgent._pre_model_hook
+
+Prompt processing is approximated by time to first token with max_tokens=1,
+so the difference between layouts is the time saved by prefix cache reuse.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import convert_to_openai_messages
+from openai import OpenAI
+
+from gtd_coach.agent.core import GTDAgent
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CAPTURES = [
+    "Finish the quarterly report draft",
+    "Call the dentist about the crown",
+    "Renew car insurance before the 15th",
+    "Reply to Sam about the offsite agenda",
+    "Book flights for the conference",
+    "Fix the leaking kitchen tap",
+    "Review the pull request backlog",
+    "Plan meals for next week",
+]
+
+
+class PromptCacheBenchmark:
+    """Compare per-turn prompt processing time across context layouts"""
+
+    def __init__(self, lm_studio_url: str, model_name: str, turns: int = 8):
+        self.lm_studio_url = lm_studio_url
+        self.model_name = model_name
+        self.turns = turns
+        self.client = OpenAI(base_url=lm_studio_url, api_key="lm-studio")
+
+    def _time_to_first_token(self, messages: List[Dict]) -> float:
+        """Stream a 1-token completion and return seconds until the first chunk"""
+        start = time.perf_counter()
+        stream = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            max_tokens=1,
+            temperature=0,
+            stream=True
+        )
+        elapsed = None
+        for _ in stream:
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+        return elapsed if elapsed is not None else time.perf_counter() - start
+
+    def run_layout(self, layout: str) -> Dict[str, Any]:
+        """Simulate a mind sweep conversation where the clock advances each turn"""
+        agent = GTDAgent(
+            lm_studio_url=self.lm_studio_url,
+            model_name=self.model_name,
+            use_memory_saver=True,
+            context_layout=layout
+        )
+        phase_start = datetime.now()
+        history = [HumanMessage(content="Let's start the mind sweep.")]
+        timings = []
+
+        for turn in range(self.turns):
+            state = {
+                "messages": list(history),
+                "current_phase": "MIND_SWEEP",
+                # One simulated minute per turn so the time context changes
+                "phase_start_time": phase_start - timedelta(minutes=turn),
+                "accountability_mode": "firm",
+                "phase_summary": "STARTUP: Completed",
+            }
+            request = convert_to_openai_messages(agent._pre_model_hook(state))
+            timings.append(self._time_to_first_token(request))
+
+            history.append(AIMessage(content="Got it. What else is on your mind?"))
+            history.append(HumanMessage(content=CAPTURES[turn % len(CAPTURES)]))
+
+        # First turn is a cold cache for both layouts
+        warm = timings[1:] or timings
+        return {
+            "layout": layout,
+            "turns": len(timings),
+            "timings_s": [round(t, 4) for t in timings],
+            "mean_warm_s": statistics.mean(warm),
+            "median_warm_s": statistics.median(warm),
+            "prefix_reuse": agent.get_context_metrics()["prefix_reuse"],
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """Run both layouts and report time saved per turn"""
+        inline = self.run_layout("inline")
+        prefix_stable = self.run_layout("prefix_stable")
+        saved = inline["mean_warm_s"] - prefix_stable["mean_warm_s"]
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "model": self.model_name,
+            "inline": inline,
+            "prefix_stable": prefix_stable,
+            "saved_per_turn_s": saved,
+            "saved_per_turn_pct": (saved / inline["mean_warm_s"] * 100) if inline["mean_warm_s"] else 0.0,
+        }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark prompt cache reuse per context layout')
+    parser.add_argument('--url', default=os.getenv('LM_STUDIO_URL', 'http://localhost:1234/v1'),
+                        help='LM Studio API URL')
+    parser.add_argument('--model', default=os.getenv('LM_STUDIO_MODEL', 'meta-llama-3.1-8b-instruct'),
+                        help='Model name')
+    parser.add_argument('--turns', type=int, default=8, help='Conversation turns per layout')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    url = args.url if args.url.endswith('/v1') else f"{args.url}/v1"
+    results = PromptCacheBenchmark(url, args.model, args.turns).run()
+
+    print(f"\nInline:        {results['inline']['mean_warm_s'] * 1000:.0f} ms/turn")
+    print(f"Prefix-stable: {results['prefix_stable']['mean_warm_s'] * 1000:.0f} ms/turn")
+    print(f"Saved:         {results['saved_per_turn_s'] * 1000:.0f} ms/turn "
+          f"({results['saved_per_turn_pct']:.0f}%)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
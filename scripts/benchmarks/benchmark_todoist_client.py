@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Todoist Client Benchmark
+Runs the same 50-item clarify sequence against a local fake Todoist server
+with a fresh TodoistClient per call (how the agent tools used to work) and
+with the shared pooled client from get_todoist_client(), and compares
+requests, TCP connections and wall time.
+
+Each step is a separate tool-style call: read the inbox, then per item
+close it and (for kept items) add it to today, re-reading the inbox at
+every 5-item break. Mutations go straight to the REST API and reads skip
+the local mirror so connection reuse is measured; the write-behind queue and
+the mirror are covered by their own tests.
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_todoist import FakeTodoistServer
+from gtd_coach.integrations import todoist
+import logging
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def clarify_run(get_client: Callable[[], todoist.TodoistClient]) -> int:
+    """One clarify session; returns the number of items processed"""
+    inbox = get_client().get_inbox_tasks()
+    for i, task in enumerate(inbox, 1):
+        if i % 3:  # keep two of every three
+            get_client().add_to_today(task['content'], is_deep_work=(i % 10 == 1))
+        get_client().mark_complete(task['id'])
+        if i % 5 == 0:
+            get_client().get_inbox_tasks()
+    return len(inbox)
+
+
+def measure(name: str, get_client: Callable[[], todoist.TodoistClient], items: int,
+            request_ms: float, connect_ms: float) -> Dict[str, Any]:
+    """Run clarify_run against a fresh fake account"""
+    server = FakeTodoistServer(inbox_items=items, request_ms=request_ms, connect_ms=connect_ms)
+    os.environ['TODOIST_API_URL'] = server.url
+    todoist.MIRROR_ENABLED = False
+    todoist._clients.clear()
+    try:
+        start = time.perf_counter()
+        processed = clarify_run(get_client)
+        elapsed = time.perf_counter() - start
+        return {
+            "mode": name,
+            "items": processed,
+            "requests": sum(server.requests.values()),
+            "connections": server.connections,
+            "by_route": dict(server.requests),
+            "seconds": round(elapsed, 3),
+        }
+    finally:
+        server.shutdown()
+
+
+def run(items: int, request_ms: float, connect_ms: float) -> Dict[str, Any]:
+    """Benchmark both modes"""
+    fresh = measure("fresh client per call", lambda: todoist.TodoistClient(api_key="bench"),
+                    items, request_ms, connect_ms)
+    pooled = measure("shared pooled client", lambda: todoist.get_todoist_client(api_key="bench"),
+                     items, request_ms, connect_ms)
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "request_ms": request_ms,
+        "connect_ms": connect_ms,
+        "fresh": fresh,
+        "pooled": pooled,
+        "requests_saved": fresh["requests"] - pooled["requests"],
+        "speedup": round(fresh["seconds"] / pooled["seconds"], 2) if pooled["seconds"] else None,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the pooled Todoist client')
+    parser.add_argument('--items', type=int, default=50, help='Inbox items to clarify')
+    parser.add_argument('--request-ms', type=float, default=10.0,
+                        help='Simulated server time per request')
+    parser.add_argument('--connect-ms', type=float, default=30.0,
+                        help='Simulated TCP+TLS setup per new connection')
+    parser.add_argument('--output', help='Write JSON results to this file')
+    args = parser.parse_args()
+
+    results = run(args.items, args.request_ms, args.connect_ms)
+    for key in ("fresh", "pooled"):
+        r = results[key]
+        print(f"{r['mode']:>24}: {r['requests']:4d} requests, {r['connections']:4d} connections, "
+              f"{r['seconds']:.2f}s")
+    print(f"{'':>24}  {results['requests_saved']} fewer requests, {results['speedup']}x faster")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    return 0 if results['pooled']['requests'] < results['fresh']['requests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
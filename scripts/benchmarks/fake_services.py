@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local fake LLM, Timing and Graphiti backends for offline end-to-end benchmarks
+The LLM server speaks the OpenAI-compatible chat completions API LM Studio
+serves (plain and streamed, with tool calls), the Timing server the two report
+endpoints the coach reads, and the Graphiti fake stands in for the graph client
+itself: Graphiti talks to FalkorDB over the Redis protocol, so there is no
+HTTP boundary to put a server behind. Every backend takes a fixed latency and
+counts what it was asked to do.
+"""
+
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+MODEL = "meta-llama-3.1-8b-instruct"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+class _JSONServer:
+    """Threaded HTTP/1.1 server on a free localhost port with a fixed per-request delay"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.requests: Counter = Counter()
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, Nagle
+            # plus delayed ACKs adds ~40 ms to every keep-alive response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._dispatch(self, "GET")
+
+            def do_POST(self):
+                server._dispatch(self, "POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        time.sleep(self.latency)
+        path = urlparse(handler.path).path.rstrip("/")
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length)) if length else {}
+        with self._lock:
+            self.requests[f"{method} {path}"] += 1
+        status, content_type, data = self._route(method, path, body)
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _route(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, str, bytes]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _json(payload: Any, status: int = 200) -> Tuple[int, str, bytes]:
+        return status, "application/json", json.dumps(payload).encode()
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeLLMServer(_JSONServer):
+    """
+    OpenAI-compatible chat completions endpoint with scripted replies.
+
+    Requests that offer tools (the LangGraph agent) get the next tool call of
+    the agent script, chosen by how many assistant turns the request already
+    holds, so the script replays identically however the agent is resumed;
+    once it runs out the agent gets a closing text reply. Requests without
+    tools (the legacy coach) get a short coaching reply.
+    """
+
+    def __init__(self, latency_ms: float = 0.0,
+                 agent_script: Optional[List[Tuple[str, str, Dict[str, Any]]]] = None):
+        """
+        Args:
+            latency_ms: Delay before every response (stands in for inference time)
+            agent_script: (phase, tool name, tool arguments) per agent turn
+        """
+        self.agent_script = agent_script or []
+        self.calls: Counter = Counter()   # "agent" or "chat"
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.agent_turns: List[Tuple[float, str]] = []  # (perf_counter, script phase)
+        super().__init__(latency_ms)
+
+    def _route(self, method, path, body):
+        if method == "GET" and path == "/v1/models":
+            return self._json({"object": "list", "data": [{"id": MODEL, "object": "model"}]})
+        if method == "POST" and path == "/v1/chat/completions":
+            return self._complete(body)
+        return self._json({"error": "Not found"}, 404)
+
+    def _complete(self, body: Dict[str, Any]) -> Tuple[int, str, bytes]:
+        messages = body.get("messages", [])
+        tool_call = None
+        if body.get("tools"):
+            step = sum(1 for m in messages if m.get("role") == "assistant")
+            with self._lock:
+                self.calls["agent"] += 1
+                if step < len(self.agent_script):
+                    phase, name, args = self.agent_script[step]
+                    self.agent_turns.append((time.perf_counter(), phase))
+                    tool_call = {"id": f"call_{step}", "type": "function",
+                                 "function": {"name": name, "arguments": json.dumps(args)}}
+            content = None if tool_call else "Great work today. Your weekly review is complete."
+        else:
+            with self._lock:
+                self.calls["chat"] += 1
+            content = "Got it. Stay with the current step; you're on track and doing well."
+
+        prompt_tokens = estimate_tokens(json.dumps(messages))
+        completion_tokens = estimate_tokens(content or tool_call["function"]["arguments"])
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        finish = "tool_calls" if tool_call else "stop"
+        base = {"id": "chatcmpl-fake", "created": int(time.time()), "model": body.get("model", MODEL)}
+
+        if not body.get("stream"):
+            message = {"role": "assistant", "content": content}
+            if tool_call:
+                message["tool_calls"] = [tool_call]
+            return self._json({**base, "object": "chat.completion", "usage": usage,
+                               "choices": [{"index": 0, "message": message, "finish_reason": finish}]})
+
+        delta = {"role": "assistant", "content": content}
+        if tool_call:
+            delta["tool_calls"] = [{"index": 0, **tool_call}]
+        chunks = [
+            {**base, "object": "chat.completion.chunk",
+             "choices": [{"index": 0, "delta": delta, "finish_reason": None}]},
+            {**base, "object": "chat.completion.chunk",
+             "choices": [{"index": 0, "delta": {}, "finish_reason": finish}]},
+        ]
+        if (body.get("stream_options") or {}).get("include_usage"):
+            chunks.append({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        events = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+        return 200, "text/event-stream", events.encode()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class FakeTimingServer(_JSONServer):
+    """Timing Web API report and time entry endpoints over a fixed week of data"""
+
+    PROJECTS = [("Client Platform", 9.5), ("GTD Coach", 6.0), ("Hiring", 3.0),
+                ("Admin", 2.5), ("Learning", 1.5)]
+
+    def _route(self, method, path, body):
+        if method == "GET" and path == "/api/v1/report":
+            return self._json({"data": [{"duration": int(hours * 3600), "project": {"title": title}}
+                                        for title, hours in self.PROJECTS]})
+        if method == "GET" and path == "/api/v1/time-entries":
+            start = datetime.now(timezone.utc) - timedelta(days=2)
+            entries = []
+            for i in range(40):
+                title, _ = self.PROJECTS[(i // 3) % len(self.PROJECTS)]
+                began = start + timedelta(minutes=20 * i)
+                entries.append({
+                    "id": str(i), "project": {"title": title}, "application": {"name": "Code"},
+                    "start_date": began.isoformat(), "end_date": (began + timedelta(minutes=18)).isoformat(),
+                    "duration": 18 * 60, "title": f"{title} work",
+                })
+            return self._json({"data": entries})
+        return self._json({"error": "Not found"}, 404)
+
+
+class FakeGraphiti:
+    """In-process stand-in for the Graphiti client returned by GraphitiClient.initialize()"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.episodes: List[str] = []
+        self.searches = 0
+        self._lock = threading.Lock()
+
+    async def add_episode(self, name: str = "", **_kwargs) -> SimpleNamespace:
+        await asyncio.sleep(self.latency)
+        with self._lock:
+            self.episodes.append(name)
+        return SimpleNamespace(episode=SimpleNamespace(uuid=f"episode-{len(self.episodes)}"))
+
+    async def search(self, query: str, center_node_uuid: Optional[str] = None,
+                     num_results: int = 10, **_kwargs) -> List[SimpleNamespace]:
+        await asyncio.sleep(self.latency)
+        with self._lock:
+            self.searches += 1
+        now = datetime.now(timezone.utc)
+        facts = ["Prefers short check-ins at the start of a review",
+                 "Client Platform has been the top project for three weeks"]
+        return [SimpleNamespace(fact=fact, score=1.0, created_at=now) for fact in facts][:num_results]
+
+    async def _search(self, query: str, _config: Any = None, **_kwargs) -> SimpleNamespace:
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(nodes=[], edges=[])
+
+    @contextmanager
+    def installed(self):
+        """Make GraphitiMemory connect to this fake instead of FalkorDB"""
+        from gtd_coach.integrations import graphiti
+
+        fake = self
+
+        class FakeGraphitiClient:
+            async def initialize(self, *_args, **_kwargs):
+                return fake
+
+        episode_type = getattr(graphiti, "EpisodeType", None) or SimpleNamespace(
+            message="message", json="json", text="text")
+        with patch.object(graphiti, "GRAPHITI_AVAILABLE", True), \
+                patch.object(graphiti, "GraphitiClient", FakeGraphitiClient, create=True), \
+                patch.object(graphiti, "EpisodeType", episode_type, create=True):
+            yield self
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local fake Todoist server for offline benchmarks and tests
+Serves the REST v1 endpoints the coach uses (projects, tasks, labels, task
+close) and the Sync API (``commands`` writes and incremental ``sync_token``
+reads), counting requests and TCP connections. Optional delays stand in for network round trips and TLS
+connection setup, which a localhost socket doesn't have.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+NOW = datetime(2025, 1, 6, 9, 0, tzinfo=timezone.utc).isoformat()
+
+
+def _project(project_id: str, name: str, inbox: bool = False) -> Dict[str, Any]:
+    return {
+        "id": project_id, "name": name, "description": "", "child_order": 0,
+        "color": "grey", "collapsed": False, "shared": False, "is_favorite": False,
+        "is_archived": False, "can_assign_tasks": False, "view_style": "list",
+        "created_at": NOW, "updated_at": NOW, "inbox_project": inbox,
+    }
+
+
+class FakeTodoistServer:
+    """Threaded HTTP/1.1 server holding an in-memory Todoist account"""
+
+    def __init__(self, inbox_items: int = 50, request_ms: float = 0.0, connect_ms: float = 0.0):
+        """
+        Start serving on a free localhost port.
+
+        Args:
+            inbox_items: Tasks created in the inbox up front
+            request_ms: Delay added to every request
+            connect_ms: Delay added once per new TCP connection
+        """
+        self.request_delay = request_ms / 1000
+        self.connect_delay = connect_ms / 1000
+        self.projects = [_project("inbox", "Inbox", inbox=True), _project("work", "Work")]
+        self.labels = ["quick"]
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.requests: Counter = Counter()
+        self.sync_seen: Dict[str, Any] = {}
+        self.version = 0                       # bumped on every change
+        self.changed: Dict[str, int] = {}      # task id -> version of its last change
+        self.deleted: Dict[str, int] = {}      # task id -> version it was deleted at
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._next_id = 1
+        for i in range(inbox_items):
+            self._add_task({"content": f"Inbox item {i}", "project_id": "inbox"})
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse sockets
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+                time.sleep(server.connect_delay)
+
+            def do_GET(self):
+                server._dispatch(self, "GET")
+
+            def do_POST(self):
+                server._dispatch(self, "POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    # ----- account -----
+
+    def _add_task(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        task_id = str(self._next_id)
+        self._next_id += 1
+        labels = list(body.get("labels") or [])
+        for label in labels:
+            if label not in self.labels:
+                self.labels.append(label)
+        due_string = body.get("due_string") or (body.get("due") or {}).get("string")
+        task = {
+            "id": task_id, "content": body["content"], "description": "",
+            "project_id": body.get("project_id", "inbox"), "section_id": None,
+            "parent_id": None, "labels": labels, "priority": 1,
+            "due": {"date": "2025-01-06", "string": due_string} if due_string else None,
+            "deadline": None, "duration": None, "collapsed": False, "child_order": 0,
+            "responsible_uid": None, "assigned_by_uid": None, "completed_at": None,
+            "added_by_uid": "user", "added_at": NOW, "updated_at": NOW,
+        }
+        self.tasks[task_id] = task
+        self._touch(task_id)
+        return task
+
+    def _touch(self, task_id: str) -> None:
+        self.version += 1
+        self.changed[task_id] = self.version
+
+    def complete_task(self, task_id: str) -> None:
+        """Complete a task as if from another device"""
+        with self._lock:
+            self.tasks[task_id]["completed_at"] = NOW
+            self._touch(task_id)
+
+    def delete_task(self, task_id: str) -> None:
+        """Delete a task as if from another device"""
+        with self._lock:
+            del self.tasks[task_id]
+            self.version += 1
+            self.deleted[task_id] = self.version
+
+    def add_task(self, content: str, project_id: str = "inbox", due_string: Optional[str] = None) -> str:
+        """Add a task as if from another device"""
+        with self._lock:
+            return self._add_task({"content": content, "project_id": project_id,
+                                   "due_string": due_string})["id"]
+
+    def open_tasks(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [t for t in self.tasks.values()
+                if t["completed_at"] is None and (project_id is None or t["project_id"] == project_id)]
+
+    # ----- HTTP -----
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        time.sleep(self.request_delay)
+        url = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length)) if length else {}
+        parts = url.path.strip("/").split("/")
+        route = f"{method} /{'/'.join(p if not p.isdigit() else '{id}' for p in parts)}"
+        with self._lock:
+            self.requests[route] += 1
+            status, payload = self._route(method, parts, parse_qs(url.query), body)
+        data = b"" if payload is None else json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _route(self, method, parts, query, body):
+        if parts[:2] == ["api", "v1"]:
+            resource = parts[2:]
+            if method == "GET" and resource == ["projects"]:
+                return 200, {"results": self.projects, "next_cursor": None}
+            if method == "GET" and resource == ["labels"]:
+                labels = [{"id": str(i), "name": n, "color": "grey", "order": i, "is_favorite": False}
+                          for i, n in enumerate(self.labels)]
+                return 200, {"results": labels, "next_cursor": None}
+            if method == "GET" and resource == ["tasks"]:
+                project_id = query.get("project_id", [None])[0]
+                return 200, {"results": self.open_tasks(project_id), "next_cursor": None}
+            if method == "POST" and resource == ["tasks"]:
+                return 200, self._add_task(body)
+            if method == "POST" and len(resource) == 3 and resource[0] == "tasks" and resource[2] == "close":
+                task = self.tasks.get(resource[1])
+                if task is None:
+                    return 404, {"error": "Task not found"}
+                task["completed_at"] = NOW
+                self._touch(task["id"])
+                return 204, None
+            if method == "POST" and resource == ["sync"]:
+                if "sync_token" in body:
+                    return 200, self._read_sync(body["sync_token"])
+                return 200, self._sync(body.get("commands", []))
+        return 404, {"error": "Not found"}
+
+    def _sync(self, commands: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply Sync API commands once per uuid"""
+        mapping = {}
+        for command in commands:
+            if command["uuid"] in self.sync_seen:
+                continue
+            args = command.get("args", {})
+            if command["type"] == "item_add":
+                task = self._add_task({**args, "project_id": args.get("project_id", "work")})
+                mapping[command.get("temp_id")] = task["id"]
+                self.sync_seen[command["uuid"]] = "ok"
+            elif command["type"] == "item_close" and args.get("id") in self.tasks:
+                self.tasks[args["id"]]["completed_at"] = NOW
+                self._touch(args["id"])
+                self.sync_seen[command["uuid"]] = "ok"
+            else:
+                self.sync_seen[command["uuid"]] = {"error_code": 22, "error": "Item not found"}
+        return {"sync_status": {c["uuid"]: self.sync_seen[c["uuid"]] for c in commands},
+                "temp_id_mapping": mapping}
+
+    def _read_sync(self, sync_token: str) -> Dict[str, Any]:
+        """Everything open for "*", else what changed since the token"""
+        def item(task):
+            return {"id": task["id"], "content": task["content"], "description": task["description"],
+                    "project_id": task["project_id"], "labels": task["labels"], "due": task["due"],
+                    "checked": task["completed_at"] is not None, "is_deleted": False}
+
+        if sync_token == "*":
+            items = [item(t) for t in self.open_tasks()]
+            projects = self.projects
+        else:
+            since = int(sync_token)
+            items = [item(self.tasks[i]) for i, v in self.changed.items()
+                     if v > since and i in self.tasks]
+            items += [{"id": i, "is_deleted": True} for i, v in self.deleted.items() if v > since]
+            projects = []
+        return {"sync_token": str(self.version), "full_sync": sync_token == "*",
+                "items": items, "projects": projects}
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.connections = 0
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -17,6 +17,8 @@ from gtd_coach.integrations.graphiti import GraphitiRetriever
 from gtd_coach.patterns.adhd_metrics import ADHDPatternDetector
 from gtd_coach.integrations.timing import TimingAPI
 from gtd_coach.integrations.timing_comparison import compare_time_with_priorities, format_comparison_report
+from gtd_coach.persistence.session_store import get_session_store
+from gtd_coach.analytics.warehouse import get_warehouse
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,7 @@ class WeeklySummaryGenerator:
         self.retriever = GraphitiRetriever()
         self.pattern_detector = ADHDPatternDetector()
         self.timing_api = TimingAPI()
+        self.warehouse = get_warehouse(get_base_dir() / "data", get_base_dir() / "logs")
         self.summary_data = {
             "period": {
                 "start": None,
@@ -96,57 +99,37 @@ class WeeklySummaryGenerator:
         """Gather session data from file system (temporary until MCP integration)"""
         # TODO: Replace with GraphitiRetriever.get_recent_sessions() when MCP is ready
         
-        data_dir = get_base_dir() / "data"
-        logs_dir = get_base_dir() / "logs"
-        
-        # Get recent review logs
+        # Get recent review logs from the local warehouse (incremental ingest)
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        for log_file in sorted(logs_dir.glob("review_*.json"), reverse=True):
-            try:
-                with open(log_file, 'r') as f:
-                    session_data = json.load(f)
-                
-                # Parse timestamp from filename
-                timestamp_str = log_file.stem.split('_', 1)[1]
-                session_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                
-                if session_date >= cutoff_date:
-                    self.summary_data["sessions"].append({
-                        "date": session_date,
-                        "data": session_data
-                    })
-            except Exception as e:
-                logger.error(f"Failed to load session {log_file}: {e}")
+        for review in reversed(self.warehouse.query('review', since=cutoff_date)):
+            self.summary_data["sessions"].append({
+                "date": review["timestamp"],
+                "data": review["data"]
+            })
     
     async def _analyze_patterns(self, days: int) -> None:
         """Analyze behavioral patterns from Graphiti batch files"""
         # TODO: Replace with GraphitiRetriever.search_patterns() when MCP is ready
         
-        data_dir = get_base_dir() / "data"
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        # Load Graphiti batch files
-        for batch_file in data_dir.glob("graphiti_batch_*.json"):
+        # Behavior pattern episodes from Graphiti batch backups in the window
+        for episode in self.warehouse.episodes('behavior_pattern', since=cutoff_date):
             try:
-                with open(batch_file, 'r') as f:
-                    batch_data = json.load(f)
+                pattern_data = episode["data"]
                 
-                for episode in batch_data.get("episodes", []):
-                    if episode["type"] == "behavior_pattern":
-                        pattern_data = episode["data"]
-                        
-                        if pattern_data["pattern_type"] == "task_switch":
-                            self.summary_data["patterns"]["task_switches"].append(pattern_data)
-                        elif pattern_data["pattern_type"] == "low_coherence":
-                            self.summary_data["patterns"]["coherence_scores"].append(
-                                pattern_data["score"]
-                            )
-                        elif pattern_data["pattern_type"] == "focus_event":
-                            self.summary_data["patterns"]["focus_events"].append(pattern_data)
-                            
+                if pattern_data["pattern_type"] == "task_switch":
+                    self.summary_data["patterns"]["task_switches"].append(pattern_data)
+                elif pattern_data["pattern_type"] == "low_coherence":
+                    self.summary_data["patterns"]["coherence_scores"].append(
+                        pattern_data["score"]
+                    )
+                elif pattern_data["pattern_type"] == "focus_event":
+                    self.summary_data["patterns"]["focus_events"].append(pattern_data)
+                    
             except Exception as e:
-                logger.error(f"Failed to load batch file {batch_file}: {e}")
+                logger.error(f"Failed to read behavior pattern episode: {e}")
     
     async def _analyze_mindsweep_trends(self, days: int) -> None:
         """Analyze mindsweep trends from saved data"""
@@ -158,27 +141,28 @@ class WeeklySummaryGenerator:
         all_items = []
         session_counts = []
         
-        for mindsweep_file in sorted(data_dir.glob("mindsweep_*.json"), reverse=True):
-            try:
-                # Parse timestamp
-                timestamp_str = mindsweep_file.stem.split('_', 1)[1]
-                file_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                
-                if file_date >= cutoff_date:
-                    with open(mindsweep_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    items = data.get("items", [])
-                    all_items.extend(items)
-                    session_counts.append(len(items))
-                    
-                    # Categorize items by topic
-                    for item in items:
-                        topic = self.pattern_detector._categorize_topic(item.lower())
-                        self.summary_data["mindsweep_analysis"]["items_by_topic"][topic] += 1
-                        
-            except Exception as e:
-                logger.error(f"Failed to load mindsweep file {mindsweep_file}: {e}")
+        # Prefer the indexed session store; legacy JSON files otherwise
+        store = get_session_store()
+        store.import_legacy_files(data_dir)
+        use_store = store.has_items()
+        if use_store:
+            for items in store.get_items_by_session(since=cutoff_date).values():
+                all_items.extend(items)
+                session_counts.append(len(items))
+                for item in items:
+                    topic = self.pattern_detector._categorize_topic(item.lower())
+                    self.summary_data["mindsweep_analysis"]["items_by_topic"][topic] += 1
+        
+        mindsweep_files = [] if use_store else self.warehouse.query('mindsweep', since=cutoff_date)
+        for mindsweep_file in reversed(mindsweep_files):
+            items = mindsweep_file["data"].get("items", [])
+            all_items.extend(items)
+            session_counts.append(len(items))
+            
+            # Categorize items by topic
+            for item in items:
+                topic = self.pattern_detector._categorize_topic(item.lower())
+                self.summary_data["mindsweep_analysis"]["items_by_topic"][topic] += 1
         
         if session_counts:
             self.summary_data["mindsweep_analysis"]["total_items"] = sum(session_counts)
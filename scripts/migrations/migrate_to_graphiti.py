@@ -15,6 +15,8 @@ from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 from gtd_coach.integrations.graphiti_client import GraphitiClient
+from gtd_coach.persistence.artifacts import get_artifact_store
+from gtd_coach.persistence.jsonl import load_document
 from graphiti_core.nodes import EpisodeType
 
 # Configure logging
@@ -24,6 +26,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Artifact types that hold episodes worth migrating
+MIGRATED_TYPES = ('graphiti_batch', 'mindsweep', 'priorities')
+
+
+def find_migration_files(data_dir: Path) -> List[Path]:
+    """Files of the migrated types, flat or week-partitioned, oldest first"""
+    store = get_artifact_store(data_dir)
+    entries = [entry for kind in MIGRATED_TYPES for entry in store.find(kind)]
+    return [entry['file'] for entry in sorted(entries, key=lambda e: e['timestamp'])]
+
 
 class GraphitiMigrator:
     """Handles migration of JSON data to Graphiti"""
@@ -83,17 +95,10 @@ class GraphitiMigrator:
         total_tokens = 0
         file_count = 0
         
-        # Scan all JSON files
-        json_files = sorted(data_dir.glob("*.json"))
-        
-        for json_file in json_files:
-            # Skip non-Graphiti files
-            if not any(prefix in json_file.name for prefix in ['graphiti_batch_', 'mindsweep_', 'priorities_']):
-                continue
-                
+        # Scan all Graphiti-relevant artifacts
+        for json_file in find_migration_files(data_dir):
             try:
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
+                data = load_document(json_file)
                 
                 # Count episodes
                 if 'episodes' in data:
@@ -168,8 +173,7 @@ class GraphitiMigrator:
             return False
         
         try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
+            data = load_document(json_file)
             
             # Determine the structure of the file
             if 'episodes' in data:
@@ -275,13 +279,10 @@ class GraphitiMigrator:
         state = self._load_migration_state(state_file)
         
         # Get files to process
-        json_files = sorted(data_dir.glob("*.json"))
         files_to_process = [
-            f for f in json_files
+            f for f in find_migration_files(data_dir)
             if f.name not in state['processed']
             and f.name not in state['failed']
-            and not f.name.startswith('.')
-            and any(prefix in f.name for prefix in ['graphiti_batch_', 'mindsweep_', 'priorities_'])
         ]
         
         if not files_to_process:
@@ -267,10 +267,11 @@ def test_integration():
         metrics.save_metrics(data_dir)
         print("✓ Integration test completed successfully")
         
-        # Clean up test file
-        test_file = data_dir / f"north_star_metrics_{metrics.session_id}.json"
-        if test_file.exists():
-            test_file.unlink()
+        # Clean up test file (written to the week partition)
+        from gtd_coach.persistence.artifacts import get_artifact_store
+        for entry in get_artifact_store(data_dir).find("north_star", session_id=metrics.session_id):
+            if entry['file'].exists():
+                entry['file'].unlink()
             
     except Exception as e:
         print(f"✗ Integration test failed: {e}")
@@ -14,6 +14,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 
+@pytest.fixture(autouse=True)
+def isolated_session_db(tmp_path, monkeypatch):
+    """Point the session store singleton at a per-test SQLite file."""
+    from gtd_coach.persistence import session_store
+    monkeypatch.setenv('GTD_SESSION_DB', str(tmp_path / "sessions.db"))
+    monkeypatch.setattr(session_store, '_session_store', None)
+    yield
+    if session_store._session_store is not None:
+        session_store._session_store.close()
+
+
 @pytest.fixture
 def clean_env():
     """Clean environment variables for testing"""
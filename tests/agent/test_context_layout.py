@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the prefix-stable context layout in GTDAgent._pre_model_hook
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+
+from gtd_coach.agent.core import GTDAgent
+from gtd_coach.agent.tools.time_manager_v2 import state_manager
+
+
+def make_agent(layout):
+    """Create a GTDAgent without contacting LM Studio"""
+    with patch.object(GTDAgent, '_create_lm_studio_client', return_value=Mock()):
+        return GTDAgent(use_memory_saver=True, context_layout=layout)
+
+
+def make_state(minutes_ago, history):
+    return {
+        "messages": history,
+        "current_phase": "MIND_SWEEP",
+        "phase_start_time": datetime.now() - timedelta(minutes=minutes_ago),
+        "accountability_mode": "firm",
+        "phase_summary": "STARTUP: Completed",
+    }
+
+
+class RecordingChatModel(BaseChatModel):
+    """Chat model that records what it is sent and replies with plain text"""
+
+    calls: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append(list(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="What's next?"))])
+
+
+@tool
+def noop_tool() -> str:
+    """Does nothing"""
+    return "ok"
+
+
+@pytest.fixture
+def shared_state():
+    """Phase fields as the V2 tools see them, restored afterwards"""
+    saved = dict(state_manager.get_state())
+    state_manager.get_state().clear()
+    yield state_manager
+    state_manager.get_state().clear()
+    state_manager.set_state(saved)
+
+
+HISTORY = [
+    HumanMessage(content="Let's start"),
+    AIMessage(content="What's on your mind?"),
+    HumanMessage(content="Buy milk, call dentist"),
+]
+
+
+class TestContextLayout:
+    """Compare inline and prefix-stable layouts"""
+
+    def test_inline_layout_unchanged(self):
+        """Inline layout keeps separate system messages before the history"""
+        agent = make_agent("inline")
+        result = agent._pre_model_hook(make_state(1, list(HISTORY)))
+
+        system = [m for m in result if isinstance(m, SystemMessage)]
+        assert len(system) == 4
+        assert "min remaining in MIND_SWEEP" in system[1].content
+        assert result[len(system):] == HISTORY
+
+    def test_prefix_stable_prefix_is_identical_across_turns(self):
+        """Static prefix and history are byte-identical as the clock moves"""
+        agent = make_agent("prefix_stable")
+        first = agent._pre_model_hook(make_state(1, list(HISTORY)))
+        later_history = list(HISTORY) + [AIMessage(content="Got it"), HumanMessage(content="Email Bob")]
+        second = agent._pre_model_hook(make_state(7, later_history))
+
+        assert isinstance(first[0], SystemMessage)
+        assert first[0].content == second[0].content
+        assert "remaining" not in first[0].content
+        # Earlier turns are sent exactly as stored
+        assert second[1:4] == HISTORY
+        assert agent.get_context_metrics()['prefix_reuse'] == {'hits': 1, 'misses': 1}
+
+    def test_prefix_stable_time_context_on_latest_turn(self):
+        """Volatile time context rides on a copy of the last human turn"""
+        agent = make_agent("prefix_stable")
+        history = list(HISTORY)
+        result = agent._pre_model_hook(make_state(9.5, history))
+
+        assert len(result) == 1 + len(HISTORY)
+        assert isinstance(result[-1], HumanMessage)
+        assert result[-1].content.startswith("Buy milk, call dentist\n\n[")
+        assert "MIND_SWEEP" in result[-1].content
+        # Stored history is not modified
+        assert history[-1].content == "Buy milk, call dentist"
+
+    def test_prefix_stable_tool_turn(self):
+        """Tool results can carry the time context too"""
+        agent = make_agent("prefix_stable")
+        history = list(HISTORY) + [
+            AIMessage(content="", tool_calls=[{"name": "check_time", "args": {}, "id": "call_1"}]),
+            ToolMessage(content="ok", tool_call_id="call_1"),
+        ]
+        result = agent._pre_model_hook(make_state(2, history))
+
+        assert isinstance(result[-1], ToolMessage)
+        assert result[-1].tool_call_id == "call_1"
+        assert result[-1].content.startswith("ok\n\n[")
+
+    def test_prefix_stable_without_user_turn(self):
+        """With no turn to attach to, the time context stays in the prefix"""
+        agent = make_agent("prefix_stable")
+        result = agent._pre_model_hook(make_state(1, [AIMessage(content="Hello")]))
+
+        assert [type(m) for m in result] == [SystemMessage, SystemMessage, AIMessage]
+
+    def test_compiled_graph_sends_managed_context(self, shared_state):
+        """The ReAct graph calls the hook before the model on every turn"""
+        llm = RecordingChatModel(calls=[])
+        with patch.object(GTDAgent, '_create_lm_studio_client', return_value=llm):
+            agent = GTDAgent(use_memory_saver=True, context_layout="prefix_stable")
+        agent.set_tools([noop_tool])
+        shared_state.set_state({
+            "current_phase": "MIND_SWEEP",
+            "phase_start_time": datetime.now() - timedelta(minutes=1),
+            "accountability_mode": "firm",
+        })
+
+        agent.invoke({"messages": [SystemMessage(content="Runner prompt"), *HISTORY]},
+                     {"configurable": {"thread_id": "layout"}})
+
+        sent = llm.calls[-1]  # calls[0] is the connection check in set_tools
+        assert [type(m) for m in sent] == [SystemMessage, HumanMessage, AIMessage, HumanMessage]
+        assert sent[0].content.startswith("Runner prompt\n\nYou are an ADHD coach")
+        assert "Current phase: MIND_SWEEP" in sent[0].content
+        assert sent[-1].content.startswith("Buy milk, call dentist\n\n[")
+        metrics = agent.get_context_metrics()
+        assert len(metrics['phase_tokens']['MIND_SWEEP']) == 1
+        assert metrics['prefix_reuse'] == {'hits': 0, 'misses': 1}
+
+    def test_invalid_layout_falls_back(self):
+        """Unknown layout names fall back to inline"""
+        assert make_agent("prefix-stabel").context_layout == "inline"
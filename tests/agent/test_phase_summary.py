@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Tests for background LLM phase summaries (PhaseSummarizer)
+"""
+
+import json
+import threading
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+
+from gtd_coach.agent.core import GTDAgent
+from gtd_coach.agent.tools.time_manager_v2 import state_manager
+from gtd_coach.agent.phase_summary import (
+    PhaseSummarizer, parse_summary, format_summary, MAX_ITEMS_PER_FIELD
+)
+
+
+class FakeLLM:
+    """Returns a canned JSON summary, optionally waiting on a gate first"""
+
+    def __init__(self, reply=None, gate=None):
+        self.reply = reply if reply is not None else json.dumps({
+            "captured_items": ["Buy milk", "Call dentist"],
+            "decisions": ["Dentist call is a next action"],
+            "priorities": [],
+        })
+        self.gate = gate
+        self.calls = []
+
+    def invoke(self, messages, **kwargs):
+        self.calls.append((messages, kwargs))
+        if self.gate:
+            self.gate.wait(timeout=5)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return AIMessage(content=self.reply)
+
+
+MIND_SWEEP = [
+    HumanMessage(content="Buy milk"),
+    AIMessage(content="Got it, what else?"),
+    HumanMessage(content="Call dentist"),
+    AIMessage(content="Anything else?"),
+    HumanMessage(content="That's all"),
+]
+
+
+class GraphChatModel(BaseChatModel):
+    """Chat model for the compiled graph: JSON for summary requests, text otherwise"""
+
+    turns: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "graph-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if "compress one phase" in str(messages[0].content):
+            reply = json.dumps({"captured_items": ["Buy milk"], "decisions": [], "priorities": []})
+        else:
+            self.turns.append(list(messages))
+            reply = "Which project next?"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+
+@tool
+def noop_tool() -> str:
+    """Does nothing"""
+    return "ok"
+
+
+def make_agent(llm):
+    with patch.object(GTDAgent, '_create_lm_studio_client', return_value=llm):
+        return GTDAgent(use_memory_saver=True, context_layout="inline")
+
+
+def transition_state(messages):
+    return {
+        "messages": list(messages),
+        "current_phase": "PROJECT_REVIEW",
+        "completed_phases": ["STARTUP", "MIND_SWEEP"],
+        "phase_start_time": datetime.now(),
+        "phase_summary": "STARTUP: Completed",
+        "phase_changed": True,
+    }
+
+
+class TestParsing:
+    """Summaries are structured and bounded"""
+
+    def test_parse_with_code_fence(self):
+        text = '```json\n{"captured_items": ["a"], "decisions": "b"}\n```'
+        assert parse_summary(text) == {"captured_items": ["a"], "decisions": ["b"], "priorities": []}
+
+    def test_parse_bounds_items(self):
+        text = json.dumps({"captured_items": [f"item {i} " + "x" * 200 for i in range(20)]})
+        summary = parse_summary(text)
+        assert len(summary["captured_items"]) == MAX_ITEMS_PER_FIELD
+        assert all(len(item) <= 80 for item in summary["captured_items"])
+
+    def test_parse_rejects_prose(self):
+        assert parse_summary("The user captured several items.") is None
+
+    def test_format_skips_empty_fields(self):
+        text = format_summary("MIND_SWEEP", {"captured_items": ["a", "b"], "decisions": [], "priorities": []})
+        assert text == "MIND_SWEEP: captured: a; b"
+
+
+class TestPhaseSummarizer:
+    """Background summarization and caching"""
+
+    def test_phase_summarized_once(self):
+        llm = FakeLLM()
+        summarizer = PhaseSummarizer(llm)
+        summarizer.submit("MIND_SWEEP", MIND_SWEEP)
+        summarizer.submit("MIND_SWEEP", MIND_SWEEP)
+        ready = summarizer.wait(timeout=5)
+        summarizer.submit("MIND_SWEEP", MIND_SWEEP)
+
+        assert len(llm.calls) == 1
+        assert ready["MIND_SWEEP"].startswith("MIND_SWEEP: captured: Buy milk; Call dentist")
+        assert summarizer.stats == {'submitted': 1, 'completed': 1, 'failed': 0}
+
+    def test_failure_is_not_cached(self):
+        summarizer = PhaseSummarizer(FakeLLM(reply=ConnectionError("LM Studio down")))
+        summarizer.submit("MIND_SWEEP", MIND_SWEEP)
+        assert summarizer.wait(timeout=5) == {}
+        assert summarizer.cache == {}
+        assert summarizer.stats['failed'] == 1
+
+
+class TestAgentPhaseSummaries:
+    """The agent never waits on a summary"""
+
+    def test_placeholder_then_llm_summary(self):
+        gate = threading.Event()
+        llm = FakeLLM(gate=gate)
+        agent = make_agent(llm)
+
+        state = transition_state(MIND_SWEEP)
+        first = agent._pre_model_hook(state)
+        # The summary call is blocked, so the placeholder is used this turn
+        assert state["phase_summaries"] == {"MIND_SWEEP": "Mind Sweep: Captured 3 items"}
+        assert state["phase_summary"] == "STARTUP: Completed"
+        assert any("Captured 3 items" in m.content for m in first if isinstance(m, SystemMessage))
+
+        gate.set()
+        agent.phase_summarizer.wait(timeout=5)
+
+        state["messages"] = list(MIND_SWEEP[-2:]) + [HumanMessage(content="Next project")]
+        second = agent._pre_model_hook(state)
+        summary_message = [m for m in second if "Previous phases summary" in str(m.content)][0]
+        assert "MIND_SWEEP: captured: Buy milk; Call dentist" in summary_message.content
+        assert "STARTUP: Completed" in summary_message.content
+        assert "Captured 3 items" not in summary_message.content
+        assert state["phase_summaries"]["MIND_SWEEP"].startswith("MIND_SWEEP:")
+
+        # The summary prompt carries the finished phase's transcript
+        prompt = llm.calls[0][0][1].content
+        assert "Phase: MIND_SWEEP" in prompt and "User: Call dentist" in prompt
+
+    def test_compiled_graph_summarizes_transitions(self):
+        """A transition recorded by the V2 tools is summarized during a real graph run"""
+        saved = dict(state_manager.get_state())
+        try:
+            state_manager.get_state().clear()
+            state_manager.set_state({
+                "current_phase": "PROJECT_REVIEW",
+                "completed_phases": ["STARTUP", "MIND_SWEEP"],
+                "phase_start_time": datetime.now(),
+                "phase_changed": True,
+            })
+            llm = GraphChatModel(turns=[])
+            agent = make_agent(llm)
+            agent.set_tools([noop_tool])
+            config = {"configurable": {"thread_id": "summaries"}}
+
+            agent.invoke({"messages": list(MIND_SWEEP)}, config)
+            assert state_manager.get("phase_changed") is False
+            agent.phase_summarizer.wait(timeout=5)
+            agent.invoke({"messages": [HumanMessage(content="Next project")]}, config)
+
+            assert state_manager.get("phase_summaries") == {"MIND_SWEEP": "MIND_SWEEP: captured: Buy milk"}
+            prefix = " ".join(str(m.content) for m in llm.turns[-1] if isinstance(m, SystemMessage))
+            assert "MIND_SWEEP: captured: Buy milk" in prefix
+            assert "Captured 3 items" not in prefix
+        finally:
+            state_manager.get_state().clear()
+            state_manager.set_state(saved)
+
+    def test_unparseable_reply_keeps_placeholder(self):
+        agent = make_agent(FakeLLM(reply="Sure! The user captured things."))
+        state = transition_state(MIND_SWEEP)
+        agent._pre_model_hook(state)
+        agent.phase_summarizer.wait(timeout=5)
+        agent._pre_model_hook(state)
+        assert state["phase_summaries"]["MIND_SWEEP"] == "Mind Sweep: Captured 3 items"
+
+    def test_replacement_is_keyed_by_phase(self):
+        """A placeholder that also appears in other text is only replaced in its own entry"""
+        agent = make_agent(FakeLLM())
+        state = transition_state(MIND_SWEEP)
+        state["phase_summary"] = "Note: Mind Sweep: Captured 3 items"
+        agent._pre_model_hook(state)
+        agent.phase_summarizer.wait(timeout=5)
+        agent._pre_model_hook(state)
+
+        assert state["phase_summary"] == "Note: Mind Sweep: Captured 3 items"
+        assert state["phase_summaries"]["MIND_SWEEP"].startswith("MIND_SWEEP: captured: Buy milk")
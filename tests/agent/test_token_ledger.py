@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental token accounting (TokenLedger)
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately, trim_messages
+
+from gtd_coach.agent.core import GTDAgent
+from gtd_coach.agent.token_ledger import TokenLedger, load_tokenizer
+
+
+class WordTokenizer:
+    """Fake tokenizer: one token per whitespace-separated word"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text):
+        self.calls += 1
+        return text.split()
+
+
+def conversation(n):
+    return [
+        (HumanMessage if i % 2 == 0 else AIMessage)(content=f"message number {i}", id=f"m{i}")
+        for i in range(n)
+    ]
+
+
+class TestTokenLedger:
+    """Test per-message caching and incremental totals"""
+
+    def test_tokenizer_counts_with_template_overhead(self):
+        ledger = TokenLedger(WordTokenizer(), tokens_per_message=4)
+        assert ledger.mode == "tokenizer"
+        assert ledger.count(HumanMessage(content="buy milk today")) == 3 + 4
+
+    def test_approximate_fallback_matches_langchain(self):
+        ledger = TokenLedger()
+        messages = conversation(6)
+        assert ledger.mode == "approximate"
+        assert ledger(messages) == count_tokens_approximately(messages)
+
+    def test_only_new_messages_are_tokenized(self):
+        tokenizer = WordTokenizer()
+        ledger = TokenLedger(tokenizer)
+        messages = conversation(40)
+
+        first = ledger.count_messages(messages[:38])
+        assert tokenizer.calls == 38
+
+        total = ledger.count_messages(messages)
+        assert tokenizer.calls == 40
+        assert total == first + ledger.count(messages[38]) + ledger.count(messages[39])
+        assert total == ledger(messages)
+
+    def test_running_total_rebuilds_after_trim(self):
+        tokenizer = WordTokenizer()
+        ledger = TokenLedger(tokenizer)
+        messages = conversation(20)
+        ledger.count_messages(messages)
+
+        # A suffix (as after trimming) is recounted from cache, not re-tokenized
+        assert ledger.count_messages(messages[-6:]) == ledger(messages[-6:])
+        assert tokenizer.calls == 20
+
+    def test_messages_without_ids_use_content(self):
+        tokenizer = WordTokenizer()
+        ledger = TokenLedger(tokenizer)
+        ledger.count(SystemMessage(content="same text"))
+        ledger.count(SystemMessage(content="same text"))
+        assert tokenizer.calls == 1
+        assert ledger.stats == {'cache_hits': 1, 'cache_misses': 1}
+
+    def test_usable_as_trim_counter(self):
+        ledger = TokenLedger(WordTokenizer())
+        trimmed = trim_messages(
+            conversation(30), strategy="last", token_counter=ledger,
+            max_tokens=35, start_on="human", allow_partial=False
+        )
+        assert 0 < ledger(trimmed) <= 35
+
+    def test_no_tokenizer_configured(self, monkeypatch):
+        monkeypatch.delenv("GTD_TOKENIZER_PATH", raising=False)
+        monkeypatch.delenv("GTD_TOKENIZER_NAME", raising=False)
+        assert load_tokenizer() is None
+
+    def test_missing_tokenizer_file(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("GTD_TOKENIZER_PATH", str(tmp_path / "missing.json"))
+        monkeypatch.delenv("GTD_TOKENIZER_NAME", raising=False)
+        assert load_tokenizer() is None
+
+
+class TestAgentTokenAccounting:
+    """Ledger feeds the agent's context metrics"""
+
+    def test_phase_tokens_use_ledger(self):
+        with patch.object(GTDAgent, '_create_lm_studio_client', return_value=Mock()), \
+             patch('gtd_coach.agent.core.load_tokenizer', return_value=WordTokenizer()):
+            agent = GTDAgent(use_memory_saver=True, context_layout="inline")
+
+        state = {
+            "messages": conversation(4),
+            "current_phase": "MIND_SWEEP",
+            "phase_start_time": datetime.now(),
+        }
+        sent = agent._pre_model_hook(state)
+
+        metrics = agent.get_context_metrics()
+        assert metrics['token_counter'] == "tokenizer"
+        assert metrics['phase_tokens']['MIND_SWEEP'] == [agent.token_ledger(sent)]
+
+    def test_final_summary_reports_server_usage_and_context(self, capsys):
+        from gtd_coach.agent.runner import GTDAgentRunner
+
+        runner = Mock()
+        runner.agent.get_context_metrics.return_value = {
+            'total_tokens': 900,
+            'overflow_count': 0,
+            'phase_tokens': {'MIND_SWEEP': [100, 300]},
+            'phase_usage': {'STARTUP': 250, 'MIND_SWEEP': 650},
+        }
+        GTDAgentRunner._show_final_summary(runner)
+
+        out = capsys.readouterr().out
+        assert "MIND_SWEEP: 650 tokens used, 200 avg context tokens" in out
+        assert "STARTUP: 250 tokens used" in out
@@ -8,9 +8,12 @@ import subprocess
 import time
 import os
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from gtd_coach.persistence.artifacts import get_artifact_store
+from gtd_coach.persistence.jsonl import load_document
+
 # Test data
 TEST_INPUTS = {
     "startup": "\n",  # Just press enter to acknowledge
@@ -103,8 +106,9 @@ def check_data_files():
     logs_dir = Path.home() / "gtd-coach" / "logs"
     
     # Find most recent files
-    now = datetime.now()
-    today = now.strftime("%Y%m%d")
+    recent = datetime.now() - timedelta(minutes=5)
+    data_store = get_artifact_store(data_dir)
+    logs_store = get_artifact_store(logs_dir)
     
     found_files = {
         "mindsweep": False,
@@ -114,40 +118,41 @@ def check_data_files():
     }
     
     # Check mindsweep files
-    for f in data_dir.glob(f"mindsweep_{today}*.json"):
-        if (now - datetime.fromtimestamp(f.stat().st_mtime)).seconds < 300:  # Within 5 minutes
-            print(f"✅ Found recent mindsweep: {f.name}")
-            found_files["mindsweep"] = True
-            # Print content
-            with open(f, 'r') as file:
-                data = json.load(file)
-                print(f"   Items captured: {len(data.get('items', []))}")
+    for entry in data_store.find("mindsweep", since=recent):
+        f = entry['file']
+        print(f"✅ Found recent mindsweep: {f.name}")
+        found_files["mindsweep"] = True
+        # Print content
+        with open(f, 'r') as file:
+            data = json.load(file)
+            print(f"   Items captured: {len(data.get('items', []))}")
     
     # Check priorities files
-    for f in data_dir.glob(f"priorities_{today}*.json"):
-        if (now - datetime.fromtimestamp(f.stat().st_mtime)).seconds < 300:
-            print(f"✅ Found recent priorities: {f.name}")
-            found_files["priorities"] = True
-            # Print content
-            with open(f, 'r') as file:
-                data = json.load(file)
-                print(f"   Priorities set: {len(data.get('priorities', []))}")
+    for entry in data_store.find("priorities", since=recent):
+        f = entry['file']
+        print(f"✅ Found recent priorities: {f.name}")
+        found_files["priorities"] = True
+        # Print content
+        with open(f, 'r') as file:
+            data = json.load(file)
+            print(f"   Priorities set: {len(data.get('priorities', []))}")
     
     # Check review logs
-    for f in logs_dir.glob(f"review_{today}*.json"):
-        if (now - datetime.fromtimestamp(f.stat().st_mtime)).seconds < 300:
-            print(f"✅ Found recent review log: {f.name}")
-            found_files["review_log"] = True
+    for entry in logs_store.find("review", since=recent):
+        f = entry['file']
+        print(f"✅ Found recent review log: {f.name}")
+        found_files["review_log"] = True
+        data = load_document(f)
+        print(f"   Messages logged: {len(data.get('messages', []))}")
     
     # Check Graphiti batch files
-    for f in data_dir.glob(f"graphiti_batch_{today}*.json"):
-        if (now - datetime.fromtimestamp(f.stat().st_mtime)).seconds < 300:
-            print(f"✅ Found recent Graphiti batch: {f.name}")
-            found_files["graphiti_batch"] = True
-            # Print episode count
-            with open(f, 'r') as file:
-                data = json.load(file)
-                print(f"   Episodes captured: {len(data.get('episodes', []))}")
+    for entry in data_store.find("graphiti_batch", since=recent):
+        f = entry['file']
+        print(f"✅ Found recent Graphiti batch: {f.name}")
+        found_files["graphiti_batch"] = True
+        # Print episode count
+        data = load_document(f)
+        print(f"   Episodes captured: {len(data.get('episodes', []))}")
     
     return all(found_files.values())
 
@@ -5,17 +5,17 @@ Tests the complete flow of timing analysis, pattern detection, and memory storag
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
-from pathlib import Path
 from dotenv import load_dotenv
 
 # Import all integration modules
 from gtd_coach.integrations.timing import TimingAPI
 from gtd_coach.integrations.timing_comparison import compare_time_with_priorities, format_comparison_report
 from gtd_coach.patterns.adhd_metrics import ADHDPatternDetector
-from gtd_coach.integrations.graphiti import GraphitiMemory
+from gtd_coach.integrations.graphiti import GraphitiMemory, get_base_dir
+from gtd_coach.persistence.artifacts import get_artifact_store
+from gtd_coach.persistence.jsonl import load_document
 
 # Set up logging
 logging.basicConfig(
@@ -185,20 +185,19 @@ async def test_graphiti_memory_storage(timing_data, adhd_analysis):
     print(f"\n✓ Saved {episodes_saved} episodes to Graphiti batch file")
     
     # Check if file was created
-    data_dir = Path("data")
-    batch_files = list(data_dir.glob(f"graphiti_batch_{session_id}_*.json"))
+    store = get_artifact_store(get_base_dir() / "data")
+    batch_files = [e['file'] for e in store.find("graphiti_batch", session_id=session_id)]
     
     if batch_files:
         print(f"✓ Batch file created: {batch_files[0].name}")
         
         # Show sample of saved data
-        with open(batch_files[0], 'r') as f:
-            batch_data = json.load(f)
-            print(f"  • Episodes in batch: {len(batch_data.get('episodes', []))}")
-            
-            # Show episode types
-            episode_types = [e['type'] for e in batch_data.get('episodes', [])]
-            print(f"  • Episode types: {', '.join(set(episode_types))}")
+        batch_data = load_document(batch_files[0])
+        print(f"  • Episodes in batch: {len(batch_data.get('episodes', []))}")
+        
+        # Show episode types
+        episode_types = [e['type'] for e in batch_data.get('episodes', [])]
+        print(f"  • Episode types: {', '.join(set(episode_types))}")
     else:
         print("⚠️ No batch file created")
 
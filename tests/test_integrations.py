@@ -5,15 +5,16 @@ Validates memory capture and pattern detection
 """
 
 import asyncio
-import json
 import time
 from pathlib import Path
 from datetime import datetime
 
 # Test imports
 try:
-    from gtd_coach.integrations.graphiti import GraphitiMemory
+    from gtd_coach.integrations.graphiti import GraphitiMemory, get_base_dir
     from gtd_coach.patterns.adhd_metrics import ADHDPatternDetector
+    from gtd_coach.persistence.artifacts import get_artifact_store
+    from gtd_coach.persistence.jsonl import load_document
     print("✅ Successfully imported Graphiti integration modules")
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -85,15 +86,14 @@ async def test_memory_capture():
     print(f"✅ Flushed {count} episodes to disk")
     
     # Verify file was created
-    data_dir = Path.home() / "gtd-coach" / "data"
-    batch_files = list(data_dir.glob(f"graphiti_batch_{session_id}_*.json"))
+    store = get_artifact_store(get_base_dir() / "data")
+    batch_files = [e['file'] for e in store.find("graphiti_batch", session_id=session_id)]
     
     if batch_files:
         print(f"✅ Created batch file: {batch_files[0].name}")
         
         # Load and verify content
-        with open(batch_files[0], 'r') as f:
-            data = json.load(f)
+        data = load_document(batch_files[0])
         
         print(f"  - Session ID: {data['session_id']}")
         print(f"  - Group ID: {data['group_id']}")
@@ -305,11 +305,62 @@ class TestAdaptiveResponseManager(unittest.TestCase):
         self.assertIn('low_energy', metrics['adaptation_counts'])
         self.assertIn('high_confusion', metrics['adaptation_counts'])
         self.assertIsNotNone(metrics['most_common'])
+    
+    def test_lookup_entries_not_shared(self):
+        """Test combined lookups and that callers can't alter the table"""
+        user_state = {
+            'energy_level': 'low',
+            'confusion_level': 0.0,
+            'engagement_level': 1.0,
+            'stress_indicators': 2,
+            'needs_break': True
+        }
+        
+        adaptations = self.manager.get_adaptations(user_state, 'PRIORITIZATION')
+        self.assertEqual(adaptations['prompt_modifiers'], [
+            "Be very concise and encouraging. ",
+            "Remember: not everything needs to be an A priority. Be kind to yourself. ",
+            "Gently suggest a quick break if needed. "
+        ])
+        self.assertEqual(adaptations['settings'], {'max_tokens': 80, 'temperature': 0.6})
+        self.assertEqual(adaptations['flags'], {'grounding_reminder', 'break_suggestion'})
+        
+        adaptations['prompt_modifiers'].clear()
+        adaptations['flags'].add('celebration_mode')
+        again = self.manager.get_adaptations(user_state, 'PRIORITIZATION')
+        self.assertEqual(len(again['prompt_modifiers']), 3)
+        self.assertNotIn('celebration_mode', again['flags'])
+        
+        # Phases without overrides use the base adaptations
+        self.assertEqual(self.manager.get_adaptations(user_state, 'WRAP_UP')['prompt_modifiers'][1],
+                         "Stay calm and supportive. ")
 
 
 class TestIntegration(unittest.TestCase):
     """Test integration between monitor and manager"""
     
+    def test_memory_bounded_for_long_sessions(self):
+        """Test history stays bounded while totals keep counting"""
+        monitor = UserStateMonitor()
+        manager = AdaptiveResponseManager()
+        
+        for i in range(5000):
+            monitor.update_from_interaction(
+                response_time=15.0 if i % 2 else 1.0,
+                content="ok",
+                pattern_data={'topic_switches': 3}
+            )
+            monitor.get_adaptation_needs()
+            manager.get_adaptations(monitor.get_state(), 'MIND_SWEEP')
+        
+        self.assertEqual(len(monitor.recent_response_times), 5)
+        self.assertEqual(len(monitor.state_history), 20)
+        self.assertEqual(len(monitor.adaptation_history), 50)
+        self.assertEqual(len(manager.adaptation_history), 50)
+        self.assertGreater(monitor.get_metrics()['adaptations_triggered'], 4900)
+        self.assertGreater(manager.get_adaptation_metrics()['total_adaptations'], 4900)
+        self.assertAlmostEqual(monitor.get_metrics()['avg_response_time'], 9.4)  # last five only
+    
     def test_full_adaptation_flow(self):
         """Test complete flow from state detection to adaptation"""
         monitor = UserStateMonitor()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental mindsweep coherence analysis in ADHDPatternDetector
+"""
+
+import time
+import unittest
+from unittest.mock import patch
+
+from gtd_coach.patterns.adhd_metrics import ADHDPatternDetector
+
+
+ITEMS = [
+    "Email the client about the report deadline",
+    "um",
+    "Pay the electricity bill",
+    "Fix the phone app login bug",
+    "I don't know, maybe call mom",
+    "Schedule dentist appointment",
+    "Read the book for the course",
+    "Email boss",
+    "project",
+]
+
+
+class TestIncrementalCoherence(unittest.TestCase):
+    """Incremental updates must match the full recomputation"""
+
+    def setUp(self):
+        self.detector = ADHDPatternDetector()
+
+    def test_add_item_matches_full_analysis(self):
+        for i, item in enumerate(ITEMS):
+            incremental = self.detector.add_mindsweep_item(item)
+            expected = ADHDPatternDetector().analyze_mindsweep_coherence(ITEMS[:i + 1])
+            self.assertEqual(incremental, expected)
+
+    def test_update_ingests_only_new_items(self):
+        self.detector.update_mindsweep(ITEMS[:5])
+        with patch.object(self.detector, '_categorize_topic',
+                          wraps=self.detector._categorize_topic) as categorize:
+            metrics = self.detector.update_mindsweep(ITEMS)
+            self.assertEqual(categorize.call_count, len(ITEMS) - 5)
+            # Same list again: nothing to ingest
+            self.detector.update_mindsweep(ITEMS)
+            self.assertEqual(categorize.call_count, len(ITEMS) - 5)
+        self.assertEqual(metrics, self.detector.analyze_mindsweep_coherence(ITEMS))
+
+    def test_update_rebuilds_when_list_replaced(self):
+        self.detector.update_mindsweep(ITEMS)
+        reordered = list(reversed(ITEMS[:4]))
+        self.assertEqual(self.detector.update_mindsweep(reordered),
+                         self.detector.analyze_mindsweep_coherence(reordered))
+
+    def test_empty(self):
+        self.assertEqual(self.detector.update_mindsweep([])['coherence_score'], 0)
+        self.detector.add_mindsweep_item("Buy milk today")
+        self.detector.reset_mindsweep()
+        self.assertEqual(self.detector.update_mindsweep([])['topic_switches'], 0)
+
+    def test_update_cost_independent_of_history(self):
+        """Per-message cost stays flat as the mind sweep grows"""
+        items = [ITEMS[i % len(ITEMS)] + f" {i}" for i in range(2000)]
+        self.detector.update_mindsweep(items[:1999])
+        start = time.perf_counter()
+        self.detector.update_mindsweep(items)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.detector.analyze_mindsweep_coherence(items)
+        full = time.perf_counter() - start
+        self.assertLess(incremental * 50, full)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the week-partitioned artifact layout and manifest lookups
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from gtd_coach.persistence.artifacts import ArtifactStore, MANIFEST_NAME, partition_name
+from gtd_coach.metrics.north_star import NorthStarMetrics
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Partitioned writes, manifest lookups and legacy indexing"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.store = ArtifactStore(self.root)
+        self.now = datetime.now().replace(microsecond=0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_goes_to_week_partition(self):
+        when = datetime(2025, 1, 1, 9, 30)  # ISO week 1 of 2025
+        path = self.store.write_json("mindsweep", "mindsweep_x.json", {"items": ["a"]},
+                                     session_id="s1", when=when)
+
+        self.assertEqual(partition_name(when), "2025/W01")
+        self.assertEqual(path, self.root / "2025" / "W01" / "mindsweep_x.json")
+        with open(path.parent / MANIFEST_NAME) as f:
+            entry = json.loads(f.readline())
+        self.assertEqual(entry["type"], "mindsweep")
+        self.assertEqual(entry["session"], "s1")
+        self.assertEqual(entry["path"], "2025/W01/mindsweep_x.json")
+        self.assertEqual(entry["size"], path.stat().st_size)
+
+    def test_find_filters(self):
+        for days in (40, 10, 1):
+            when = self.now - timedelta(days=days)
+            self.store.write_json("mindsweep", f"mindsweep_{days}.json", {"days": days},
+                                  session_id=f"s{days}", when=when)
+        self.store.write_json("priorities", "priorities_1.json", {}, when=self.now)
+
+        self.assertEqual(len(self.store.find("mindsweep")), 3)
+        recent = self.store.find("mindsweep", since=self.now - timedelta(days=14))
+        self.assertEqual([self.store.load(e)["days"] for e in recent], [10, 1])
+        two_weeks = [e["session"] for e in self.store.find("mindsweep", weeks=2)]
+        self.assertIn("s1", two_weeks)
+        self.assertNotIn("s40", two_weeks)
+        self.assertEqual([e["session"] for e in self.store.find(session_id="s10")], ["s10"])
+        self.assertEqual([e["session"] for e in self.store.recent("mindsweep", 2)], ["s10", "s1"])
+        self.assertEqual(len(self.store.find("priorities")), 1)
+
+    def test_torn_manifest_line_is_skipped(self):
+        path = self.store.write_json("review", "review_1.json", {}, when=self.now)
+        with open(path.parent / MANIFEST_NAME, 'a') as f:
+            f.write('{"type": "rev')
+        self.assertEqual(len(self.store.find("review")), 1)
+
+    def test_legacy_files_indexed_once(self):
+        stamp = (self.now - timedelta(days=3)).strftime("%Y%m%d_%H%M%S")
+        with open(self.root / f"mindsweep_{stamp}.json", 'w') as f:
+            json.dump({"items": ["legacy"]}, f)
+        with open(self.root / "unrelated.json", 'w') as f:
+            json.dump({}, f)
+
+        self.assertEqual(self.store.index_legacy_files(), 1)
+        self.assertEqual(self.store.index_legacy_files(), 0)
+        # A new flat file bumps the directory mtime; only it is recorded
+        with open(self.root / f"priorities_{stamp}.json", 'w') as f:
+            json.dump({"priorities": []}, f)
+        os.utime(self.root, (1, 1))
+        self.assertEqual(self.store.index_legacy_files(), 1)
+
+        entries = self.store.find("mindsweep")
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["session"], stamp)
+        self.assertEqual(self.store.load(entries[0])["items"], ["legacy"])
+
+    def test_north_star_round_trip(self):
+        metrics = NorthStarMetrics("20250101_090000")
+        metrics.session_start_time = datetime(2025, 1, 1, 9, 0)
+        metrics.save_metrics(self.root)
+
+        self.assertTrue((self.root / "2025" / "W01" / "north_star_metrics_20250101_090000.json").exists())
+        loaded = NorthStarMetrics.load_previous_metrics("20250101_090000", self.root)
+        self.assertEqual(loaded["session_id"], "20250101_090000")
+        self.assertIsNone(NorthStarMetrics.load_previous_metrics("missing", self.root))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for durable, resumable daily clarify sessions
+"""
+
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.agent.workflows.daily_clarify import DailyClarifyWorkflow, clarify_thread_id
+from gtd_coach.persistence.checkpointer import open_sqlite_saver
+
+TASKS = [{"id": str(i), "content": f"Buy item {i}"} for i in range(8)]
+
+
+class Crash(Exception):
+    pass
+
+
+class ScriptedUser:
+    """Answers every prompt with "y", optionally crashing at the nth task prompt"""
+
+    def __init__(self, crash_at=None):
+        self.crash_at = crash_at
+        self.task_prompts = []
+
+    def __call__(self, prompt):
+        if "Keep?" in prompt:
+            self.task_prompts.append(prompt.strip().split("]")[0] + "]")
+            if len(self.task_prompts) == self.crash_at:
+                raise Crash()
+        return "y"
+
+
+class TestClarifyCheckpoint(unittest.TestCase):
+    """Crash halfway, then resume from the SQLite checkpoint in a new process"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "checkpoints.db"
+        self.completed = MagicMock()
+        self.completed.invoke.return_value = {"success": True}
+        added = MagicMock()
+        added.invoke.return_value = {"success": True}
+        inbox = MagicMock()
+        inbox.invoke.return_value = {"tasks": TASKS}
+        for name, mock in (("get_inbox_tasks_tool", inbox), ("mark_task_complete_tool", self.completed),
+                           ("add_to_today_tool", added), ("flush_write_queue", lambda: True)):
+            patcher = patch(f"gtd_coach.agent.workflows.daily_clarify.{name}", mock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def workflow(self, ask, user_id="alice"):
+        saver = open_sqlite_saver(self.db_path)
+        self.addCleanup(saver.conn.close)
+        return DailyClarifyWorkflow(use_graphiti=False, prefetch_depth=0, user_id=user_id,
+                                    checkpointer=saver, ask=ask)
+
+    def test_resume_skips_decided_tasks(self):
+        first = ScriptedUser(crash_at=4)
+        with self.assertRaises(Crash):
+            self.workflow(first).run()
+        self.assertEqual(self.completed.invoke.call_count, 3)
+
+        # A new process with the same database picks up at task 4
+        second = ScriptedUser()
+        resumed = self.workflow(second)
+        self.assertTrue(resumed.has_resumable_session())
+        final = resumed.resume()
+
+        self.assertEqual(second.task_prompts, [f"[{i}/8]" for i in range(4, 9)])
+        self.assertEqual(final["processed_count"], 8)
+        self.assertEqual(final["quick_task_count"], 8)
+        self.assertEqual([c.args[0]["task_id"] for c in self.completed.invoke.call_args_list],
+                         [t["id"] for t in TASKS])
+        self.assertFalse(resumed.has_resumable_session())
+        self.assertIsNone(resumed.resume())
+
+    def test_threads_per_user_and_day(self):
+        self.assertEqual(clarify_thread_id("alice", date(2025, 1, 6)), "clarify-alice-2025-01-06")
+        self.assertEqual(clarify_thread_id(day=date(2025, 1, 6)), "clarify-default-2025-01-06")
+
+        with self.assertRaises(Crash):
+            self.workflow(ScriptedUser(crash_at=2)).run()
+        self.assertFalse(self.workflow(ScriptedUser(), user_id="bob").has_resumable_session())
+        self.assertTrue(self.workflow(ScriptedUser()).has_resumable_session())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the deep work analysis prefetch in the daily clarify workflow
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from gtd_coach.agent.workflows.daily_clarify import DailyClarifyWorkflow
+
+ANALYSIS_SECONDS = 0.1
+THINKING_SECONDS = 0.15
+
+
+class SlowAnalyzer:
+    """Deep work analysis that takes ANALYSIS_SECONDS, counting calls"""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, content):
+        with self._lock:
+            self.calls.append(content)
+        time.sleep(ANALYSIS_SECONDS)
+        return {"is_deep_work": content.startswith("Design")}
+
+
+class TestClarifyPrefetch(unittest.TestCase):
+    """Per-item wait after a keep decision"""
+
+    def setUp(self):
+        self.tasks = [{"id": str(i), "content": f"Design part {i}" if i % 2 else f"Buy item {i}"}
+                      for i in range(6)]
+        decision = MagicMock()
+        decision.invoke.side_effect = lambda _: time.sleep(THINKING_SECONDS) or "keep"
+        for name, mock in (("clarify_decision_v3", decision),
+                           ("mark_task_complete_tool", MagicMock())):
+            patcher = patch(f"gtd_coach.agent.workflows.daily_clarify.{name}", mock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def workflow(self, **kwargs):
+        return DailyClarifyWorkflow(use_graphiti=False, checkpointer=InMemorySaver(), **kwargs)
+
+    def run_items(self, workflow):
+        """Process every task; returns the wait after each decision and the routes"""
+        state = {"inbox_tasks": self.tasks, "current_task_index": 0, "processed_count": 0,
+                 "deleted_count": 0, "deep_work_count": 0}
+        waits, routes = [], []
+        for _ in self.tasks:
+            state.update(workflow.process_task_node(state))
+            started = time.perf_counter()
+            routes.append(workflow._route_after_process(state))
+            waits.append(time.perf_counter() - started)
+        workflow._stop_prefetch()
+        return waits, routes
+
+    def test_wait_drops_after_first_item(self):
+        analyzer = SlowAnalyzer()
+        waits, routes = self.run_items(self.workflow(analyzer=analyzer))
+
+        self.assertEqual(routes, ["add_regular", "check_deep"] * 3)
+        for wait in waits:
+            self.assertLess(wait, 0.05)  # analysis finished while the user was deciding
+        self.assertEqual(sorted(analyzer.calls), sorted(t["content"] for t in self.tasks))
+
+        baseline, _ = self.run_items(self.workflow(analyzer=SlowAnalyzer(), prefetch_depth=0))
+        self.assertGreater(min(baseline), ANALYSIS_SECONDS * 0.9)
+
+    def test_cache_keyed_by_content(self):
+        analyzer = SlowAnalyzer()
+        workflow = self.workflow(analyzer=analyzer, prefetch_depth=2)
+        workflow._prefetch_analyses(self.tasks, 0)
+        workflow._prefetch_analyses(self.tasks, 1)
+        self.assertFalse(workflow._deep_work_analysis({"id": "1", "content": "Buy milk"})["is_deep_work"])
+        self.assertTrue(workflow._deep_work_analysis(self.tasks[1])["is_deep_work"])
+        self.assertEqual(len(analyzer.calls), 4)  # tasks 0-2 once each, plus the edited task 1
+        workflow._stop_prefetch()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Tests for precompiled per-phase prompt assembly
+"""
+
+import re
+import sys
+import time
+import logging
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.prompts.compiled import (
+    PhasePromptTemplate,
+    STABLE_TIME_REFERENCE,
+    format_time_status,
+    precompile_phase_prompt,
+    precompile_phase_prompts,
+    resolve_prompt_layout,
+)
+
+
+class FakeChatPrompt:
+    """Minimal stand-in for a Langfuse chat prompt (mustache variables)"""
+
+    def __init__(self, template):
+        self.template = template
+        self.compile_calls = 0
+
+    def compile(self, **variables):
+        self.compile_calls += 1
+        content = re.sub(r"\{\{(\w+)\}\}", lambda m: str(variables[m.group(1)]), self.template)
+        return [{"role": "system", "content": content}]
+
+
+TEMPLATE = (
+    "You are a GTD coach. Total review time: {{total_time}} minutes\n"
+    "Current phase: {{phase_name}}\n"
+    "Time limit: {{phase_time_limit}} minutes\n"
+    "{{phase_instructions}}\n"
+    "Time check: {{time_elapsed}} minutes elapsed, {{time_remaining}} minutes remaining."
+)
+
+CONFIG = {
+    "phase_times": {"STARTUP": 2, "MIND_SWEEP": 10},
+    "phase_instructions": {"MIND_SWEEP": "Capture everything."}
+}
+
+
+class TestPhasePromptTemplate(unittest.TestCase):
+    """Test splitting and rendering of phase prompts"""
+
+    def setUp(self):
+        self.prompt = FakeChatPrompt(TEMPLATE)
+
+    def test_render_matches_direct_compile(self):
+        """Rendering a precompiled template equals compiling with the values"""
+        template = precompile_phase_prompt(self.prompt, "MIND_SWEEP", CONFIG)
+        expected = self.prompt.compile(
+            total_time=30, phase_name="MIND_SWEEP", phase_time_limit=10,
+            phase_instructions="Capture everything.", time_elapsed=7, time_remaining=3
+        )[0]["content"]
+        self.assertEqual(template.render(time_remaining=3, time_elapsed=7), expected)
+
+    def test_fields_are_split_out(self):
+        """Only the time fields remain open after precompiling"""
+        template = precompile_phase_prompt(self.prompt, "MIND_SWEEP", CONFIG)
+        self.assertEqual(template.fields, ["time_elapsed", "time_remaining"])
+        self.assertIn("Current phase: MIND_SWEEP", template.static_prefix)
+        self.assertIn("Capture everything.", template.static_prefix)
+
+    def test_static_body_is_stable(self):
+        """Static body has no time values and does not change between turns"""
+        template = precompile_phase_prompt(self.prompt, "MIND_SWEEP", CONFIG)
+        body = template.static_body
+        self.assertIn(STABLE_TIME_REFERENCE, body)
+        template.render(time_remaining=1, time_elapsed=20)
+        self.assertEqual(template.static_body, body)
+
+    def test_fractional_minutes_render_whole(self):
+        """Sub-minute changes do not alter the rendered prompt"""
+        template = precompile_phase_prompt(self.prompt, "MIND_SWEEP", CONFIG)
+        self.assertEqual(
+            template.render(time_remaining=4.9, time_elapsed=5.1),
+            template.render(time_remaining=5.2, time_elapsed=4.8)
+        )
+        self.assertNotIn("-", template.render(time_remaining=-2, time_elapsed=0))
+
+    def test_precompile_all_phases_once(self):
+        """Every default phase is compiled exactly once at session start"""
+        templates = precompile_phase_prompts(self.prompt, CONFIG)
+        self.assertEqual(
+            set(templates),
+            {"STARTUP", "MIND_SWEEP", "PROJECT_REVIEW", "PRIORITIZATION", "WRAP_UP"}
+        )
+        self.assertEqual(self.prompt.compile_calls, 5)
+        templates["PROJECT_REVIEW"].render(time_remaining=10, time_elapsed=14)
+        self.assertEqual(self.prompt.compile_calls, 5)
+
+    def test_template_without_time_fields(self):
+        """Prompts without time variables render unchanged"""
+        template = precompile_phase_prompt(FakeChatPrompt("Phase {{phase_name}}"), "STARTUP")
+        self.assertEqual(template.fields, [])
+        self.assertEqual(template.render(time_remaining=1), "Phase STARTUP")
+
+    def test_mismatched_segments_rejected(self):
+        """Segments and fields must interleave"""
+        with self.assertRaises(ValueError):
+            PhasePromptTemplate("STARTUP", ["a"], ["time_elapsed"])
+
+    def test_time_status(self):
+        """Trailing time check is short and whole-minute"""
+        status = format_time_status("MIND_SWEEP", 3.4, 12.6)
+        self.assertEqual(status, "TIME CHECK (MIND_SWEEP): 13 minutes elapsed, 3 minutes remaining.")
+
+    def test_missing_phase_uses_baseline_limit(self):
+        """Phases absent from phase_times fall back to 5 minutes"""
+        prompt = FakeChatPrompt("Time limit: {{phase_time_limit}} minutes")
+        template = precompile_phase_prompt(prompt, "PROJECT_REVIEW", CONFIG)
+        self.assertEqual(template.render(), "Time limit: 5 minutes")
+
+    def test_layout_validation(self):
+        """Unknown layouts fall back to inline with a warning"""
+        self.assertEqual(resolve_prompt_layout("prefix_stable"), "prefix_stable")
+        self.assertEqual(resolve_prompt_layout(None), "inline")
+        with self.assertLogs("gtd_coach.prompts.compiled", level="WARNING"):
+            self.assertEqual(resolve_prompt_layout("prefix-stabel"), "inline")
+
+
+class TestSendMessageLayout(unittest.TestCase):
+    """Drive GTDCoach.send_message and check the exact messages sent"""
+
+    def _make_coach(self, layout):
+        from gtd_coach.coach import GTDCoach
+
+        # Skip __init__ (LM Studio, Langfuse, Graphiti) and set only what send_message uses
+        coach = GTDCoach.__new__(GTDCoach)
+        coach.logger = logging.getLogger("test_compiled_prompts")
+        coach.session_id = "20250101_120000"
+        coach.user_id = "2025-W01"
+        coach.current_phase = "MIND_SWEEP"
+        coach.langfuse_enabled = False
+        coach.langfuse_prompts = MagicMock()
+        coach.system_prompt = FakeChatPrompt(TEMPLATE)
+        coach.model_config = CONFIG
+        coach.phase_prompts = precompile_phase_prompts(coach.system_prompt, CONFIG)
+        coach.prompt_layout = layout
+        coach.prompt_tone = "firm"
+        coach.model_name = "test-model"
+        coach.phase_metrics = {}
+        coach.timing_projects = None
+        coach.evaluator = None
+        coach.mindsweep_items = []
+        coach.loop = MagicMock()
+        coach.memory = MagicMock()
+        coach.north_star = MagicMock()
+        coach.north_star.get_all_metrics.return_value = {}
+        coach._stream_review_log = MagicMock()  # no log files from these tests
+        coach.phase_start_times = {"MIND_SWEEP": time.time() - 180}
+        coach.review_start_time = None
+        coach.messages = [{"role": "system", "content": "initial"}]
+
+        completion = MagicMock()
+        completion.choices[0].message.content = "Got it."
+        coach.openai_client = MagicMock()
+        coach.openai_client.chat.completions.create.return_value = completion
+        return coach
+
+    def _sent_messages(self, coach):
+        return coach.openai_client.chat.completions.create.call_args.kwargs["messages"]
+
+    def test_inline_layout(self):
+        """Inline layout puts the time values in the system prompt"""
+        coach = self._make_coach("inline")
+        coach.send_message("Buy milk", phase_name="MIND_SWEEP")
+
+        expected_system = coach.phase_prompts["MIND_SWEEP"].render(time_remaining=7, time_elapsed=0)
+        self.assertEqual(self._sent_messages(coach), [
+            {"role": "system", "content": expected_system},
+            {"role": "user", "content": "Buy milk"}
+        ])
+
+    def test_prefix_stable_layout(self):
+        """Prefix-stable layout keeps the system prompt fixed and tags the user turn"""
+        coach = self._make_coach("prefix_stable")
+        coach.send_message("Buy milk", phase_name="MIND_SWEEP")
+        first_system = self._sent_messages(coach)[0]
+
+        static_body = coach.phase_prompts["MIND_SWEEP"].static_body
+        self.assertEqual(self._sent_messages(coach), [
+            {"role": "system", "content": static_body},
+            {"role": "user", "content": (
+                "Buy milk\n\n[TIME CHECK (MIND_SWEEP): 0 minutes elapsed, 7 minutes remaining.]"
+            )}
+        ])
+
+        # Time check is not stored in history and the prefix is byte-identical next turn
+        self.assertEqual(coach.messages[1], {"role": "user", "content": "Buy milk"})
+        coach.phase_start_times["MIND_SWEEP"] -= 120
+        coach.send_message("Call dentist", phase_name="MIND_SWEEP")
+        sent = self._sent_messages(coach)
+        self.assertEqual(sent[0], first_system)
+        self.assertEqual(sent[:3], coach.messages[:3])
+        self.assertTrue(all(m["role"] != "system" for m in sent[1:]))
+        self.assertTrue(sent[-1]["content"].endswith("5 minutes remaining.]"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline end-to-end benchmark: fake LLM replies and baseline comparison
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import requests
+
+from scripts.benchmarks.benchmark_e2e_review import compare_to_baseline, percentiles
+from scripts.benchmarks.fake_services import FakeLLMServer
+
+SCRIPT = [("STARTUP", "ask_question_v3", {"question": "Energy level?"}),
+          ("MIND_SWEEP", "transition_phase_tool", {"next_phase": "MIND_SWEEP"})]
+
+
+def flow(startup_p95, total_p95=1000.0, llm_calls=18):
+    stats = {"p50": 50.0, "p95": startup_p95, "p99": startup_p95}
+    return {"flows": {"agent": {
+        "phases_ms": {"STARTUP": stats},
+        "total_ms": {"p50": total_p95, "p95": total_p95, "p99": total_p95},
+        "per_review": {"llm_calls": llm_calls, "tokens": 20000, "episodes": 1},
+    }}}
+
+
+class TestFakeLLMServer(unittest.TestCase):
+    """Scripted tool calls by assistant turn, plain replies without tools"""
+
+    def setUp(self):
+        self.server = FakeLLMServer(agent_script=SCRIPT)
+        self.addCleanup(self.server.shutdown)
+        self.session = requests.Session()  # requests.post itself is mocked suite-wide
+        self.addCleanup(self.session.close)
+
+    def complete(self, messages, **body):
+        response = self.session.post(f"{self.server.url}/v1/chat/completions",
+                                      json={"model": "m", "messages": messages, **body}, timeout=5)
+        response.raise_for_status()
+        return response
+
+    def test_agent_turns_follow_script(self):
+        tools = [{"type": "function", "function": {"name": "ask_question_v3"}}]
+        first = self.complete([{"role": "user", "content": "Start"}], tools=tools).json()
+        call = first["choices"][0]["message"]["tool_calls"][0]["function"]
+        self.assertEqual((call["name"], json.loads(call["arguments"])), ("ask_question_v3", SCRIPT[0][2]))
+
+        history = [{"role": "user", "content": "Start"}, {"role": "assistant", "content": None},
+                   {"role": "tool", "content": "7"}]
+        streamed = self.complete(history, tools=tools, stream=True).text
+        self.assertIn('"transition_phase_tool"', streamed)
+        self.assertTrue(streamed.endswith("data: [DONE]\n\n"))
+
+        history += [{"role": "assistant", "content": None}, {"role": "tool", "content": "ok"}]
+        final = self.complete(history, tools=tools).json()["choices"][0]
+        self.assertEqual(final["finish_reason"], "stop")
+        self.assertEqual([phase for _, phase in self.server.agent_turns], ["STARTUP", "MIND_SWEEP"])
+
+    def test_chat_replies_and_token_counts(self):
+        reply = self.complete([{"role": "user", "content": "Start the weekly review process."}]).json()
+        self.assertTrue(reply["choices"][0]["message"]["content"])
+        self.assertEqual(self.server.calls["chat"], 1)
+        self.assertEqual(self.server.total_tokens, reply["usage"]["total_tokens"])
+
+
+class TestBaselineComparison(unittest.TestCase):
+    """Percentiles and regression detection"""
+
+    def test_percentiles(self):
+        self.assertEqual(percentiles(range(1, 101)), {"p50": 50.5, "p95": 95.05, "p99": 99.01})
+        self.assertEqual(percentiles([]), {"p50": 0.0, "p95": 0.0, "p99": 0.0})
+
+    def test_regressions_above_threshold(self):
+        baseline = flow(200.0)
+        self.assertEqual(compare_to_baseline(flow(230.0), baseline, threshold=0.2), [])
+        self.assertEqual(compare_to_baseline(flow(300.0), baseline, threshold=0.2),
+                         ["agent STARTUP p95: 200.0 ms -> 300.0 ms", "agent STARTUP p99: 200.0 ms -> 300.0 ms"])
+        # Small phases need real growth, not jitter
+        self.assertEqual(compare_to_baseline(flow(20.0), flow(10.0), threshold=0.2), [])
+        self.assertEqual(compare_to_baseline(flow(200.0, llm_calls=24), baseline, threshold=0.2),
+                         ["agent llm_calls per review: 18 -> 24"])
+        self.assertEqual(compare_to_baseline(flow(900.0), {"flows": {}}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for background Graphiti ingestion of captured review data
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gtd_coach.integrations.graphiti import GraphitiMemory
+from gtd_coach.integrations.graphiti_ingest import GraphitiIngestQueue, build_batch_metrics
+from gtd_coach.persistence.artifacts import get_artifact_store
+from gtd_coach.persistence.jsonl import load_document
+from gtd_coach.persistence.session_store import SessionStore
+from gtd_coach.agent.tools.capture_v2 import (
+    batch_save_mind_sweep_v2, get_ingest_status_v2, save_weekly_priority_v2
+)
+
+
+class SlowMemory:
+    """GraphitiMemory stand-in whose sends block until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+        self.episodes = []
+        self.initialized = 0
+        self.flushes = 0
+
+    async def initialize(self):
+        self.initialized += 1
+
+    def is_configured(self):
+        return True
+
+    async def add_mindsweep_batch(self, items, phase_metrics):
+        self.release.wait(5)
+        self.batches.append((items, phase_metrics))
+
+    async def queue_episode(self, episode_data):
+        self.episodes.append(episode_data)
+
+    async def flush_episodes(self):
+        self.flushes += 1
+        return 1
+
+
+class TestIngestQueue(unittest.TestCase):
+    """One grouped episode per batch, sent off the caller's thread"""
+
+    def test_submit_returns_before_ingestion(self):
+        memory = SlowMemory()
+        queue = GraphitiIngestQueue(lambda: memory)
+        job_id = queue.submit([f"item {i}" for i in range(30)], user_id="u1")
+
+        self.assertIn(queue.status(job_id)["state"], ("queued", "running"))
+        memory.release.set()
+        status = queue.wait(job_id, timeout=5)
+        queue.wait(queue.submit_episode({"type": "weekly_priority", "data": {}}), timeout=5)
+        queue.shutdown()
+
+        self.assertEqual((status["state"], status["graphiti"]), ("done", True))
+        self.assertEqual(len(memory.batches), 1)
+        items, metrics = memory.batches[0]
+        self.assertEqual(len(items), 30)
+        self.assertEqual(metrics["user_id"], "u1")
+        self.assertEqual(memory.episodes[0]["type"], "weekly_priority")
+        # One memory, initialized once, flushed after every job
+        self.assertEqual((memory.initialized, memory.flushes), (1, 2))
+
+    def test_unavailable_memory_fails_job(self):
+        failing = GraphitiIngestQueue(lambda: None)
+        status = failing.wait(failing.submit(["a"]), timeout=5)
+        failing.shutdown()
+        self.assertEqual(status["state"], "failed")
+        self.assertIn("unavailable", status["error"])
+        self.assertEqual(failing.stats, {'submitted': 1, 'completed': 0, 'failed': 1})
+
+    def test_batch_description_is_bounded(self):
+        metrics = build_batch_metrics([f"item {i}" for i in range(50)])
+        self.assertIn("(+30 more)", metrics["description"])
+
+
+class TestBatchSaveTool(unittest.TestCase):
+    """batch_save_mind_sweep_v2 persists locally and queues one episode"""
+
+    def test_batch_tool(self):
+        memory = SlowMemory()
+        queue = GraphitiIngestQueue(lambda: memory)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(Path(temp_dir) / "sessions.db")
+            with patch('gtd_coach.agent.tools.capture_v2.get_session_store', return_value=store), \
+                 patch('gtd_coach.agent.tools.capture_v2.get_ingest_queue', return_value=queue), \
+                 patch('gtd_coach.agent.tools.capture_v2.GRAPHITI_AVAILABLE', True):
+                start = time.perf_counter()
+                result = batch_save_mind_sweep_v2.invoke({"items": ["Fix bike", "Call mom", "Taxes"]})
+                elapsed = time.perf_counter() - start
+
+                self.assertLess(elapsed, 1.0)  # does not wait on the blocked client
+                self.assertEqual(result["saved"], 3)
+                self.assertEqual(result["graphiti_status"], "queued")
+                self.assertEqual(len(store.get_items()), 3)
+
+                memory.release.set()
+                queue.wait(result["ingest_job_id"], timeout=5)
+                status = get_ingest_status_v2.invoke({"job_id": result["ingest_job_id"]})
+                self.assertEqual(status["state"], "done")
+                self.assertEqual(get_ingest_status_v2.invoke({"job_id": "nope"})["state"], "unknown")
+            queue.shutdown()
+            store.close()
+
+
+class TestGraphitiMemoryRoute(unittest.TestCase):
+    """The default queue sends through the real GraphitiMemory"""
+
+    def test_captures_reach_memory_backup(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(Path(temp_dir) / "sessions.db")
+            queue = GraphitiIngestQueue()
+            with patch.dict('os.environ', {'GRAPHITI_ENABLED': 'false'}), \
+                 patch('gtd_coach.integrations.graphiti.get_base_dir', return_value=Path(temp_dir)), \
+                 patch('gtd_coach.agent.tools.capture_v2.get_session_store', return_value=store), \
+                 patch('gtd_coach.agent.tools.capture_v2.get_ingest_queue', return_value=queue), \
+                 patch('gtd_coach.agent.tools.capture_v2.GRAPHITI_AVAILABLE', True):
+                batch = batch_save_mind_sweep_v2.invoke({"items": ["Fix bike", "Call mom"]})
+                priority = save_weekly_priority_v2.invoke({"priority": "Plan Q4", "rank": 1})
+                statuses = [queue.wait(result["ingest_job_id"], timeout=10)
+                            for result in (batch, priority)]
+            queue.shutdown()
+            store.close()
+
+            self.assertIsInstance(queue._memory, GraphitiMemory)
+            # JSON-only mode: backed up, not sent
+            self.assertEqual([(s["state"], s["graphiti"]) for s in statuses], [("done", False)] * 2)
+            entries = get_artifact_store(Path(temp_dir) / "data").find("graphiti_batch")
+            self.assertEqual(len(entries), 1)
+            episodes = load_document(entries[0]["file"])["episodes"]
+            self.assertEqual([e["type"] for e in episodes], ["mindsweep_capture", "weekly_priority"])
+            self.assertEqual(episodes[0]["data"]["items"], ["Fix bike", "Call mom"])
+
+
+if __name__ == '__main__':
+    unittest.main()
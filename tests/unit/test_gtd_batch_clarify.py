@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for batch clarification and organization in the GTD tools
+"""
+
+import random
+import unittest
+
+from gtd_coach.agent.tools.gtd import (
+    clarify_items_tool, organize_tool, _clarify_single_item, _clarify_batch, _organize_batch
+)
+
+
+PHRASES = [
+    "Need to call the dentist today", "Should email Sam about the budget",
+    "Must write the quarterly report", "Want to plan the offsite this week",
+    "Have to review the contract asap", "Need to implement the new billing project",
+    "Someday learn Italian", "Reference: wifi password note", "ok", "done",
+    "Waiting on invoice from the landlord", "Quick: just reply to Anna",
+    "Should buy milk tomorrow", "The garage thing", "Will check the deploy soon",
+    "Plan to organize the garage and build shelves for the whole house",
+]
+
+
+def corpus(n, seed=5):
+    """Captures drawn from the phrases with some duplicates and suffixes"""
+    rng = random.Random(seed)
+    return [{'content': rng.choice(PHRASES) + rng.choice(["", "", " for work", " critical"]),
+             'source': 'todoist'} for _ in range(n)]
+
+
+def clarify_per_item(items, state):
+    """Reference: the original one-helper-call-per-item loop"""
+    buckets = {'actions': [], 'projects': [], 'someday_maybe': [], 'reference': [],
+               'trash': [], 'questions': []}
+    for item in items:
+        content = item.get('content', '')
+        clarification = _clarify_single_item(content, item.get('source', 'unknown'), state)
+        if clarification['actionable']:
+            key = 'projects' if clarification['is_project'] else 'actions'
+            buckets[key].append(clarification)
+        elif clarification['category'] == 'someday':
+            buckets['someday_maybe'].append(clarification)
+        elif clarification['category'] in ('reference', 'trash'):
+            buckets[clarification['category']].append(clarification)
+        if clarification.get('needs_clarification'):
+            buckets['questions'].append({'item': content,
+                                         'question': clarification['clarifying_question']})
+        clarification['original_content'] = content
+        clarification['processed'] = True
+    return buckets
+
+
+def priority_per_item(content, state):
+    """Reference ABC rules as plain substring checks"""
+    content = content.lower()
+    if any(w in content for w in ['urgent', 'asap', 'today', 'deadline', 'critical']):
+        return 'A'
+    focus = (state or {}).get('user_context', {}).get('focus_areas', [])
+    if any(area.lower() in content for area in focus):
+        return 'A'
+    if any(w in content for w in ['tomorrow', 'this week', 'soon']):
+        return 'B'
+    return 'C'
+
+
+class TestBatchClarify(unittest.TestCase):
+    """Batch pipeline produces the same per-item output as the helpers"""
+
+    def test_buckets_match_per_item_helpers(self):
+        items = corpus(500)
+        clarified, _ = _clarify_batch(items, None)
+        self.assertEqual(clarified, clarify_per_item(items, None))
+
+    def test_tool_output_and_organization(self):
+        items = corpus(200, seed=9)
+        result = clarify_items_tool.func(items_to_clarify=items, state=None)
+        expected = clarify_per_item(items, None)
+        for key in expected:
+            self.assertEqual(result[key], expected[key])
+        self.assertEqual(result['clarified_count'], 200)
+
+        organization = result['organization']
+        actionable = expected['actions'] + expected['projects']
+        self.assertEqual(sum(organization['by_priority'].values()), len(actionable))
+        self.assertEqual(organization['by_priority']['A'],
+                         sum(1 for c in actionable if priority_per_item(c['original'], None) == 'A'))
+        self.assertEqual(organization['by_context'].get('@phone', 0),
+                         sum(1 for c in expected['actions'] if c['context'] == '@phone'))
+
+
+class TestBatchOrganize(unittest.TestCase):
+    """Single-pass organization matches per-item priority rules"""
+
+    def setUp(self):
+        self.state = {'user_context': {'focus_areas': ['Billing']}, 'captures': []}
+        for i, item in enumerate(corpus(300, seed=2)):
+            self.state['captures'].append({
+                'id': str(i), 'content': item['content'], 'clarified': True,
+                'actionable': i % 4 != 0, 'context_required': ['@phone', '@computer'][i % 2],
+                'energy_level': ['low', 'medium', 'high'][i % 3], 'time_estimate': i % 30,
+            })
+
+    def test_priorities_and_groups(self):
+        actionable = [c for c in self.state['captures'] if c['actionable']]
+        groups = _organize_batch(actionable, self.state)
+        for item in actionable:
+            self.assertEqual(item['priority'], priority_per_item(item['content'], self.state))
+        self.assertEqual(len(groups['by_context']['@phone']),
+                         sum(1 for c in actionable if c['context_required'] == '@phone'))
+        self.assertEqual(len(groups['quick_wins']),
+                         sum(1 for c in actionable if c['time_estimate'] <= 5))
+
+    def test_focus_area_miss_falls_through_to_b_and_c(self):
+        groups = _organize_batch([{'content': 'Call Sam tomorrow'}, {'content': 'Call Sam'}],
+                                 {'user_context': {'focus_areas': ['health']}})
+        self.assertEqual([len(groups['by_priority'][p]) for p in 'ABC'], [0, 1, 1])
+
+    def test_organize_tool(self):
+        result = organize_tool.func(state=self.state)
+        actionable = [c for c in self.state['captures'] if c['actionable']]
+        self.assertEqual(result['organized_count'], len(actionable))
+        self.assertEqual(sum(result['by_priority'].values()), len(actionable))
+        self.assertEqual(len(result['processed_actions']), len(actionable))
+
+
+if __name__ == '__main__':
+    unittest.main()
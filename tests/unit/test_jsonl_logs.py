@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for streamed JSONL review logs and Graphiti episode backups
+"""
+
+import asyncio
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from gtd_coach.persistence.jsonl import StreamingDocument, load_document
+from gtd_coach.integrations.graphiti import GraphitiMemory
+from gtd_coach.coach import GTDCoach, validate_session_data
+
+
+class TestStreamingDocument(unittest.TestCase):
+    """Line-per-event writes rebuilt into the nested format"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "doc.jsonl"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        doc = StreamingDocument(self.path, "messages", session_id="s1")
+        doc.add({"role": "user", "content": "hi"})
+        doc.add({"role": "assistant", "content": "hello"})
+        # Each event is on disk before close
+        self.assertEqual(len(self.path.read_bytes().splitlines()), 3)
+        doc.set("review_data", {"items_captured": 2})
+        doc.close()
+
+        self.assertEqual(load_document(self.path), {
+            "session_id": "s1",
+            "messages": [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}],
+            "review_data": {"items_captured": 2},
+        })
+
+    def test_torn_line_and_reopen(self):
+        doc = StreamingDocument(self.path, "episodes", session_id="s1")
+        doc.add({"n": 1})
+        doc.close()
+        with open(self.path, 'a') as f:
+            f.write('{"record": "item", "val')  # crash mid-write
+
+        doc = StreamingDocument(self.path, "episodes", session_id="s1")
+        doc.add({"n": 2})
+        doc.close()
+        self.assertEqual(load_document(self.path)["episodes"], [{"n": 1}, {"n": 2}])
+
+    def test_plain_json_still_loads(self):
+        legacy = Path(self.temp_dir.name) / "review_20250101_090000.json"
+        legacy.write_text(json.dumps({"session_id": "old", "messages": []}, indent=2))
+        self.assertEqual(load_document(legacy)["session_id"], "old")
+
+
+class TestGraphitiBackupStream(unittest.TestCase):
+    """Episodes reach disk when queued; flush only syncs and counts"""
+
+    def test_episodes_streamed_before_flush(self):
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch('gtd_coach.integrations.graphiti.get_base_dir', return_value=Path(temp_dir)):
+            memory = GraphitiMemory("stream_session")
+            for i in range(3):
+                asyncio.run(memory.queue_episode({"type": "interaction", "data": {"i": i}}))
+
+            path = memory.episode_log.path
+            self.assertEqual(path.suffix, ".jsonl")
+            self.assertEqual(len(load_document(path)["episodes"]), 3)  # no flush yet
+            self.assertEqual(memory.pending_episodes, [])
+
+            self.assertEqual(asyncio.run(memory.flush_episodes()), 3)
+            self.assertEqual(asyncio.run(memory.flush_episodes()), 0)
+            asyncio.run(memory.queue_episode({"type": "interaction", "data": {"i": 3}}))
+            self.assertEqual(asyncio.run(memory.flush_episodes()), 1)
+
+            batch = load_document(path)
+            self.assertEqual(batch["session_id"], "stream_session")
+            self.assertEqual(batch["group_id"], memory.session_group_id)
+            self.assertEqual([e["data"]["i"] for e in batch["episodes"]], [0, 1, 2, 3])
+
+
+class TestReviewLogStream(unittest.TestCase):
+    """GTDCoach writes messages per turn and the summary at save time"""
+
+    def test_review_log(self):
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch('gtd_coach.coach.LOGS_DIR', Path(temp_dir)):
+            coach = GTDCoach.__new__(GTDCoach)
+            coach.session_id = "20250101_090000"
+            coach.messages = [{"role": "system", "content": "prompt"}]
+            coach.review_log = None
+            coach._logged_messages = 1
+            coach.review_data = {"items_captured": 0}
+            coach.logger = logging.getLogger("test")
+            coach.north_star = MagicMock()
+            coach.memory = MagicMock(create_session_summary=AsyncMock())
+            coach.loop = asyncio.new_event_loop()
+
+            coach.messages.append({"role": "user", "content": "Fix bike"})
+            coach.messages.append({"role": "assistant", "content": "Captured"})
+            coach._stream_review_log()
+            self.assertEqual(len(load_document(coach.review_log.path)["messages"]), 2)
+
+            coach.review_data["items_captured"] = 1
+            coach.save_review_log()
+            coach.messages.append({"role": "user", "content": "one more"})
+            coach.save_review_log()  # saving again appends to the same log
+            coach.loop.close()
+
+            log = load_document(coach.review_log.path)
+            self.assertEqual(log["session_id"], "20250101_090000")
+            self.assertEqual(log["review_data"], {"items_captured": 1})
+            self.assertEqual([m["content"] for m in log["messages"]], ["Fix bike", "Captured", "one more"])
+            self.assertEqual(list(Path(temp_dir).rglob("review_*")), [coach.review_log.path])
+
+
+    def test_finished_log_is_validated(self):
+        with tempfile.TemporaryDirectory() as temp_dir, \
+             patch('gtd_coach.coach.LOGS_DIR', Path(temp_dir)), \
+             patch('gtd_coach.coach.validate_session_data', wraps=validate_session_data) as validate:
+            coach = GTDCoach.__new__(GTDCoach)
+            coach.session_id = "20250101_090000"
+            coach.messages = [{"role": "system", "content": "prompt"},
+                              {"role": "user", "content": "Fix bike"}]
+            # A log whose header lacks session_id
+            coach.review_log = StreamingDocument(Path(temp_dir) / "review_partial.jsonl", "messages")
+            coach._logged_messages = 1
+            coach.review_data = {}
+            coach.logger = logging.getLogger("test")
+            coach.north_star = MagicMock()
+            coach.memory = MagicMock(create_session_summary=AsyncMock())
+            coach.loop = asyncio.new_event_loop()
+
+            coach.save_review_log()
+            coach.loop.close()
+
+            validated = validate.call_args.args[0]
+            self.assertEqual([m["content"] for m in validated["messages"]], ["Fix bike"])
+            log = load_document(coach.review_log.path)
+            self.assertEqual(set(log), {"session_id", "timestamp", "review_data", "messages"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled keyword matcher shared by the heuristic classifiers
+"""
+
+import random
+import re
+import unittest
+
+from gtd_coach.patterns.keywords import KEYWORDS, RULE_TABLES, KeywordMatcher
+from gtd_coach.patterns.adhd_metrics import ADHDPatternDetector
+from gtd_coach.agent.tools.gtd import _determine_context, _estimate_time, _determine_energy
+from gtd_coach.integrations.timing_comparison import _categorize_time_sink
+
+
+def naive_first(table, text, default=None):
+    """Reference: the original if/elif chain of any(word in text ...)"""
+    text = text.lower()
+    for label, keywords in RULE_TABLES[table].items():
+        if any(keyword in text for keyword in keywords):
+            return label
+    return default
+
+
+def random_corpus(n, seed=7):
+    """Texts built from keywords, keyword fragments and filler words"""
+    rng = random.Random(seed)
+    keywords = sorted({k for rules in RULE_TABLES.values() for ks in rules.values() for k in ks})
+    fillers = ["the", "a", "mom", "car", "tomorrow", "um", "app", "payment", "emails",
+               "meetings", "I dont know", "Hmmm", "Xcode", "git", "e", "ma", "il"]
+    vocab = keywords + fillers
+    return [
+        rng.choice(["", " "]).join(rng.choice(vocab) for _ in range(rng.randint(1, 8)))
+        for _ in range(n)
+    ]
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Matcher reports exactly the keywords contained in the text"""
+
+    def test_overlapping_keywords(self):
+        hits = KeywordMatcher({'t': {'a': ['mail', 'email', 'e'], 'b': ['meet', 'meeting', 'tin']}}).scan(
+            "Emailing about meetings")
+        self.assertEqual(hits.keywords, {'mail', 'email', 'e', 'meet', 'meeting', 'tin'})
+        self.assertEqual(hits.counts('t'), {'a': 3, 'b': 3})
+
+    def test_keyword_sets_match_substring_semantics(self):
+        keywords = {k for rules in RULE_TABLES.values() for ks in rules.values() for k in ks}
+        for text in random_corpus(2000):
+            expected = {k for k in keywords if k in text.lower()}
+            self.assertEqual(KEYWORDS.scan(text).keywords, expected, text)
+
+    def test_first_matches_if_elif_chains(self):
+        for text in random_corpus(2000, seed=11):
+            for table in RULE_TABLES:
+                self.assertEqual(KEYWORDS.scan(text).first(table), naive_first(table, text),
+                                 (table, text))
+
+    def test_no_match(self):
+        hits = KEYWORDS.scan("zzz")
+        self.assertIsNone(hits.first('topic'))
+        self.assertFalse(hits.has('gtd_context'))
+        self.assertEqual(hits.counts('topic'), {})
+
+
+class TestClassifiers(unittest.TestCase):
+    """Callers keep their original behaviour"""
+
+    def test_gtd_helpers(self):
+        self.assertEqual(_determine_context("Call the bank"), '@phone')
+        self.assertEqual(_determine_context("Reply to the email"), '@computer')
+        self.assertEqual(_determine_context("Water plants"), '@anywhere')
+        self.assertEqual(_estimate_time("just email Sam"), 5)
+        self.assertEqual(_estimate_time("Write the report"), 45)
+        self.assertEqual(_estimate_time("Water plants"), 15)
+        self.assertEqual(_determine_energy("Plan the week"), 'medium')
+        self.assertEqual(_determine_energy("Water the lawn"), 'low')
+
+    def test_time_sinks(self):
+        self.assertEqual(_categorize_time_sink("Google Chrome"), 'browsing')
+        self.assertEqual(_categorize_time_sink("Apple Mail"), 'communication')
+        self.assertEqual(_categorize_time_sink("Xcode"), 'development')
+        self.assertEqual(_categorize_time_sink("Calculator"), 'other')
+
+    def test_detector_confusion_markers_match_regexes(self):
+        detector = ADHDPatternDetector()
+        for text in random_corpus(1000, seed=3):
+            expected = next((m for m in detector.confusion_markers if re.search(m, text.lower())), None)
+            self.assertEqual(KEYWORDS.scan(text).first('confusion_marker'), expected, text)
+
+    def test_topic_ties_follow_table_order(self):
+        detector = ADHDPatternDetector()
+        self.assertEqual(detector._categorize_topic("pay the client"), 'work')
+        self.assertEqual(detector._categorize_topic("budget and bill for the project"), 'financial')
+        self.assertEqual(detector._categorize_topic("walk"), 'other')
+
+
+if __name__ == '__main__':
+    unittest.main()
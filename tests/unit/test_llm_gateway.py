@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared LM Studio gateway (priorities, coalescing, wait metrics)
+"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+import httpx
+
+from gtd_coach.llm.gateway import (
+    LLMGateway, GatewayTransport, AsyncGatewayTransport, Priority, request_priority, current_priority
+)
+
+
+class ChunkStream(httpx.SyncByteStream):
+    """Unread response body, like a real server-sent event stream"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        yield from self.chunks
+
+
+class AsyncChunkStream(httpx.AsyncByteStream):
+    """Async version of ChunkStream"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+class TestLLMGateway(unittest.TestCase):
+    """Admission order and single-flight behaviour"""
+
+    def test_interactive_served_before_queued_background(self):
+        gateway = LLMGateway(max_concurrency=1)
+        order = []
+        release = gateway.acquire(Priority.INTERACTIVE)
+
+        def call(name, priority):
+            gateway.run(lambda: order.append(name), priority=priority)
+
+        threads = [threading.Thread(target=call, args=("evaluation", Priority.EVALUATION)),
+                   threading.Thread(target=call, args=("shadow", Priority.BACKGROUND))]
+        for t in threads:
+            t.start()
+        wait_for(lambda: gateway.get_statistics()['queue_depth'] == 2)
+
+        user = threading.Thread(target=call, args=("user", Priority.INTERACTIVE))
+        user.start()
+        wait_for(lambda: gateway.get_statistics()['queue_depth'] == 3)
+
+        release()
+        for t in threads + [user]:
+            t.join(timeout=5)
+        self.assertEqual(order, ["user", "shadow", "evaluation"])
+
+        stats = gateway.get_statistics()
+        self.assertEqual(stats['requests'], 4)
+        self.assertEqual(stats['max_queue_depth'], 3)
+        self.assertGreater(stats['wait_ms']['evaluation']['max'], 0)
+
+    def test_identical_requests_coalesced(self):
+        gateway = LLMGateway()
+        started = threading.Event()
+        finish = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            finish.wait(timeout=5)
+            return "reply"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(gateway.run(slow, key="same")))
+        leader.start()
+        started.wait(timeout=5)
+        followers = [threading.Thread(target=lambda: results.append(gateway.run(slow, key="same")))
+                     for _ in range(3)]
+        for t in followers:
+            t.start()
+        wait_for(lambda: gateway.stats['coalesced'] == 3)
+        finish.set()
+        for t in [leader] + followers:
+            t.join(timeout=5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["reply"] * 4)
+        # A later identical call is a new request, not a cached one
+        gateway.run(lambda: calls.append(1), key="same")
+        self.assertEqual(len(calls), 2)
+
+    def test_errors_reach_coalesced_callers(self):
+        gateway = LLMGateway()
+        started = threading.Event()
+        finish = threading.Event()
+
+        def failing():
+            started.set()
+            finish.wait(timeout=5)
+            raise ConnectionError("LM Studio down")
+
+        errors = []
+
+        def call():
+            try:
+                gateway.run(failing, key="k")
+            except ConnectionError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(timeout=5)
+        follower = threading.Thread(target=call)
+        follower.start()
+        wait_for(lambda: gateway.stats['coalesced'] == 1)
+        finish.set()
+        leader.join(timeout=5)
+        follower.join(timeout=5)
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(gateway.get_statistics()['active'], 0)
+
+    def test_acquire_timeout_admits_over_limit(self):
+        gateway = LLMGateway(max_concurrency=1, acquire_timeout=0.05)
+        first = gateway.acquire()
+        second = gateway.acquire(Priority.BACKGROUND)
+        stats = gateway.get_statistics()
+        self.assertEqual((stats['active'], stats['overflow'], stats['queue_depth']), (2, 1, 0))
+        first()
+        second()
+        self.assertEqual(gateway.get_statistics()['active'], 0)
+
+    def test_priority_context(self):
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+        with request_priority(Priority.BACKGROUND):
+            self.assertEqual(current_priority(), Priority.BACKGROUND)
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+
+
+class TestGatewayTransport(unittest.TestCase):
+    """httpx transport used by the OpenAI-compatible clients"""
+
+    def setUp(self):
+        self.requests = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+        def handler(request):
+            self.requests.append(json.loads(request.content) if request.content else None)
+            self.gate.wait(timeout=5)
+            if request.url.path.endswith("/models"):
+                return httpx.Response(200, json={"data": []})
+            body = json.loads(request.content)
+            if body.get("stream"):
+                return httpx.Response(200, stream=ChunkStream([b"data: a\n\n", b"data: b\n\n"]))
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+        self.gateway = LLMGateway()
+        self.client = httpx.Client(
+            transport=GatewayTransport(self.gateway, transport=httpx.MockTransport(handler)),
+            base_url="http://lmstudio.test/v1"
+        )
+
+    def test_identical_completions_sent_once(self):
+        self.gate.clear()
+        payload = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.client.post("/chat/completions", json=payload).json())) for _ in range(3)]
+        for t in threads:
+            t.start()
+        wait_for(lambda: len(self.requests) == 1 and self.gateway.stats['coalesced'] == 2)
+        self.gate.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(results, [{"choices": [{"message": {"content": "ok"}}]}] * 3)
+
+    def test_streaming_holds_slot_until_closed(self):
+        payload = {"model": "m", "messages": [], "stream": True}
+        with self.client.stream("POST", "/chat/completions", json=payload) as response:
+            self.assertEqual(self.gateway.get_statistics()['active'], 1)
+            self.assertEqual(response.read(), b"data: a\n\ndata: b\n\n")
+        self.assertEqual(self.gateway.get_statistics()['active'], 0)
+
+    def test_request_inside_open_stream_does_not_deadlock(self):
+        self.gateway.acquire_timeout = 0.05
+        payload = {"model": "m", "messages": [], "stream": True}
+        with self.client.stream("POST", "/chat/completions", json=payload):
+            reply = self.client.post("/chat/completions", json={"model": "m", "messages": []})
+        self.assertEqual(reply.status_code, 200)
+        self.assertEqual(self.gateway.get_statistics()['overflow'], 1)
+        self.assertEqual(self.gateway.get_statistics()['active'], 0)
+
+    def test_other_endpoints_bypass_queue(self):
+        self.client.get("/models")
+        self.assertEqual(self.gateway.stats['requests'], 0)
+
+
+class TestAsyncGatewayTransport(unittest.TestCase):
+    """Async transport used by ChatOpenAI's async calls (LangGraph astream)"""
+
+    def setUp(self):
+        self.requests = []
+        self.gateway = LLMGateway()
+
+    def client(self):
+        async def handler(request):
+            self.requests.append(json.loads(request.content))
+            await asyncio.sleep(0.05)
+            if self.requests[-1].get("stream"):
+                return httpx.Response(200, stream=AsyncChunkStream([b"data: a\n\n", b"data: b\n\n"]))
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+        return httpx.AsyncClient(
+            transport=AsyncGatewayTransport(self.gateway, transport=httpx.MockTransport(handler)),
+            base_url="http://lmstudio.test/v1"
+        )
+
+    def test_identical_completions_sent_once_at_context_priority(self):
+        payload = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+
+        async def main():
+            async with self.client() as client:
+                with request_priority(Priority.BACKGROUND):
+                    replies = await asyncio.gather(*[client.post("/chat/completions", json=payload)
+                                                     for _ in range(3)])
+            return [r.json() for r in replies]
+
+        results = asyncio.run(main())
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(results, [{"choices": [{"message": {"content": "ok"}}]}] * 3)
+        stats = self.gateway.get_statistics()
+        self.assertEqual((stats['requests'], stats['coalesced']), (1, 2))
+        self.assertEqual(list(stats['wait_ms']), ["background"])
+
+    def test_streaming_holds_slot_until_closed(self):
+        payload = {"model": "m", "messages": [], "stream": True}
+
+        async def main():
+            async with self.client() as client:
+                async with client.stream("POST", "/chat/completions", json=payload) as response:
+                    active = self.gateway.get_statistics()['active']
+                    body = await response.aread()
+            return active, body
+
+        active, body = asyncio.run(main())
+        self.assertEqual((active, body), (1, b"data: a\n\ndata: b\n\n"))
+        self.assertEqual(self.gateway.get_statistics()['active'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -53,8 +53,8 @@ class TestPatternPersistence:
         assert session_id is not None
         
         # Verify file was created
-        session_file = self.persistence.sessions_dir / f'{session_id}.json'
-        assert session_file.exists()
+        session_file = self.persistence.session_file(session_id)
+        assert session_file is not None and session_file.exists()
         
         # Load and verify data
         with open(session_file, 'r') as f:
@@ -117,6 +117,49 @@ class TestPatternPersistence:
         assert history['found'] is True
         assert history['total_uses'] == 1
         assert history['average_effectiveness'] > 0.5
+    
+    def write_legacy_session(self, data_dir, when, patterns, interventions=()):
+        """Session file as older versions wrote it, flat in sessions/"""
+        session_id = f"{when.strftime('%Y%m%d_%H%M%S')}_{len(patterns):08x}"
+        sessions_dir = Path(data_dir) / 'sessions'
+        sessions_dir.mkdir(parents=True, exist_ok=True)
+        with open(sessions_dir / f'{session_id}.json', 'w') as f:
+            json.dump({'session_id': session_id, 'timestamp': when.isoformat(),
+                       'patterns': patterns, 'interventions': list(interventions),
+                       'effectiveness': 0.6}, f)
+    
+    def test_existing_session_files_are_imported_once(self):
+        """Sessions saved before the index existed are counted, windowed by time"""
+        temp_dir = tempfile.mkdtemp()  # no index yet, unlike self.persistence
+        now = datetime.now(timezone.utc)
+        self.write_legacy_session(temp_dir, now - timedelta(weeks=4, hours=1),
+                                  [{'type': 'low_focus', 'severity': 'high'}])
+        self.write_legacy_session(temp_dir, now - timedelta(weeks=4) + timedelta(hours=1),
+                                  [{'type': 'low_focus', 'severity': 'medium'}])
+        self.write_legacy_session(temp_dir, now - timedelta(days=3),
+                                  [{'type': 'low_focus', 'severity': 'low'},
+                                   {'type': 'topic_jumps', 'severity': 'high'}],
+                                  [{'type': 'timer_alert', 'context': {'phase': 'MIND_SWEEP'}}])
+        
+        persistence = PatternPersistence(data_dir=Path(temp_dir))
+        recurring = {r['pattern']: r for r in persistence.load_recent_patterns(weeks_back=4)}
+        assert recurring['low_focus']['frequency'] == 2
+        assert recurring['low_focus']['severity'] == 'low'  # newest session wins
+        assert recurring['topic_jumps']['frequency'] == 1
+        
+        evolution = persistence.get_pattern_evolution('low_focus', weeks=8)
+        assert [e['severity'] for e in evolution] == ['high', 'medium', 'low']
+        assert evolution[-1]['interventions'] == ['timer_alert']
+        assert persistence.get_intervention_history('timer_alert')['recent_contexts'] == [
+            {'phase': 'MIND_SWEEP'}]
+        
+        # New sessions update the counts incrementally; nothing is imported twice
+        persistence.save_session_patterns([{'type': 'topic_jumps', 'severity': 'low'}], [], {})
+        assert persistence.import_json_sessions() == 0
+        persistence.close()
+        reopened = PatternPersistence(data_dir=Path(temp_dir))
+        recurring = {r['pattern']: r for r in reopened.load_recent_patterns(weeks_back=4)}
+        assert (recurring['topic_jumps']['frequency'], recurring['topic_jumps']['severity']) == (2, 'low')
 
 
 class TestPatternEvolution:
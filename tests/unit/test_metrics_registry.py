@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process metrics registry and its Prometheus text export
+"""
+
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import requests
+
+from gtd_coach.bridge.circuit_breaker import AgentCircuitBreaker
+from gtd_coach.llm.client import LLMClient
+from gtd_coach.metrics.registry import MetricsRegistry, get_registry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Counters, gauges and histograms rendered as Prometheus text"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_render_exposition_format(self):
+        calls = self.registry.counter("demo_calls_total", "Calls by outcome", ["outcome"])
+        depth = self.registry.gauge("demo_queue_depth", "Queued items")
+        latency = self.registry.histogram("demo_latency_seconds", "Latency\nper call", buckets=(0.1, 1))
+
+        calls.labels("success").inc()
+        calls.labels(outcome='error "timeout"').inc(2)
+        depth.set(3)
+        depth.dec()
+        for value in (0.05, 0.1, 0.5, 7):
+            latency.observe(value)
+
+        self.assertEqual(self.registry.render(), "\n".join([
+            "# HELP demo_calls_total Calls by outcome",
+            "# TYPE demo_calls_total counter",
+            'demo_calls_total{outcome="error \\"timeout\\""} 2',
+            'demo_calls_total{outcome="success"} 1',
+            "# HELP demo_latency_seconds Latency\\nper call",
+            "# TYPE demo_latency_seconds histogram",
+            'demo_latency_seconds_bucket{le="0.1"} 2',
+            'demo_latency_seconds_bucket{le="1"} 3',
+            'demo_latency_seconds_bucket{le="+Inf"} 4',
+            "demo_latency_seconds_sum 7.65",
+            "demo_latency_seconds_count 4",
+            "# HELP demo_queue_depth Queued items",
+            "# TYPE demo_queue_depth gauge",
+            "demo_queue_depth 2",
+        ]) + "\n")
+
+    def test_registration_is_idempotent_and_checked(self):
+        first = self.registry.counter("demo_total", "Demo", ["kind"])
+        self.assertIs(self.registry.counter("demo_total", "Demo", ["kind"]), first)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("demo_total", "Demo", ["kind"])
+        with self.assertRaises(ValueError):
+            first.inc()  # labelled family needs .labels()
+        with self.assertRaises(ValueError):
+            first.labels("a").inc(-1)
+
+    def test_concurrent_writers_lose_no_updates(self):
+        hits = self.registry.counter("demo_hits_total", "Hits")
+        latency = self.registry.histogram("demo_seconds", "Latency", buckets=(1,))
+
+        def work():
+            for _ in range(5000):
+                hits.inc()
+                latency.observe(0.5)
+
+        for _ in range(2):  # second round reads shards of threads that already exited
+            threads = [threading.Thread(target=work) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.registry.render()
+
+        self.assertEqual(hits.labels().value, 80000)
+        snapshot = latency.labels().snapshot()
+        self.assertEqual((snapshot["count"], snapshot["sum"]), (80000, 40000))
+
+    def test_textfile_and_http_export(self):
+        self.registry.counter("demo_exports_total", "Exports").inc()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "textfile" / "gtd.prom"
+            self.registry.write_textfile(path)
+            self.assertIn("demo_exports_total 1\n", path.read_text())
+            self.assertEqual([p.name for p in path.parent.iterdir()], ["gtd.prom"])
+
+        server = self.registry.serve(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        with requests.Session() as session:
+            response = session.get(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5)
+            missing = session.get(f"http://127.0.0.1:{server.server_port}/other", timeout=5)
+        self.assertEqual(response.text, self.registry.render())
+        self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertEqual(missing.status_code, 404)
+
+
+class TestCallSiteWiring(unittest.TestCase):
+    """Existing components report into the process-wide registry"""
+
+    def test_circuit_breaker_exports_state_and_calls(self):
+        registry = get_registry()
+        failures = registry.get("gtd_circuit_calls_total").labels("failure")
+        before = failures.value
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            breaker = AgentCircuitBreaker(failure_threshold=2, metrics_dir=Path(temp_dir))
+            breaker._record_failure("boom")
+            breaker._record_failure("boom")
+
+        self.assertEqual(failures.value - before, 2)
+        self.assertEqual(registry.get("gtd_circuit_state").labels().value, 2)
+        self.assertIn('gtd_circuit_transitions_total{state="open"}', registry.render())
+        breaker.reset()
+        self.assertEqual(registry.get("gtd_circuit_state").labels().value, 0)
+
+    def test_failed_llm_call_observes_latency(self):
+        registry = get_registry()
+        errors = registry.get("gtd_llm_requests_total").labels("agent", "error")
+        latency = registry.get("gtd_llm_request_duration_seconds").labels("agent")
+        before = (errors.value, latency.snapshot()["count"])
+
+        client = LLMClient(enable_langfuse=False)
+        client._client = MagicMock()
+        client._client.chat.completions.create.side_effect = ConnectionError("refused")
+        with self.assertRaises(ConnectionError):
+            client.chat_completion([{"role": "user", "content": "hi"}])
+
+        self.assertEqual((errors.value, latency.snapshot()["count"]), (before[0] + 1, before[1] + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
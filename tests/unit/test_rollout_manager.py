@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the rollout event log: concurrent appends, compaction and windowed rollback
+"""
+
+import json
+import multiprocessing
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.config import features
+from gtd_coach.config.features import FeatureFlags, RolloutManager
+
+PROCESSES = 6
+SESSIONS_PER_PROCESS = 150
+
+
+def record_sessions(data_dir: str, worker: int):
+    """One review process: alternating systems, legacy sessions 1, 11, 21, ... fail"""
+    manager = RolloutManager(Path(data_dir), compact_every=25)
+    for i in range(SESSIONS_PER_PROCESS):
+        used_agent = i % 2 == 0
+        manager.record_session(used_agent, success=used_agent or i % 5 != 1, latency_ms=100 + worker)
+    manager.close()
+
+
+class TestRolloutEventLog(unittest.TestCase):
+    """Sessions from many processes are appended, compacted and never lost"""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.data_dir = Path(temp_dir.name)
+        for patcher in (mock.patch.object(FeatureFlags, "KILL_SWITCH", False),
+                        mock.patch.object(FeatureFlags, "activate_kill_switch")):
+            self.kill_switch = patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def manager(self, **kwargs) -> RolloutManager:
+        manager = RolloutManager(self.data_dir, **kwargs)
+        self.addCleanup(manager.close)
+        return manager
+
+    @unittest.skipIf(features.fcntl is None, "needs fcntl file locks")
+    def test_concurrent_processes_lose_no_events(self):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=record_sessions, args=(str(self.data_dir), n))
+                   for n in range(PROCESSES)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            self.assertEqual(worker.exitcode, 0)
+
+        metrics = self.manager().metrics
+        total = PROCESSES * SESSIONS_PER_PROCESS
+        self.assertEqual(metrics["sessions_total"], total)
+        self.assertEqual((metrics["sessions_agent"], metrics["sessions_legacy"]), (total // 2, total // 2))
+        self.assertEqual((metrics["errors_agent"], metrics["errors_legacy"]), (0, total // 10))
+        self.assertAlmostEqual(metrics["avg_latency_agent_ms"], 100 + (PROCESSES - 1) / 2)
+        # Most events were folded into the snapshot, the log only holds the tail
+        log_lines = (self.data_dir / RolloutManager.EVENTS_NAME).read_text().count("\n")
+        self.assertLess(log_lines, 25 * PROCESSES)
+
+    def test_rollback_uses_recent_window(self):
+        manager = self.manager(window=10)
+        for _ in range(20):
+            manager.record_session(True, success=False, latency_ms=9000)
+        for _ in range(10):
+            manager.record_session(True, success=True, latency_ms=200)
+        self.kill_switch.reset_mock()
+        # Lifetime error rate and mean are far over the thresholds, the window is not
+        self.assertEqual(manager.metrics["window_error_rate_agent"], 0)
+        self.assertEqual(manager.metrics["p95_latency_agent_ms"], 200)
+        self.kill_switch.assert_not_called()
+
+        manager.record_session(True, success=True, latency_ms=FeatureFlags.LATENCY_THRESHOLD_MS + 1)
+        self.kill_switch.assert_called_once()
+        self.assertEqual(self.manager().metrics["rollout_history"][-1]["reason"], "high_latency")
+
+    def test_seeds_from_legacy_metrics_file(self):
+        (self.data_dir / "rollout_metrics.json").write_text(json.dumps({
+            "sessions_total": 4, "sessions_agent": 3, "sessions_legacy": 1,
+            "errors_agent": 1, "errors_legacy": 0,
+            "avg_latency_agent_ms": 300, "avg_latency_legacy_ms": 100,
+            "rollout_history": [{"event": "rollback", "reason": "high_latency"}],
+        }))
+        manager = self.manager()
+        manager.record_session(True, success=True, latency_ms=700)
+
+        metrics = self.manager().metrics
+        self.assertEqual((metrics["sessions_total"], metrics["errors_agent"]), (5, 1))
+        self.assertEqual(metrics["avg_latency_agent_ms"], 400)
+        self.assertEqual(len(metrics["rollout_history"]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
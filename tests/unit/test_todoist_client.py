@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared Todoist client registry and metadata cache
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.integrations import todoist
+from scripts.benchmarks.fake_todoist import FakeTodoistServer
+
+
+class TestTodoistClientPool(unittest.TestCase):
+    """Connection reuse, TTL cache and invalidation against a fake server"""
+
+    def setUp(self):
+        self.server = FakeTodoistServer(inbox_items=5)
+        env = patch.dict(os.environ, {'TODOIST_API_URL': self.server.url})
+        env.start()
+        self.addCleanup(env.stop)
+        mirror = patch.object(todoist, 'MIRROR_ENABLED', False)  # exercise the REST path
+        mirror.start()
+        self.addCleanup(mirror.stop)
+        clients = patch.object(todoist, '_clients', {})
+        clients.start()
+        self.addCleanup(clients.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def test_registry_shares_clients(self):
+        client = todoist.get_todoist_client(api_key="token")
+        self.assertIs(todoist.get_todoist_client(api_key="token"), client)
+        self.assertIsNot(todoist.get_todoist_client(api_key="other"), client)
+
+    def test_inbox_lookup_cached_on_one_connection(self):
+        client = todoist.get_todoist_client(api_key="token")
+        for _ in range(3):
+            self.assertEqual(len(todoist.get_todoist_client(api_key="token").get_inbox_tasks()), 5)
+
+        self.assertEqual(self.server.requests['GET /api/v1/projects'], 1)
+        self.assertEqual(self.server.requests['GET /api/v1/tasks'], 3)
+        self.assertEqual(self.server.connections, 1)
+
+        client.cache_ttl = 0
+        client.get_inbox_tasks()
+        self.assertEqual(self.server.requests['GET /api/v1/projects'], 2)
+
+    def test_own_mutations_invalidate_labels(self):
+        client = todoist.get_todoist_client(api_key="token")
+        self.assertEqual(client.get_labels(), ["quick"])
+        client.add_to_today("Write report")
+        self.assertEqual(client.get_labels(), ["quick"])  # no new label, still cached
+        self.assertEqual(self.server.requests['GET /api/v1/labels'], 1)
+
+        client.add_to_today("Design schema", is_deep_work=True)
+        self.assertEqual(client.get_labels(), ["quick", "deep"])
+        self.assertEqual(self.server.requests['GET /api/v1/labels'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the local Todoist mirror: sync deltas, queries and staleness
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.integrations import todoist
+from gtd_coach.integrations.todoist_mirror import FULL_SYNC_INTERVAL, TodoistMirror
+from gtd_coach.integrations.todoist_queue import TodoistWriteQueue
+from scripts.benchmarks.fake_todoist import FakeTodoistServer
+
+TODAY = date(2025, 1, 6)
+
+FULL_SYNC = {
+    'sync_token': "t1",
+    'full_sync': True,
+    'projects': [{'id': "inbox", 'name': "Inbox", 'inbox_project': True},
+                 {'id': "work", 'name': "Work"}],
+    'items': [
+        {'id': "1", 'content': "Call dentist", 'project_id': "inbox", 'labels': [], 'checked': False},
+        {'id': "2", 'content': "Buy milk", 'project_id': "inbox", 'labels': ["quick"], 'checked': False},
+        {'id': "3", 'content': "Standup", 'project_id': "work", 'labels': [], 'checked': False,
+         'due': {'date': "2025-01-06", 'string': "today at 9am"}},
+        {'id': "4", 'content': "Expenses", 'project_id': "work", 'labels': [], 'checked': False,
+         'due': {'date': "2025-01-03", 'string': "friday"}},
+        {'id': "5", 'content': "Plan Q2", 'project_id': "work", 'labels': [], 'checked': False,
+         'due': {'date': "2025-01-10T09:00:00", 'string': "next friday"}},
+    ],
+}
+
+DELTAS = [
+    {'sync_token': "t2", 'full_sync': False, 'projects': [], 'items': [
+        {'id': "6", 'content': "Renew passport", 'project_id': "inbox", 'labels': [], 'checked': False},
+        {'id': "2", 'content': "Buy milk", 'project_id': "inbox", 'labels': ["quick"], 'checked': True},
+    ]},
+    {'sync_token': "t3", 'full_sync': False, 'projects': [], 'items': [
+        {'id': "4", 'is_deleted': True},
+        {'id': "1", 'content': "Call dentist", 'project_id': "work", 'labels': [], 'checked': False,
+         'due': {'date': "2025-01-06", 'string': "today"}},
+    ]},
+]
+
+
+class TestTodoistMirror(unittest.TestCase):
+    """Canned sync responses applied to a mirror in a temp dir"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mirror = TodoistMirror(Path(self.temp_dir.name) / "mirror.db")
+
+    def tearDown(self):
+        self.mirror.close()
+        self.temp_dir.cleanup()
+
+    def test_deltas_converge(self):
+        self.assertEqual(self.mirror.sync_token("acct"), "*")
+        self.mirror.apply(FULL_SYNC, account="acct")
+        self.assertEqual([t['id'] for t in self.mirror.inbox_tasks()], ["1", "2"])
+        self.assertEqual([(t['id'], t['is_overdue'], t['has_time']) for t in self.mirror.today_tasks(TODAY)],
+                         [("4", True, False), ("3", False, True)])
+
+        for delta in DELTAS:
+            self.mirror.apply(delta, account="acct")
+        self.assertEqual(self.mirror.sync_token("acct"), "t3")
+        self.assertEqual([t['content'] for t in self.mirror.inbox_tasks()], ["Renew passport"])
+        self.assertEqual([t['id'] for t in self.mirror.today_tasks(TODAY)], ["1", "3"])
+
+        # A full sync replaces whatever the deltas left behind
+        self.mirror.apply(FULL_SYNC, account="acct")
+        self.assertEqual([t['id'] for t in self.mirror.inbox_tasks()], ["1", "2"])
+
+    def test_local_adds_kept_until_dropped(self):
+        self.mirror.apply(FULL_SYNC, account="acct")
+        self.mirror.add_task("tmp-1", "Write report", ["deep"], due_string="today", due_date=TODAY, local=True)
+        self.assertIn("tmp-1", [t['id'] for t in self.mirror.inbox_tasks()])
+        self.assertIn("tmp-1", [t['id'] for t in self.mirror.today_tasks(TODAY)])
+
+        # A full sync does not know the temporary id yet and must keep it
+        self.mirror.apply(FULL_SYNC, account="acct")
+        self.assertEqual(self.mirror.local_tasks(), ["tmp-1"])
+        self.assertCountEqual([t['id'] for t in self.mirror.inbox_tasks()], ["1", "2", "tmp-1"])
+
+        self.mirror.drop_local(["tmp-1"])
+        self.assertEqual(self.mirror.local_tasks(), [])
+        self.assertEqual([t['id'] for t in self.mirror.inbox_tasks()], ["1", "2"])
+
+    def test_full_sync_forced_for_other_account_or_old_mirror(self):
+        self.mirror.apply(FULL_SYNC, account="acct")
+        self.assertTrue(self.mirror.is_fresh(60, "acct"))
+        self.assertFalse(self.mirror.is_fresh(60, "other"))
+        self.assertEqual(self.mirror.sync_token("other"), "*")
+
+        with patch('gtd_coach.integrations.todoist_mirror.time.time',
+                   return_value=time.time() + FULL_SYNC_INTERVAL + 1):
+            self.assertEqual(self.mirror.sync_token("acct"), "*")
+
+    def test_expire_and_local_completion(self):
+        self.mirror.apply(FULL_SYNC, account="acct")
+        self.mirror.mark_completed("1")
+        self.assertEqual([t['id'] for t in self.mirror.inbox_tasks()], ["2"])
+        self.mirror.expire()
+        self.assertFalse(self.mirror.is_fresh(60))
+        self.assertEqual(self.mirror.sync_token("acct"), "t1")  # still incremental
+
+
+class TestClientMirrorReads(unittest.TestCase):
+    """TodoistClient reads through the mirror against the fake server"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = FakeTodoistServer(inbox_items=5)
+        env = patch.dict(os.environ, {'TODOIST_API_URL': self.server.url})
+        env.start()
+        self.addCleanup(env.stop)
+        self.mirror = TodoistMirror(Path(self.temp_dir.name) / "mirror.db")
+        for target, value in (('MIRROR_ENABLED', True), ('_clients', {})):
+            patcher = patch.object(todoist, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch('gtd_coach.integrations.todoist_mirror.get_todoist_mirror', return_value=self.mirror)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.mirror.close()
+        self.temp_dir.cleanup()
+
+    def test_reads_within_staleness_skip_the_network(self):
+        client = todoist.get_todoist_client(api_key="token")
+        for _ in range(3):
+            self.assertEqual(len(client.get_inbox_tasks()), 5)
+        self.assertEqual(self.server.requests['POST /api/v1/sync'], 1)
+        self.assertEqual(self.server.requests['GET /api/v1/tasks'], 0)
+
+        # Changes from another device arrive with the next incremental sync
+        self.server.complete_task("1")
+        self.server.delete_task("2")
+        new_id = self.server.add_task("Renew passport")
+        client.mirror_staleness = 0
+        self.assertEqual([t['id'] for t in client.get_inbox_tasks()], ["3", "4", "5", new_id])
+        self.assertEqual(self.server.requests['POST /api/v1/sync'], 2)
+
+        # Our own completion hides the task without waiting for a sync
+        client.mirror_staleness = 60
+        client.mark_complete("3")
+        self.assertEqual([t['id'] for t in client.get_inbox_tasks()], ["4", "5", new_id])
+        self.assertEqual(self.server.requests['POST /api/v1/sync'], 2)
+
+    def test_queued_add_visible_until_sync_confirms_it(self):
+        queue = TodoistWriteQueue("token", db_path=Path(self.temp_dir.name) / "journal.db",
+                                  sync_url=f"{self.server.url}/api/v1/sync", autostart=False)
+        self.addCleanup(queue.close)
+        with patch('gtd_coach.integrations.todoist_queue.get_write_queue', return_value=queue):
+            client = todoist.get_todoist_client(api_key="token", write_behind=True)
+        client.get_inbox_tasks()
+        syncs = self.server.requests['POST /api/v1/sync']
+
+        # Shown from the mirror before the queue has sent anything
+        temp_id = client.add_to_today("Write report")
+        self.assertEqual(client.get_inbox_tasks()[-1]['id'], temp_id)
+        self.assertEqual(self.server.requests['POST /api/v1/sync'], syncs)
+
+        # Once acknowledged, the next sync swaps it for the real task
+        self.assertTrue(client.flush())
+        real_id = queue.resolve(temp_id)
+        client.mirror_staleness = 0
+        client.get_inbox_tasks()
+        self.assertEqual(self.mirror.local_tasks(), [])
+        self.assertNotIn(temp_id, [t['id'] for t in client.get_inbox_tasks()])
+        self.assertEqual(sum(t['content'] == "Write report" for t in self.mirror.today_tasks(TODAY)), 1)
+        self.assertIn(real_id, [t['id'] for t in self.mirror.today_tasks(TODAY)])
+
+    def test_sync_failure_falls_back_to_rest(self):
+        client = todoist.get_todoist_client(api_key="token")
+        with patch.object(client.http, 'post', side_effect=OSError("offline")):
+            self.assertEqual(len(client.get_inbox_tasks()), 5)
+        self.assertEqual(self.server.requests['GET /api/v1/tasks'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
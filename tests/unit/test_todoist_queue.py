@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind Todoist mutation queue against a local fake Sync API
+"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from gtd_coach.integrations.todoist import TodoistClient
+from gtd_coach.integrations.todoist_queue import TodoistWriteQueue
+
+
+class FakeTodoist:
+    """Sync API stand-in that applies each command uuid once, like Todoist"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []      # command uuids per request, in arrival order
+        self.applied = []       # commands applied, in order
+        self.seen = {}          # uuid -> sync status
+        self.fail_next = 0      # requests to answer with 503
+        self.lose_ack_next = 0  # requests applied but answered with 500
+        self.reject = set()     # task ids whose item_close fails
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                fake.handle(self, body['commands'])
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/sync"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def handle(self, handler, commands):
+        time.sleep(self.delay)
+        self.requests.append([c['uuid'] for c in commands])
+        if self.fail_next:
+            self.fail_next -= 1
+            return self._reply(handler, 503, {})
+
+        mapping = {}
+        for command in commands:
+            if command['uuid'] in self.seen:
+                continue
+            if command['type'] == 'item_close' and command['args']['id'] in self.reject:
+                self.seen[command['uuid']] = {'error_code': 22, 'error': "Item not found"}
+                continue
+            self.applied.append(command)
+            self.seen[command['uuid']] = 'ok'
+            if 'temp_id' in command:
+                mapping[command['temp_id']] = f"real-{len(self.applied)}"
+
+        if self.lose_ack_next:
+            self.lose_ack_next -= 1
+            return self._reply(handler, 500, {})
+        self._reply(handler, 200, {
+            'sync_status': {c['uuid']: self.seen[c['uuid']] for c in commands},
+            'temp_id_mapping': mapping
+        })
+
+    def _reply(self, handler, code, payload):
+        data = json.dumps(payload).encode()
+        handler.send_response(code)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestTodoistWriteQueue(unittest.TestCase):
+    """Ordering, deduplication and crash replay"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "journal.db"
+        self.fake = FakeTodoist()
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.close()
+        self.fake.shutdown()
+        self.temp_dir.cleanup()
+
+    def make_queue(self, **kwargs):
+        kwargs.setdefault('autostart', False)
+        queue = TodoistWriteQueue("token", db_path=self.db_path, sync_url=self.fake.url, **kwargs)
+        self.queues.append(queue)
+        return queue
+
+    def test_batches_in_journal_order(self):
+        queue = self.make_queue(batch_size=4)
+        temp_ids = []
+        for i in range(5):
+            temp_ids.append(queue.add_item(f"task {i}", due_string="today", key=f"item_add:{i}"))
+            queue.close_item(f"inbox-{i}")
+
+        self.assertTrue(queue.flush())
+        self.assertEqual([len(r) for r in self.fake.requests], [4, 4, 2])
+        self.assertEqual(
+            [c['args'].get('content') or c['args']['id'] for c in self.fake.applied],
+            [x for i in range(5) for x in (f"task {i}", f"inbox-{i}")]
+        )
+        self.assertEqual(self.fake.applied[0]['args']['due'], {'string': "today"})
+        self.assertEqual(queue.resolve(temp_ids[0]), "real-1")
+        self.assertEqual(queue.pending_count(), 0)
+
+    def test_duplicates_sent_once(self):
+        queue = self.make_queue()
+        first = queue.add_item("Write report", key="item_add:42")
+        self.assertEqual(queue.add_item("Write report", key="item_add:42"), first)
+        queue.close_item("42")
+        queue.close_item("42")
+
+        self.assertTrue(queue.flush())
+        self.assertEqual(len(self.fake.applied), 2)
+
+    def test_crash_replay_after_lost_ack(self):
+        queue = self.make_queue()
+        for i in range(3):
+            queue.close_item(f"inbox-{i}")
+        # Todoist applies the batch but the response never arrives
+        self.fake.lose_ack_next = 1
+        self.assertIsNone(queue.send_batch())
+        queue.close_item("inbox-3")
+        queue.close()  # crash: nothing acknowledged
+
+        replayed = self.make_queue()
+        self.assertEqual(replayed.pending_count(), 4)
+        self.assertTrue(replayed.flush())
+        self.assertEqual(self.fake.requests[1], self.fake.requests[0] + self.fake.requests[1][3:])
+        self.assertEqual([c['args']['id'] for c in self.fake.applied],
+                         ["inbox-0", "inbox-1", "inbox-2", "inbox-3"])
+
+    def test_outage_retried_and_rejections_recorded(self):
+        queue = self.make_queue()
+        self.fake.reject.add("gone")
+        queue.close_item("gone")
+        queue.close_item("ok")
+        self.fake.fail_next = 1
+
+        self.assertTrue(queue.flush())
+        self.assertEqual(len(self.fake.requests), 2)
+        self.assertEqual([c['args']['id'] for c in self.fake.applied], ["ok"])
+        self.assertEqual([f['args'] for f in queue.failed()], ['{"id": "gone"}'])
+
+    def test_enqueue_does_not_wait_for_network(self):
+        self.fake.delay = 0.3
+        queue = self.make_queue(autostart=True, flush_interval=0.05)
+
+        started = time.monotonic()
+        for i in range(10):
+            queue.close_item(f"inbox-{i}")
+        self.assertLess(time.monotonic() - started, 0.3)
+
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(len(self.fake.applied), 10)
+        self.assertLess(len(self.fake.requests), 10)  # batched while the first request ran
+
+    def test_client_routes_through_queue(self):
+        queue = self.make_queue()
+        with patch('gtd_coach.integrations.todoist_queue.get_write_queue', return_value=queue), \
+                patch('gtd_coach.integrations.todoist.MIRROR_ENABLED', False):
+            client = TodoistClient(api_key="token", write_behind=True)
+            client.api = object()  # configured; the REST API must not be called
+            temp_id = client.add_to_today("Design schema", is_deep_work=True, source_id="7")
+            self.assertTrue(client.mark_complete("7"))
+            self.assertTrue(client.flush())
+
+        self.assertEqual(queue.resolve(temp_id), "real-1")
+        self.assertEqual(self.fake.applied[0]['args']['labels'], ["deep"])
+        self.assertEqual(self.fake.applied[1], {'type': 'item_close', 'uuid': self.fake.applied[1]['uuid'],
+                                                'args': {'id': "7"}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the local Langfuse trace mirror
+"""
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.analytics.trace_mirror import TraceMirror
+
+
+class FakeTraceAPI:
+    """Langfuse ``api.trace`` stand-in with paging and call counting"""
+
+    def __init__(self, traces, delay=0.05):
+        self.traces = traces
+        self.delay = delay
+        self.list_calls = []
+        self.get_calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+    def list(self, page=1, limit=50, session_id=None, from_timestamp=None):
+        self.list_calls.append(page)
+        self._enter()
+        matching = [t for t in self.traces if not session_id or t['sessionId'] == session_id]
+        total_pages = max(1, -(-len(matching) // limit))
+        data = [{k: v for k, v in t.items() if k not in ('detail_observations', 'detail_scores')}
+                for t in matching[(page - 1) * limit:page * limit]]
+        return SimpleNamespace(data=data, meta=SimpleNamespace(total_pages=total_pages))
+
+    def get(self, trace_id):
+        self.get_calls.append(trace_id)
+        self._enter()
+        trace = next(t for t in self.traces if t['id'] == trace_id)
+        return {**trace, 'observations': trace['detail_observations'], 'scores': trace['detail_scores']}
+
+
+def make_trace(i, when, session="s1"):
+    return {
+        'id': f"t{i}",
+        'name': "gtd-review",
+        'sessionId': session,
+        'timestamp': when.isoformat(),
+        'updatedAt': when.isoformat(),
+        'tags': ["gtd-review"],
+        'metadata': {"phase": "MIND_SWEEP"},
+        'detail_observations': [
+            {'id': f"o{i}-{j}", 'name': "check_in_with_user", 'type': "SPAN",
+             'startTime': (when + timedelta(seconds=j)).isoformat(), 'output': {"j": j}}
+            for j in range(3)
+        ],
+        'detail_scores': [{'id': f"sc{i}", 'name': "quality", 'value': 0.8}],
+    }
+
+
+class TestTraceMirror(unittest.TestCase):
+    """Concurrent paged sync, change detection and local queries"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mirror = TraceMirror(Path(self.temp_dir.name) / "mirror.db")
+        now = datetime.now(timezone.utc)
+        self.api = FakeTraceAPI([make_trace(i, now - timedelta(minutes=i)) for i in range(12)])
+        self.client = SimpleNamespace(api=SimpleNamespace(trace=self.api))
+
+    def tearDown(self):
+        self.mirror.close()
+        self.temp_dir.cleanup()
+
+    def test_sync_is_concurrent_and_incremental(self):
+        stats = self.mirror.sync(self.client, page_size=5, max_workers=4)
+        self.assertEqual(stats, {'listed': 12, 'fetched': 12, 'failed': 0})
+        self.assertEqual(sorted(self.api.list_calls), [1, 2, 3])
+        self.assertGreater(self.api.max_active, 1)
+
+        # Unchanged traces are not fetched again; an updated one is
+        self.api.get_calls.clear()
+        self.api.traces[3]['updatedAt'] = datetime.now(timezone.utc).isoformat()
+        self.api.traces[3]['detail_scores'].append({'id': "late", 'name': "followthrough", 'value': 1.0})
+        stats = self.mirror.sync(self.client, page_size=5)
+        self.assertEqual(stats['fetched'], 1)
+        self.assertEqual(self.api.get_calls, ["t3"])
+        self.assertEqual(len(self.mirror.scores(["t3"])["t3"]), 2)
+
+    def test_queries_read_locally(self):
+        self.mirror.sync(self.client)
+        traces = self.mirror.traces(session_id="s1", limit=5)
+        self.assertEqual([t.id for t in traces], ["t0", "t1", "t2", "t3", "t4"])
+        self.assertIsInstance(traces[0].timestamp, datetime)
+        self.assertEqual(traces[0].tags, ["gtd-review"])
+        self.assertEqual(len(self.mirror.traces(tag="gtd-review")), 12)
+        self.assertEqual(self.mirror.traces(tag="other"), [])
+
+        observations = self.mirror.observations(["t0", "t1"])
+        self.assertEqual([o.output for o in observations["t0"]], [{"j": 0}, {"j": 1}, {"j": 2}])
+        self.assertEqual(observations["t1"][0].name, "check_in_with_user")
+        self.assertEqual(self.mirror.scores(["t0"])["t0"][0].value, 0.8)
+        self.assertIsNotNone(self.mirror.last_sync())
+
+    def test_failed_detail_fetch_is_retried_next_sync(self):
+        original = self.api.get
+
+        def flaky_get(trace_id):
+            if trace_id == "t5":
+                raise RuntimeError("502 Bad Gateway")
+            return original(trace_id)
+
+        self.api.get = flaky_get
+        stats = self.mirror.sync(self.client)
+        self.assertEqual(stats['failed'], 1)
+        self.assertIsNone(self.mirror.get_trace("t5"))
+
+        self.api.get = original
+        self.assertEqual(self.mirror.sync(self.client)['fetched'], 1)
+        self.assertIsNotNone(self.mirror.get_trace("t5"))
+
+    def test_analysis_script_runs_offline(self):
+        from scripts.analyze_langfuse_traces import analyze_test_failure
+
+        self.mirror.sync(self.client)
+        self.api.list_calls.clear()
+        with patch('scripts.analyze_langfuse_traces.get_trace_mirror', return_value=self.mirror):
+            analysis = analyze_test_failure("s1", return_data=True, offline=True)
+
+        self.assertEqual(self.api.list_calls, [])
+        self.assertEqual(len(analysis["traces"]), 12)
+        self.assertEqual(len(analysis["tool_calls"]), 36)
+
+
+    def test_sync_single_trace_by_id(self):
+        self.assertTrue(self.mirror.sync_trace(self.client, "t7"))
+        self.assertEqual(self.api.list_calls, [])
+        self.assertEqual(self.api.get_calls, ["t7"])
+        self.assertEqual(len(self.mirror.observations(["t7"])["t7"]), 3)
+
+        # A later list sync sees the same version and does not refetch it
+        self.api.get_calls.clear()
+        self.mirror.sync(self.client)
+        self.assertNotIn("t7", self.api.get_calls)
+
+    def test_trace_details_fetch_missing_trace(self):
+        from scripts.analyze_langfuse_traces import get_trace_details
+
+        def sync(mirror=None, trace_id=None, **kwargs):
+            return {'fetched': int(mirror.sync_trace(self.client, trace_id))}
+
+        with patch('scripts.analyze_langfuse_traces.get_trace_mirror', return_value=self.mirror), \
+             patch('scripts.analyze_langfuse_traces.sync_trace_mirror', side_effect=sync):
+            get_trace_details("t4")
+        self.assertEqual(self.api.get_calls, ["t4"])
+        self.assertIsNotNone(self.mirror.get_trace("t4"))
+
+    def test_missing_keys_and_empty_mirror_is_an_error(self):
+        from scripts.analyze_langfuse_traces import analyze_test_failure
+
+        with patch.dict('os.environ', {'LANGFUSE_PUBLIC_KEY': '', 'LANGFUSE_SECRET_KEY': ''}), \
+             patch('scripts.analyze_langfuse_traces.get_trace_mirror', return_value=self.mirror):
+            analysis = analyze_test_failure("s1", return_data=True)
+        self.assertIn("keys not found", analysis["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the warm transcription worker, using a stub model in place of Whisper
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gtd_coach.integrations.transcription import TranscriptionError, TranscriptionWorker
+
+
+class StubModel:
+    """Whisper stand-in: text clips echo their contents, WAV clips their frame count"""
+
+    def transcribe(self, audio_file):
+        path = Path(audio_file)
+        if path.suffix == ".wav":
+            with wave.open(str(path), 'rb') as clip:
+                return {"text": f"{clip.getnframes()} frames"}
+        text = path.read_text()
+        if text == "crash":
+            os._exit(3)
+        if text.startswith("slow"):
+            time.sleep(1.0)
+        return {"text": f" {text} "}
+
+
+class TestTranscriptionWorker(unittest.TestCase):
+    """Multiplexing, chunking, timeouts, crash recovery and idle unload"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_worker(self, **kwargs):
+        worker = TranscriptionWorker(model_factory=StubModel, **kwargs)
+        self.addCleanup(worker.close)
+        return worker
+
+    def clip(self, name, text):
+        path = self.dir / f"{name}.txt"
+        path.write_text(text)
+        return path
+
+    def test_concurrent_clips_share_one_warm_model(self):
+        worker = self.make_worker()
+        clips = [self.clip(f"note{i}", f"note {i}") for i in range(12)]
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            texts = list(pool.map(lambda c: worker.transcribe(c, timeout=30), clips))
+
+        self.assertEqual(texts, [f"note {i}" for i in range(12)])
+        self.assertEqual((worker.starts, worker.model_loads), (1, 1))
+
+    def test_long_recording_streams_in_chunks(self):
+        recording = self.dir / "long.wav"
+        with wave.open(str(recording), 'wb') as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(8000)
+            out.writeframes(b"\x00\x00" * 20000)
+
+        worker = self.make_worker(chunk_seconds=1)
+        self.assertEqual(list(worker.stream(recording, timeout=30)),
+                         ["8000 frames", "8000 frames", "4000 frames"])
+        self.assertEqual(list(self.dir.iterdir()), [recording])  # chunk files removed
+
+    def test_timeout_leaves_worker_usable(self):
+        worker = self.make_worker()
+        worker.transcribe(self.clip("warm", "warm"), timeout=30)
+        with self.assertRaises(TimeoutError):
+            worker.transcribe(self.clip("slow", "slow note"), timeout=0.2)
+        self.assertEqual(worker.transcribe(self.clip("next", "next"), timeout=30), "next")
+        self.assertEqual(worker.starts, 1)
+
+    def test_crash_fails_only_the_clip_in_progress(self):
+        worker = self.make_worker()
+        crashing = worker.submit(self.clip("bad", "crash"))
+        queued = [worker.submit(self.clip(f"after{i}", f"after {i}")) for i in range(3)]
+
+        with self.assertRaises(TranscriptionError):
+            crashing.result(timeout=30)
+        self.assertEqual([f.result(timeout=30) for f in queued], ["after 0", "after 1", "after 2"])
+        self.assertEqual(worker.starts, 2)
+
+    def test_idle_timeout_unloads_model(self):
+        worker = self.make_worker(idle_timeout=0.3)
+        worker.transcribe(self.clip("first", "first"), timeout=30)
+        deadline = time.monotonic() + 10
+        while worker.pid is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertIsNone(worker.pid)
+
+        self.assertEqual(worker.transcribe(self.clip("second", "second"), timeout=30), "second")
+        self.assertEqual((worker.starts, worker.model_loads), (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
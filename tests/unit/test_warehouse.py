@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental local analytics warehouse
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from gtd_coach.analytics.warehouse import ArtifactWarehouse
+from gtd_coach.persistence.jsonl import StreamingDocument
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+class TestArtifactWarehouse(unittest.TestCase):
+    """Incremental ingestion and windowed queries"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.data_dir, self.logs_dir = root / "data", root / "logs"
+        self.now = datetime.now().replace(microsecond=0)
+        old, recent = self.now - timedelta(days=30), self.now - timedelta(days=2)
+
+        for when in (old, recent):
+            stamp = when.strftime("%Y%m%d_%H%M%S")
+            write_json(self.logs_dir / f"review_{stamp}.json", {"session_id": stamp, "phases": {}})
+            write_json(self.data_dir / f"mindsweep_{stamp}.json", {"items": [f"item {stamp}"]})
+            write_json(self.data_dir / f"graphiti_batch_s1_{stamp}.json", {
+                "session_id": "s1",
+                "episodes": [
+                    {"type": "behavior_pattern", "timestamp": when.isoformat(),
+                     "data": {"pattern_type": "task_switch", "phase": "MIND_SWEEP"}},
+                    {"type": "interaction", "timestamp": when.isoformat(), "data": {}},
+                ]
+            })
+            write_json(self.data_dir / f"north_star_metrics_{stamp}.json",
+                       {"session_start": when.isoformat(), "metrics": {}})
+        for i in range(5):
+            write_json(self.data_dir / "evaluations" / f"eval_2024010{i}_090000.json",
+                       {"session_id": str(i), "timestamp": (self.now - timedelta(days=i)).isoformat()})
+
+        self.warehouse = ArtifactWarehouse(self.data_dir, self.logs_dir)
+
+    def tearDown(self):
+        self.warehouse.close()
+        self.temp_dir.cleanup()
+
+    def test_ingest_is_incremental(self):
+        self.assertEqual(self.warehouse.ingest()['loaded'], 13)
+        self.assertEqual(self.warehouse.ingest(), {'loaded': 0, 'removed': 0, 'failed': 0})
+
+        review = sorted(self.logs_dir.glob("review_*.json"))[-1]
+        write_json(review, {"session_id": "changed", "phases": {"STARTUP": {}}})
+        os.utime(review, (1, 1))
+        mindsweep = sorted(self.data_dir.glob("mindsweep_*.json"))[0]
+        mindsweep.unlink()
+        self.assertEqual(self.warehouse.ingest(), {'loaded': 1, 'removed': 1, 'failed': 0})
+
+        self.assertEqual(self.warehouse.query('review')[-1]['session_id'], "changed")
+        self.assertEqual(len(self.warehouse.query('mindsweep')), 1)
+
+    def test_window_queries(self):
+        self.warehouse.ingest()
+        since = self.now - timedelta(days=7)
+        reviews = self.warehouse.query('review', since=since)
+        self.assertEqual(len(reviews), 1)
+        self.assertGreaterEqual(reviews[0]['timestamp'], since)
+
+        recent_week = (self.now - timedelta(days=2)).strftime("%G-W%V")
+        self.assertEqual(len(self.warehouse.query('north_star', week=recent_week)), 1)
+        patterns = self.warehouse.episodes('behavior_pattern', since=since)
+        self.assertEqual([p['data']['pattern_type'] for p in patterns], ['task_switch'])
+        self.assertEqual(len(self.warehouse.episodes('behavior_pattern')), 2)
+
+    def test_streamed_jsonl_logs(self):
+        stamp = self.now.strftime("%Y%m%d_%H%M%S")
+        doc = StreamingDocument(self.data_dir / "2025" / "W01" / f"graphiti_batch_s2_{stamp}.jsonl",
+                                "episodes", session_id="s2")
+        doc.add({"type": "behavior_pattern", "timestamp": self.now.isoformat(),
+                 "data": {"pattern_type": "hyperfocus"}})
+        doc.close()
+
+        self.assertEqual(self.warehouse.ingest(['graphiti_batch'])['loaded'], 3)
+        self.assertEqual(len(self.warehouse.episodes('behavior_pattern', pattern_type='hyperfocus')), 1)
+
+    def test_recent_by_name(self):
+        self.warehouse.ingest()
+        recent = self.warehouse.query('evaluation', limit=3, order='name')
+        self.assertEqual([r['session_id'] for r in recent], ['2', '3', '4'])
+
+
+    def test_query_ingests_only_its_kind(self):
+        self.warehouse.mark_stale()
+        self.assertEqual(len(self.warehouse.query('evaluation')), 5)
+        kinds = {row[0] for row in self.warehouse._conn.execute("SELECT kind FROM ingested_files")}
+        self.assertEqual(kinds, {'evaluation'})
+
+        # New files show up after the next mark_stale(), not before
+        write_json(self.data_dir / "evaluations" / "eval_20240109_090000.json",
+                   {"session_id": "9", "timestamp": self.now.isoformat()})
+        self.assertEqual(len(self.warehouse.query('evaluation')), 5)
+        self.warehouse.mark_stale()
+        self.assertEqual(len(self.warehouse.query('evaluation')), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()